@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compare two pytest-benchmark result files and flag the regressions.
+
+Run the suite once to store a baseline, and again after a change:
+
+    python -m pytest benchmarks/test_hot_paths.py --benchmark-json=baseline.json
+    python -m pytest benchmarks/test_hot_paths.py --benchmark-json=current.json
+    python benchmarks/compare_benchmarks.py baseline.json current.json --tolerance 0.15
+
+A benchmark regresses when its statistic grows by more than the tolerance
+and by more than --min-difference milliseconds, which keeps the jitter of
+sub-millisecond benchmarks from being reported. The exit status is 1 if
+any benchmark regressed.
+"""
+
+import argparse
+import json
+import sys
+
+# Statistics of pytest-benchmark that can be compared
+STATS = ('min', 'median', 'mean', 'max')
+
+
+def load_results(path, stat):
+    """Read a pytest-benchmark JSON file.
+
+    Returns:
+        dict: Seconds of the statistic, by benchmark full name
+    """
+    with open(path, encoding='utf-8') as results_file:
+        results = json.load(results_file)
+    return {benchmark['fullname']: benchmark['stats'][stat] for benchmark in results['benchmarks']}
+
+
+def compare(baseline, current, tolerance, min_difference):
+    """Compare the results of two runs.
+
+    Args:
+        baseline (dict): Seconds by benchmark, as stored
+        current (dict): Seconds by benchmark, of the run to check
+        tolerance (float): Relative growth allowed, e.g. 0.15 for 15%
+        min_difference (float): Growth in seconds always allowed
+
+    Returns:
+        list: (name, baseline seconds, current seconds, status) rows, status being
+            'ok', 'faster', 'REGRESSION', 'new' or 'missing'
+    """
+    rows = []
+    for name in sorted(set(baseline) | set(current)):
+        before, after = baseline.get(name), current.get(name)
+        if before is None:
+            status = 'new'
+        elif after is None:
+            status = 'missing'
+        elif after > before * (1 + tolerance) and after - before > min_difference:
+            status = 'REGRESSION'
+        elif after < before * (1 - tolerance) and before - after > min_difference:
+            status = 'faster'
+        else:
+            status = 'ok'
+        rows.append((name, before, after, status))
+    return rows
+
+
+def format_ms(seconds):
+    """Format a time in milliseconds, or '-' if missing."""
+    return '-' if seconds is None else f'{seconds * 1000:.3f}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two pytest-benchmark result files.")
+    parser.add_argument('baseline', help="JSON results stored with --benchmark-json")
+    parser.add_argument('current', help="JSON results of the run to check")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="Relative slowdown allowed before flagging a regression (default 0.15)")
+    parser.add_argument('--min-difference', type=float, default=0.1,
+                        help="Slowdown in milliseconds always allowed (default 0.1)")
+    parser.add_argument('--stat', choices=STATS, default='median', help="Statistic compared (default median)")
+    args = parser.parse_args()
+
+    rows = compare(load_results(args.baseline, args.stat), load_results(args.current, args.stat),
+                   args.tolerance, args.min_difference / 1000)
+
+    width = max([len(name) for name, _, _, _ in rows] + [len('Benchmark')])
+    print(f"{'Benchmark':<{width}}  {'Baseline ms':>12}  {'Current ms':>12}  {'Change':>8}  Status")
+    for name, before, after, status in rows:
+        change = f'{(after - before) / before * 100:+.1f}%' if before and after is not None else '-'
+        print(f"{name:<{width}}  {format_ms(before):>12}  {format_ms(after):>12}  {change:>8}  {status}")
+
+    regressions = [name for name, _, _, status in rows if status == 'REGRESSION']
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%} ({args.stat})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Import time report for the Finanzas startup path.
+
+Runs one cold start under `python -X importtime` (until the dashboard is
+first painted) and prints the most expensive imports, flagging heavy
+modules that should have been deferred.
+
+Usage:
+    python benchmarks/import_time_report.py [--top 25] [--db path/to/finanzas.db]
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+
+from startup_benchmark import ROOT_DIR, HEAVY_MODULES, FIRST_PAINT_MARKER, child_command
+
+
+def parse_import_times(stderr):
+    """Parse the output of `python -X importtime` up to the first paint.
+
+    Args:
+        stderr (str): Captured standard error of the interpreter
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth) tuples in import order
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if line.strip() == FIRST_PAINT_MARKER:
+            break
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the import cost of the startup path.")
+    parser.add_argument('--top', type=int, default=25, help="Number of modules to list")
+    parser.add_argument('--db', help="Database to open. Defaults to a new empty database")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), 'finanzas.db')
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    output = subprocess.run(child_command(db_path, python_options=('-X', 'importtime')),
+                            capture_output=True, text=True, env=env, check=True, cwd=ROOT_DIR)
+
+    entries = parse_import_times(output.stderr)
+    top_level_total = sum(cumulative for _, _, cumulative, depth in entries if depth == 0)
+
+    print(f"Total import time before first paint: {top_level_total / 1000:.1f} ms "
+          f"({len(entries)} modules)")
+    print()
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for name, self_us, cumulative_us, depth in sorted(entries, key=lambda e: e[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:10.1f}ms {self_us / 1000:8.1f}ms  {'  ' * depth}{name}")
+
+    loaded_heavy = sorted({name.split('.')[0] for name, _, _, _ in entries} & set(HEAVY_MODULES))
+    print()
+    if loaded_heavy:
+        print(f"Heavy modules imported before first paint: {', '.join(loaded_heavy)}")
+    else:
+        print("No heavy modules imported before first paint.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Startup benchmark for Finanzas.
+
+Measures the time from process start until the dashboard is first painted,
+with lazily built tabs and with every tab built eagerly. Each run happens in
+a fresh interpreter so imports are measured cold.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 5] [--db path/to/finanzas.db]
+
+See also benchmarks/import_time_report.py for a per-module breakdown.
+"""
+
+import time
+START_TIME = time.perf_counter()
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should only be imported when first needed, never before first paint
+HEAVY_MODULES = ('pyqtgraph', 'numpy', 'pandas', 'matplotlib', 'openpyxl', 'pyarrow')
+
+# Written to stderr at first paint, so import time reports can stop there
+FIRST_PAINT_MARKER = '-- first paint --'
+
+
+def measure_first_paint(db_path, lazy_tabs):
+    """Start the application and measure the first paint of the dashboard.
+
+    Args:
+        db_path (str): Path to the database file
+        lazy_tabs (bool): Build tab views on first activation
+
+    Returns:
+        dict: 'elapsed' seconds from interpreter start to the first dashboard paint,
+            and the 'heavy_modules' already imported at that moment
+    """
+    sys.path.insert(0, ROOT_DIR)
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QObject, QEvent, QTimer
+    from src.models.database_manager import DatabaseManager
+    from src.views.main_window import MainWindow
+    from src.controllers.main_controller import MainController
+
+    app = QApplication(sys.argv)
+    app.setStyle('Fusion')
+
+    db_manager = DatabaseManager(db_path)
+    db_manager.setup_database()
+
+    main_window = MainWindow(lazy_tabs=lazy_tabs)
+    controller = MainController(main_window, db_manager)
+
+    result = {}
+
+    class PaintWatcher(QObject):
+        """Stops the event loop on the first dashboard paint."""
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and 'elapsed' not in result:
+                result['elapsed'] = time.perf_counter() - START_TIME
+                result['heavy_modules'] = [name for name in HEAVY_MODULES if name in sys.modules]
+                print(FIRST_PAINT_MARKER, file=sys.stderr, flush=True)
+                QTimer.singleShot(0, app.quit)
+            return False
+
+    watcher = PaintWatcher()
+    main_window.dashboard_view.installEventFilter(watcher)
+
+    # Safety net in case the platform never paints
+    QTimer.singleShot(30000, app.quit)
+
+    main_window.show()
+    app.exec_()
+
+    result.setdefault('elapsed', float('nan'))
+    result.setdefault('heavy_modules', [])
+    return result
+
+
+def child_command(db_path, lazy_tabs=True, python_options=()):
+    """Return the command line of a single cold start measurement."""
+    command = [sys.executable, *python_options, os.path.abspath(__file__), '--child', '--db', db_path]
+    if not lazy_tabs:
+        command.append('--eager')
+    return command
+
+
+def run_child(db_path, lazy_tabs=True):
+    """Run one cold measurement in a fresh interpreter.
+
+    Returns:
+        dict: 'elapsed' seconds to first paint and the 'heavy_modules' loaded by then
+    """
+    import subprocess
+
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    output = subprocess.run(child_command(db_path, lazy_tabs), capture_output=True, text=True,
+                            env=env, check=True, cwd=ROOT_DIR)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the time to first paint of the dashboard.")
+    parser.add_argument('--runs', type=int, default=5, help="Number of cold starts per mode")
+    parser.add_argument('--db', help="Database to open. Defaults to a new empty database")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--eager', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_first_paint(args.db, lazy_tabs=not args.eager)))
+        return
+
+    import statistics
+
+    db_path = args.db
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(), 'finanzas.db')
+
+    results = {}
+    for label, lazy_tabs in (("Eager tabs", False), ("Lazy tabs", True)):
+        timings = [run_child(db_path, lazy_tabs)['elapsed'] for _ in range(args.runs)]
+        results[label] = statistics.median(timings)
+        print(f"{label:<12} median {results[label] * 1000:8.1f} ms  "
+              f"(min {min(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms)")
+
+    eager, lazy = results["Eager tabs"], results["Lazy tabs"]
+    if eager > 0:
+        print(f"Improvement: {(eager - lazy) * 1000:.1f} ms ({(eager - lazy) / eager * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
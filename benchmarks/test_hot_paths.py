@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+pytest-benchmark suite of the database and controller hot paths.
+
+Every benchmark runs against synthetic ledgers built by
+src/models/ledger_generator.py. The ledgers are cached between runs, in
+FINANZAS_BENCHMARK_CACHE or the system's temporary directory, and the
+sizes measured are chosen with FINANZAS_BENCHMARK_SIZES:
+
+    FINANZAS_BENCHMARK_SIZES=small,medium,large python -m pytest benchmarks/test_hot_paths.py \
+        --benchmark-json=baseline.json
+
+See benchmarks/compare_benchmarks.py to compare two runs.
+"""
+
+import csv
+import importlib.util
+import itertools
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from src.models import dashboard_data, exporters, importers, report_data
+from src.models.database_manager import DatabaseManager
+from src.models.ledger_generator import generate_ledger
+
+# Transactions of each ledger size
+LEDGER_SIZES = {'small': 10000, 'medium': 100000, 'large': 1000000}
+
+# Sizes measured, from the environment; the large ledgers take minutes to build
+SIZES = [size.strip() for size in os.environ.get('FINANZAS_BENCHMARK_SIZES', 'small').split(',') if size.strip()]
+
+# Seed of every ledger, so every run measures the same rows
+LEDGER_SEED = 2024
+
+# Rows read per page of the transactions view
+PAGE_SIZE = 200
+
+# Rows of each imported file
+IMPORT_ROWS = 5000
+
+# Last day of the ledgers, fixed so that runs on different days measure the same
+# data; the filters and reports cover the months before it
+LEDGER_END = date(2024, 12, 31)
+
+# get_transactions() filters, as the transactions view sends them
+TRANSACTION_FILTERS = {
+    'first_page': {},
+    'account': {'account_id': 1},
+    'category': {'category_id': 1},
+    'type': {'transaction_type': 'income'},
+    'dates': {'start_date': (LEDGER_END - timedelta(days=90)).isoformat(), 'end_date': LEDGER_END.isoformat()},
+    'amount': {'min_amount': 1000, 'max_amount': 2000},
+    'search_common': {'search': 'Walmart'},
+    'search_rare': {'search': 'Cerrajero'},
+}
+
+# Export files, by format
+EXPORT_FILES = {
+    'csv': 'transacciones.csv',
+    'csv_gzip': 'transacciones.csv.gz',
+    'xlsx': 'transacciones.xlsx',
+    'parquet': 'transacciones.parquet',
+}
+
+
+def ledger_path(size):
+    """Return the path of a cached ledger, generating it if needed."""
+    cache_dir = os.environ.get('FINANZAS_BENCHMARK_CACHE', os.path.join(tempfile.gettempdir(), 'finanzas-benchmarks'))
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f'{size}-{LEDGER_SIZES[size]}-{LEDGER_SEED}-{LEDGER_END.isoformat()}.db')
+    if os.path.exists(path):
+        return path
+
+    # Built under another name, so an interrupted run leaves no partial ledger
+    partial_path = path + '.partial'
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+    db_manager = DatabaseManager(partial_path)
+    db_manager.setup_database()
+    generate_ledger(db_manager, transactions=LEDGER_SIZES[size], accounts=6, categories=25, seed=LEDGER_SEED,
+                    today=LEDGER_END)
+    os.replace(partial_path, path)
+    return path
+
+
+@pytest.fixture(scope='module', params=SIZES)
+def ledger(request):
+    if request.param not in LEDGER_SIZES:
+        pytest.fail(f"Unknown ledger size {request.param!r}, use one of {', '.join(LEDGER_SIZES)}")
+    return ledger_path(request.param)
+
+
+@pytest.fixture
+def writable_ledger(ledger, tmp_path):
+    """Copy of the ledger for the benchmarks that write to it."""
+    path = str(tmp_path / 'finanzas.db')
+    shutil.copyfile(ledger, path)
+    return path
+
+
+@pytest.fixture(scope='module')
+def qt_app():
+    pytest.importorskip('PyQt5.QtWidgets')
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.mark.parametrize('filter_name', list(TRANSACTION_FILTERS))
+def test_get_transactions(benchmark, ledger, filter_name):
+    db_manager = DatabaseManager(ledger)
+    benchmark(db_manager.get_transactions, limit=PAGE_SIZE, **TRANSACTION_FILTERS[filter_name])
+
+
+def test_get_transactions_next_page(benchmark, ledger):
+    db_manager = DatabaseManager(ledger)
+    last = db_manager.get_transactions(limit=PAGE_SIZE)[-1]
+    benchmark(db_manager.get_transactions, limit=PAGE_SIZE, after=(last['date'], last['id']))
+
+
+def test_add_transaction(benchmark, writable_ledger):
+    db_manager = DatabaseManager(writable_ledger)
+    benchmark(db_manager.add_transaction, 1, 125.5, 'expense', LEDGER_END.isoformat(), category_id=1,
+              description='Benchmark')
+
+
+def test_compute_dashboard(benchmark, ledger):
+    benchmark(dashboard_data.compute_dashboard, DatabaseManager(ledger), today=LEDGER_END)
+
+
+def test_update_dashboard(benchmark, ledger, qt_app):
+    from PyQt5.QtCore import QThreadPool
+    from src.views.main_window import MainWindow
+    from src.controllers.main_controller import MainController
+
+    window = MainWindow()
+    controller = MainController(window, DatabaseManager(ledger))
+    window.show()
+
+    # Let the startup workers finish, so they do not run during the measurement
+    QThreadPool.globalInstance().waitForDone()
+    qt_app.processEvents()
+
+    # The controller shows the months up to the current date, past the ledger's end;
+    # test_compute_dashboard measures the same queries over the ledger's last months
+    benchmark(controller.update_dashboard)
+    window.close()
+
+
+@pytest.mark.parametrize('report_type', list(report_data.REPORT_FUNCTIONS))
+def test_compute_report(benchmark, ledger, report_type):
+    db_manager = DatabaseManager(ledger)
+    start_date = date(LEDGER_END.year - 1, LEDGER_END.month, 1).isoformat()
+    benchmark(report_data.compute_report, db_manager, report_type, start_date, LEDGER_END.isoformat())
+
+
+def test_build_daily_series(benchmark, ledger):
+    pytest.importorskip('numpy')
+    from src.models.timeseries import build_daily_series
+    benchmark(build_daily_series, DatabaseManager(ledger))
+
+
+def test_import_csv(benchmark, writable_ledger, tmp_path):
+    db_manager = DatabaseManager(writable_ledger)
+    rounds = itertools.count()
+
+    def write_file():
+        # New descriptions every round, so no row is skipped as imported before
+        path = str(tmp_path / f'importar_{next(rounds)}.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['fecha', 'importe', 'tipo', 'descripción', 'categoría'])
+            for number in range(IMPORT_ROWS):
+                day = LEDGER_END - timedelta(days=number % 365)
+                writer.writerow([day.isoformat(), f'{(number % 997) + 0.5:.2f}', 'gasto',
+                                 f'Compra {os.path.basename(path)} {number}', 'Alimentación'])
+        return (db_manager, 'transactions', path, 'yyyy-MM-dd', 1), {}
+
+    benchmark.pedantic(importers.import_file, setup=write_file, rounds=5)
+
+
+@pytest.mark.parametrize('file_format', list(EXPORT_FILES))
+def test_export(benchmark, ledger, tmp_path, file_format):
+    db_manager = DatabaseManager(ledger)
+    path = str(tmp_path / EXPORT_FILES[file_format])
+    if file_format == 'parquet':
+        pytest.importorskip('pyarrow')
+        export = exporters.export_columnar
+    elif file_format == 'xlsx':
+        if not any(importlib.util.find_spec(name) for name in ('openpyxl', 'xlsxwriter')):
+            pytest.skip("openpyxl or xlsxwriter is not installed")
+        export = exporters.export_excel
+    else:
+        export = exporters.export_csv
+
+    # The first export imports the writer modules
+    benchmark.pedantic(export, args=(db_manager, ['transactions'], path), rounds=3, warmup_rounds=1)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Startup regression checks on the offscreen Qt platform.
+
+The cold start budget can be configured with the FINANZAS_STARTUP_BUDGET_MS
+environment variable.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip('PyQt5.QtWidgets')
+
+from startup_benchmark import HEAVY_MODULES, run_child
+
+# Maximum time from interpreter start to the first dashboard paint
+STARTUP_BUDGET_MS = float(os.environ.get('FINANZAS_STARTUP_BUDGET_MS', 1500))
+
+# Number of cold starts; the fastest one is compared with the budget
+STARTUP_RUNS = 3
+
+
+@pytest.fixture(scope='module')
+def startup_results():
+    db_path = os.path.join(tempfile.mkdtemp(), 'finanzas.db')
+    return [run_child(db_path) for _ in range(STARTUP_RUNS)]
+
+
+def test_cold_start_within_budget(startup_results):
+    fastest_ms = min(result['elapsed'] for result in startup_results) * 1000
+    assert fastest_ms <= STARTUP_BUDGET_MS, (
+        f"Cold start took {fastest_ms:.0f} ms, budget is {STARTUP_BUDGET_MS:.0f} ms")
+
+
+def test_heavy_modules_deferred(startup_results):
+    loaded = set(startup_results[0]['heavy_modules'])
+    assert not loaded, f"Imported before first paint: {', '.join(sorted(loaded))} (deferred: {HEAVY_MODULES})"
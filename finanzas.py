@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Finanzas - Informes desde la línea de comandos
+
+Computes reports without the Qt interface, so statements can be written
+from scripts and cron jobs. Reports for several accounts and types are
+computed in parallel processes:
+
+    python -m finanzas report --type income_expense --from 2024-01-01 --to 2024-01-31 --format png
+    python -m finanzas report --type category --type budget --all-accounts --format csv --format json
+
+Synthetic ledgers of any size can be generated for load testing:
+
+    python -m finanzas --db /tmp/carga.db generate --transactions 10000000 --accounts 8 --categories 30 --seed 7
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+
+from src.models import report_data
+from src.models.dashboard_data import add_months
+from src.models.database_manager import DatabaseManager
+
+# Output formats; images are drawn with matplotlib
+FORMATS = ('png', 'svg', 'csv', 'json')
+IMAGE_FORMATS = ('png', 'svg')
+
+
+def parse_date(value):
+    """Check a 'YYYY-MM-DD' date argument."""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha no válida: {value!r}, use AAAA-MM-DD")
+
+
+def last_month(today=None):
+    """Return the first and last day of the previous month, as 'YYYY-MM-DD' strings."""
+    today = today or date.today()
+    year, month = add_months(today.year, today.month, -1)
+    end = date(today.year, today.month, 1) - timedelta(days=1)
+    return date(year, month, 1).isoformat(), end.isoformat()
+
+
+def report_file_name(report_type, start_date, end_date, account_id, file_format):
+    """Return the file name of a report, unique per type, period, account and format."""
+    account = f'cuenta{account_id}' if account_id is not None else 'todas'
+    return f'{report_type}_{start_date}_{end_date}_{account}.{file_format}'
+
+
+def write_report(report, path, file_format, account_name=None, daily_series=None):
+    """Write a computed report to a file.
+
+    Args:
+        report: Report data
+        path (str): Output file path
+        file_format (str): One of FORMATS
+        account_name (str, optional): Name of the account filtering the report, shown in images
+        daily_series (dict, optional): build_daily_series() pyramids, drawn by trend images
+    """
+    if file_format == 'json':
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump(report_data.report_to_dict(report), output, ensure_ascii=False, indent=2)
+    elif file_format == 'csv':
+        headers, rows = report_data.report_rows(report)
+        with open(path, 'w', encoding='utf-8', newline='') as output:
+            writer = csv.writer(output)
+            writer.writerow(headers)
+            writer.writerows(rows)
+    else:
+        from src.views.report_figures import save_report_figure
+        save_report_figure(report, path, file_format, account_name, daily_series)
+
+
+def run_report_job(db_path, report_type, start_date, end_date, account_id, formats, output_dir):
+    """Compute a report and write it in every requested format. Runs in a worker process.
+
+    Args:
+        db_path (str): Path to the database file
+        report_type (str): Type of report
+        start_date (str): Start date in format 'yyyy-MM-dd'
+        end_date (str): End date in format 'yyyy-MM-dd', included in the report
+        account_id (int): Account ID to filter by, or None for every account
+        formats (list): Output formats
+        output_dir (str): Directory the files are written to
+
+    Returns:
+        list: Paths of the written files
+    """
+    db_manager = DatabaseManager(db_path)
+    report = report_data.compute_report(db_manager, report_type, start_date, end_date, account_id)
+
+    account_name = None
+    if account_id is not None:
+        account = db_manager.get_account(account_id)
+        account_name = account['name'] if account else None
+
+    # Trend images draw the daily series, built once for every format
+    daily_series = None
+    if report_type == 'trend' and any(file_format in IMAGE_FORMATS for file_format in formats):
+        from src.models.timeseries import build_daily_series
+        daily_series = build_daily_series(db_manager)
+
+    paths = []
+    for file_format in formats:
+        path = os.path.join(output_dir, report_file_name(report_type, start_date, end_date, account_id, file_format))
+        write_report(report, path, file_format, account_name, daily_series)
+        paths.append(path)
+    return paths
+
+
+def run_report_command(args):
+    """Write the reports requested on the command line.
+
+    Returns:
+        int: Exit status, 1 if any report failed
+    """
+    start_date, end_date = last_month()
+    start_date = args.start_date or start_date
+    end_date = args.end_date or end_date
+    if start_date > end_date:
+        print(f"Error: el período empieza después de terminar ({start_date} > {end_date})", file=sys.stderr)
+        return 2
+
+    # Create the tables and rollups once, before the jobs read them in parallel
+    db_manager = DatabaseManager(args.db)
+    db_manager.setup_database()
+
+    if args.all_accounts:
+        account_ids = [account['id'] for account in db_manager.get_accounts()]
+    else:
+        account_ids = args.accounts or [None]
+
+    report_types = list(dict.fromkeys(args.types))
+    formats = list(dict.fromkeys(args.formats or ['json']))
+    os.makedirs(args.output, exist_ok=True)
+
+    # Reports covering every account are written once, not once per account
+    jobs = [(db_manager.db_path, report_type, start_date, end_date, account_id, formats, args.output)
+            for report_type in report_types
+            for account_id in ([None] if report_type in report_data.ALL_ACCOUNT_REPORTS else account_ids)]
+
+    status = 0
+    workers = min(args.jobs or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        results = []
+        for job in jobs:
+            try:
+                results.append((job, run_report_job(*job), None))
+            except Exception as error:
+                results.append((job, None, error))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [(job, executor.submit(run_report_job, *job)) for job in jobs]
+            results = [(job, future.result(), None) if future.exception() is None
+                       else (job, None, future.exception()) for job, future in futures]
+
+    for job, paths, error in results:
+        if error is not None:
+            print(f"Error en el informe {job[1]} (cuenta {job[4] or 'todas'}): {error}", file=sys.stderr)
+            status = 1
+            continue
+        for path in paths:
+            print(path)
+    return status
+
+
+def run_generate_command(args):
+    """Write a synthetic ledger to a new database.
+
+    Returns:
+        int: Exit status
+    """
+    from src.models.ledger_generator import generate_ledger
+
+    if not args.db:
+        print("Error: indique con --db la base de datos a generar", file=sys.stderr)
+        return 2
+    if os.path.exists(args.db):
+        if not args.replace:
+            print(f"Error: {args.db} ya existe; use --replace para reemplazarla", file=sys.stderr)
+            return 2
+        os.remove(args.db)
+
+    db_manager = DatabaseManager(args.db)
+    db_manager.setup_database()
+
+    written = {}
+
+    def show_progress(count):
+        written['time'] = time.perf_counter()
+        print(f"\r{count:,} transacciones", end='', file=sys.stderr, flush=True)
+
+    started = written['time'] = time.perf_counter()
+    counts = generate_ledger(db_manager, on_progress=show_progress, accounts=args.accounts,
+                             categories=args.categories, transactions=args.transactions, years=args.years,
+                             seed=args.seed, currencies=args.currencies or ['MXN'], goals=args.goals,
+                             today=datetime.strptime(args.end_date, '%Y-%m-%d').date() if args.end_date else None)
+    finished = time.perf_counter()
+    print(file=sys.stderr)
+
+    for table, count in counts.items():
+        print(f"{table}: {count:,}")
+    # The indexes, search index and rollup are built once the rows are written
+    writing = max(written['time'] - started, 1e-9)
+    print(f"{counts['transactions'] / writing:,.0f} transacciones por segundo ({writing:.1f} s), "
+          f"índices construidos en {finished - written['time']:.1f} s")
+    return 0
+
+
+def build_parser():
+    """Build the command-line parser."""
+    parser = argparse.ArgumentParser(prog='python -m finanzas',
+                                     description="Finanzas - Software de Gestión Financiera")
+    parser.add_argument('--db', help="ruta de la base de datos (por defecto data/finanzas.db)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    report_parser = subparsers.add_parser('report', help="genera informes sin abrir la interfaz",
+                                          description="Genera informes sin abrir la interfaz. Sin --from ni --to "
+                                                      "se usa el mes anterior.")
+    report_parser.add_argument('--type', dest='types', action='append', required=True,
+                               choices=list(report_data.REPORT_FUNCTIONS),
+                               help="tipo de informe; puede repetirse")
+    report_parser.add_argument('--from', dest='start_date', type=parse_date, help="primer día (AAAA-MM-DD)")
+    report_parser.add_argument('--to', dest='end_date', type=parse_date, help="último día, incluido (AAAA-MM-DD)")
+    report_parser.add_argument('--format', dest='formats', action='append', choices=FORMATS,
+                               help="formato de salida; puede repetirse (por defecto json)")
+    accounts = report_parser.add_mutually_exclusive_group()
+    accounts.add_argument('--account', dest='accounts', action='append', type=int,
+                          help="ID de la cuenta; puede repetirse para un informe por cuenta")
+    accounts.add_argument('--all-accounts', action='store_true', help="un informe por cada cuenta activa")
+    report_parser.add_argument('--output', default='.', help="directorio de salida (por defecto el actual)")
+    report_parser.add_argument('--jobs', type=int, help="procesos en paralelo (por defecto uno por CPU)")
+    report_parser.set_defaults(handler=run_report_command)
+
+    generate_parser = subparsers.add_parser('generate', help="genera un libro contable sintético para pruebas de carga",
+                                            description="Genera en una base de datos nueva cuentas, categorías, "
+                                                        "transacciones, presupuestos y metas sintéticos. La misma "
+                                                        "semilla y fecha final generan siempre los mismos datos.")
+    generate_parser.add_argument('--transactions', type=int, default=1000000,
+                                 help="número de transacciones (por defecto 1000000)")
+    generate_parser.add_argument('--accounts', type=int, default=5, help="número de cuentas (por defecto 5)")
+    generate_parser.add_argument('--categories', type=int, default=13,
+                                 help="número de categorías, al menos las 13 predeterminadas (por defecto 13)")
+    generate_parser.add_argument('--years', type=int, default=10, help="años de historial (por defecto 10)")
+    generate_parser.add_argument('--to', dest='end_date', type=parse_date,
+                                 help="último día del historial (AAAA-MM-DD, por defecto hoy)")
+    generate_parser.add_argument('--currency', dest='currencies', action='append',
+                                 help="moneda de las cuentas; puede repetirse, la primera es la base (por defecto MXN)")
+    generate_parser.add_argument('--goals', type=int, default=4, help="número de metas (por defecto 4)")
+    generate_parser.add_argument('--seed', type=int, default=0, help="semilla aleatoria (por defecto 0)")
+    generate_parser.add_argument('--replace', action='store_true', help="reemplaza la base de datos si ya existe")
+    generate_parser.set_defaults(handler=run_generate_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,112 @@
 # -*- coding: utf-8 -*-
 
 from src.models.database_manager import DatabaseManager
+from src.models import change_events, dashboard_data, exporters, importers, report_data
 from src.views.main_window import MainWindow
+from src.controllers.workers import start_worker
+
+
+def error_summary(message):
+    """Return the exception message of a worker's traceback, held by its last line."""
+    return message.strip().splitlines()[-1].split(': ', 1)[-1]
+
+
+def read_transactions_page(db_path, filters, after, limit):
+    """Read a page of filtered transactions. Runs on a worker thread.
+    
+    Args:
+        db_path (str): Path to the database file
+        filters (dict): get_transactions filter arguments
+        after (tuple): (date, id) key of the last loaded transaction, or None
+        limit (int): Maximum number of transactions to read
+    
+    Returns:
+        list: Transaction dictionaries, newest first
+    """
+    # The worker thread uses its own manager, since managers keep their connection
+    return DatabaseManager(db_path).get_transactions(after=after, limit=limit, **filters)
+
+
+def read_daily_series(db_path):
+    """Build the daily income, expense and balance pyramids. Runs on a worker thread.
+    
+    Args:
+        db_path (str): Path to the database file
+    
+    Returns:
+        dict: LodPyramid per series name
+    """
+    from src.models.timeseries import build_daily_series
+    return build_daily_series(DatabaseManager(db_path))
+
+
+def read_dashboard(db_path):
+    """Compute every card, chart and table of the dashboard. Runs on a worker thread.
+    
+    Args:
+        db_path (str): Path to the database file
+    
+    Returns:
+        dict: compute_dashboard() data
+    """
+    return dashboard_data.compute_dashboard(DatabaseManager(db_path))
+
+
+def read_report(db_path, report_type, start_date, end_date, account_id=None, worker=None):
+    """Compute the data of a report. Runs on a worker thread.
+    
+    Args:
+        db_path (str): Path to the database file
+        report_type (str): Type of report
+        start_date (str): Start date in format 'yyyy-MM-dd'
+        end_date (str): End date in format 'yyyy-MM-dd', included in the report
+        account_id (int, optional): Account ID to filter by. Defaults to None.
+        worker (Worker, optional): Worker running the computation
+    
+    Returns:
+        The report's data object, or None if the worker was cancelled
+    """
+    return report_data.compute_report(DatabaseManager(db_path), report_type, start_date, end_date, account_id,
+                                      worker=worker)
+
+
+def read_import(db_path, data_type, path, date_format, account_id=None, worker=None):
+    """Import a CSV or bank statement file into the database. Runs on a worker thread.
+    
+    Args:
+        db_path (str): Path to the database file
+        data_type (str): 'transactions', 'accounts' or 'categories'
+        path (str): Path to the file
+        date_format (str): Date format of CSV and QIF files, e.g. 'dd/MM/yyyy'
+        account_id (int, optional): Account of the transactions, when the file does not name a known one
+        worker (Worker, optional): Worker running the import
+    
+    Returns:
+        ImportResult: Summary of the import, or None if the worker was cancelled before anything was written
+    """
+    return importers.import_file(DatabaseManager(db_path), data_type, path, date_format, account_id, worker=worker)
+
+
+def read_export(db_path, datasets, path, file_format, worker=None):
+    """Export data of the database to a file. Runs on a worker thread.
+    
+    Args:
+        db_path (str): Path to the database file
+        datasets (list): Datasets to export, or None for every table
+        path (str): Path to the file; CSV exports of several datasets write one file each
+        file_format (str): 'csv', 'excel', 'parquet' or 'arrow'
+        worker (Worker, optional): Worker running the export
+    
+    Returns:
+        ExportResult: Written files and rows, or None if the worker was cancelled
+    """
+    db_manager = DatabaseManager(db_path)
+    if file_format in exporters.COLUMNAR_FORMATS:
+        return exporters.export_columnar(db_manager, datasets, path, file_format, worker=worker)
+    if file_format == 'excel':
+        return exporters.export_excel(db_manager, datasets, path, worker=worker)
+    return exporters.export_csv(db_manager, datasets, path, worker=worker)
+
 
 class MainController:
     """Main controller for the financial management application.
@@ -21,6 +126,36 @@ class MainController:
         self.main_window = main_window
         self.db_manager = db_manager
         
+        # Cached dashboard inputs, so single cards can be refreshed on their own
+        self.dashboard_state = {}
+        self.chart_months_data = {}
+        
+        # Worker computing the whole dashboard at startup, while the saved snapshot is shown
+        self.dashboard_worker = None
+        self.dashboard_snapshot_path = dashboard_data.snapshot_path(db_manager.db_path)
+        
+        # Views whose data changed while they were hidden
+        self.stale_views = set()
+        
+        # Filters of the transactions table and the worker reading its current page
+        self.transaction_filters = {}
+        self.transactions_worker = None
+        
+        # Daily series of the trend charts, updated in place as transactions are added
+        self.daily_series = None
+        self.daily_series_worker = None
+        
+        # Worker computing the latest requested report, and the number of that request
+        self.report_worker = None
+        self.report_generation = 0
+        
+        # Computed reports, valid until the next database change
+        self.report_cache = report_data.ReportCache()
+        
+        # Workers running the current file import or export; only one runs at a time
+        self.import_worker = None
+        self.export_worker = None
+        
         # Connect signals and slots
         self.connect_signals()
         
@@ -29,178 +164,502 @@ class MainController:
     
     def connect_signals(self):
         """Connect UI signals to controller slots."""
-        # Connect main window actions
-        self.main_window.accounts_view.add_account_requested.connect(self.add_account)
-        self.main_window.transactions_view.add_transaction_requested.connect(self.add_transaction)
-        self.main_window.budgets_view.add_budget_requested.connect(self.add_budget)
-        self.main_window.goals_view.add_goal_requested.connect(self.add_goal)
-        self.main_window.goals_view.edit_goal_requested.connect(self.edit_goal)
-        self.main_window.goals_view.delete_goal_requested.connect(self.delete_goal)
-        
-        # Connect settings signals
-        self.main_window.settings_view.settings_saved.connect(self.save_settings)
+        # Views are built lazily, so their signals are connected once they exist
+        self.main_window.view_created.connect(self.on_view_created)
+        self.main_window.view_activated.connect(self.on_view_activated)
         
         # Connect toolbar and menu actions
         self.main_window.generate_report_signal.connect(self.generate_report)
+        self.main_window.import_requested.connect(self.on_import_requested)
+        self.main_window.export_requested.connect(self.on_export_requested)
+        self.main_window.task_cancelled.connect(self.cancel_task)
+        self.main_window.closing.connect(self.save_dashboard_snapshot)
+        self.main_window.set_account_source(self.db_manager.get_accounts)
+        
+        # Refresh only the views and cards affected by each database write
+        self.db_manager.subscribe(self.on_accounts_changed, entities=(change_events.ACCOUNT, change_events.TRANSACTION))
+        self.db_manager.subscribe(self.on_transactions_changed, entities=(change_events.TRANSACTION, change_events.ACCOUNT, change_events.CATEGORY))
+        self.db_manager.subscribe(self.on_budgets_changed, entities=(change_events.BUDGET,))
+        self.db_manager.subscribe(self.on_goals_changed, entities=(change_events.GOAL,))
+        self.db_manager.subscribe(self.on_reports_data_changed, entities=(change_events.TRANSACTION, change_events.ACCOUNT,
+                                                                          change_events.EXCHANGE_RATE))
+        self.db_manager.subscribe(self.on_exchange_rates_changed, entities=(change_events.EXCHANGE_RATE,))
+        self.db_manager.subscribe(self.on_dashboard_data_changed)
+    
+    def connect_view_signals(self, name, view):
+        """Connect the signals of a freshly built view.
+        
+        Args:
+            name (str): Name of the view's tab
+            view (QWidget): The view
+        """
+        if name == 'accounts':
+            view.add_account_requested.connect(self.add_account)
+        elif name == 'transactions':
+            view.add_transaction_requested.connect(self.add_transaction)
+            view.filters_changed.connect(self.on_transaction_filters_changed)
+        elif name == 'budgets':
+            view.add_budget_requested.connect(self.add_budget)
+        elif name == 'goals':
+            view.add_goal_requested.connect(self.add_goal)
+            view.edit_goal_requested.connect(self.edit_goal)
+            view.delete_goal_requested.connect(self.delete_goal)
+        elif name == 'reports':
+            view.report_requested.connect(self.on_report_requested)
+        elif name == 'settings':
+            view.settings_saved.connect(self.save_settings)
+            view.export_requested.connect(self.on_export_requested)
+            view.import_requested.connect(self.on_import_requested)
     
     def load_initial_data(self):
-        """Load initial data from the database to the views."""
-        # Load accounts data
-        accounts = self.db_manager.get_accounts()
-        self.main_window.accounts_view.load_accounts(accounts)
+        """Load initial data into the views that are already built."""
+        for name, view in list(self.main_window.views.items()):
+            self.on_view_created(name, view)
+    
+    def load_view_data(self, name):
+        """Load the data shown by a view from the database.
         
-        # Load recent transactions
-        transactions = self.db_manager.get_transactions(limit=10)
-        self.main_window.transactions_view.load_transactions(transactions)
+        Args:
+            name (str): Name of the view's tab
+        """
+        self.stale_views.discard(name)
+        
+        if name == 'dashboard':
+            self.load_dashboard()
+        elif name == 'accounts':
+            accounts = self.db_manager.get_accounts()
+            self.main_window.accounts_view.load_accounts(accounts)
+        elif name == 'transactions':
+            transactions_view = self.main_window.transactions_view
+            transactions_view.load_filter_options(self.db_manager.get_accounts(), self.db_manager.get_categories())
+            # The table reads further pages on its own while it is scrolled
+            transactions_view.set_page_source(self.fetch_transactions_page)
+        elif name == 'budgets':
+            budgets = self.db_manager.get_budgets()
+            self.main_window.budgets_view.load_budgets(budgets)
+        elif name == 'goals':
+            goals = self.db_manager.get_goals()
+            self.main_window.goals_view.load_goals(goals)
+        elif name == 'reports':
+            accounts = self.db_manager.get_accounts()
+            self.main_window.reports_view.load_accounts(accounts)
+            self.load_daily_series()
+        elif name == 'settings':
+            settings_view = self.main_window.settings_view
+            settings_view.set_base_currency(self.db_manager.get_base_currency())
+            settings_view.show_exchange_rates(self.db_manager.get_latest_rates())
+    
+    def fetch_transactions_page(self, after, limit, deliver):
+        """Read a page of filtered transactions on a worker thread.
+        
+        Args:
+            after (tuple): (date, id) key of the last loaded transaction, or None for the first page
+            limit (int): Maximum number of transactions to read
+            deliver (callable): Called on the GUI thread with the page, newest first
+        """
+        # Only the latest request matters, the table discards older pages anyway
+        if self.transactions_worker is not None:
+            self.transactions_worker.cancel()
+        
+        self.transactions_worker = start_worker(
+            read_transactions_page, self.db_manager.db_path, dict(self.transaction_filters), after, limit,
+            on_finished=deliver,
+            on_error=lambda message: self.on_transactions_page_error(message, deliver))
+    
+    def on_transactions_page_error(self, message, deliver):
+        """Report a failed page read and end the table's loading state."""
+        self.main_window.show_status_error(f"Error al leer las transacciones: {error_summary(message)}")
+        deliver([])
+    
+    def load_daily_series(self):
+        """Show the daily series in the reports, building them on a worker thread if needed."""
+        if self.daily_series is not None:
+            self.main_window.reports_view.set_daily_series(self.daily_series)
+            return
+        
+        if self.daily_series_worker is not None:
+            self.daily_series_worker.cancel()
+        
+        self.daily_series_worker = start_worker(
+            read_daily_series, self.db_manager.db_path,
+            on_finished=self.on_daily_series_loaded,
+            on_error=self.on_daily_series_error)
+    
+    def on_daily_series_loaded(self, series):
+        """Keep the built daily series and show them in the reports."""
+        self.daily_series_worker = None
+        self.daily_series = series
+        reports_view = self.main_window.views.get('reports')
+        if reports_view is not None:
+            reports_view.set_daily_series(series)
+    
+    def on_daily_series_error(self, message):
+        """Report a failed daily series build."""
+        self.daily_series_worker = None
+        self.main_window.show_status_error(f"Error al leer los totales diarios: {error_summary(message)}")
+    
+    def on_transaction_filters_changed(self, filters):
+        """Reload the transactions table with new filters.
+        
+        Args:
+            filters (dict): get_transactions filter arguments
+        """
+        self.transaction_filters = filters
+        self.main_window.transactions_view.reload_transactions()
+    
+    def refresh_view(self, name):
+        """Reload a view now if it is visible, or when it is next shown.
+        
+        Args:
+            name (str): Name of the view's tab
+        """
+        if self.main_window.views.get(name) is None:
+            # Not built yet, it loads fresh data when first shown
+            return
+        
+        if self.main_window.current_tab_name() == name:
+            self.load_view_data(name)
+        else:
+            self.stale_views.add(name)
+    
+    def on_view_created(self, name, view):
+        """Connect and fill a view right after it is built."""
+        self.connect_view_signals(name, view)
+        self.load_view_data(name)
+    
+    def on_view_activated(self, name):
+        """Reload a view whose data changed while it was hidden."""
+        if name in self.stale_views:
+            self.load_view_data(name)
+    
+    def load_dashboard(self):
+        """Show the saved dashboard snapshot at once, and compute the current dashboard on a worker thread."""
+        if not self.dashboard_state:
+            snapshot = dashboard_data.load_snapshot(self.dashboard_snapshot_path)
+            if snapshot is not None:
+                self.show_dashboard(snapshot)
+        
+        if self.dashboard_worker is not None:
+            self.dashboard_worker.cancel()
+        generation = self.db_manager.change_bus.generation
+        self.dashboard_worker = start_worker(
+            read_dashboard, self.db_manager.db_path,
+            on_finished=lambda dashboard: self.on_dashboard_ready(dashboard, generation),
+            on_error=self.on_dashboard_error)
+    
+    def on_dashboard_ready(self, dashboard, generation):
+        """Show the dashboard computed on a worker thread, and save it as the next startup's snapshot."""
+        self.dashboard_worker = None
         
-        # Load budgets
-        budgets = self.db_manager.get_budgets()
-        self.main_window.budgets_view.load_budgets(budgets)
+        # Cards refreshed by later changes are newer than the computed ones
+        if generation != self.db_manager.change_bus.generation:
+            self.load_dashboard()
+            return
         
-        # Update dashboard with summary data
+        self.show_dashboard(dashboard)
+        self.save_dashboard_snapshot()
+    
+    def on_dashboard_error(self, message):
+        """Compute the dashboard on the GUI thread if the worker failed."""
+        self.dashboard_worker = None
+        self.main_window.show_status_error(f"Error al calcular el panel principal: {error_summary(message)}")
         self.update_dashboard()
     
+    def show_dashboard(self, dashboard):
+        """Render a whole dashboard from compute_dashboard() data.
+        
+        Args:
+            dashboard (dict): Dashboard data, computed or loaded from the snapshot
+        """
+        self.dashboard_state = dict(dashboard['state'])
+        self.chart_months_data = dict(dashboard['chart_months'])
+        self.render_month_summary()
+        self.render_balance_card()
+        self.render_budget_card()
+        self.render_goals_card()
+        self.render_income_expenses_chart()
+        self.render_expense_categories_chart()
+        self.render_recent_transactions()
+    
+    def save_dashboard_snapshot(self):
+        """Save the dashboard shown, once it has been computed, for the next startup."""
+        if 'recent_transactions' not in self.dashboard_state:
+            return
+        
+        try:
+            dashboard_data.save_snapshot(self.dashboard_snapshot_path,
+                                         {'state': self.dashboard_state, 'chart_months': self.chart_months_data})
+        except OSError as error:
+            # The snapshot only speeds up the next startup
+            self.main_window.show_status_error(f"No se pudo guardar el panel principal: {error}")
+    
     def update_dashboard(self):
-        """Update dashboard with current financial data."""
-        # Get financial summary data
-        accounts = self.db_manager.get_accounts()
-        
-        # Calculate total balance
-        total_balance = sum(account['current_balance'] for account in accounts)
-        
-        # Get transactions for the current month
-        from datetime import datetime, timedelta
-        today = datetime.now()
-        first_day = datetime(today.year, today.month, 1)
-        last_month = first_day - timedelta(days=1)
-        first_day_last_month = datetime(last_month.year, last_month.month, 1)
-        
-        # Get current month transactions
-        current_month_transactions = self.db_manager.get_transactions(
-            start_date=first_day.strftime('%Y-%m-%d'),
-            end_date=today.strftime('%Y-%m-%d')
-        )
+        """Update the whole dashboard with current financial data."""
+        self.refresh_month_summary()
+        self.refresh_total_balance()
+        self.refresh_budget_card()
+        self.refresh_goals_card()
+        self.refresh_income_expenses_chart()
+        self.refresh_expense_categories_chart()
+        self.refresh_recent_transactions()
+    
+    def refresh_total_balance(self):
+        """Refresh the total balance card."""
+        self.dashboard_state['total_balance'] = dashboard_data.compute_total_balance(self.db_manager)
+        self.render_balance_card()
+    
+    def refresh_month_summary(self):
+        """Refresh the income, expenses and savings cards of the current month."""
+        self.dashboard_state.update(dashboard_data.compute_month_summary(self.db_manager))
+        self.render_month_summary()
+        
+        # The balance card shows the income change as its trend
+        if 'total_balance' in self.dashboard_state:
+            self.render_balance_card()
+    
+    def render_month_summary(self):
+        """Render the income, expenses and savings cards from the cached dashboard state."""
+        state = self.dashboard_state
+        dashboard = self.main_window.dashboard_view
         
-        # Get last month transactions
-        last_month_transactions = self.db_manager.get_transactions(
-            start_date=first_day_last_month.strftime('%Y-%m-%d'),
-            end_date=last_month.strftime('%Y-%m-%d')
-        )
+        income_change = state['income_change']
+        expense_change = state['expense_change']
         
-        # Calculate income and expenses for current month
-        current_income = sum(t['amount'] for t in current_month_transactions if t['type'] == 'income')
-        current_expenses = sum(t['amount'] for t in current_month_transactions if t['type'] == 'expense')
+        dashboard.update_summary_card("Ingresos (este mes)", f"${state['current_income']:,.2f}", "#28A745", 
+                                    f"{'↑' if income_change >= 0 else '↓'} {abs(income_change):.1f}% desde el mes pasado")
         
-        # Calculate income and expenses for last month
-        last_income = sum(t['amount'] for t in last_month_transactions if t['type'] == 'income')
-        last_expenses = sum(t['amount'] for t in last_month_transactions if t['type'] == 'expense')
+        dashboard.update_summary_card("Gastos (este mes)", f"${state['current_expenses']:,.2f}", "#DC3545", 
+                                    f"{'↓' if expense_change <= 0 else '↑'} {abs(expense_change):.1f}% desde el mes pasado")
         
-        # Calculate percentage changes
-        income_change = ((current_income - last_income) / last_income * 100) if last_income > 0 else 0
-        expense_change = ((current_expenses - last_expenses) / last_expenses * 100) if last_expenses > 0 else 0
+        dashboard.update_summary_card("Ahorros", f"${state['savings']:,.2f}", "#FFC107", 
+                                    f"{state['savings_percentage']:.1f}% de los ingresos")
+    
+    def render_balance_card(self):
+        """Render the total balance card from the cached dashboard state."""
+        total_balance = self.dashboard_state['total_balance']
+        income_change = self.dashboard_state.get('income_change', 0)
+        self.main_window.dashboard_view.update_summary_card(
+            "Balance Total", f"${total_balance:,.2f}", "#007ACC", 
+            f"{'↑' if income_change >= 0 else '↓'} {abs(income_change):.1f}% desde el mes pasado")
+    
+    def refresh_budget_card(self):
+        """Refresh the remaining budget card."""
+        current_expenses = self.dashboard_state.get('current_expenses', 0)
+        self.dashboard_state.update(dashboard_data.compute_budget_summary(self.db_manager, current_expenses))
+        self.render_budget_card()
+    
+    def render_budget_card(self):
+        """Render the remaining budget card from the cached dashboard state."""
+        self.main_window.dashboard_view.update_summary_card(
+            "Presupuesto Restante", f"${self.dashboard_state['budget_remaining']:,.2f}", "#17A2B8", 
+            f"{self.dashboard_state['budget_percentage']:.1f}% disponible")
+    
+    def refresh_goals_card(self):
+        """Refresh the goals progress card."""
+        self.dashboard_state.update(dashboard_data.compute_goals_summary(self.db_manager))
+        self.render_goals_card()
+    
+    def render_goals_card(self):
+        """Render the goals progress card from the cached dashboard state."""
+        self.main_window.dashboard_view.update_summary_card(
+            "Progreso de Metas", f"{self.dashboard_state['goals_progress']:.0f}%", "#6F42C1", 
+            f"{self.dashboard_state['active_goals_count']} metas activas")
+    
+    def refresh_income_expenses_chart(self, months=None):
+        """Refresh the income vs expenses chart.
         
-        # Calculate savings
-        savings = current_income - current_expenses
-        savings_percentage = (savings / current_income * 100) if current_income > 0 else 0
+        Args:
+            months (iterable, optional): Month keys to recompute. Defaults to None,
+                which recomputes every month shown in the chart.
+        """
+        window_keys = [key for key, _ in dashboard_data.chart_months()]
         
-        # Get active budgets
-        budgets = self.db_manager.get_budgets(active_only=True)
+        # Drop months that scrolled out of the chart window
+        for key in list(self.chart_months_data):
+            if key not in window_keys:
+                del self.chart_months_data[key]
         
-        # Calculate budget remaining
-        total_budget = sum(budget['amount'] for budget in budgets)
-        budget_spent = current_expenses
-        budget_remaining = total_budget - budget_spent
-        budget_percentage = (budget_remaining / total_budget * 100) if total_budget > 0 else 0
+        for key in window_keys:
+            if months is None or key in months or key not in self.chart_months_data:
+                self.chart_months_data[key] = dashboard_data.compute_month_totals(self.db_manager, key)
         
-        # Get active goals
-        goals = self.db_manager.get_goals(active_only=True)
-        active_goals_count = len(goals)
+        self.render_income_expenses_chart()
+    
+    def render_income_expenses_chart(self):
+        """Render the income vs expenses chart from the cached month totals."""
+        window = dashboard_data.chart_months()
+        # A snapshot saved in an earlier month lacks the newest months until it is recomputed
+        totals = [self.chart_months_data.get(key, {'income': 0, 'expenses': 0}) for key, _ in window]
+        self.main_window.dashboard_view.update_income_expenses_chart(
+            [label for _, label in window], [month['income'] for month in totals],
+            [month['expenses'] for month in totals])
+    
+    def refresh_expense_categories_chart(self):
+        """Refresh the expense categories chart of the current month."""
+        self.dashboard_state['expense_categories'] = list(dashboard_data.compute_expense_categories(self.db_manager))
+        self.render_expense_categories_chart()
+    
+    def render_expense_categories_chart(self):
+        """Render the expense categories chart from the cached dashboard state."""
+        names, values, colors = self.dashboard_state['expense_categories']
+        self.main_window.dashboard_view.update_expense_categories_chart(names, values, colors)
+    
+    def refresh_recent_transactions(self):
+        """Refresh the recent transactions table of the dashboard."""
+        self.dashboard_state['recent_transactions'] = self.db_manager.get_transactions(
+            limit=dashboard_data.RECENT_TRANSACTIONS)
+        self.render_recent_transactions()
+    
+    def render_recent_transactions(self):
+        """Render the recent transactions table from the cached dashboard state."""
+        self.main_window.dashboard_view.update_recent_transactions(self.dashboard_state['recent_transactions'])
+    
+    # Change event handlers
+    def on_accounts_changed(self, event):
+        """Update the account rows after account or balance changes.
         
-        # Calculate goals progress
-        if active_goals_count > 0:
-            goals_progress = sum(goal['current_amount'] / goal['target_amount'] for goal in goals if goal['target_amount'] > 0) / active_goals_count * 100
+        Args:
+            event (ChangeEvent): Published change event
+        """
+        if event.operation == change_events.UPDATE or event.entity == change_events.TRANSACTION:
+            self.update_account_rows(event.accounts)
         else:
-            goals_progress = 0
-        
-        # Get expense categories data for pie chart
-        categories = {}
-        for transaction in current_month_transactions:
-            if transaction['type'] == 'expense' and transaction['category_name']:
-                category = transaction['category_name']
-                if category not in categories:
-                    categories[category] = {
-                        'amount': 0,
-                        'color': transaction['category_color'] or '#FF5733'
-                    }
-                categories[category]['amount'] += transaction['amount']
-        
-        # Prepare data for expense categories chart
-        category_names = list(categories.keys())
-        category_values = [categories[cat]['amount'] for cat in category_names]
-        category_colors = [categories[cat]['color'] for cat in category_names]
-        
-        # Get monthly data for income vs expenses chart
-        months_data = {}
-        for i in range(6):
-            month_date = today - timedelta(days=30*i)
-            month_name = month_date.strftime('%b')
-            first_day = datetime(month_date.year, month_date.month, 1)
-            if month_date.month == 12:
-                last_day = datetime(month_date.year + 1, 1, 1) - timedelta(days=1)
-            else:
-                last_day = datetime(month_date.year, month_date.month + 1, 1) - timedelta(days=1)
-            
-            # Get transactions for this month
-            month_transactions = self.db_manager.get_transactions(
-                start_date=first_day.strftime('%Y-%m-%d'),
-                end_date=last_day.strftime('%Y-%m-%d')
-            )
+            self.refresh_view('accounts')
+    
+    def update_account_rows(self, account_ids):
+        """Update the rows of changed accounts in place, or reload the view if rows move.
+        
+        Args:
+            account_ids (iterable): IDs of the changed accounts
+        """
+        accounts_view = self.main_window.views.get('accounts')
+        if accounts_view is None:
+            return
+        
+        for account_id in account_ids:
+            cached = accounts_view.record_index.get(account_id)
+            account = self.db_manager.get_account(account_id)
             
-            # Calculate income and expenses
-            month_income = sum(t['amount'] for t in month_transactions if t['type'] == 'income')
-            month_expenses = sum(t['amount'] for t in month_transactions if t['type'] == 'expense')
+            # Renamed, hidden or unknown accounts change the row order or count
+            if (cached is None or account is None or not account['is_active']
+                    or account['name'] != cached['name']):
+                self.refresh_view('accounts')
+                return
             
-            months_data[month_name] = {
-                'income': month_income,
-                'expenses': month_expenses
-            }
-        
-        # Prepare data for income vs expenses chart
-        chart_months = list(reversed(list(months_data.keys())))
-        chart_income = [months_data[month]['income'] for month in chart_months]
-        chart_expenses = [months_data[month]['expenses'] for month in chart_months]
+            accounts_view.update_account_row(account)
+    
+    def on_transactions_changed(self, event):
+        """Reload the transactions view after transaction changes, or account and category changes shown in its filters."""
+        self.refresh_view('transactions')
+    
+    def on_reports_data_changed(self, event):
+        """Update the daily series with new transactions, or rebuild them after account changes.
         
-        # Get recent transactions
-        recent_transactions = self.db_manager.get_transactions(limit=5)
+        Args:
+            event (ChangeEvent): Published change event
+        """
+        # Amounts of accounts in other currencies are converted when the series are read again
+        if (event.entity == change_events.TRANSACTION and event.operation == change_events.INSERT
+                and self.daily_series is not None and event.records and len(event.records) == len(event.ids)
+                and event.accounts.isdisjoint(self.db_manager.get_converted_accounts())):
+            from src.models.timeseries import apply_transaction
+            for record in event.records:
+                apply_transaction(self.daily_series, record)
+            reports_view = self.main_window.views.get('reports')
+            if reports_view is not None:
+                reports_view.refresh_daily_series()
+            return
+        
+        # Balances may have changed anywhere in the history, read everything again
+        loaded = self.daily_series is not None or self.daily_series_worker is not None
+        self.daily_series = None
+        if self.daily_series_worker is not None:
+            self.daily_series_worker.cancel()
+            self.daily_series_worker = None
+        
+        # The reports view also lists account names
+        if loaded or event.entity == change_events.ACCOUNT:
+            self.refresh_view('reports')
+    
+    def on_exchange_rates_changed(self, event):
+        """Show the new rates in the settings view after rate or base currency changes."""
+        self.refresh_view('settings')
+    
+    def on_budgets_changed(self, event):
+        """Reload the budgets view after budget changes."""
+        self.refresh_view('budgets')
+    
+    def on_goals_changed(self, event):
+        """Update the goal rows after goal changes.
         
-        # Update dashboard view with real data
-        dashboard = self.main_window.dashboard_view
+        Args:
+            event (ChangeEvent): Published change event
+        """
+        goals_view = self.main_window.views.get('goals')
+        if goals_view is None:
+            return
         
-        # Update financial summary cards
-        dashboard.update_summary_card("Balance Total", f"${total_balance:,.2f}", "#007ACC", 
-                                    f"{'↑' if income_change >= 0 else '↓'} {abs(income_change):.1f}% desde el mes pasado")
+        if event.operation == change_events.INSERT:
+            self.refresh_view('goals')
+            return
         
-        dashboard.update_summary_card("Ingresos (este mes)", f"${current_income:,.2f}", "#28A745", 
-                                    f"{'↑' if income_change >= 0 else '↓'} {abs(income_change):.1f}% desde el mes pasado")
+        for goal_id in event.ids:
+            goal = self.db_manager.get_goal(goal_id) if event.operation == change_events.UPDATE else None
+            
+            # The view only lists goals that are not completed
+            if goal is None or goal['is_completed']:
+                goals_view.remove_goal_row(goal_id)
+            elif not goals_view.update_goal_row(goal):
+                self.refresh_view('goals')
+                return
+    
+    def on_dashboard_data_changed(self, event):
+        """Refresh only the dashboard cards and chart months affected by a change.
         
-        dashboard.update_summary_card("Gastos (este mes)", f"${current_expenses:,.2f}", "#DC3545", 
-                                    f"{'↓' if expense_change <= 0 else '↑'} {abs(expense_change):.1f}% desde el mes pasado")
+        Args:
+            event (ChangeEvent): Published change event
+        """
+        current_month, last_month = dashboard_data.current_and_last_month()
+        
+        if event.entity == change_events.TRANSACTION:
+            # Income, expenses and savings compare the current and the previous month
+            if event.affects_months((current_month, last_month)):
+                self.refresh_month_summary()
+                # The remaining budget depends on the current month expenses
+                if current_month in event.months:
+                    self.refresh_budget_card()
+            
+            if event.accounts:
+                self.refresh_total_balance()
+            
+            if current_month in event.months:
+                self.refresh_expense_categories_chart()
+            
+            chart_keys = [key for key, _ in dashboard_data.chart_months()]
+            if event.affects_months(chart_keys):
+                self.refresh_income_expenses_chart(months=event.months)
+            
+            self.refresh_recent_transactions()
         
-        dashboard.update_summary_card("Ahorros", f"${savings:,.2f}", "#FFC107", 
-                                    f"{savings_percentage:.1f}% de los ingresos")
+        elif event.entity == change_events.ACCOUNT:
+            # A changed currency converts every total of the account differently
+            if event.operation == change_events.UPDATE:
+                self.update_dashboard()
+            else:
+                self.refresh_total_balance()
         
-        dashboard.update_summary_card("Presupuesto Restante", f"${budget_remaining:,.2f}", "#17A2B8", 
-                                    f"{budget_percentage:.1f}% disponible")
+        elif event.entity == change_events.EXCHANGE_RATE:
+            self.update_dashboard()
         
-        dashboard.update_summary_card("Progreso de Metas", f"{goals_progress:.0f}%", "#6F42C1", 
-                                    f"{active_goals_count} metas activas")
+        elif event.entity == change_events.BUDGET:
+            self.refresh_budget_card()
         
-        # Update charts
-        dashboard.update_income_expenses_chart(chart_months, chart_income, chart_expenses)
-        dashboard.update_expense_categories_chart(category_names, category_values, category_colors)
+        elif event.entity == change_events.GOAL:
+            self.refresh_goals_card()
         
-        # Update recent transactions
-        dashboard.update_recent_transactions(recent_transactions)
+        elif event.entity == change_events.CATEGORY:
+            if event.categories:
+                self.refresh_expense_categories_chart()
     
     # Action handlers
     def add_account(self, account_data):
@@ -219,12 +678,7 @@ class MainController:
             icon=account_data.get('icon')
         )
         
-        # Refresh accounts view
-        accounts = self.db_manager.get_accounts()
-        self.main_window.accounts_view.load_accounts(accounts)
-        
-        # Update dashboard
-        self.update_dashboard()
+        # Views and dashboard cards refresh through the change events
         
         return account_id
     
@@ -243,12 +697,7 @@ class MainController:
             description=transaction_data.get('description')
         )
         
-        # Refresh transactions view
-        transactions = self.db_manager.get_transactions(limit=10)
-        self.main_window.transactions_view.load_transactions(transactions)
-        
-        # Update dashboard
-        self.update_dashboard()
+        # Views and dashboard cards refresh through the change events
         
         return transaction_id
     
@@ -266,12 +715,7 @@ class MainController:
             end_date=budget_data['end_date']
         )
         
-        # Refresh budgets view
-        budgets = self.db_manager.get_budgets()
-        self.main_window.budgets_view.load_budgets(budgets)
-        
-        # Update dashboard
-        self.update_dashboard()
+        # Views and dashboard cards refresh through the change events
         
         return budget_id
     
@@ -288,12 +732,7 @@ class MainController:
             description=goal_data.get('description')
         )
         
-        # Refresh goals view
-        goals = self.db_manager.get_goals()
-        self.main_window.goals_view.load_goals(goals)
-        
-        # Update dashboard
-        self.update_dashboard()
+        # Views and dashboard cards refresh through the change events
         
         return goal_id
         
@@ -304,26 +743,8 @@ class MainController:
             goal_id (int): ID of the goal to edit
             goal_data (dict): Updated goal data
         """
-        self.db_manager.connect()
-        try:
-            # Build the SET part of the SQL query
-            set_clause = ', '.join([f'{key} = ?' for key in goal_data.keys()])
-            values = list(goal_data.values())
-            values.append(goal_id)
-            
-            self.db_manager.cursor.execute(f'UPDATE goals SET {set_clause} WHERE id = ?', values)
-            self.db_manager.commit()
-            
-            # Refresh goals view
-            goals = self.db_manager.get_goals()
-            self.main_window.goals_view.load_goals(goals)
-            
-            # Update dashboard
-            self.update_dashboard()
-            
-            return True
-        finally:
-            self.db_manager.disconnect()
+        # Views and dashboard cards refresh through the change events
+        return self.db_manager.update_goal(goal_id, **goal_data)
     
     def delete_goal(self, goal_id):
         """Delete a financial goal.
@@ -331,21 +752,8 @@ class MainController:
         Args:
             goal_id (int): ID of the goal to delete
         """
-        self.db_manager.connect()
-        try:
-            self.db_manager.cursor.execute('DELETE FROM goals WHERE id = ?', (goal_id,))
-            self.db_manager.commit()
-            
-            # Refresh goals view
-            goals = self.db_manager.get_goals()
-            self.main_window.goals_view.load_goals(goals)
-            
-            # Update dashboard
-            self.update_dashboard()
-            
-            return True
-        finally:
-            self.db_manager.disconnect()
+        # Views and dashboard cards refresh through the change events
+        return self.db_manager.delete_goal(goal_id)
     
     def save_settings(self, settings):
         """Save application settings.
@@ -357,6 +765,10 @@ class MainController:
         # For now, we'll just print the settings
         print("Saving settings:", settings)
         
+        # Totals are converted to the default currency; views refresh through the change events
+        if 'default_currency' in settings:
+            self.db_manager.set_base_currency(settings['default_currency'])
+        
         # Apply theme if changed
         if 'theme' in settings:
             theme = settings['theme']
@@ -369,6 +781,155 @@ class MainController:
             
         return True
     
+    def on_import_requested(self, path, data_type, date_format, account_id):
+        """Import a CSV or bank statement file on a worker thread.
+        
+        Args:
+            path (str): Path to the file
+            data_type (str): 'transactions', 'accounts', 'categories' or 'exchange_rates'
+            date_format (str): Date format of CSV and QIF files, e.g. 'dd/MM/yyyy'
+            account_id (int): Account of the transactions, when the file does not name a known one, or None
+        """
+        if self.import_worker is not None or self.export_worker is not None:
+            self.main_window.show_task_busy()
+            return
+        
+        self.main_window.start_task("Importando")
+        self.import_worker = start_worker(
+            read_import, self.db_manager.db_path, data_type, path, date_format, account_id,
+            pass_worker=True,
+            deliver_cancelled=True,
+            on_finished=self.on_import_finished,
+            on_error=self.on_import_error,
+            on_progress=lambda percentage: self.main_window.show_task_progress(
+                percentage, cancellable=percentage < importers.COMMIT_PROGRESS))
+    
+    def cancel_task(self):
+        """Cancel the running import or export.
+        
+        Nothing of a cancelled export is written. Transactions are imported chunk
+        by chunk, so the import worker stops after the current chunk and still
+        delivers the summary of the chunks it committed.
+        """
+        if self.import_worker is not None:
+            self.import_worker.cancel()
+            self.main_window.show_task_cancelling()
+        elif self.export_worker is not None:
+            self.export_worker.cancel()
+            self.export_worker = None
+            self.main_window.show_export_cancelled()
+    
+    def on_import_finished(self, result):
+        """Publish the changes of a finished import and show its summary.
+        
+        Args:
+            result (ImportResult): Summary of the import, or None if it was cancelled before writing anything
+        """
+        self.import_worker = None
+        if result is None:
+            self.main_window.show_import_cancelled()
+            return
+        
+        # The worker wrote through its own manager; views refresh through this one's subscribers
+        for event in result.events:
+            self.db_manager.publish_change(event)
+        if result.cancelled:
+            self.main_window.show_import_cancelled(result.imported)
+        else:
+            self.main_window.show_import_result(result)
+    
+    def on_import_error(self, message):
+        """Report a failed import."""
+        self.import_worker = None
+        self.main_window.show_import_error(error_summary(message))
+    
+    def on_export_requested(self, path, datasets, file_format):
+        """Export data to a file on a worker thread.
+        
+        Args:
+            path (str): Path to the file; its extension selects the compression of CSV files
+            datasets (list): Datasets to export, or None for every table
+            file_format (str): 'csv', 'excel', 'parquet' or 'arrow'
+        """
+        if self.import_worker is not None or self.export_worker is not None:
+            self.main_window.show_task_busy()
+            return
+        
+        self.main_window.start_task("Exportando")
+        self.export_worker = start_worker(
+            read_export, self.db_manager.db_path, datasets, path, file_format,
+            pass_worker=True,
+            on_finished=self.on_export_finished,
+            on_error=self.on_export_error,
+            on_progress=self.main_window.show_task_progress)
+    
+    def on_export_finished(self, result):
+        """Show the files written by a finished export."""
+        self.export_worker = None
+        if result is not None:
+            self.main_window.show_export_result(result)
+    
+    def on_export_error(self, message):
+        """Report a failed export."""
+        self.export_worker = None
+        self.main_window.show_export_error(error_summary(message))
+    
+    def on_report_requested(self, report_type, start_date, end_date, account_id):
+        """Compute a report on a worker thread, dropping any report still being computed.
+        
+        Args:
+            report_type (str): Type of report
+            start_date (str): Start date in format 'yyyy-MM-dd'
+            end_date (str): End date in format 'yyyy-MM-dd', included in the report
+            account_id (int): Account ID to filter by, or None
+        """
+        if self.report_worker is not None:
+            self.report_worker.cancel()
+            self.report_worker = None
+        
+        # Results and progress of older requests may still be queued, they are ignored
+        self.report_generation += 1
+        generation = self.report_generation
+        
+        # Reports computed since the last database change are shown without reading it again
+        key = self.report_cache.key(report_type, start_date, end_date, account_id,
+                                    self.db_manager.change_bus.generation)
+        report = self.report_cache.get(key)
+        if report is not None:
+            self.main_window.reports_view.show_report(report)
+            return
+        
+        self.report_worker = start_worker(
+            read_report, self.db_manager.db_path, report_type, start_date, end_date, account_id,
+            pass_worker=True,
+            on_finished=lambda report: self.on_report_ready(report, generation, key),
+            on_error=lambda message: self.on_report_error(message, generation),
+            on_progress=lambda percentage: self.on_report_progress(percentage, generation))
+    
+    def on_report_progress(self, percentage, generation):
+        """Show the progress of the latest requested report."""
+        if generation == self.report_generation:
+            self.main_window.reports_view.show_report_progress(percentage)
+    
+    def on_report_ready(self, report, generation, key):
+        """Cache a computed report, and show it if it is the latest requested one."""
+        if report is None:
+            return
+        
+        # Keyed by the data version at request time; a write made meanwhile already outdated the key
+        self.report_cache.put(key, report)
+        if generation != self.report_generation:
+            return
+        self.report_worker = None
+        self.main_window.reports_view.show_report(report)
+    
+    def on_report_error(self, message, generation):
+        """Report a failed report computation."""
+        if generation != self.report_generation:
+            return
+        self.report_worker = None
+        self.main_window.reports_view.show_report_error(error_summary(message))
+    
     def generate_report(self, report_type=None):
         """Generate a financial report.
         
@@ -376,7 +937,7 @@ class MainController:
             report_type (str, optional): Type of report to generate. Defaults to None.
         """
         # Switch to reports tab
-        self.main_window.tab_widget.setCurrentIndex(4)  # Index of reports tab
+        reports_view = self.main_window.show_tab('reports')
         
         # Generate the report
-        self.main_window.reports_view.generate_report(report_type)
\ No newline at end of file
+        reports_view.generate_report(report_type)
\ No newline at end of file
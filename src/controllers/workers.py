@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Background workers for database reads and other slow operations.
+
+Workers run a function on the global QThreadPool and deliver its result
+through Qt signals, which are received on the GUI thread. Functions that
+touch the database must open their own DatabaseManager, since a manager
+keeps its connection on the instance and is not shared between threads.
+"""
+
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    """Signals emitted by a Worker."""
+
+    # Emitted with the function's return value
+    finished = pyqtSignal(object)
+
+    # Emitted with the formatted traceback when the function raises
+    error = pyqtSignal(str)
+
+    # Emitted with a percentage (0-100) reported by the function
+    progress = pyqtSignal(int)
+
+
+class Worker(QRunnable):
+    """Runs a function in the thread pool.
+
+    If the function accepts a 'worker' keyword argument it receives the worker
+    itself, so it can report progress and check is_cancelled() between steps.
+    """
+
+    def __init__(self, fn, *args, pass_worker=False, deliver_cancelled=False, **kwargs):
+        """Initialize the worker.
+
+        Args:
+            fn (callable): Function to run
+            *args: Positional arguments for the function
+            pass_worker (bool, optional): Pass the worker as the 'worker' keyword argument.
+                Defaults to False.
+            deliver_cancelled (bool, optional): Deliver the result or error even after
+                cancel(), for functions that stop early and return what they already
+                wrote. Defaults to False.
+            **kwargs: Keyword arguments for the function
+        """
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        if pass_worker:
+            self.kwargs['worker'] = self
+        self.signals = WorkerSignals()
+        self.cancelled = False
+        self.deliver_cancelled = deliver_cancelled
+
+    def cancel(self):
+        """Ask the worker to stop. Its result, if any, is not delivered unless deliver_cancelled was set."""
+        self.cancelled = True
+
+    def is_cancelled(self):
+        """Check whether the worker was cancelled."""
+        return self.cancelled
+
+    def report_progress(self, percentage):
+        """Report progress from inside the running function."""
+        if not self.cancelled:
+            self.signals.progress.emit(int(percentage))
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception:
+            if not self.cancelled or self.deliver_cancelled:
+                self.signals.error.emit(traceback.format_exc())
+            return
+
+        if not self.cancelled or self.deliver_cancelled:
+            self.signals.finished.emit(result)
+
+
+def start_worker(fn, *args, on_finished=None, on_error=None, on_progress=None, pass_worker=False,
+                 deliver_cancelled=False, **kwargs):
+    """Run a function on the global thread pool.
+
+    Args:
+        fn (callable): Function to run
+        *args: Positional arguments for the function
+        on_finished (callable, optional): Called with the result on the GUI thread
+        on_error (callable, optional): Called with the traceback text on the GUI thread
+        on_progress (callable, optional): Called with progress percentages on the GUI thread
+        pass_worker (bool, optional): Pass the worker as the 'worker' keyword argument
+        deliver_cancelled (bool, optional): Deliver the result or error even after cancel()
+        **kwargs: Keyword arguments for the function
+
+    Returns:
+        Worker: The started worker, which can be cancelled
+    """
+    worker = Worker(fn, *args, pass_worker=pass_worker, deliver_cancelled=deliver_cancelled, **kwargs)
+    if on_finished is not None:
+        worker.signals.finished.connect(on_finished)
+    if on_error is not None:
+        worker.signals.error.connect(on_error)
+    if on_progress is not None:
+        worker.signals.progress.connect(on_progress)
+    QThreadPool.globalInstance().start(worker)
+    return worker
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Change notification primitives published by the DatabaseManager.
+
+Every write performed through the DatabaseManager publishes a ChangeEvent
+describing what changed, so views and dashboard cards can refresh only
+when their inputs are affected.
+"""
+
+# Entity names used in change events
+ACCOUNT = 'account'
+TRANSACTION = 'transaction'
+CATEGORY = 'category'
+BUDGET = 'budget'
+GOAL = 'goal'
+EXCHANGE_RATE = 'exchange_rate'
+
+# Operation names used in change events
+INSERT = 'insert'
+UPDATE = 'update'
+DELETE = 'delete'
+
+
+def month_key(date):
+    """Return the 'YYYY-MM' key of a date, datetime or date string.
+
+    Args:
+        date (datetime|str): Date to convert
+
+    Returns:
+        str: Month key in format 'YYYY-MM'
+    """
+    if isinstance(date, str):
+        return date[:7]
+    return date.strftime('%Y-%m')
+
+
+class ChangeEvent:
+    """Describes a single write performed on the database."""
+
+    def __init__(self, entity, operation, ids=(), accounts=(), categories=(), months=(), records=()):
+        """Initialize the change event.
+
+        Args:
+            entity (str): Changed entity (account, transaction, category, budget, goal, exchange_rate)
+            operation (str): Performed operation (insert, update, delete)
+            ids (iterable, optional): IDs of the changed rows
+            accounts (iterable, optional): IDs of the accounts whose balance or data changed
+            categories (iterable, optional): IDs of the affected categories
+            months (iterable, optional): Affected months as 'YYYY-MM' keys
+            records (iterable, optional): Changed rows as dictionaries, when available
+        """
+        self.entity = entity
+        self.operation = operation
+        self.ids = frozenset(ids)
+        self.accounts = frozenset(a for a in accounts if a is not None)
+        self.categories = frozenset(c for c in categories if c is not None)
+        self.months = frozenset(months)
+        self.records = tuple(records)
+
+    def affects_months(self, months):
+        """Check whether the event touches any of the given months.
+
+        Args:
+            months (iterable): Month keys in format 'YYYY-MM'
+
+        Returns:
+            bool: True if at least one of the months is affected
+        """
+        return not self.months.isdisjoint(months)
+
+    def __repr__(self):
+        return (f"ChangeEvent({self.entity!r}, {self.operation!r}, ids={sorted(self.ids)}, "
+                f"accounts={sorted(self.accounts)}, categories={sorted(self.categories)}, "
+                f"months={sorted(self.months)})")
+
+
+class ChangeBus:
+    """Synchronous publish/subscribe bus for database change events."""
+
+    def __init__(self):
+        self._subscribers = []
+        # Incremented on every published event, usable as a data version
+        self.generation = 0
+
+    def subscribe(self, callback, entities=None):
+        """Register a callback for change events.
+
+        Args:
+            callback (callable): Function called with the ChangeEvent
+            entities (iterable, optional): Only deliver events for these entities.
+                Defaults to None (all entities).
+        """
+        entities = frozenset(entities) if entities is not None else None
+        self._subscribers.append((callback, entities))
+
+    def unsubscribe(self, callback):
+        """Remove a previously registered callback."""
+        self._subscribers = [(cb, entities) for cb, entities in self._subscribers if cb != callback]
+
+    def publish(self, event):
+        """Deliver an event to every interested subscriber.
+
+        Args:
+            event (ChangeEvent): Event to publish
+        """
+        self.generation += 1
+        for callback, entities in list(self._subscribers):
+            if entities is None or event.entity in entities:
+                callback(event)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Dashboard data computations.
+
+Each function computes the inputs of a single dashboard card or chart, so
+the controller can refresh only the parts affected by a database change.
+
+The whole dashboard is also saved as a small JSON snapshot next to the
+database, shown at startup before any query runs.
+"""
+
+import json
+import os
+from datetime import datetime
+
+from src.models.change_events import month_key
+
+# Number of months shown in the income vs expenses chart
+CHART_MONTHS = 6
+
+# Number of transactions listed in the recent transactions table
+RECENT_TRANSACTIONS = 5
+
+# Version of the snapshot layout; snapshots of other versions are ignored
+SNAPSHOT_VERSION = 1
+
+
+def add_months(year, month, delta):
+    """Shift a (year, month) pair by a number of months.
+
+    Args:
+        year (int): Year
+        month (int): Month (1-12)
+        delta (int): Number of months to add (may be negative)
+
+    Returns:
+        tuple: Shifted (year, month) pair
+    """
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def month_range(key):
+    """Return the first day of a month and the first day of the next one.
+
+    Args:
+        key (str): Month key in format 'YYYY-MM'
+
+    Returns:
+        tuple: (start_date, end_date) strings, end_date being exclusive
+    """
+    year, month = int(key[:4]), int(key[5:7])
+    next_year, next_month = add_months(year, month, 1)
+    return f'{year:04d}-{month:02d}-01', f'{next_year:04d}-{next_month:02d}-01'
+
+
+def current_and_last_month(today=None):
+    """Return the month keys of the current and the previous month."""
+    today = today or datetime.now()
+    last_year, last_month = add_months(today.year, today.month, -1)
+    return month_key(today), f'{last_year:04d}-{last_month:02d}'
+
+
+def chart_months(today=None, count=CHART_MONTHS):
+    """Return the (key, label) pairs shown in the income vs expenses chart, oldest first."""
+    today = today or datetime.now()
+    months = []
+    for delta in range(-(count - 1), 1):
+        year, month = add_months(today.year, today.month, delta)
+        months.append((f'{year:04d}-{month:02d}', datetime(year, month, 1).strftime('%b')))
+    return months
+
+
+def percentage_change(current, previous):
+    """Return the percentage change between two amounts."""
+    return ((current - previous) / previous * 100) if previous > 0 else 0
+
+
+def compute_total_balance(db_manager):
+    """Compute the total balance of all active accounts, in the base currency at the latest rates."""
+    return db_manager.get_total_balance()
+
+
+def compute_month_totals(db_manager, key):
+    """Compute income and expenses of a single month.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        key (str): Month key in format 'YYYY-MM'
+
+    Returns:
+        dict: Dictionary with 'income' and 'expenses' totals
+    """
+    start_date, end_date = month_range(key)
+    totals = db_manager.get_totals_by_type(start_date=start_date, end_date=end_date)
+    return {'income': totals['income'], 'expenses': totals['expense']}
+
+
+def compute_month_summary(db_manager, today=None):
+    """Compute the income, expenses and savings cards of the current month.
+
+    Returns:
+        dict: Current and previous month totals with their percentage changes
+    """
+    current_key, last_key = current_and_last_month(today)
+    current = compute_month_totals(db_manager, current_key)
+    last = compute_month_totals(db_manager, last_key)
+
+    savings = current['income'] - current['expenses']
+    return {
+        'current_income': current['income'],
+        'current_expenses': current['expenses'],
+        'income_change': percentage_change(current['income'], last['income']),
+        'expense_change': percentage_change(current['expenses'], last['expenses']),
+        'savings': savings,
+        'savings_percentage': (savings / current['income'] * 100) if current['income'] > 0 else 0
+    }
+
+
+def compute_budget_summary(db_manager, current_expenses):
+    """Compute the remaining budget card.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        current_expenses (float): Expenses of the current month
+
+    Returns:
+        dict: Remaining budget and its percentage
+    """
+    budgets = db_manager.get_budgets(active_only=True)
+    total_budget = sum(budget['amount'] for budget in budgets)
+    budget_remaining = total_budget - current_expenses
+    return {
+        'budget_remaining': budget_remaining,
+        'budget_percentage': (budget_remaining / total_budget * 100) if total_budget > 0 else 0
+    }
+
+
+def compute_goals_summary(db_manager):
+    """Compute the goals progress card."""
+    goals = db_manager.get_goals(active_only=True)
+    active_goals_count = len(goals)
+
+    if active_goals_count > 0:
+        goals_progress = sum(goal['current_amount'] / goal['target_amount']
+                             for goal in goals if goal['target_amount'] > 0) / active_goals_count * 100
+    else:
+        goals_progress = 0
+
+    return {'goals_progress': goals_progress, 'active_goals_count': active_goals_count}
+
+
+def compute_expense_categories(db_manager, today=None):
+    """Compute the expense categories chart of the current month.
+
+    Returns:
+        tuple: (names, values, colors) lists
+    """
+    start_date, end_date = month_range(current_and_last_month(today)[0])
+    rows = db_manager.get_category_totals(start_date=start_date, end_date=end_date)
+    names = [row['category_name'] for row in rows]
+    values = [row['total'] for row in rows]
+    colors = [row['category_color'] or '#FF5733' for row in rows]
+    return names, values, colors
+
+
+def compute_dashboard(db_manager, today=None):
+    """Compute every card, chart and table of the dashboard.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        today (datetime, optional): Current date. Defaults to now.
+
+    Returns:
+        dict: 'state' with the card values, the current month's 'expense_categories'
+            and the 'recent_transactions'; and 'chart_months' with the income and
+            expenses of each chart month. Only holds JSON types.
+    """
+    state = compute_month_summary(db_manager, today)
+    state['total_balance'] = compute_total_balance(db_manager)
+    state.update(compute_budget_summary(db_manager, state['current_expenses']))
+    state.update(compute_goals_summary(db_manager))
+    state['expense_categories'] = list(compute_expense_categories(db_manager, today))
+    state['recent_transactions'] = db_manager.get_transactions(limit=RECENT_TRANSACTIONS)
+    return {
+        'state': state,
+        'chart_months': {key: compute_month_totals(db_manager, key) for key, _ in chart_months(today)}
+    }
+
+
+def snapshot_path(db_path):
+    """Return the path of the dashboard snapshot of a database, e.g. 'finanzas.dashboard.json'."""
+    return os.path.splitext(db_path)[0] + '.dashboard.json'
+
+
+def save_snapshot(path, dashboard):
+    """Save a compute_dashboard() result, replacing the previous snapshot at once.
+
+    Args:
+        path (str): Snapshot path
+        dashboard (dict): Dashboard data
+    """
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as snapshot_file:
+        json.dump({'version': SNAPSHOT_VERSION, **dashboard}, snapshot_file, ensure_ascii=False,
+                  separators=(',', ':'))
+    os.replace(temporary_path, path)
+
+
+def load_snapshot(path):
+    """Load a saved dashboard.
+
+    Returns:
+        dict: compute_dashboard() data, or None if there is no readable snapshot
+    """
+    try:
+        with open(path, encoding='utf-8') as snapshot_file:
+            snapshot = json.load(snapshot_file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.pop('version', None) != SNAPSHOT_VERSION:
+        return None
+    return snapshot
@@ -1,13 +1,47 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import math
 import os
 import sqlite3
 from datetime import datetime
 
+from src.models.change_events import (ChangeBus, ChangeEvent, month_key,
+                                      ACCOUNT, TRANSACTION, CATEGORY, BUDGET, GOAL, EXCHANGE_RATE,
+                                      INSERT, UPDATE, DELETE)
+
 class DatabaseManager:
     """Manages all database operations for the financial management software."""
     
+    # Description searches matching fewer than sqrt(rows) * SEARCH_DENSITY_FACTOR
+    # transactions read the full-text index, more common ones scan by date
+    SEARCH_DENSITY_FACTOR = 16
+    
+    # Tables that can be exported; table names are never taken from elsewhere
+    EXPORT_TABLES = ('accounts', 'categories', 'transactions', 'budgets', 'goals', 'recurring_transactions')
+    
+    # Transactions with the names of their account and category, oldest first
+    TRANSACTIONS_DETAIL_QUERY = '''
+    SELECT t.id, substr(t.date, 1, 10) AS date, t.type, t.amount, a.name AS account, a.currency,
+           c.name AS category, t.description
+    FROM transactions t
+    LEFT JOIN accounts a ON t.account_id = a.id
+    LEFT JOIN categories c ON t.category_id = c.id
+    ORDER BY t.date, t.id
+    '''
+    
+    # Destination account of a transfer, named by ID after the last ':' of its description
+    TRANSFER_DESTINATION = ("CAST(substr(description, length(rtrim(description, replace(description, ':', ''))) + 1) "
+                            "AS INTEGER)")
+    
+    # Declared types of the transactions_detail columns
+    TRANSACTIONS_DETAIL_TYPES = (('id', 'INTEGER'), ('date', 'DATE'), ('type', 'TEXT'), ('amount', 'REAL'),
+                                 ('account', 'TEXT'), ('currency', 'TEXT'), ('category', 'TEXT'),
+                                 ('description', 'TEXT'))
+    
+    # Currency of the totals until another one is chosen in the settings
+    DEFAULT_BASE_CURRENCY = 'MXN'
+    
     def __init__(self, db_path=None):
         """Initialize the database manager.
         
@@ -24,6 +58,22 @@ class DatabaseManager:
         
         self.conn = None
         self.cursor = None
+        
+        # Bus used to notify subscribers about every write
+        self.change_bus = ChangeBus()
+    
+    def subscribe(self, callback, entities=None):
+        """Subscribe to change events published after each write.
+        
+        Args:
+            callback (callable): Function called with a ChangeEvent
+            entities (iterable, optional): Only receive events for these entities
+        """
+        self.change_bus.subscribe(callback, entities)
+    
+    def publish_change(self, event):
+        """Publish a change event to all subscribers."""
+        self.change_bus.publish(event)
     
     def connect(self):
         """Connect to the database."""
@@ -90,6 +140,7 @@ class DatabaseManager:
             description TEXT,
             date TIMESTAMP NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            fingerprint TEXT,
             FOREIGN KEY (account_id) REFERENCES accounts(id) ON DELETE CASCADE,
             FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE SET NULL
         )
@@ -144,6 +195,58 @@ class DatabaseManager:
         )
         ''')
         
+        # Create exchange rates table. Each rate is the value of one unit of the
+        # currency in a common reference currency, so any two currencies
+        # convert through the ratio of their rates
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS exchange_rates (
+            currency TEXT NOT NULL,
+            day TEXT NOT NULL,
+            rate REAL NOT NULL,
+            PRIMARY KEY (currency, day)
+        ) WITHOUT ROWID
+        ''')
+        
+        # Create settings table
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+        ''')
+        
+        # Index backing the date ordered, keyset paginated transaction reads
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_date_id ON transactions (date, id)
+        ''')
+        
+        # Indexes backing the transaction filters, each keeping the date order
+        # The account index also covers the columns summed for the accounts in
+        # other currencies, which are read from the transactions to be converted
+        self.cursor.execute('DROP INDEX IF EXISTS idx_transactions_account_date')
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_account_amounts
+        ON transactions (account_id, date, id, type, category_id, amount)
+        ''')
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_category_date ON transactions (category_id, date, id)
+        ''')
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_type_date ON transactions (type, date, id)
+        ''')
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_amount ON transactions (amount)
+        ''')
+        
+        # Create the fingerprint index of imported transactions
+        self.setup_fingerprints()
+        
+        # Create the description search index
+        self.setup_search_index()
+        
+        # Create the monthly totals rollup
+        self.setup_rollups()
+        
         # Insert default categories if they don't exist
         default_categories = [
             ('Alimentación', 'expense', '#FF5733', 'food'),
@@ -171,6 +274,128 @@ class DatabaseManager:
         self.commit()
         self.disconnect()
     
+    def setup_search_index(self):
+        """Create the trigram full-text index of transaction descriptions, if FTS5 is available."""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'transactions_fts'")
+        if self.cursor.fetchone():
+            return
+        
+        try:
+            self.cursor.execute('''
+            CREATE VIRTUAL TABLE transactions_fts USING fts5(
+                description, content='transactions', content_rowid='id', tokenize='trigram'
+            )
+            ''')
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 or the trigram tokenizer, searches scan the table
+            return
+        
+        # Keep the index in sync with the transactions table
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN
+            INSERT INTO transactions_fts (rowid, description) VALUES (new.id, new.description);
+        END
+        ''')
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN
+            INSERT INTO transactions_fts (transactions_fts, rowid, description) VALUES ('delete', old.id, old.description);
+        END
+        ''')
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_update AFTER UPDATE OF description ON transactions BEGIN
+            INSERT INTO transactions_fts (transactions_fts, rowid, description) VALUES ('delete', old.id, old.description);
+            INSERT INTO transactions_fts (rowid, description) VALUES (new.id, new.description);
+        END
+        ''')
+        
+        # Index the transactions stored before the index existed
+        self.cursor.execute("INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild')")
+    
+    def setup_fingerprints(self):
+        """Add the fingerprint column of imported transactions to older databases, and its unique index."""
+        self.cursor.execute('PRAGMA table_info(transactions)')
+        if 'fingerprint' not in [column['name'] for column in self.cursor.fetchall()]:
+            self.cursor.execute('ALTER TABLE transactions ADD COLUMN fingerprint TEXT')
+        
+        # Transactions entered by hand have no fingerprint and are never deduplicated
+        self.cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_fingerprint ON transactions (fingerprint)
+        WHERE fingerprint IS NOT NULL
+        ''')
+    
+    def setup_rollups(self):
+        """Create the monthly totals per account, category and type, kept in sync by triggers."""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'monthly_category_totals'")
+        exists = self.cursor.fetchone() is not None
+        
+        # Uncategorized transactions are stored with category_id 0
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_category_totals (
+            month TEXT NOT NULL,
+            account_id INTEGER NOT NULL,
+            category_id INTEGER NOT NULL,
+            type TEXT NOT NULL,
+            total REAL NOT NULL DEFAULT 0,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, account_id, category_id, type)
+        ) WITHOUT ROWID
+        ''')
+        
+        # Keep the rollup in sync with the transactions table
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS monthly_category_totals_insert AFTER INSERT ON transactions BEGIN
+            INSERT INTO monthly_category_totals (month, account_id, category_id, type, total, count)
+            VALUES (substr(new.date, 1, 7), new.account_id, COALESCE(new.category_id, 0), new.type, new.amount, 1)
+            ON CONFLICT (month, account_id, category_id, type)
+            DO UPDATE SET total = total + excluded.total, count = count + 1;
+        END
+        ''')
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS monthly_category_totals_delete AFTER DELETE ON transactions BEGIN
+            UPDATE monthly_category_totals SET total = total - old.amount, count = count - 1
+            WHERE month = substr(old.date, 1, 7) AND account_id = old.account_id
+              AND category_id = COALESCE(old.category_id, 0) AND type = old.type;
+            DELETE FROM monthly_category_totals WHERE count = 0;
+        END
+        ''')
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS monthly_category_totals_update
+        AFTER UPDATE OF amount, type, date, account_id, category_id ON transactions BEGIN
+            UPDATE monthly_category_totals SET total = total - old.amount, count = count - 1
+            WHERE month = substr(old.date, 1, 7) AND account_id = old.account_id
+              AND category_id = COALESCE(old.category_id, 0) AND type = old.type;
+            INSERT INTO monthly_category_totals (month, account_id, category_id, type, total, count)
+            VALUES (substr(new.date, 1, 7), new.account_id, COALESCE(new.category_id, 0), new.type, new.amount, 1)
+            ON CONFLICT (month, account_id, category_id, type)
+            DO UPDATE SET total = total + excluded.total, count = count + 1;
+            DELETE FROM monthly_category_totals WHERE count = 0;
+        END
+        ''')
+        
+        # Sum up the transactions stored before the rollup existed
+        if not exists:
+            self.cursor.execute('''
+            INSERT INTO monthly_category_totals (month, account_id, category_id, type, total, count)
+            SELECT substr(date, 1, 7), account_id, COALESCE(category_id, 0), type, SUM(amount), COUNT(*)
+            FROM transactions
+            GROUP BY 1, 2, 3, 4
+            ''')
+    
+    def _search_is_selective(self, phrase):
+        """Check whether a full-text phrase matches few enough transactions to read them from the index."""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'transactions_fts'")
+        if not self.cursor.fetchone():
+            return False
+        
+        self.cursor.execute('SELECT MAX(id) FROM transactions')
+        threshold = int(math.sqrt(self.cursor.fetchone()[0] or 0) * self.SEARCH_DENSITY_FACTOR) + 1
+        
+        # Count the matches, stopping at the threshold
+        self.cursor.execute('''
+        SELECT COUNT(*) FROM (SELECT 1 FROM transactions_fts WHERE transactions_fts MATCH ? LIMIT ?)
+        ''', (phrase, threshold))
+        return self.cursor.fetchone()[0] < threshold
+    
     # Account methods
     def add_account(self, name, type, currency, initial_balance, description=None, color=None, icon=None):
         """Add a new account."""
@@ -182,9 +407,32 @@ class DatabaseManager:
             ''', (name, type, currency, initial_balance, initial_balance, description, color, icon))
             account_id = self.cursor.lastrowid
             self.commit()
-            return account_id
         finally:
             self.disconnect()
+        
+        self.publish_change(ChangeEvent(ACCOUNT, INSERT, ids=[account_id], accounts=[account_id]))
+        return account_id
+    
+    def add_accounts(self, chunks):
+        """Add chunks of (name, type, currency, initial_balance, description, color, icon) rows in one transaction, skipping existing names."""
+        account_ids = []
+        self.connect()
+        try:
+            for rows in chunks:
+                for row in rows:
+                    self.cursor.execute('''
+                    INSERT OR IGNORE INTO accounts (name, type, currency, initial_balance, current_balance, description, color, icon)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', row[:4] + row[3:])
+                    if self.cursor.rowcount:
+                        account_ids.append(self.cursor.lastrowid)
+            self.commit()
+        finally:
+            self.disconnect()
+        
+        if account_ids:
+            self.publish_change(ChangeEvent(ACCOUNT, INSERT, ids=account_ids, accounts=account_ids))
+        return account_ids
     
     def get_accounts(self, active_only=True):
         """Get all accounts."""
@@ -219,9 +467,13 @@ class DatabaseManager:
             
             self.cursor.execute(f'UPDATE accounts SET {set_clause} WHERE id = ?', values)
             self.commit()
-            return self.cursor.rowcount > 0
+            updated = self.cursor.rowcount > 0
         finally:
             self.disconnect()
+        
+        if updated:
+            self.publish_change(ChangeEvent(ACCOUNT, UPDATE, ids=[account_id], accounts=[account_id]))
+        return updated
     
     # Transaction methods
     def add_transaction(self, account_id, amount, type, date, category_id=None, description=None):
@@ -240,6 +492,7 @@ class DatabaseManager:
             transaction_id = self.cursor.lastrowid
             
             # Update account balance
+            affected_accounts = [account_id]
             if type == 'income':
                 self.cursor.execute('''
                 UPDATE accounts SET current_balance = current_balance + ? WHERE id = ?
@@ -259,14 +512,241 @@ class DatabaseManager:
                     self.cursor.execute('''
                     UPDATE accounts SET current_balance = current_balance + ? WHERE id = ?
                     ''', (amount, dest_account_id))
+                    affected_accounts.append(dest_account_id)
             
             self.commit()
-            return transaction_id
         finally:
             self.disconnect()
+        
+        record = {
+            'id': transaction_id,
+            'account_id': account_id,
+            'category_id': category_id,
+            'amount': amount,
+            'type': type,
+            'date': date
+        }
+        self.publish_change(ChangeEvent(TRANSACTION, INSERT, ids=[transaction_id], accounts=affected_accounts,
+                                        categories=[category_id], months=[month_key(date)], records=[record]))
+        return transaction_id
     
-    def get_transactions(self, account_id=None, category_id=None, start_date=None, end_date=None, transaction_type=None, limit=None):
-        """Get transactions with optional filtering."""
+    def add_transactions(self, chunks, on_commit=None):
+        """Add chunks of imported transactions, skipping those imported before.
+        
+        Rows are (account_id, category_id, amount, type, description, date,
+        fingerprint) tuples; a fingerprint already stored marks a duplicate.
+        Each chunk is written in its own transaction, so other writers wait for a
+        chunk rather than for the whole file. If reading the chunks fails or is
+        cancelled, the chunks committed before stay written, and the change
+        event covering them is still published.
+        
+        Args:
+            chunks (iterable): Lists of rows
+            on_commit (callable, optional): Called with the number of rows inserted by each committed chunk
+        
+        Returns:
+            int: Number of inserted rows
+        """
+        count = 0
+        affected = set()
+        self.connect()
+        try:
+            # Each chunk is staged, and the times every fingerprint was seen are counted for the whole file
+            self.cursor.execute('''
+            CREATE TEMP TABLE import_chunk (
+                account_id INTEGER, category_id INTEGER, amount REAL, type TEXT, description TEXT, date TEXT, fingerprint TEXT
+            )
+            ''')
+            self.cursor.execute('CREATE TEMP TABLE import_seen (fingerprint TEXT PRIMARY KEY, count INTEGER NOT NULL)')
+            
+            for rows in chunks:
+                # The write lock is taken before reading the last ID, so rows added
+                # meanwhile by other connections are not counted as this chunk's
+                self.cursor.execute('BEGIN IMMEDIATE')
+                self.cursor.execute('SELECT COALESCE(MAX(id), 0) FROM transactions')
+                last_id = self.cursor.fetchone()[0]
+                
+                self.cursor.execute('DELETE FROM import_chunk')
+                self.cursor.executemany('''
+                INSERT INTO import_chunk (account_id, category_id, amount, type, description, date, fingerprint)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+                
+                # Identical rows of a file are told apart by a sequence number; rows imported before are ignored.
+                # The rollup and search index triggers run for every inserted row.
+                self.cursor.execute('''
+                INSERT OR IGNORE INTO transactions (account_id, category_id, amount, type, description, date, fingerprint)
+                SELECT c.account_id, c.category_id, c.amount, c.type, c.description, c.date,
+                       c.fingerprint || ':' || (COALESCE(s.count, 0)
+                                                + ROW_NUMBER() OVER (PARTITION BY c.fingerprint ORDER BY c.rowid) - 1)
+                FROM import_chunk c LEFT JOIN import_seen s ON s.fingerprint = c.fingerprint
+                ORDER BY c.rowid
+                ''')
+                inserted = self.cursor.rowcount
+                
+                self.cursor.execute('''
+                INSERT INTO import_seen (fingerprint, count)
+                SELECT fingerprint, COUNT(*) FROM import_chunk WHERE fingerprint IS NOT NULL GROUP BY fingerprint
+                ON CONFLICT (fingerprint) DO UPDATE SET count = count + excluded.count
+                ''')
+                
+                # Update the account balances once per chunk, from its inserted rows;
+                # transfers also credit their destination account, as in load_transactions()
+                self.cursor.execute(f'''
+                WITH transfers AS (
+                    SELECT account_id, amount, {self.TRANSFER_DESTINATION} AS destination_id
+                    FROM transactions WHERE id > ?1 AND type = 'transfer' AND instr(description, ':')
+                ), deltas AS (
+                    SELECT account_id, SUM(delta) AS delta FROM (
+                        SELECT account_id, CASE type WHEN 'income' THEN amount ELSE -amount END AS delta
+                        FROM transactions WHERE id > ?1 AND type IN ('income', 'expense')
+                        UNION ALL
+                        SELECT account_id, -amount FROM transfers
+                        UNION ALL
+                        SELECT destination_id, amount FROM transfers
+                    )
+                    GROUP BY account_id
+                )
+                UPDATE accounts SET current_balance = current_balance + deltas.delta
+                FROM deltas WHERE accounts.id = deltas.account_id
+                ''', (last_id,))
+                
+                # The rollup of the inserted rows lists their accounts, categories and months,
+                # and the destination accounts of their transfers
+                self.cursor.execute(f'''
+                SELECT account_id, category_id, substr(date, 1, 7) AS month
+                FROM transactions WHERE id > ?1
+                UNION
+                SELECT {self.TRANSFER_DESTINATION}, category_id, substr(date, 1, 7)
+                FROM transactions WHERE id > ?1 AND type = 'transfer' AND instr(description, ':')
+                ''', (last_id,))
+                chunk_affected = [tuple(row) for row in self.cursor.fetchall()]
+                self.commit()
+                
+                count += inserted
+                affected.update(chunk_affected)
+                if on_commit:
+                    on_commit(inserted)
+        except BaseException:
+            self.disconnect()
+            # Subscribers still hear of the chunks committed before the error, and
+            # may reuse the connection; an error they raise must not hide this one
+            try:
+                self._publish_imported(count, affected)
+            except Exception:
+                pass
+            raise
+        
+        self.disconnect()
+        self._publish_imported(count, affected)
+        return count
+    
+    def _publish_imported(self, count, affected):
+        """Publish the change event of the transactions added by add_transactions().
+        
+        Args:
+            count (int): Number of inserted rows
+            affected (set): (account_id, category_id, month) of the inserted rows
+        """
+        # Bulk inserts list no rows, so the daily series are rebuilt rather than updated
+        if count:
+            self.publish_change(ChangeEvent(TRANSACTION, INSERT, accounts=[row[0] for row in affected],
+                                            categories=[row[1] for row in affected],
+                                            months=[row[2] for row in affected]))
+    
+    def load_transactions(self, chunks):
+        """Add chunks of transactions in a single database transaction.
+        
+        Rows are (account_id, category_id, amount, type, description, date)
+        tuples. The indexes, search index and rollup are built once at the end
+        instead of row by row.
+        
+        Args:
+            chunks (iterable): Lists of rows
+        
+        Returns:
+            int: Number of rows added
+        """
+        count = 0
+        self.connect()
+        try:
+            # Foreign keys are checked once for the whole load, after the inserts;
+            # the drops below are part of the transaction, so a failed load keeps them
+            self.conn.execute('PRAGMA foreign_keys = OFF')
+            self.cursor.execute('BEGIN')
+            self.cursor.execute('SELECT COALESCE(MAX(id), 0) FROM transactions')
+            last_id = self.cursor.fetchone()[0]
+            
+            # Maintaining the indexes and sync triggers row by row costs more than
+            # building them from the whole table; setup_database() recreates them
+            self.cursor.execute('''
+            SELECT type, name FROM sqlite_master
+            WHERE tbl_name = 'transactions' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+            ''')
+            for object_type, name in self.cursor.fetchall():
+                self.cursor.execute(f'DROP {object_type.upper()} "{name}"')
+            self.cursor.execute('DROP TABLE IF EXISTS transactions_fts')
+            self.cursor.execute('DROP TABLE IF EXISTS monthly_category_totals')
+            
+            for rows in chunks:
+                self.cursor.executemany('''
+                INSERT INTO transactions (account_id, category_id, amount, type, description, date)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''', rows)
+                count += len(rows)
+            
+            self.cursor.execute('''
+            SELECT 1 FROM transactions t
+            WHERE t.id > ? AND (NOT EXISTS (SELECT 1 FROM accounts a WHERE a.id = t.account_id)
+                                OR (t.category_id IS NOT NULL
+                                    AND NOT EXISTS (SELECT 1 FROM categories c WHERE c.id = t.category_id)))
+            LIMIT 1
+            ''', (last_id,))
+            if self.cursor.fetchone():
+                raise sqlite3.IntegrityError('FOREIGN KEY constraint failed')
+            
+            # Update the account balances once; transfers name their destination
+            # account after the last ':' of the description, as in add_transaction()
+            self.cursor.execute(f'''
+            WITH transfers AS (
+                SELECT account_id, amount, {self.TRANSFER_DESTINATION} AS destination_id
+                FROM transactions WHERE id > ?1 AND type = 'transfer' AND instr(description, ':')
+            ), deltas AS (
+                SELECT account_id, SUM(delta) AS delta FROM (
+                    SELECT account_id, CASE type WHEN 'income' THEN amount ELSE -amount END AS delta
+                    FROM transactions WHERE id > ?1 AND type IN ('income', 'expense')
+                    UNION ALL
+                    SELECT account_id, -amount FROM transfers
+                    UNION ALL
+                    SELECT destination_id, amount FROM transfers
+                )
+                GROUP BY account_id
+            )
+            UPDATE accounts SET current_balance = current_balance + deltas.delta
+            FROM deltas WHERE accounts.id = deltas.account_id
+            ''', (last_id,))
+            
+            self.cursor.execute('''
+            SELECT DISTINCT account_id, category_id, substr(date, 1, 7) AS month
+            FROM transactions WHERE id > ?
+            ''', (last_id,))
+            affected = self.cursor.fetchall()
+            self.commit()
+        finally:
+            self.disconnect()
+        
+        self.setup_database()
+        
+        # Bulk inserts list no rows, so the daily series are rebuilt rather than updated
+        if count:
+            self.publish_change(ChangeEvent(TRANSACTION, INSERT, accounts=[row['account_id'] for row in affected],
+                                            categories=[row['category_id'] for row in affected],
+                                            months=[row['month'] for row in affected]))
+        return count
+    
+    def get_transactions(self, account_id=None, category_id=None, start_date=None, end_date=None, transaction_type=None, limit=None, after=None,
+                         min_amount=None, max_amount=None, search=None):
+        """Get transactions with optional filtering, newest first. after is the (date, id) key of the last row read."""
         self.connect()
         try:
             query = '''
@@ -299,7 +779,32 @@ class DatabaseManager:
                 query += ' AND t.type = ?'
                 params.append(transaction_type)
             
-            query += ' ORDER BY t.date DESC'
+            if min_amount is not None:
+                query += ' AND t.amount >= ?'
+                params.append(min_amount)
+            
+            if max_amount is not None:
+                query += ' AND t.amount <= ?'
+                params.append(max_amount)
+            
+            if search:
+                # Case-insensitive substring match on the description. Rare substrings
+                # are looked up in the trigram index, which needs at least 3 characters.
+                phrase = '"' + search.replace('"', '""') + '"'
+                if len(search) >= 3 and self._search_is_selective(phrase):
+                    query += ' AND t.id IN (SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH ?)'
+                    params.append(phrase)
+                else:
+                    query += " AND t.description LIKE ? ESCAPE '\\'"
+                    escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                    params.append(f'%{escaped}%')
+            
+            if after is not None:
+                # Keyset pagination: continue right after the last row already read
+                query += ' AND (t.date < ? OR (t.date = ? AND t.id < ?))'
+                params.extend([after[0], after[0], after[1]])
+            
+            query += ' ORDER BY t.date DESC, t.id DESC'
             
             if limit is not None:
                 query += ' LIMIT ?'
@@ -333,9 +838,32 @@ class DatabaseManager:
             ''', (name, type, color, icon))
             category_id = self.cursor.lastrowid
             self.commit()
-            return category_id
         finally:
             self.disconnect()
+        
+        self.publish_change(ChangeEvent(CATEGORY, INSERT, ids=[category_id], categories=[category_id]))
+        return category_id
+    
+    def add_categories(self, chunks):
+        """Add chunks of (name, type, color, icon) rows in one transaction, skipping existing names."""
+        category_ids = []
+        self.connect()
+        try:
+            for rows in chunks:
+                for row in rows:
+                    self.cursor.execute('''
+                    INSERT OR IGNORE INTO categories (name, type, color, icon)
+                    VALUES (?, ?, ?, ?)
+                    ''', row)
+                    if self.cursor.rowcount:
+                        category_ids.append(self.cursor.lastrowid)
+            self.commit()
+        finally:
+            self.disconnect()
+        
+        if category_ids:
+            self.publish_change(ChangeEvent(CATEGORY, INSERT, ids=category_ids, categories=category_ids))
+        return category_ids
     
     # Budget methods
     def add_budget(self, category_id, amount, period, start_date, end_date):
@@ -348,9 +876,12 @@ class DatabaseManager:
             ''', (category_id, amount, period, start_date, end_date))
             budget_id = self.cursor.lastrowid
             self.commit()
-            return budget_id
         finally:
             self.disconnect()
+        
+        self.publish_change(ChangeEvent(BUDGET, INSERT, ids=[budget_id], categories=[category_id],
+                                        months=self._months_between(start_date, end_date)))
+        return budget_id
     
     def get_budgets(self, active_only=True):
         """Get all budgets."""
@@ -384,9 +915,11 @@ class DatabaseManager:
             ''', (name, target_amount, deadline, description))
             goal_id = self.cursor.lastrowid
             self.commit()
-            return goal_id
         finally:
             self.disconnect()
+        
+        self.publish_change(ChangeEvent(GOAL, INSERT, ids=[goal_id]))
+        return goal_id
     
     def get_goals(self, active_only=True):
         """Get all goals."""
@@ -398,4 +931,460 @@ class DatabaseManager:
             self.cursor.execute(query)
             return [dict(goal) for goal in self.cursor.fetchall()]
         finally:
-            self.disconnect()
\ No newline at end of file
+            self.disconnect()
+    
+    def get_goal(self, goal_id):
+        """Get goal by ID."""
+        self.connect()
+        try:
+            self.cursor.execute('SELECT * FROM goals WHERE id = ?', (goal_id,))
+            goal = self.cursor.fetchone()
+            return dict(goal) if goal else None
+        finally:
+            self.disconnect()
+    
+    def update_goal(self, goal_id, **kwargs):
+        """Update goal details."""
+        self.connect()
+        try:
+            # Build the SET part of the SQL query
+            set_clause = ', '.join([f'{key} = ?' for key in kwargs.keys()])
+            values = list(kwargs.values())
+            values.append(goal_id)
+            
+            self.cursor.execute(f'UPDATE goals SET {set_clause} WHERE id = ?', values)
+            self.commit()
+            updated = self.cursor.rowcount > 0
+        finally:
+            self.disconnect()
+        
+        if updated:
+            self.publish_change(ChangeEvent(GOAL, UPDATE, ids=[goal_id]))
+        return updated
+    
+    def delete_goal(self, goal_id):
+        """Delete a goal."""
+        self.connect()
+        try:
+            self.cursor.execute('DELETE FROM goals WHERE id = ?', (goal_id,))
+            self.commit()
+            deleted = self.cursor.rowcount > 0
+        finally:
+            self.disconnect()
+        
+        if deleted:
+            self.publish_change(ChangeEvent(GOAL, DELETE, ids=[goal_id]))
+        return deleted
+    
+    # Exchange rate methods
+    def _base_currency(self):
+        """Read the base currency through the open connection."""
+        self.cursor.execute("SELECT value FROM settings WHERE key = 'base_currency'")
+        row = self.cursor.fetchone()
+        return row['value'] if row else self.DEFAULT_BASE_CURRENCY
+    
+    def get_base_currency(self):
+        """Get the currency the totals are converted to."""
+        self.connect()
+        try:
+            return self._base_currency()
+        finally:
+            self.disconnect()
+    
+    def set_base_currency(self, currency):
+        """Set the currency the totals are converted to."""
+        self.connect()
+        try:
+            changed = self._base_currency() != currency
+            self.cursor.execute('''
+            INSERT INTO settings (key, value) VALUES ('base_currency', ?)
+            ON CONFLICT (key) DO UPDATE SET value = excluded.value
+            ''', (currency,))
+            self.commit()
+        finally:
+            self.disconnect()
+        
+        # Every converted total changes with the base currency
+        if changed:
+            self.publish_change(ChangeEvent(EXCHANGE_RATE, UPDATE))
+        return changed
+    
+    @staticmethod
+    def _rate_sql(currency, day):
+        """SQL expression of a currency's rate on a day: the latest one up to the day, or else the first one after it."""
+        return f'''COALESCE(
+            (SELECT r.rate FROM exchange_rates r WHERE r.currency = {currency} AND r.day <= {day}
+             ORDER BY r.day DESC LIMIT 1),
+            (SELECT r.rate FROM exchange_rates r WHERE r.currency = {currency} ORDER BY r.day LIMIT 1))'''
+    
+    @classmethod
+    def _conversion_sql(cls, currency, day):
+        """SQL expression of the factor converting a currency to conversion.base on a day, 1 when either has no rates."""
+        return f'COALESCE({cls._rate_sql(currency, day)} / {cls._rate_sql("conversion.base", day)}, 1.0)'
+    
+    def _converted_currencies(self, base):
+        """Return the account currencies converted to the base currency: those with rates, when the base has them too."""
+        self.cursor.execute('''
+        SELECT DISTINCT currency FROM accounts
+        WHERE currency != ? AND currency IN (SELECT currency FROM exchange_rates)
+          AND EXISTS (SELECT 1 FROM exchange_rates WHERE currency = ?)
+        ''', (base, base))
+        return [row['currency'] for row in self.cursor.fetchall()]
+    
+    def get_converted_accounts(self):
+        """Get the IDs of the accounts whose amounts are converted to the base currency."""
+        self.connect()
+        try:
+            currencies = self._converted_currencies(self._base_currency())
+            self.cursor.execute(f'SELECT id FROM accounts WHERE currency IN ({", ".join("?" * len(currencies))})',
+                                currencies)
+            return {row['id'] for row in self.cursor.fetchall()}
+        finally:
+            self.disconnect()
+    
+    def add_exchange_rates(self, chunks):
+        """Add chunks of (currency, 'YYYY-MM-DD' day, rate, quote currency) rows in one transaction, the rate pricing the currency in the quote currency."""
+        count = 0
+        months = set()
+        self.connect()
+        try:
+            for rows in chunks:
+                # A quote currency without rates becomes the reference, worth 1
+                for quote, day in {row[3]: row[1] for row in rows}.items():
+                    self.cursor.execute('''
+                    INSERT INTO exchange_rates (currency, day, rate)
+                    SELECT ?1, ?2, 1.0 WHERE NOT EXISTS (SELECT 1 FROM exchange_rates WHERE currency = ?1)
+                    ''', (quote, day))
+                
+                # Stored in the reference currency, through the quote's rate of the day
+                self.cursor.executemany(f'''
+                INSERT INTO exchange_rates (currency, day, rate)
+                VALUES (?1, ?2, ?3 * {self._rate_sql('?4', '?2')})
+                ON CONFLICT (currency, day) DO UPDATE SET rate = excluded.rate
+                ''', rows)
+                count += len(rows)
+                months.update(month_key(row[1]) for row in rows)
+            self.commit()
+        finally:
+            self.disconnect()
+        
+        if count:
+            self.publish_change(ChangeEvent(EXCHANGE_RATE, INSERT, months=months))
+        return count
+    
+    def get_rate_currencies(self):
+        """Get the currencies that have exchange rates."""
+        self.connect()
+        try:
+            self.cursor.execute('SELECT DISTINCT currency FROM exchange_rates')
+            return {row['currency'] for row in self.cursor.fetchall()}
+        finally:
+            self.disconnect()
+    
+    def get_latest_rates(self):
+        """Get the day of the latest rate of each currency and its current rate in the base currency, None when the base has no rates."""
+        self.connect()
+        try:
+            today = "date('now')"
+            self.cursor.execute(f'''
+            SELECT latest.currency, latest.day,
+                   {self._rate_sql('latest.currency', today)} / {self._rate_sql('conversion.base', today)} AS rate
+            FROM (SELECT currency, MAX(day) AS day FROM exchange_rates GROUP BY currency) latest,
+                 (SELECT ? AS base) conversion
+            WHERE latest.currency != conversion.base
+            ORDER BY latest.currency
+            ''', (self._base_currency(),))
+            return [dict(row) for row in self.cursor.fetchall()]
+        finally:
+            self.disconnect()
+    
+    def get_total_balance(self):
+        """Get the balance of all active accounts in the base currency, at the latest rates."""
+        self.connect()
+        try:
+            self.cursor.execute(f'''
+            SELECT SUM(a.current_balance * {self._conversion_sql('a.currency', "date('now')")})
+            FROM accounts a, (SELECT ? AS base) conversion
+            WHERE a.is_active = 1
+            ''', (self._base_currency(),))
+            return self.cursor.fetchone()[0] or 0
+        finally:
+            self.disconnect()
+    
+    def get_total_initial_balance(self):
+        """Get the initial balance of every account in the base currency, at the rates of the day of its first transaction."""
+        self.connect()
+        try:
+            first_day = 'substr(COALESCE((SELECT MIN(date) FROM transactions WHERE account_id = a.id), a.created_at), 1, 10)'
+            self.cursor.execute(f'''
+            SELECT SUM(a.initial_balance * {self._conversion_sql('a.currency', first_day)})
+            FROM accounts a, (SELECT ? AS base) conversion
+            ''', (self._base_currency(),))
+            return self.cursor.fetchone()[0] or 0
+        finally:
+            self.disconnect()
+    
+    # Aggregate methods
+    @staticmethod
+    def _rollup_ranges(start_date=None, end_date=None):
+        """Split a date range into whole months read from the rollup and edges read from transactions.
+        
+        Args:
+            start_date (str|datetime, optional): First date in range
+            end_date (str|datetime, optional): Exclusive end date
+        
+        Returns:
+            tuple: ((first month, end month) 'YYYY-MM' keys of the whole months, each None if
+                unbounded and the end exclusive, or None if there is no whole month;
+                list of (start, end) date ranges to read from the transactions table)
+        """
+        def is_month_start(date):
+            return date[8:10] == '01' and not date[10:].strip(' 0:')
+        
+        def next_month(key):
+            year, month = int(key[:4]), int(key[5:7])
+            return f'{year + month // 12:04d}-{month % 12 + 1:02d}'
+        
+        start = str(start_date) if start_date is not None else None
+        end = str(end_date) if end_date is not None else None
+        
+        first_month = None
+        if start is not None:
+            first_month = start[:7] if is_month_start(start) else next_month(start[:7])
+        end_month = end[:7] if end is not None else None
+        
+        if first_month is not None and end_month is not None and first_month >= end_month:
+            # Not a single whole month, read everything from the transactions
+            return None, [(start, end)]
+        
+        edges = []
+        if start is not None and not is_month_start(start):
+            edges.append((start, f'{first_month}-01'))
+        if end is not None and not is_month_start(end):
+            edges.append((f'{end_month}-01', end))
+        return (first_month, end_month), edges
+    
+    def _totals_query(self, keys, start_date=None, end_date=None, account_id=None, transaction_type=None):
+        """Build a query of transaction totals per month, category_id and/or type, reading whole months from the rollup.
+        
+        Totals are in the base currency. The transactions of accounts in other
+        currencies are summed per day instead, and converted at that day's rates.
+        
+        Returns:
+            tuple: (query returning one column per key and a 'total' column, parameters)
+        """
+        filters, filter_params = '', []
+        if transaction_type is not None:
+            filters += ' AND type = ?'
+            filter_params.append(transaction_type)
+        if account_id is not None:
+            filters += ' AND account_id = ?'
+            filter_params.append(account_id)
+        
+        # Accounts in converted currencies are left out of the monthly parts
+        base = self._base_currency()
+        currencies = self._converted_currencies(base)
+        converted_accounts = f'SELECT id FROM accounts WHERE currency IN ({", ".join("?" * len(currencies))})'
+        native_filters, native_params = filters, filter_params
+        if currencies:
+            native_filters += f' AND account_id NOT IN ({converted_accounts})'
+            native_params = filter_params + currencies
+        
+        months, edges = self._rollup_ranges(start_date, end_date)
+        parts, params = [], []
+        columns = ', '.join(keys)
+        
+        if months is not None:
+            first_month, end_month = months
+            part = f'SELECT {columns}, total FROM monthly_category_totals WHERE 1=1{native_filters}'
+            params.extend(native_params)
+            if first_month is not None:
+                part += ' AND month >= ?'
+                params.append(first_month)
+            if end_month is not None:
+                part += ' AND month < ?'
+                params.append(end_month)
+            parts.append(part)
+        
+        # Same columns as the rollup, computed from each transaction
+        transactions_columns = {'month': 'substr(date, 1, 7) AS month',
+                                'category_id': 'COALESCE(category_id, 0) AS category_id'}
+        columns_from_transactions = ', '.join(transactions_columns.get(key, key) for key in keys)
+        for edge_start, edge_end in edges:
+            part = f'SELECT {columns_from_transactions}, amount AS total FROM transactions WHERE 1=1{native_filters}'
+            params.extend(native_params)
+            if edge_start is not None:
+                part += ' AND date >= ?'
+                params.append(edge_start)
+            if edge_end is not None:
+                part += ' AND date < ?'
+                params.append(edge_end)
+            parts.append(part)
+        
+        if currencies:
+            # Summed per day and account first, so each rate is looked up once per day
+            part = (f'SELECT {columns_from_transactions}, substr(date, 1, 10) AS day, account_id, SUM(amount) AS total '
+                    f'FROM transactions WHERE account_id IN ({converted_accounts}){filters}')
+            params.extend(currencies + filter_params)
+            if start_date is not None:
+                part += ' AND date >= ?'
+                params.append(start_date)
+            if end_date is not None:
+                part += ' AND date < ?'
+                params.append(end_date)
+            # Grouped in the order of the account index
+            part += f' GROUP BY account_id, day, {", ".join(str(position) for position in range(1, len(keys) + 1))}'
+            totals_columns = ', '.join(f'totals.{key} AS {key}' for key in keys)
+            parts.append(f'SELECT {totals_columns}, totals.total * {self._conversion_sql("a.currency", "totals.day")} '
+                         f'AS total FROM ({part}) totals JOIN accounts a ON a.id = totals.account_id, '
+                         f'(SELECT ? AS base) conversion')
+            params.append(base)
+        
+        query = f'SELECT {columns}, SUM(total) AS total FROM ({" UNION ALL ".join(parts)}) GROUP BY {columns}'
+        return query, params
+    
+    def get_totals_by_type(self, start_date=None, end_date=None, account_id=None):
+        """Get transaction totals per type. end_date is exclusive."""
+        self.connect()
+        try:
+            query, params = self._totals_query(('type',), start_date, end_date, account_id)
+            self.cursor.execute(query, params)
+            totals = {'income': 0, 'expense': 0, 'transfer': 0}
+            for row in self.cursor.fetchall():
+                totals[row['type']] = row['total'] or 0
+            return totals
+        finally:
+            self.disconnect()
+    
+    def get_monthly_totals(self, start_date=None, end_date=None, account_id=None):
+        """Get transaction totals per month ('YYYY-MM') and type, oldest first. end_date is exclusive."""
+        self.connect()
+        try:
+            totals_query, params = self._totals_query(('month', 'type'), start_date, end_date, account_id)
+            self.cursor.execute(f'{totals_query} ORDER BY month', params)
+            return [dict(row) for row in self.cursor.fetchall()]
+        finally:
+            self.disconnect()
+    
+    def get_category_totals(self, start_date=None, end_date=None, transaction_type='expense', account_id=None):
+        """Get transaction totals per category, largest first. end_date is exclusive."""
+        self.connect()
+        try:
+            totals_query, params = self._totals_query(('category_id',), start_date, end_date, account_id,
+                                                      transaction_type)
+            query = f'''
+            SELECT c.id AS category_id, c.name AS category_name, c.color AS category_color, totals.total
+            FROM ({totals_query}) totals
+            JOIN categories c ON totals.category_id = c.id
+            ORDER BY totals.total DESC
+            '''
+            self.cursor.execute(query, params)
+            return [dict(row) for row in self.cursor.fetchall()]
+        finally:
+            self.disconnect()
+    
+    def get_daily_totals(self, start_date=None, end_date=None, account_id=None):
+        """Get income and expense totals per day ('YYYY-MM-DD'), oldest first. end_date is exclusive."""
+        self.connect()
+        try:
+            # Totals of accounts in other currencies are converted at each day's rates
+            base = self._base_currency()
+            converted = bool(self._converted_currencies(base))
+            
+            query = f'''
+            SELECT substr(date, 1, 10) AS day,{' account_id,' if converted else ''}
+                   SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END) AS income,
+                   SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END) AS expense
+            FROM transactions
+            WHERE 1=1
+            '''
+            params = []
+            
+            if account_id is not None:
+                query += ' AND account_id = ?'
+                params.append(account_id)
+            
+            if start_date is not None:
+                query += ' AND date >= ?'
+                params.append(start_date)
+            
+            if end_date is not None:
+                query += ' AND date < ?'
+                params.append(end_date)
+            
+            if converted:
+                query = f'''
+                SELECT day, SUM(income * factor) AS income, SUM(expense * factor) AS expense
+                FROM (SELECT totals.*, {self._conversion_sql('a.currency', 'totals.day')} AS factor
+                      FROM ({query} GROUP BY day, account_id) totals
+                      JOIN accounts a ON a.id = totals.account_id, (SELECT ? AS base) conversion)
+                GROUP BY day ORDER BY day
+                '''
+                params.append(base)
+            else:
+                query += ' GROUP BY day ORDER BY day'
+            
+            self.cursor.execute(query, params)
+            return [dict(row) for row in self.cursor.fetchall()]
+        finally:
+            self.disconnect()
+    
+    # Export methods
+    def _export_table(self, dataset):
+        """Return the table read by an export dataset: a table of EXPORT_TABLES or 'transactions_detail'."""
+        if dataset == 'transactions_detail':
+            return 'transactions'
+        if dataset not in self.EXPORT_TABLES:
+            raise ValueError(f"Unknown export dataset: {dataset}")
+        return dataset
+    
+    def count_export_rows(self, dataset):
+        """Count the rows of an export dataset."""
+        table = self._export_table(dataset)
+        self.connect()
+        try:
+            self.cursor.execute(f'SELECT COUNT(*) FROM {table}')
+            return self.cursor.fetchone()[0]
+        finally:
+            self.disconnect()
+    
+    def get_export_column_types(self, dataset):
+        """Get the (name, declared type) pairs of the columns of an export dataset."""
+        table = self._export_table(dataset)
+        if dataset == 'transactions_detail':
+            return list(self.TRANSACTIONS_DETAIL_TYPES)
+        self.connect()
+        try:
+            self.cursor.execute(f'PRAGMA table_info({table})')
+            return [(column['name'], column['type'].upper()) for column in self.cursor.fetchall()]
+        finally:
+            self.disconnect()
+    
+    def iter_export_rows(self, dataset, batch_size=5000):
+        """Yield the column names of an export dataset, then its rows as lists of at most batch_size tuples."""
+        table = self._export_table(dataset)
+        query = self.TRANSACTIONS_DETAIL_QUERY if dataset == 'transactions_detail' else f'SELECT * FROM {table} ORDER BY id'
+        # The rows are read while the caller writes them out, so the generator
+        # keeps a connection of its own instead of the manager's shared one
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(query)
+            yield [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _months_between(start_date, end_date):
+        """Return the 'YYYY-MM' keys of every month between two dates."""
+        year, month = int(str(start_date)[:4]), int(str(start_date)[5:7])
+        last_year, last_month = int(str(end_date)[:4]), int(str(end_date)[5:7])
+        months = []
+        while (year, month) <= (last_year, last_month):
+            months.append(f'{year:04d}-{month:02d}')
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return months
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming parser of the European Central Bank's reference rate files.
+
+The ECB publishes its daily euro reference rates as XML (eurofxref-daily,
+eurofxref-hist and eurofxref-hist-90d), one <Cube time="..."> element per
+day holding a <Cube currency="..." rate="..."/> element per currency. The
+rates are units of each currency per euro.
+"""
+
+from collections import namedtuple
+from xml.etree import ElementTree
+
+# Currency the ECB rates are quoted against
+ECB_QUOTE_CURRENCY = 'EUR'
+
+# Marker found in the namespace of the ECB files
+ECB_MARKER = b'eurofxref'
+
+# Rate of a currency on a day, as found in the file
+RateEntry = namedtuple('RateEntry', ['number', 'day', 'currency', 'rate'])
+
+
+def is_ecb_file(head):
+    """Check whether the first bytes of a file belong to an ECB reference rate file."""
+    return head.lstrip().startswith(b'<') and ECB_MARKER in head
+
+
+def parse_ecb(rates_file):
+    """Yield the rates of an ECB reference rate file.
+
+    The XML is parsed with iterparse, and every day is removed from the
+    tree once read, so the full history is never held whole in memory.
+
+    Args:
+        rates_file (file): File opened in binary mode
+
+    Yields:
+        RateEntry: One entry per currency and day; days are 'YYYY-MM-DD' and
+            rates the texts of the file, in units of the currency per euro
+    """
+    parents = []
+    number = 0
+
+    for event, element in ElementTree.iterparse(rates_file, events=('start', 'end')):
+        if event == 'start':
+            parents.append(element)
+            continue
+
+        parents.pop()
+        day = element.get('time')
+        if day is None:
+            continue
+        for rate in element:
+            if rate.get('currency') and rate.get('rate'):
+                number += 1
+                yield RateEntry(number, day, rate.get('currency'), rate.get('rate'))
+        # Days are children of the outer cube; drop them once read
+        if parents:
+            parents[-1].remove(element)
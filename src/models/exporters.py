@@ -0,0 +1,420 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming export of the database to CSV files, optionally compressed, and
+to typed Parquet and Arrow IPC files.
+
+Rows are read from the database in batches and written out as they come,
+so tables of any size are exported in bounded memory. CSV files ending in
+.gz are written with gzip, and files ending in .zst with zstd when the
+optional zstandard package is installed. Parquet and Arrow files need the
+optional pyarrow package. Excel workbooks are streamed with openpyxl's
+write-only mode, or xlsxwriter's constant memory mode without openpyxl.
+"""
+
+import csv
+import functools
+import gzip
+import importlib.util
+import io
+import itertools
+import os
+from collections import namedtuple
+from datetime import date, datetime
+
+from src.models.progress import report_step
+
+# Rows read from the database and written at a time
+EXPORT_BATCH_SIZE = 5000
+
+# Compression of the files, by extension
+COMPRESSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
+
+# Formats written with pyarrow: Parquet, and Arrow IPC files (also read as Feather)
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+# Rows per Parquet row group or Arrow record batch
+ROW_GROUP_SIZE = 100000
+
+# Rows of an Excel worksheet, the header included; longer datasets continue in further sheets
+EXCEL_MAX_ROWS = 1048576
+
+# Distinct date texts whose conversion is kept per Excel date column; rows come
+# mostly in date order, so recent dates are the ones repeated
+DATE_CACHE_SIZE = 4096
+
+# Files written by an export and the number of rows in them
+ExportResult = namedtuple('ExportResult', ['paths', 'rows'])
+
+
+class ExportCancelled(Exception):
+    """Raised inside an export to discard it once its worker is cancelled."""
+
+
+class ExportFormatError(ValueError):
+    """Raised when a file cannot be written in the requested format."""
+
+
+def zstd_available():
+    """Return whether the zstandard package needed by .zst files is installed."""
+    return importlib.util.find_spec('zstandard') is not None
+
+
+def pyarrow_available():
+    """Return whether the pyarrow package needed by Parquet and Arrow files is installed."""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def compression_for(path):
+    """Return the compression of a file from its extension: 'gzip', 'zstd' or None."""
+    return COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def dataset_path(path, dataset):
+    """Return the file of a dataset in an export of several, e.g. 'datos_accounts.csv.gz' for 'datos.csv.gz'."""
+    base, extension = path, ''
+    if compression_for(base):
+        base, extension = os.path.splitext(base)
+    base, csv_extension = os.path.splitext(base)
+    return f"{base}_{dataset}{csv_extension}{extension}"
+
+
+def open_output(path, compression=None):
+    """Open a text file for CSV output, compressing what is written to it.
+
+    Args:
+        path (str): Path of the file
+        compression (str, optional): 'gzip', 'zstd' (needs zstandard) or None
+
+    Returns:
+        file: Text file in UTF-8 with universal newlines disabled, as csv expects
+    """
+    if compression == 'gzip':
+        # Level 6 is gzip's own default: much faster than 9, barely larger
+        return gzip.open(path, 'wt', compresslevel=6, encoding='utf-8', newline='')
+    if compression == 'zstd':
+        import zstandard
+        writer = zstandard.ZstdCompressor(level=3).stream_writer(open(path, 'wb'))
+        return io.TextIOWrapper(writer, encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def partial_path(path):
+    """Return the temporary file an export writes before it replaces the file at path."""
+    return path + '.partial'
+
+
+def remove_files(paths):
+    """Remove the files of a failed or cancelled export."""
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def export_files(db_manager, datasets, path, write_file, worker=None, batch_size=EXPORT_BATCH_SIZE, single_file=False,
+                 finish=None):
+    """Export datasets of the database to one file each.
+
+    Every file is written under a temporary name (see partial_path) and
+    replaces the file at its path once the whole export succeeded, so a
+    failed or cancelled export leaves the files it would overwrite untouched.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        datasets (list): Tables of DatabaseManager.EXPORT_TABLES, or 'transactions_detail'
+            for the transactions with the names of their account and category.
+            None exports every table.
+        path (str): Path of the file; with several datasets, one file per dataset is
+            written next to it (see dataset_path)
+        write_file (callable): Called with a dataset, its batches (column names first,
+            as DatabaseManager.iter_export_rows() yields them) and the temporary path to write
+        worker (Worker, optional): Worker running the export
+        batch_size (int, optional): Rows read and written at a time
+        single_file (bool, optional): Write every dataset to the path, e.g. to sheets of a workbook
+        finish (callable, optional): Called once every dataset is written, before the
+            temporary files replace the targets, e.g. to save a workbook
+
+    Returns:
+        ExportResult: Written files and rows, or None if the worker was cancelled;
+            the temporary files written so far are removed then
+    """
+    datasets = list(datasets or db_manager.EXPORT_TABLES)
+    if single_file or len(datasets) == 1:
+        paths = [path] * len(datasets)
+    else:
+        paths = [dataset_path(path, dataset) for dataset in datasets]
+    partials = {dataset_file: partial_path(dataset_file) for dataset_file in paths}
+    total = sum(db_manager.count_export_rows(dataset) for dataset in datasets)
+    written = 0
+
+    def counted(batches):
+        """Pass the batches through, reporting the progress once each is written."""
+        nonlocal written
+        yield next(batches)
+        for rows in batches:
+            yield rows
+            written += len(rows)
+            if not report_step(worker, min(99, written * 100 // max(total, 1))):
+                raise ExportCancelled()
+
+    try:
+        for dataset, dataset_file in zip(datasets, paths):
+            batches = db_manager.iter_export_rows(dataset, batch_size)
+            try:
+                write_file(dataset, counted(batches), partials[dataset_file])
+            finally:
+                batches.close()
+        if finish is not None:
+            finish()
+    except BaseException as error:
+        # No partial export is left behind, and the files it would replace are kept
+        remove_files(partials.values())
+        if isinstance(error, ExportCancelled):
+            return None
+        raise
+
+    for dataset_file, partial in partials.items():
+        os.replace(partial, dataset_file)
+    return ExportResult(list(partials), written)
+
+
+def export_csv(db_manager, datasets, path, worker=None, batch_size=EXPORT_BATCH_SIZE):
+    """Export datasets of the database to CSV files, compressed if the path ends in .gz or .zst.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        datasets (list): Datasets to export, see export_files; None exports every table
+        path (str): Path of the file
+        worker (Worker, optional): Worker running the export
+        batch_size (int, optional): Rows read and written at a time
+
+    Returns:
+        ExportResult: Written files and rows, or None if the worker was cancelled
+    """
+    compression = compression_for(path)
+    if compression == 'zstd' and not zstd_available():
+        raise ExportFormatError("La compresión zstd necesita el paquete zstandard (pip install zstandard).")
+
+    def write_file(dataset, batches, dataset_file):
+        with open_output(dataset_file, compression) as output:
+            writer = csv.writer(output)
+            writer.writerow(next(batches))
+            for rows in batches:
+                writer.writerows(rows)
+
+    return export_files(db_manager, datasets, path, write_file, worker, batch_size)
+
+
+def arrow_schema(pa, names, column_types):
+    """Build the Arrow schema of an export dataset.
+
+    Args:
+        pa (module): pyarrow
+        names (list): Column names
+        column_types (dict): Declared SQLite type per column name
+
+    Returns:
+        Schema: Integers, floats, timestamps and dates typed as such, the rest as strings
+    """
+    types = {'INTEGER': pa.int64(), 'REAL': pa.float64(), 'TIMESTAMP': pa.timestamp('s'), 'DATE': pa.date32()}
+    return pa.schema([(name, types.get(column_types.get(name), pa.string())) for name in names])
+
+
+def arrow_batch(pa, schema, rows):
+    """Convert rows read from the database into a record batch of a schema."""
+    arrays = []
+    for field, values in zip(schema, zip(*rows)):
+        if pa.types.is_temporal(field.type):
+            # Dates are stored as 'YYYY-MM-DD HH:MM:SS' texts, parsed by Arrow itself
+            arrays.append(pa.array(values, pa.string()).cast(field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_columnar(db_manager, datasets, path, file_format='parquet', worker=None, batch_size=EXPORT_BATCH_SIZE,
+                    row_group_size=ROW_GROUP_SIZE):
+    """Export datasets of the database to typed, zstd-compressed Parquet or Arrow IPC files.
+
+    Rows are converted to Arrow arrays as they are read, and written once
+    they fill a Parquet row group or Arrow record batch, so a single group
+    is held in memory at a time.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        datasets (list): Datasets to export, see export_files; None exports every table
+        path (str): Path of the file
+        file_format (str, optional): 'parquet' or 'arrow'
+        worker (Worker, optional): Worker running the export
+        batch_size (int, optional): Rows read at a time
+        row_group_size (int, optional): Rows per row group or record batch
+
+    Returns:
+        ExportResult: Written files and rows, or None if the worker was cancelled
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportFormatError("Los archivos Parquet y Arrow necesitan el paquete pyarrow (pip install pyarrow).")
+
+    def write_file(dataset, batches, dataset_file):
+        schema = arrow_schema(pa, next(batches), dict(db_manager.get_export_column_types(dataset)))
+        if file_format == 'parquet':
+            writer = pq.ParquetWriter(dataset_file, schema, compression='zstd')
+        else:
+            writer = pa.ipc.new_file(dataset_file, schema, options=pa.ipc.IpcWriteOptions(compression='zstd'))
+
+        with writer:
+            group, group_rows = [], 0
+            for rows in batches:
+                group.append(arrow_batch(pa, schema, rows))
+                group_rows += len(rows)
+                if group_rows >= row_group_size:
+                    writer.write_table(pa.Table.from_batches(group).combine_chunks(), row_group_size)
+                    group, group_rows = [], 0
+            if group:
+                writer.write_table(pa.Table.from_batches(group).combine_chunks(), row_group_size)
+
+    return export_files(db_manager, datasets, path, write_file, worker, batch_size)
+
+
+class OpenpyxlWorkbook:
+    """Workbook written with openpyxl's write-only mode, which streams the rows of each sheet to a temporary file."""
+
+    def __init__(self, path):
+        from openpyxl import Workbook
+
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+
+    def add_sheet(self, title):
+        """Add a worksheet and return the function appending a row to it."""
+        return self.workbook.create_sheet(title).append
+
+    def close(self):
+        """Write the workbook."""
+        self.workbook.save(self.path)
+
+    def discard(self):
+        """Drop the workbook without writing it."""
+        # Closing ends the sheets' row writers; openpyxl removes their temporary files at exit
+        for sheet in self.workbook.worksheets:
+            if not sheet.closed:
+                sheet.close()
+
+
+class XlsxWriterWorkbook:
+    """Workbook written with xlsxwriter's constant memory mode, which flushes each row once the next starts."""
+
+    def __init__(self, path):
+        import xlsxwriter
+
+        self.workbook = xlsxwriter.Workbook(path, {'constant_memory': True,
+                                                   'default_date_format': 'yyyy-mm-dd hh:mm:ss'})
+
+    def add_sheet(self, title):
+        """Add a worksheet and return the function appending a row to it."""
+        sheet = self.workbook.add_worksheet(title)
+        numbers = itertools.count()
+        return lambda row: sheet.write_row(next(numbers), 0, row)
+
+    def close(self):
+        """Write the workbook."""
+        self.workbook.close()
+
+    def discard(self):
+        """Drop the workbook without writing it."""
+        # Marked as closed, so it is not written when collected
+        self.workbook.fileclosed = True
+
+
+def open_workbook(path):
+    """Open an Excel workbook for streaming, with openpyxl or else xlsxwriter."""
+    for workbook_class in (OpenpyxlWorkbook, XlsxWriterWorkbook):
+        try:
+            return workbook_class(path)
+        except ImportError:
+            continue
+    raise ExportFormatError("Los archivos Excel necesitan el paquete openpyxl o xlsxwriter (pip install openpyxl).")
+
+
+def sheet_title(dataset, number):
+    """Return the title of a dataset's worksheet: the dataset, then 'dataset (2)' and so on."""
+    return dataset if number == 1 else f"{dataset} ({number})"
+
+
+def date_converter(parse):
+    """Return a function converting date texts with parse, caching the latest distinct texts; other values are kept."""
+    @functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+    def convert(value):
+        if value is None:
+            return None
+        try:
+            return parse(value)
+        except (TypeError, ValueError):
+            return value
+
+    return convert
+
+
+def excel_dates(column_types, names):
+    """Return the converters of the date columns of a dataset, by column index.
+
+    Dates are stored as text; converted, Excel shows and sorts them as dates.
+    """
+    parsers = {'TIMESTAMP': datetime.fromisoformat, 'DATE': date.fromisoformat}
+    return {index: date_converter(parsers[column_types[name]]) for index, name in enumerate(names)
+            if column_types.get(name) in parsers}
+
+
+def export_excel(db_manager, datasets, path, worker=None, batch_size=EXPORT_BATCH_SIZE):
+    """Export datasets of the database to an Excel workbook, one sheet per dataset.
+
+    The rows are streamed to the workbook as they are read. Datasets longer
+    than an Excel worksheet continue in further sheets, e.g. 'transactions (2)'.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        datasets (list): Datasets to export, see export_files; None exports every table
+        path (str): Path of the workbook
+        worker (Worker, optional): Worker running the export
+        batch_size (int, optional): Rows read at a time
+
+    Returns:
+        ExportResult: Written workbook and rows, or None if the worker was cancelled
+    """
+    # Saved under a temporary name, which export_files() moves to the path
+    workbook = open_workbook(partial_path(path))
+
+    def write_sheets(dataset, batches, _):
+        names = next(batches)
+        converters = excel_dates(dict(db_manager.get_export_column_types(dataset)), names)
+        append = None
+        sheet_rows = number = 0
+        for rows in batches:
+            for row in rows:
+                if append is None or sheet_rows >= EXCEL_MAX_ROWS:
+                    number += 1
+                    append = workbook.add_sheet(sheet_title(dataset, number))
+                    append(names)
+                    sheet_rows = 1
+                if converters:
+                    row = list(row)
+                    for index, convert in converters.items():
+                        row[index] = convert(row[index])
+                append(row)
+                sheet_rows += 1
+        if append is None:
+            workbook.add_sheet(dataset)(names)
+
+    try:
+        result = export_files(db_manager, datasets, path, write_sheets, worker, batch_size, single_file=True,
+                              finish=workbook.close)
+    except BaseException:
+        workbook.discard()
+        raise
+    if result is None:
+        workbook.discard()
+    return result
@@ -0,0 +1,954 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming import of transactions, accounts, categories and exchange rates
+from CSV, Parquet and Arrow IPC files, of transactions from OFX/QFX, QIF and
+CAMT.053 bank statements, and of exchange rates from the ECB's XML files.
+
+Files are read line by line and converted in fixed-size chunks, so bank
+exports of any size are imported in bounded memory. Columns are found by
+name, dates and account or category names are converted once per distinct
+value, and each chunk is written with a single executemany. Transactions
+are committed chunk by chunk, each in its own BEGIN IMMEDIATE transaction,
+so other writers only wait for a chunk: a failed or cancelled import keeps
+the chunks committed before it stopped, and its summary says so.
+
+Imported transactions carry a fingerprint of their account, day, amount and
+description, unique in the database, so files covering periods imported
+before only add the transactions that are new.
+
+Parquet and Arrow files, as written by the exporters, are read in record
+batches with the optional pyarrow package. Their numbers and dates are
+typed, so they are taken as they are instead of parsed from text.
+"""
+
+import codecs
+import csv
+import hashlib
+import os
+from collections import namedtuple
+from datetime import datetime
+
+from src.models import exchange_rates, statements
+from src.models.progress import report_step
+
+# Rows converted and inserted at a time
+IMPORT_CHUNK_SIZE = 5000
+
+# Progress reported once the file is read, when the import can no longer be cancelled;
+# transactions are committed chunk by chunk, and can be cancelled until the end
+COMMIT_PROGRESS = 95
+
+# Bytes read between two progress reports
+PROGRESS_BYTES = 256 * 1024
+
+# Column separators recognized in the header line
+DELIMITERS = (',', ';', '\t', '|')
+
+# Rejected rows whose error is kept for the import summary
+MAX_REPORTED_ERRORS = 10
+
+# strptime formats of the date formats offered by the import dialog
+DATE_FORMATS = {
+    'dd/MM/yyyy': '%d/%m/%Y',
+    'MM/dd/yyyy': '%m/%d/%Y',
+    'yyyy-MM-dd': '%Y-%m-%d'
+}
+
+# Accepted header names of each field, compared in lower case
+COLUMN_ALIASES = {
+    'date': ('date', 'fecha', 'fecha operación', 'fecha operacion', 'fecha valor'),
+    'amount': ('amount', 'importe', 'monto', 'cantidad', 'valor'),
+    'type': ('type', 'tipo'),
+    'description': ('description', 'descripción', 'descripcion', 'concepto', 'detalle'),
+    'account': ('account', 'account_id', 'cuenta'),
+    'category': ('category', 'category_id', 'categoría', 'categoria'),
+    'name': ('name', 'nombre'),
+    'currency': ('currency', 'moneda', 'divisa'),
+    'initial_balance': ('initial_balance', 'saldo inicial', 'saldo', 'balance'),
+    'color': ('color',),
+    'icon': ('icon', 'icono'),
+    'rate': ('rate', 'tasa', 'tipo de cambio', 'cambio'),
+    'quote': ('quote', 'moneda base', 'base')
+}
+
+# Fields that must be present in the file, per data type
+REQUIRED_COLUMNS = {
+    'transactions': ('date', 'amount'),
+    'accounts': ('name',),
+    'categories': ('name', 'type'),
+    'exchange_rates': ('date', 'currency', 'rate')
+}
+
+# Values of the type column, in lower case
+TRANSACTION_TYPES = {
+    'income': 'income', 'ingreso': 'income', 'ingresos': 'income', 'abono': 'income', 'credit': 'income',
+    'expense': 'expense', 'gasto': 'expense', 'gastos': 'expense', 'cargo': 'expense', 'debit': 'expense',
+    'transfer': 'transfer', 'transferencia': 'transfer'
+}
+
+# Leading bytes of the columnar formats; Feather v2 files are Arrow IPC files
+COLUMNAR_MAGIC = {b'PAR1': 'parquet', b'ARROW1': 'arrow'}
+
+# Columns of the rows built from statement entries
+STATEMENT_HEADER = ['date', 'amount', 'type', 'description', 'account', 'category']
+
+# Columns of the rows built from ECB rate entries
+ECB_HEADER = ['date', 'currency', 'rate', 'quote']
+
+# strptime formats of the statement dates; QIF dates follow the import dialog's format
+STATEMENT_DATE_FORMATS = {
+    'ofx': '%Y%m%d',
+    'camt053': '%Y-%m-%d'
+}
+
+# Defaults of the columns missing from account and category files
+DEFAULT_ACCOUNT_TYPE = 'checking'
+DEFAULT_CURRENCY = 'USD'
+DEFAULT_CATEGORY_COLOR = '#888888'
+
+# Summary of a finished import, with the change events published by its database manager.
+# Duplicates are rows already in the database, like transactions imported before. A
+# transaction import cancelled or failed after committing some chunks is summarized too,
+# with 'cancelled' set or the 'error' that stopped it.
+ImportResult = namedtuple('ImportResult', ['data_type', 'imported', 'duplicates', 'rejected', 'errors', 'events',
+                                           'cancelled', 'error'], defaults=(False, None))
+
+
+class ImportCancelled(Exception):
+    """Raised inside an import to discard it once its worker is cancelled."""
+
+
+class ImportFormatError(ValueError):
+    """Raised when a file lacks the columns needed by an import."""
+
+
+def map_columns(header, mapping=None):
+    """Find the column index of each known field.
+
+    Args:
+        header (list): Column names of the file
+        mapping (dict, optional): Column name per field, overriding COLUMN_ALIASES
+
+    Returns:
+        dict: Column index per field found in the header
+    """
+    names = [name.strip().lower() for name in header]
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        if mapping and field in mapping:
+            aliases = (mapping[field].strip().lower(),)
+        for alias in aliases:
+            if alias in names:
+                columns[field] = names.index(alias)
+                break
+    return columns
+
+
+def parse_amount(text):
+    """Convert an amount as written by banks, e.g. '-1.234,56 €' or '$1,234.56', to a float.
+
+    When both '.' and ',' are used, the last one is the decimal separator.
+    Otherwise a separator written more than once, as in '1,000,000', separates
+    thousands, and so does a single one followed by exactly three digits
+    after a non-zero whole part, as in '1.234' but not '0.125'.
+    """
+    text = ''.join(char for char in text if char.isdigit() or char in '.,-+')
+    separator = max(text.rfind('.'), text.rfind(','))
+    if separator >= 0 and not ('.' in text and ',' in text):
+        whole = text[:separator].lstrip('+-')
+        if text.count(text[separator]) > 1 or (len(text) - separator - 1 == 3 and whole.strip('0')):
+            # '1,000,000' or '1.234': thousands separators only
+            separator = -1
+    if separator < 0:
+        return float(text.replace('.', '').replace(',', ''))
+    whole = text[:separator].replace('.', '').replace(',', '')
+    return float(f"{whole}.{text[separator + 1:]}")
+
+
+def parse_rate(text):
+    """Convert an exchange rate, e.g. '17,123' or '1.0876', to a float.
+
+    Rates often have three decimals, so unlike amounts the last '.' or ','
+    is always the decimal separator.
+    """
+    separator = max(text.rfind('.'), text.rfind(','))
+    if separator < 0:
+        return float(text)
+    whole = text[:separator].replace('.', '').replace(',', '')
+    return float(f"{whole}.{text[separator + 1:]}")
+
+
+def parse_dates(values, date_format, cache):
+    """Convert the dates of a chunk to the 'YYYY-MM-DD HH:MM:SS' form stored in the database.
+
+    Each distinct text is parsed once; bank exports repeat the same few
+    hundred dates over millions of rows.
+
+    Args:
+        values (list): Date texts of the chunk
+        date_format (str): strptime format of the dates
+        cache (dict): Parsed date per text, shared by every chunk of a file
+
+    Returns:
+        list: Stored date per value, or None for the values that could not be parsed
+    """
+    for value in set(values).difference(cache):
+        try:
+            # Times after the date, as in '05/03/2025 10:30', are ignored
+            parsed = datetime.strptime(value.strip().split(' ')[0].split('T')[0], date_format)
+            cache[value] = parsed.strftime('%Y-%m-%d 00:00:00')
+        except ValueError:
+            cache[value] = None
+    return [cache[value] for value in values]
+
+
+def fingerprint(account_id, date, amount, transaction_type, description):
+    """Return the fingerprint of an imported transaction.
+
+    Transactions of the same account, day, signed amount and description,
+    ignoring case and spacing, share it; the database tells repeated ones
+    apart by a sequence number.
+
+    Args:
+        account_id (int): Account ID
+        date (str): Date in format 'YYYY-MM-DD[ HH:MM:SS]'
+        amount (float): Amount, positive
+        transaction_type (str): 'income' or 'expense'
+        description (str): Description, or None
+
+    Returns:
+        str: Hexadecimal digest
+    """
+    cents = round(amount * 100) * (-1 if transaction_type == 'expense' else 1)
+    text = f"{account_id}|{date[:10]}|{cents}|{' '.join((description or '').lower().split())}"
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=12).hexdigest()
+
+
+class NameLookup:
+    """Resolves account or category names and IDs, remembering every resolved value."""
+
+    def __init__(self, rows):
+        """Initialize the lookup.
+
+        Args:
+            rows (iterable): Rows with 'id' and 'name' keys
+        """
+        self.ids = {}
+        self.names = {}
+        for row in rows:
+            self.ids[row['id']] = row['name']
+            self.names[row['name'].strip().lower()] = row['id']
+        self.cache = {}
+
+    def resolve(self, value):
+        """Return the ID of a name or numeric ID, or None if it is unknown."""
+        if value in self.cache:
+            return self.cache[value]
+
+        key = value.strip()
+        if key.isdigit() and int(key) in self.ids:
+            resolved = int(key)
+        else:
+            resolved = self.names.get(key.lower())
+        self.cache[value] = resolved
+        return resolved
+
+
+def detect_format(path):
+    """Detect the format of a file to import.
+
+    Returns:
+        str: 'parquet', 'arrow', 'ecb', or a statements.detect_format() format
+    """
+    with open(path, 'rb') as import_file:
+        head = import_file.read(4096)
+    for magic, file_format in COLUMNAR_MAGIC.items():
+        if head.startswith(magic):
+            return file_format
+    if exchange_rates.is_ecb_file(head.lstrip(codecs.BOM_UTF8)):
+        return 'ecb'
+    return statements.detect_format(path)
+
+
+def detect_encoding(sample):
+    """Return 'utf-8' if the start of a file is valid UTF-8, or 'cp1252', used by most bank exports otherwise."""
+    try:
+        sample.decode('utf-8')
+    except UnicodeDecodeError as error:
+        # A character may be cut at the end of the sample
+        if error.start < len(sample) - 3:
+            return 'cp1252'
+    return 'utf-8'
+
+
+class ProgressFile:
+    """Binary file reporting the share of it read, which stops the import once its worker is cancelled."""
+
+    def __init__(self, raw, size, worker, progress):
+        """Initialize the file.
+
+        Args:
+            raw (file): File opened in binary mode
+            size (int): Size of the file in bytes
+            worker (Worker): Worker running the import, or None
+            progress (tuple): (first, last) percentages spanned by the file
+        """
+        self.raw = raw
+        self.size = max(size, 1)
+        self.worker = worker
+        self.progress = progress
+        self.position = 0
+        self.next_report = 0
+
+    def advance(self, count):
+        """Count bytes read, reporting the progress every PROGRESS_BYTES."""
+        self.position += count
+        if self.position >= self.next_report:
+            self.next_report = self.position + PROGRESS_BYTES
+            first, last = self.progress
+            if not report_step(self.worker, first + (last - first) * min(self.position, self.size) // self.size):
+                raise ImportCancelled()
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.advance(len(data))
+        return data
+
+    def __iter__(self):
+        for line in self.raw:
+            self.advance(len(line))
+            yield line
+
+
+def read_chunks(path, worker=None, chunk_size=IMPORT_CHUNK_SIZE, progress=(0, COMMIT_PROGRESS)):
+    """Read a CSV file in chunks of rows, without loading it whole.
+
+    The encoding (UTF-8 or Windows-1252) and the delimiter (',', ';', tab
+    or '|') are detected from the start of the file, and quoted values may
+    span several lines.
+
+    Args:
+        path (str): Path to the CSV file
+        worker (Worker, optional): Worker running the import, checked for cancellation
+        chunk_size (int, optional): Rows per chunk
+        progress (tuple, optional): (first, last) percentages spanned by the file
+
+    Yields:
+        list: The header first, then lists of (line number, row) pairs
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as csv_file:
+        sample = csv_file.read(64 * 1024)
+        encoding = detect_encoding(sample)
+        # Skip the byte order mark written by spreadsheet programs
+        csv_file.seek(len(codecs.BOM_UTF8) if sample.startswith(codecs.BOM_UTF8) else 0)
+
+        # The delimiter is the separator found most often in the header
+        header_line = sample.decode(encoding, errors='replace').lstrip('\ufeff').split('\n', 1)[0]
+        delimiter = max(DELIMITERS, key=header_line.count)
+
+        lines = (line.decode(encoding, errors='replace') for line in ProgressFile(csv_file, size, worker, progress))
+        reader = csv.reader(lines, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield header
+
+        chunk = []
+        for row in reader:
+            if not any(value.strip() for value in row):
+                continue
+            chunk.append((reader.line_num, row))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+        # Last chance to cancel, before the rows are committed
+        if not report_step(worker, progress[1]):
+            raise ImportCancelled()
+
+
+class CsvImport:
+    """Converts the chunks of a CSV file into database rows, keeping count of what was imported."""
+
+    # Names the position of rejected rows in the import summary
+    position_label = "Línea"
+
+    def __init__(self, data_type, path, worker=None, mapping=None, chunk_size=IMPORT_CHUNK_SIZE):
+        """Initialize the import.
+
+        Args:
+            data_type (str): 'transactions', 'accounts', 'categories' or 'exchange_rates'
+            path (str): Path to the CSV file
+            worker (Worker, optional): Worker running the import
+            mapping (dict, optional): Column name per field, overriding COLUMN_ALIASES
+            chunk_size (int, optional): Rows per chunk
+        """
+        self.data_type = data_type
+        self.chunks = self.read_chunks(path, worker, chunk_size)
+        header = next(self.chunks, None)
+        if header is None:
+            raise ImportFormatError("El archivo está vacío.")
+
+        self.columns = map_columns(header, mapping)
+        missing = [field for field in REQUIRED_COLUMNS[data_type] if field not in self.columns]
+        if missing:
+            # Named by their Spanish alias
+            raise ImportFormatError(f"Faltan las columnas: {', '.join(COLUMN_ALIASES[field][1] for field in missing)}")
+
+        self.read = 0
+        self.imported = 0
+        self.rejected = 0
+        self.errors = []
+        self.cancelled = False
+        self.error = None
+
+    def read_chunks(self, path, worker, chunk_size):
+        """Yield the header of the file, then its chunks of (position, row) pairs."""
+        return read_chunks(path, worker, chunk_size)
+
+    def reject(self, line, message):
+        """Count a rejected row, keeping the first errors."""
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"{self.position_label} {line}: {message}")
+
+    def column(self, chunk, field, default=''):
+        """Return the values of a field in a chunk, or the default when the file lacks the column."""
+        index = self.columns.get(field)
+        if index is None:
+            return [default] * len(chunk)
+        return [row[index].strip() if index < len(row) else default for _, row in chunk]
+
+    def amounts(self, chunk, field, default=None):
+        """Return the amounts of a field in a chunk as floats.
+
+        Empty values and missing columns give the default, and values that
+        are not amounts give None.
+        """
+        amounts = []
+        for value in self.column(chunk, field):
+            try:
+                amounts.append(parse_amount(value) if value else default)
+            except ValueError:
+                amounts.append(None)
+        return amounts
+
+    def count_imported(self, count):
+        """Count the rows written by a committed chunk."""
+        self.imported += count
+
+    def result(self, events):
+        """Return the summary of the import."""
+        return ImportResult(self.data_type, self.imported, self.read - self.imported, self.rejected,
+                            tuple(self.errors), tuple(events), self.cancelled, self.error)
+
+
+class TransactionImport(CsvImport):
+    """Converts bank exports into transaction rows.
+
+    Amounts are signed unless the file has a type column: negative amounts
+    are expenses and positive ones income. Rows of unknown accounts are
+    rejected, and unknown categories are left uncategorized. Transfers name
+    their destination account by ID after the last ':' of the description,
+    as the transactions table stores them.
+    """
+
+    def __init__(self, path, accounts, categories, date_format='dd/MM/yyyy', account_id=None, **kwargs):
+        """Initialize the import.
+
+        Args:
+            path (str): Path to the CSV file
+            accounts (iterable): Account rows, to resolve the account column
+            categories (iterable): Category rows, to resolve the category column
+            date_format (str, optional): Date format of the file, one of DATE_FORMATS
+            account_id (int, optional): Account of the rows without an account column
+            **kwargs: CsvImport arguments
+        """
+        super().__init__('transactions', path, **kwargs)
+        self.date_format = DATE_FORMATS.get(date_format, date_format)
+        self.account_id = account_id
+        self.account_lookup = NameLookup(accounts)
+        self.category_lookup = NameLookup(categories)
+        self.date_cache = {}
+        if 'account' not in self.columns and account_id is None:
+            raise ImportFormatError("El archivo no tiene columna de cuenta; elija la cuenta de destino.")
+
+    def __iter__(self):
+        """Yield the transaction rows of each chunk, as add_transactions() tuples."""
+        for chunk in self.chunks:
+            dates = self.dates(chunk)
+            amounts = self.amounts(chunk, 'amount')
+            types = self.column(chunk, 'type')
+            descriptions = self.column(chunk, 'description')
+            accounts = self.column(chunk, 'account')
+            categories = self.column(chunk, 'category')
+
+            rows = []
+            for index, (line, _) in enumerate(chunk):
+                date = dates[index]
+                if date is None:
+                    self.reject(line, "fecha no válida")
+                    continue
+
+                amount = amounts[index]
+                if amount is None:
+                    self.reject(line, "importe no válido")
+                    continue
+
+                transaction_type = TRANSACTION_TYPES.get(types[index].lower()) if types[index] else None
+                if transaction_type is None:
+                    if types[index]:
+                        self.reject(line, f"tipo desconocido: {types[index]}")
+                        continue
+                    transaction_type = 'expense' if amount < 0 else 'income'
+
+                account_id = self.account_lookup.resolve(accounts[index]) if accounts[index] else self.account_id
+                if account_id is None:
+                    self.reject(line, f"cuenta desconocida: {accounts[index]}" if accounts[index]
+                                else "sin cuenta de destino")
+                    continue
+
+                description = descriptions[index] or None
+                if transaction_type == 'transfer' and not self.transfer_destination(description):
+                    self.reject(line, "transferencia sin cuenta de destino")
+                    continue
+
+                category_id = self.category_lookup.resolve(categories[index]) if categories[index] else None
+                rows.append((account_id, category_id, abs(amount), transaction_type, description, date,
+                             fingerprint(account_id, date, abs(amount), transaction_type, description)))
+
+            self.read += len(rows)
+            yield rows
+
+    def transfer_destination(self, description):
+        """Return the destination account of a transfer, named by ID after the last ':' of its description, or None."""
+        if not description or ':' not in description:
+            return None
+        destination = description.rsplit(':', 1)[1].strip()
+        return int(destination) if destination.isdigit() and int(destination) in self.account_lookup.ids else None
+
+    def dates(self, chunk):
+        """Return the dates of a chunk in the stored form, or None for the values that are not dates."""
+        return parse_dates(self.column(chunk, 'date'), self.date_format, self.date_cache)
+
+
+class StatementImport(TransactionImport):
+    """Converts the entries of an OFX/QFX, QIF or CAMT.053 bank statement into transaction rows.
+
+    Entries are read by the streaming parsers of the statements module and
+    converted in chunks like the rows of a CSV file. Statement accounts
+    matching the name of an account are imported into it, the rest into the
+    account picked by the user.
+    """
+
+    position_label = "Movimiento"
+
+    def __init__(self, path, file_format, accounts, categories, date_format='dd/MM/yyyy', account_id=None, **kwargs):
+        """Initialize the import.
+
+        Args:
+            path (str): Path to the statement file
+            file_format (str): 'ofx', 'qif' or 'camt053'
+            accounts (iterable): Account rows, to resolve the statement accounts
+            categories (iterable): Category rows, to resolve QIF categories
+            date_format (str, optional): Date format of QIF files, one of DATE_FORMATS
+            account_id (int, optional): Account of the entries whose statement account is unknown
+            **kwargs: CsvImport arguments
+        """
+        self.file_format = file_format
+        super().__init__(path, accounts, categories, STATEMENT_DATE_FORMATS.get(file_format, date_format),
+                         account_id, **kwargs)
+
+    def read_chunks(self, path, worker, chunk_size):
+        """Yield STATEMENT_HEADER, then chunks of (entry number, row) pairs."""
+        yield STATEMENT_HEADER
+
+        size = os.path.getsize(path)
+        with open(path, 'rb') as statement_file:
+            source = ProgressFile(statement_file, size, worker, (0, COMMIT_PROGRESS))
+            if self.file_format == 'qif':
+                encoding = detect_encoding(statement_file.read(64 * 1024))
+                statement_file.seek(0)
+                entries = statements.parse_qif(line.decode(encoding, errors='replace') for line in source)
+            elif self.file_format == 'ofx':
+                entries = statements.parse_ofx(source)
+            else:
+                entries = statements.parse_camt053(source)
+
+            chunk = []
+            for entry in entries:
+                # Resolved here, so unknown statement accounts fall back to the picked account
+                account = entry.account if entry.account and self.account_lookup.resolve(entry.account) else ''
+                chunk.append((entry.number, [entry.date, entry.amount, '', entry.description, account,
+                                             entry.category]))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        # Last chance to cancel, before the rows are committed
+        if not report_step(worker, COMMIT_PROGRESS):
+            raise ImportCancelled()
+
+
+class AccountImport(CsvImport):
+    """Converts account lists into account rows. Accounts whose name exists are skipped."""
+
+    def __init__(self, path, **kwargs):
+        super().__init__('accounts', path, **kwargs)
+
+    def __iter__(self):
+        """Yield the account rows of each chunk, as add_accounts() tuples."""
+        for chunk in self.chunks:
+            names = self.column(chunk, 'name')
+            types = self.column(chunk, 'type', DEFAULT_ACCOUNT_TYPE)
+            currencies = self.column(chunk, 'currency', DEFAULT_CURRENCY)
+            balances = self.amounts(chunk, 'initial_balance', 0.0)
+            descriptions = self.column(chunk, 'description')
+            colors = self.column(chunk, 'color')
+            icons = self.column(chunk, 'icon')
+
+            rows = []
+            for index, (line, _) in enumerate(chunk):
+                if not names[index]:
+                    self.reject(line, "cuenta sin nombre")
+                    continue
+                if balances[index] is None:
+                    self.reject(line, "saldo no válido")
+                    continue
+                rows.append((names[index], types[index] or DEFAULT_ACCOUNT_TYPE,
+                             currencies[index] or DEFAULT_CURRENCY, balances[index], descriptions[index] or None,
+                             colors[index] or None, icons[index] or None))
+            self.read += len(rows)
+            yield rows
+
+
+class CategoryImport(CsvImport):
+    """Converts category lists into category rows. Categories whose name exists are skipped."""
+
+    def __init__(self, path, **kwargs):
+        super().__init__('categories', path, **kwargs)
+
+    def __iter__(self):
+        """Yield the category rows of each chunk, as add_categories() tuples."""
+        for chunk in self.chunks:
+            names = self.column(chunk, 'name')
+            types = self.column(chunk, 'type')
+            colors = self.column(chunk, 'color', DEFAULT_CATEGORY_COLOR)
+            icons = self.column(chunk, 'icon')
+
+            rows = []
+            for index, (line, _) in enumerate(chunk):
+                category_type = TRANSACTION_TYPES.get(types[index].lower(), types[index].lower())
+                if not names[index] or category_type not in ('income', 'expense', 'transfer'):
+                    self.reject(line, "categoría sin nombre o con tipo desconocido")
+                    continue
+                rows.append((names[index], category_type, colors[index] or DEFAULT_CATEGORY_COLOR,
+                             icons[index] or None))
+            self.read += len(rows)
+            yield rows
+
+
+class RateImport(CsvImport):
+    """Converts exchange rate lists into exchange rate rows.
+
+    Each row prices one unit of its currency in a quote currency: the one of
+    the quote column, or the base currency of the totals. Quote currencies
+    need rates of their own, stored or earlier in the file, unless there are
+    no rates at all yet; the first quote currency then becomes the reference.
+    """
+
+    def __init__(self, path, quote_currency, rate_currencies, date_format='yyyy-MM-dd', **kwargs):
+        """Initialize the import.
+
+        Args:
+            path (str): Path to the file
+            quote_currency (str): Quote currency of the rows without a quote column
+            rate_currencies (iterable): Currencies with stored rates
+            date_format (str, optional): Date format of the file, one of DATE_FORMATS
+            **kwargs: CsvImport arguments
+        """
+        super().__init__('exchange_rates', path, **kwargs)
+        self.quote_currency = quote_currency
+        self.rate_currencies = set(rate_currencies)
+        self.date_format = DATE_FORMATS.get(date_format, date_format)
+        self.date_cache = {}
+
+    def __iter__(self):
+        """Yield the exchange rate rows of each chunk, as add_exchange_rates() tuples."""
+        for chunk in self.chunks:
+            dates = self.dates(chunk)
+            currencies = self.column(chunk, 'currency')
+            quotes = self.column(chunk, 'quote')
+            rates = self.rates(chunk)
+
+            rows = []
+            for index, (line, _) in enumerate(chunk):
+                if dates[index] is None:
+                    self.reject(line, "fecha no válida")
+                    continue
+                if rates[index] is None or not rates[index] > 0:
+                    self.reject(line, "tasa no válida")
+                    continue
+
+                currency, quote = currencies[index].upper(), (quotes[index] or self.quote_currency).upper()
+                if not currency or currency == quote:
+                    self.reject(line, f"moneda no válida: {currencies[index]}")
+                    continue
+                if quote not in self.rate_currencies:
+                    if self.rate_currencies:
+                        self.reject(line, f"no hay tasas de {quote} para convertir")
+                        continue
+                    self.rate_currencies.add(quote)
+
+                self.rate_currencies.add(currency)
+                rows.append((currency, dates[index][:10], rates[index], quote))
+            self.read += len(rows)
+            yield rows
+
+    def rates(self, chunk):
+        """Return the rates of a chunk as floats, or None for the values that are not numbers."""
+        rates = []
+        for value in self.column(chunk, 'rate'):
+            try:
+                rates.append(parse_rate(value))
+            except ValueError:
+                rates.append(None)
+        return rates
+
+    def dates(self, chunk):
+        """Return the dates of a chunk in the stored form, or None for the values that are not dates."""
+        return parse_dates(self.column(chunk, 'date'), self.date_format, self.date_cache)
+
+
+class EcbRateImport(RateImport):
+    """Converts the entries of an ECB reference rate file into exchange rate rows, quoted in euros."""
+
+    position_label = "Tasa"
+
+    def __init__(self, path, rate_currencies, **kwargs):
+        """Initialize the import.
+
+        Args:
+            path (str): Path to the ECB file
+            rate_currencies (iterable): Currencies with stored rates
+            **kwargs: CsvImport arguments
+        """
+        super().__init__(path, exchange_rates.ECB_QUOTE_CURRENCY, rate_currencies, '%Y-%m-%d', **kwargs)
+
+    def read_chunks(self, path, worker, chunk_size):
+        """Yield ECB_HEADER, then chunks of (entry number, row) pairs."""
+        yield ECB_HEADER
+
+        size = os.path.getsize(path)
+        with open(path, 'rb') as rates_file:
+            chunk = []
+            for entry in exchange_rates.parse_ecb(ProgressFile(rates_file, size, worker, (0, COMMIT_PROGRESS))):
+                chunk.append((entry.number, [entry.day, entry.currency, entry.rate, '']))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        # Last chance to cancel, before the rows are committed
+        if not report_step(worker, COMMIT_PROGRESS):
+            raise ImportCancelled()
+
+    def rates(self, chunk):
+        """Return the price in euros of each currency, the inverse of the ECB rate."""
+        return [1 / rate if rate else None for rate in super().rates(chunk)]
+
+
+def read_columnar_chunks(path, worker=None, chunk_size=IMPORT_CHUNK_SIZE, progress=(0, COMMIT_PROGRESS)):
+    """Read a Parquet or Arrow IPC file in chunks of rows, one record batch at a time.
+
+    Args:
+        path (str): Path to the file
+        worker (Worker, optional): Worker running the import, checked for cancellation
+        chunk_size (int, optional): Rows per chunk
+        progress (tuple, optional): (first, last) percentages spanned by the file
+
+    Yields:
+        list: The column names first, then lists of (row number, row) pairs
+            whose rows hold typed values: numbers, dates, strings or None
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportFormatError("Los archivos Parquet y Arrow necesitan el paquete pyarrow (pip install pyarrow).")
+
+    if detect_format(path) == 'parquet':
+        parquet_file = pq.ParquetFile(path)
+        names, total = parquet_file.schema_arrow.names, parquet_file.metadata.num_rows
+        batches = parquet_file.iter_batches(batch_size=chunk_size)
+    else:
+        # Memory-mapped, and read one record batch at a time
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        names, total = reader.schema.names, reader.count_rows()
+        batches = (batch.slice(offset, chunk_size)
+                   for batch in map(reader.get_batch, range(reader.num_record_batches))
+                   for offset in range(0, batch.num_rows, chunk_size))
+    yield names
+
+    first, last = progress
+    number = 0
+    for batch in batches:
+        rows = zip(*(column.to_pylist() for column in batch.columns))
+        yield list(zip(range(number + 1, number + batch.num_rows + 1), rows))
+        number += batch.num_rows
+        if not report_step(worker, first + (last - first) * number // max(total, 1)):
+            raise ImportCancelled()
+
+    # Last chance to cancel, before the rows are committed
+    if not report_step(worker, last):
+        raise ImportCancelled()
+
+
+class ColumnarFile:
+    """Reads the chunks of the imports from Parquet and Arrow IPC files.
+
+    Mixed in ahead of an import class: the rows hold typed values, so
+    numbers and dates are taken as they are, and only text values are
+    parsed like those of CSV files.
+    """
+
+    position_label = "Fila"
+
+    def read_chunks(self, path, worker, chunk_size):
+        """Yield the column names of the file, then its chunks of (row number, row) pairs."""
+        return read_columnar_chunks(path, worker, chunk_size)
+
+    def column(self, chunk, field, default=''):
+        """Return the values of a field in a chunk as text, or the default when missing."""
+        index = self.columns.get(field)
+        if index is None:
+            return [default] * len(chunk)
+        return [default if row[index] is None else str(row[index]).strip() for _, row in chunk]
+
+    def amounts(self, chunk, field, default=None):
+        """Return the amounts of a field in a chunk as floats, parsing only text values."""
+        index = self.columns.get(field)
+        if index is None:
+            return [default] * len(chunk)
+        amounts = []
+        for _, row in chunk:
+            value = row[index]
+            if value is None or value == '':
+                amounts.append(default)
+            elif isinstance(value, str):
+                try:
+                    amounts.append(parse_amount(value))
+                except ValueError:
+                    amounts.append(None)
+            else:
+                amounts.append(float(value))
+        return amounts
+
+    def dates(self, chunk):
+        """Return the dates of a chunk in the stored form, parsing only text values."""
+        index = self.columns['date']
+        values = [row[index] for _, row in chunk]
+        for value in set(values).difference(self.date_cache):
+            if not isinstance(value, str):
+                # Dates and timestamps; the time of day is dropped, as from CSV files
+                self.date_cache[value] = value.strftime('%Y-%m-%d 00:00:00') if value is not None else None
+        return parse_dates(values, self.date_format, self.date_cache)
+
+
+class ColumnarTransactionImport(ColumnarFile, TransactionImport):
+    """Converts the rows of Parquet and Arrow files into transaction rows."""
+
+
+class ColumnarAccountImport(ColumnarFile, AccountImport):
+    """Converts the rows of Parquet and Arrow files into account rows."""
+
+
+class ColumnarCategoryImport(ColumnarFile, CategoryImport):
+    """Converts the rows of Parquet and Arrow files into category rows."""
+
+
+class ColumnarRateImport(ColumnarFile, RateImport):
+    """Converts the rows of Parquet and Arrow files into exchange rate rows."""
+
+
+def import_file(db_manager, data_type, path, date_format='dd/MM/yyyy', account_id=None, mapping=None, worker=None):
+    """Import a CSV, Parquet or Arrow file or a bank statement into the database.
+
+    The format is detected from the start of the file. The change events
+    published by the database manager are returned with the summary, so a
+    manager running on a worker thread can hand them to the GUI thread's one.
+    Transactions are committed chunk by chunk: once some are written, a
+    cancelled or failed import still returns their summary.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        data_type (str): 'transactions', 'accounts', 'categories' or 'exchange_rates'; statements only
+            hold transactions, and ECB files exchange rates
+        path (str): Path to the file
+        date_format (str, optional): Date format of CSV and QIF files, one of DATE_FORMATS
+        account_id (int, optional): Account of the transactions, when the file does not name a known one
+        mapping (dict, optional): Column name per field of CSV, Parquet and Arrow files, overriding COLUMN_ALIASES
+        worker (Worker, optional): Worker running the import
+
+    Returns:
+        ImportResult: Summary of the import, or None if the worker was cancelled before anything was written
+    """
+    file_format = detect_format(path)
+    columnar = file_format in COLUMNAR_MAGIC.values()
+    if file_format == 'ecb' and data_type != 'exchange_rates':
+        raise ImportFormatError("Los archivos del BCE solo contienen tasas de cambio.")
+    if file_format not in ('csv', 'ecb') and not columnar and data_type != 'transactions':
+        raise ImportFormatError("Los extractos bancarios solo contienen transacciones.")
+
+    rows = None
+    events = []
+    db_manager.subscribe(events.append)
+    try:
+        if data_type == 'transactions':
+            accounts, categories = db_manager.get_accounts(active_only=False), db_manager.get_categories()
+            if file_format == 'csv' or columnar:
+                import_class = ColumnarTransactionImport if columnar else TransactionImport
+                rows = import_class(path, accounts, categories, date_format, account_id, mapping=mapping,
+                                    worker=worker)
+            else:
+                rows = StatementImport(path, file_format, accounts, categories, date_format, account_id,
+                                       worker=worker)
+            db_manager.add_transactions(rows, on_commit=rows.count_imported)
+        elif data_type == 'accounts':
+            rows = (ColumnarAccountImport if columnar else AccountImport)(path, mapping=mapping, worker=worker)
+            rows.imported = len(db_manager.add_accounts(rows))
+        elif data_type == 'categories':
+            rows = (ColumnarCategoryImport if columnar else CategoryImport)(path, mapping=mapping, worker=worker)
+            rows.imported = len(db_manager.add_categories(rows))
+        elif data_type == 'exchange_rates':
+            rate_currencies = db_manager.get_rate_currencies()
+            if file_format == 'ecb':
+                rows = EcbRateImport(path, rate_currencies, worker=worker)
+            else:
+                rows = (ColumnarRateImport if columnar else RateImport)(path, db_manager.get_base_currency(),
+                                                                      rate_currencies, date_format,
+                                                                      mapping=mapping, worker=worker)
+            rows.imported = db_manager.add_exchange_rates(rows)
+        else:
+            raise ValueError(f"Unknown import type: {data_type}")
+    except ImportCancelled:
+        if rows is None or not rows.imported:
+            return None
+        rows.cancelled = True
+    except Exception as error:
+        # The chunks committed before the error stay written, and are summarized with it
+        if rows is None or not rows.imported:
+            raise
+        rows.error = str(error)
+    finally:
+        db_manager.change_bus.unsubscribe(events.append)
+
+    return rows.result(events)
@@ -0,0 +1,468 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Synthetic ledger generator for load testing.
+
+Builds a database with any number of accounts, categories and
+transactions spread over several years: biweekly salaries, monthly
+bills, savings transfers, credit card payments and daily purchases whose
+volume follows the weekday and the season, plus monthly budgets, goals
+and, for accounts in several currencies, daily exchange rates. The same
+seed always builds the same ledger.
+
+Transactions are generated day by day, oldest first, and written in
+chunks through DatabaseManager.load_transactions(), which builds the
+indexes, search index and rollup once at the end.
+"""
+
+import math
+import random
+from datetime import date, timedelta
+from statistics import NormalDist
+
+from src.models.dashboard_data import add_months
+
+# Transactions written per chunk
+CHUNK_SIZE = 50000
+
+# Accounts created first, as (name, type, share of the purchases)
+ACCOUNT_TEMPLATES = [
+    ('Cuenta de Nómina', 'checking', 3),
+    ('Tarjeta de Crédito', 'credit', 4),
+    ('Ahorros', 'savings', 0),
+    ('Efectivo', 'cash', 2),
+    ('Inversiones', 'investment', 0),
+]
+
+# Expense categories of the default set, as (share of the purchases,
+# median amount, merchants)
+PURCHASES = {
+    'Alimentación': (30, 320, ['Walmart', 'Soriana', 'Chedraui', 'La Comer', 'OXXO', 'Mercado local',
+                               'Panadería', 'Taquería', 'Starbucks', 'Costco']),
+    'Transporte': (14, 250, ['Pemex', 'Uber', 'DiDi', 'Metro', 'Estacionamiento', 'Caseta', 'Shell']),
+    'Entretenimiento': (10, 380, ['Cinépolis', 'Restaurante', 'Bar', 'Steam', 'Ticketmaster', 'Boliche']),
+    'Salud': (5, 450, ['Farmacia Guadalajara', 'Farmacias del Ahorro', 'Consulta médica', 'Laboratorio']),
+    'Educación': (3, 600, ['Librería Gandhi', 'Curso en línea', 'Papelería']),
+    'Ropa': (6, 750, ['Liverpool', 'Zara', 'C&A', 'Coppel', 'Palacio de Hierro']),
+    'Servicios': (5, 300, ['Amazon', 'Mercado Libre', 'Lavandería', 'Tintorería']),
+    'Vivienda': (3, 900, ['Home Depot', 'Ferretería', 'Plomero', 'Cerrajero']),
+}
+
+# Categories added after the default set, as (name, type, color, share of
+# the purchases, median amount); further ones are numbered
+EXTRA_CATEGORIES = [
+    ('Restaurantes', 'expense', '#E67E22', 8, 450),
+    ('Supermercado', 'expense', '#27AE60', 10, 900),
+    ('Gasolina', 'expense', '#C0392B', 6, 700),
+    ('Mascotas', 'expense', '#8E44AD', 2, 400),
+    ('Viajes', 'expense', '#2980B9', 1, 3500),
+    ('Seguros', 'expense', '#7F8C8D', 1, 1800),
+    ('Suscripciones', 'expense', '#D35400', 3, 180),
+    ('Telefonía', 'expense', '#16A085', 1, 400),
+    ('Gimnasio', 'expense', '#F39C12', 1, 600),
+    ('Cuidado personal', 'expense', '#E84393', 3, 350),
+    ('Donativos', 'expense', '#00B894', 1, 250),
+    ('Bonos', 'income', '#55EFC4', 0, 5000),
+]
+
+# Purchases that are refunds, as (category, share of the purchases, median amount)
+REFUNDS = ('Otros Ingresos', 2, 300)
+
+# Spread of the purchase amounts around their median, drawn from the
+# quantiles of a log-normal distribution so that no row calls gauss()
+AMOUNT_SIGMA = 0.8
+AMOUNT_SPREAD = [math.exp(AMOUNT_SIGMA * NormalDist().inv_cdf((index + 0.5) / 1024)) for index in range(1024)]
+
+# Purchase volume of each month (January first) and weekday (Monday first)
+MONTH_FACTORS = (0.85, 0.9, 0.95, 1.0, 1.05, 0.95, 1.05, 1.0, 0.95, 1.0, 1.1, 1.4)
+WEEKDAY_FACTORS = (0.85, 0.9, 0.9, 0.95, 1.15, 1.35, 1.1)
+
+# Yearly increase of prices and of the salary
+INFLATION = 0.045
+
+# Monthly bills of the payroll account, as (day, description, category, amount, every n months)
+BILLS = [
+    (1, 'Renta del departamento', 'Vivienda', 9500, 1),
+    (5, 'Telmex Internet', 'Servicios', 599, 1),
+    (8, 'Telcel Plan', 'Servicios', 449, 1),
+    (12, 'CFE Luz', 'Servicios', 780, 2),
+    (15, 'Netflix', 'Entretenimiento', 219, 1),
+    (20, 'Agua SACMEX', 'Servicios', 310, 2),
+    (25, 'Spotify', 'Entretenimiento', 129, 1),
+]
+
+# Goals, as (name, target amount)
+GOAL_TEMPLATES = [
+    ('Fondo de emergencia', 180000),
+    ('Vacaciones', 45000),
+    ('Auto nuevo', 320000),
+    ('Enganche de casa', 650000),
+    ('Computadora nueva', 35000),
+    ('Posgrado', 120000),
+]
+
+# Value of each currency in MXN when the ledger starts; others start at 10
+START_RATES = {'MXN': 1.0, 'USD': 17.5, 'EUR': 19.5, 'GBP': 22.5, 'CAD': 13.0, 'JPY': 0.12}
+
+
+def daily_counts(start, days, total):
+    """Spread a number of purchases over days, following the month and weekday factors.
+
+    Rounding the running total keeps the sum exact and the counts smooth.
+
+    Returns:
+        list: Purchases of each day
+    """
+    weights = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        weights.append(MONTH_FACTORS[day.month - 1] * WEEKDAY_FACTORS[day.weekday()])
+    scale = total / sum(weights) if weights else 0
+
+    counts = []
+    expected = 0.0
+    assigned = 0
+    for weight in weights:
+        expected += weight * scale
+        count = round(expected) - assigned
+        counts.append(count)
+        assigned += count
+    return counts
+
+
+def last_day(year, month):
+    """Return the last day of a month."""
+    next_year, next_month = add_months(year, month, 1)
+    return (date(next_year, next_month, 1) - timedelta(days=1)).day
+
+
+class LedgerGenerator:
+    """Generates the rows of a synthetic ledger and writes them to a database."""
+
+    def __init__(self, db_manager, accounts=5, categories=13, transactions=1000000, years=10, seed=0,
+                 currencies=('MXN',), goals=4, today=None):
+        """Initialize the generator.
+
+        Args:
+            db_manager (DatabaseManager): Manager of an empty database
+            accounts (int, optional): Number of accounts. Defaults to 5.
+            categories (int, optional): Number of categories, at least the 13 default
+                ones. Defaults to 13.
+            transactions (int, optional): Number of transactions; salaries and bills
+                are always generated, purchases fill the rest. Defaults to 1000000.
+            years (int, optional): Years of history, up to today. Defaults to 10.
+            seed (int, optional): Random seed. Defaults to 0.
+            currencies (tuple, optional): Currencies of the accounts, assigned in turn;
+                the first one is the base currency. Defaults to ('MXN',).
+            goals (int, optional): Number of goals. Defaults to 4.
+            today (date, optional): Last day of the ledger. Defaults to today.
+        """
+        self.db_manager = db_manager
+        self.account_count = max(1, accounts)
+        self.category_count = categories
+        self.transaction_count = transactions
+        self.seed = seed
+        self.currencies = list(dict.fromkeys(currencies)) or ['MXN']
+        self.goal_count = goals
+        self.random = random.Random(seed)
+
+        self.end = today or date.today()
+        self.start = date(self.end.year - years, self.end.month, 1)
+        self.days = (self.end - self.start).days + 1
+
+        # Monthly spending of each category in the last year, budgeted afterwards
+        self.budget_start = date(*add_months(self.end.year, self.end.month, -12), 1)
+        self.spending = {}
+
+    def generate(self, on_progress=None):
+        """Write the whole ledger.
+
+        Args:
+            on_progress (callable, optional): Called with the number of transactions
+                written after each chunk
+
+        Returns:
+            dict: Number of 'accounts', 'categories', 'transactions', 'budgets',
+                'goals' and 'exchange_rates' written
+        """
+        self.create_categories()
+        self.create_accounts()
+        rate_count = self.create_exchange_rates()
+
+        def chunks():
+            written = 0
+            for rows in self.transaction_chunks():
+                yield rows
+                written += len(rows)
+                if on_progress:
+                    on_progress(written)
+
+        transaction_count = self.db_manager.load_transactions(chunks())
+        return {
+            'accounts': len(self.accounts),
+            'categories': len(self.category_ids),
+            'transactions': transaction_count,
+            'budgets': self.create_budgets(),
+            'goals': self.create_goals(),
+            'exchange_rates': rate_count,
+        }
+
+    def create_categories(self):
+        """Add the categories beyond the default set, and pick the purchase categories."""
+        rows = []
+        extra_purchases = []
+        for number in range(max(0, self.category_count - len(self.db_manager.get_categories()))):
+            if number < len(EXTRA_CATEGORIES):
+                name, category_type, color, share, median = EXTRA_CATEGORIES[number]
+            else:
+                name, category_type, color = f'Gastos varios {number - len(EXTRA_CATEGORIES) + 1}', 'expense', '#95A5A6'
+                share, median = 1, self.random.choice((150, 300, 600, 1200))
+            rows.append((name, category_type, color, None))
+            if category_type == 'expense':
+                extra_purchases.append((name, share, median, [name]))
+        self.db_manager.add_categories([rows])
+
+        self.category_ids = {category['name']: category['id'] for category in self.db_manager.get_categories()}
+
+        # Purchases are (category ID, type, median amount, merchants), picked by share
+        purchases = [(name, share, median, merchants) for name, (share, median, merchants) in PURCHASES.items()]
+        purchases += extra_purchases
+        self.purchase_kinds = [(self.category_ids.get(name), 'expense', median, merchants)
+                               for name, _, median, merchants in purchases]
+        self.purchase_kinds.append((self.category_ids.get(REFUNDS[0]), 'income', REFUNDS[2], ['Reembolso']))
+        self.purchase_shares = [share for _, share, _, _ in purchases] + [REFUNDS[1]]
+
+        # Each merchant is drawn on its own, so that one draw picks the category and description
+        self.merchants = []
+        self.merchant_weights = []
+        total = 0
+        for (category_id, category_type, median, merchants), share in zip(self.purchase_kinds, self.purchase_shares):
+            for merchant in merchants:
+                total += share / len(merchants)
+                self.merchants.append((category_id, category_type, median, merchant))
+                self.merchant_weights.append(total)
+
+    def create_accounts(self):
+        """Add the accounts, cycling through the currencies."""
+        rows = []
+        for number in range(self.account_count):
+            if number < len(ACCOUNT_TEMPLATES):
+                name, account_type, _ = ACCOUNT_TEMPLATES[number]
+            else:
+                name, account_type = f'Cuenta {number + 1}', 'checking'
+            currency = self.currencies[number % len(self.currencies)]
+            initial_balance = round(self.random.uniform(0, 20000) * self.currency_scale(currency), 2)
+            rows.append((name, account_type, currency, initial_balance, None, None, None))
+        self.db_manager.add_accounts([rows])
+
+        # (ID, name, type, currency, share of the purchases) of the accounts, the payroll account first
+        accounts = sorted(self.db_manager.get_accounts(), key=lambda account: account['id'])
+        self.accounts = []
+        for number, account in enumerate(accounts):
+            share = ACCOUNT_TEMPLATES[number][2] if number < len(ACCOUNT_TEMPLATES) else 1
+            self.accounts.append((account['id'], account['name'], account['type'], account['currency'], share))
+        self.payroll = self.accounts[0]
+
+        purchase_accounts = [account for account in self.accounts if account[4]]
+        self.purchase_accounts = [(account[0], self.currency_scale(account[3])) for account in purchase_accounts]
+        self.account_weights = [sum(account[4] for account in purchase_accounts[:index + 1])
+                                for index in range(len(purchase_accounts))]
+
+    def currency_scale(self, currency):
+        """Return the factor turning base currency amounts into amounts in a currency."""
+        base = START_RATES.get(self.currencies[0], 10.0)
+        return base / START_RATES.get(currency, 10.0)
+
+    def create_exchange_rates(self):
+        """Add a daily random walk of the rate of every currency besides the base one."""
+        base = self.currencies[0]
+        if len(self.currencies) == 1:
+            return 0
+
+        rows = []
+        for currency in self.currencies[1:]:
+            rate = 1 / self.currency_scale(currency)
+            for offset in range(self.days):
+                rate *= math.exp(self.random.gauss(0, 0.005))
+                rows.append((currency, (self.start + timedelta(days=offset)).isoformat(), round(rate, 6), base))
+        self.db_manager.set_base_currency(base)
+        return self.db_manager.add_exchange_rates([rows])
+
+    def recurring_transactions(self):
+        """Return the salaries, bills and transfers of the ledger by day.
+
+        Returns:
+            dict: Lists of (account ID, category ID, amount, type, description) rows by
+                date, amounts being None for the credit card payments
+        """
+        schedule = {}
+        employer = self.random.choice(('Grupo Bimbo', 'FEMSA', 'Cemex', 'Banorte', 'Liverpool', 'Telmex'))
+        payroll_id, _, _, payroll_currency, _ = self.payroll
+        scale = self.currency_scale(payroll_currency)
+        salary_category = self.category_ids.get('Salario')
+        transfer_category = self.category_ids.get('Transferencia')
+        deposit_category = self.category_ids.get('Otros Ingresos')
+
+        # Expected monthly purchases of each account, in the base currency; large
+        # ledgers earn more, so that the balances stay in a realistic range
+        mean_amount = sum(share * kind[2] for share, kind in zip(self.purchase_shares, self.purchase_kinds)
+                          if kind[1] == 'expense') / sum(self.purchase_shares)
+        monthly_spending = self.transaction_count / (self.days / 30.44) * mean_amount * math.exp(AMOUNT_SIGMA ** 2 / 2)
+        total_share = self.account_weights[-1] if self.account_weights else 1
+        account_spending = {account[0]: monthly_spending * account[4] / total_share for account in self.accounts}
+        bills = sum(amount / every for _, _, _, amount, every in BILLS)
+        # Only accounts in the payroll currency are funded from the payroll account
+        funded_spending = sum(account_spending[account[0]] for account in self.accounts if account[3] == payroll_currency)
+        salary = max(self.random.randrange(28000, 48000, 500), (funded_spending + bills) * 1.1) / 2
+        prices = 1.0
+
+        savings_accounts = [account for account in self.accounts[1:] if not account[4]]
+
+        year, month = self.start.year, self.start.month
+        while date(year, month, 1) <= self.end:
+            if month == 1 and year > self.start.year:
+                salary = round(salary * (1 + INFLATION + self.random.uniform(-0.01, 0.01)), -1)
+                prices *= 1 + INFLATION
+
+            def add(day, row):
+                when = date(year, month, min(day, last_day(year, month)))
+                if self.start <= when <= self.end:
+                    schedule.setdefault(when, []).append(row)
+
+            for day in (15, 31):
+                add(day, (payroll_id, salary_category, round(salary * scale, 2), 'income', f'Nómina {employer}'))
+            for day, description, category, amount, every in BILLS:
+                if (year * 12 + month) % every == 0:
+                    amount = round(amount * prices * self.random.uniform(0.97, 1.03) * scale, 2)
+                    add(day, (payroll_id, self.category_ids.get(category), amount, 'expense', description))
+
+            # Credit cards are paid off, and the other accounts funded, from the payroll account
+            for account_id, name, account_type, currency, share in self.accounts[1:]:
+                if account_type == 'credit':
+                    amount = None
+                elif share:
+                    amount = account_spending[account_id] * prices * self.random.uniform(0.95, 1.1)
+                else:
+                    amount = salary * self.random.uniform(0.1, 0.2) / len(savings_accounts)
+
+                if currency != payroll_currency:
+                    # Accounts in other currencies are funded by deposits, in their own currency
+                    if amount is not None:
+                        amount = round(amount * self.currency_scale(currency), 2)
+                    add(10 if amount is None else 16, (account_id, deposit_category, amount, 'income', 'Depósito'))
+                elif amount is None:
+                    add(10, (payroll_id, transfer_category, None, 'transfer', f'Pago a {name}:{account_id}'))
+                elif account_type == 'cash':
+                    add(1, (payroll_id, transfer_category, round(amount * scale, 2), 'transfer',
+                            f'Retiro de efectivo a {name}:{account_id}'))
+                else:
+                    add(16, (payroll_id, transfer_category, round(amount * scale, 2), 'transfer',
+                             f'Transferencia a {name}:{account_id}'))
+            if month == 12:
+                add(20, (payroll_id, salary_category, round(salary * scale, 2), 'income', 'Aguinaldo'))
+
+            year, month = add_months(year, month, 1)
+        return schedule
+
+    def transaction_chunks(self):
+        """Yield the transactions of the ledger in chunks, oldest first."""
+        schedule = self.recurring_transactions()
+        recurring_count = sum(len(rows) for rows in schedule.values())
+        counts = daily_counts(self.start, self.days, max(0, self.transaction_count - recurring_count))
+
+        choices = self.random.choices
+        merchants, merchant_weights = self.merchants, self.merchant_weights
+        accounts, account_weights = self.purchase_accounts, self.account_weights
+        card_ids = {account[0] for account in self.accounts if account[2] == 'credit'}
+        card_spending = dict.fromkeys(card_ids, 0.0)
+
+        rows = []
+        for offset, count in enumerate(counts):
+            day = self.start + timedelta(days=offset)
+            timestamp = f'{day.isoformat()} 00:00:00'
+            inflation = (1 + INFLATION) ** (offset / 365.25)
+
+            for account_id, category_id, amount, transaction_type, description in schedule.get(day, ()):
+                if amount is None:
+                    # The card payment settles what was spent since the previous one
+                    card_id = int(description.rsplit(':', 1)[-1]) if ':' in description else account_id
+                    amount, card_spending[card_id] = round(card_spending[card_id], 2), 0.0
+                    if amount <= 0:
+                        continue
+                rows.append((account_id, category_id, amount, transaction_type, description, timestamp))
+
+            budgeted = day >= self.budget_start
+            month = timestamp[:7]
+            for (category_id, transaction_type, median, merchant), (account_id, scale), spread in zip(
+                    choices(merchants, cum_weights=merchant_weights, k=count),
+                    choices(accounts, cum_weights=account_weights, k=count),
+                    choices(AMOUNT_SPREAD, k=count)):
+                amount = round(median * inflation * scale * spread, 2)
+                rows.append((account_id, category_id, amount, transaction_type, merchant, timestamp))
+
+                if account_id in card_ids:
+                    card_spending[account_id] += amount if transaction_type == 'expense' else -amount
+                if budgeted and transaction_type == 'expense':
+                    key = (month, category_id)
+                    self.spending[key] = self.spending.get(key, 0) + amount / scale
+
+            if len(rows) >= CHUNK_SIZE:
+                yield rows
+                rows = []
+        if rows:
+            yield rows
+
+    def create_budgets(self):
+        """Add monthly budgets of the last year, around what was spent in each category.
+
+        Returns:
+            int: Number of budgets
+        """
+        count = 0
+        current = f'{self.end.year:04d}-{self.end.month:02d}'
+        for delta in range(-12, 1):
+            year, month = add_months(self.end.year, self.end.month, delta)
+            key = f'{year:04d}-{month:02d}'
+            # The current month is budgeted from the previous one
+            spent_month = key if key != current else '%04d-%02d' % add_months(year, month, -1)
+            for category_id, _, _, _ in self.purchase_kinds[:-1]:
+                spent = self.spending.get((spent_month, category_id), 0)
+                if category_id is None or spent <= 0:
+                    continue
+                amount = round(spent * self.random.uniform(0.85, 1.2), -1)
+                self.db_manager.add_budget(category_id, amount, 'monthly', f'{key}-01',
+                                           f'{key}-{last_day(year, month):02d}')
+                count += 1
+        return count
+
+    def create_goals(self):
+        """Add goals with some progress, completing the ones already reached.
+
+        Returns:
+            int: Number of goals
+        """
+        for number in range(self.goal_count):
+            name, target = GOAL_TEMPLATES[number % len(GOAL_TEMPLATES)]
+            if number >= len(GOAL_TEMPLATES):
+                name = f'{name} {number // len(GOAL_TEMPLATES) + 1}'
+            year, month = add_months(self.end.year, self.end.month, self.random.randint(3, 36))
+            goal_id = self.db_manager.add_goal(name, target, f'{year:04d}-{month:02d}-01')
+            current_amount = round(target * min(1.0, self.random.uniform(0.05, 1.15)), 2)
+            self.db_manager.update_goal(goal_id, current_amount=current_amount,
+                                        is_completed=int(current_amount >= target))
+        return self.goal_count
+
+
+def generate_ledger(db_manager, on_progress=None, **options):
+    """Write a synthetic ledger to an empty database.
+
+    Args:
+        db_manager (DatabaseManager): Manager of an empty database, set up
+        on_progress (callable, optional): Called with the number of transactions written
+        **options: LedgerGenerator options
+
+    Returns:
+        dict: Number of rows written per table
+    """
+    return LedgerGenerator(db_manager, **options).generate(on_progress)
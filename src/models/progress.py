@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Progress and cancellation of computations running on a worker thread.
+
+Models take an optional worker and call report_step() between steps, so the
+same code runs on the GUI thread, on a worker or from the command line
+without importing Qt.
+"""
+
+
+def report_step(worker, percentage):
+    """Report the progress of a computation running on a worker.
+
+    Args:
+        worker (Worker): Worker running the computation, or None
+        percentage (int): Progress so far (0-100)
+
+    Returns:
+        bool: False if the worker was cancelled and the computation should stop
+    """
+    if worker is None:
+        return True
+    if worker.is_cancelled():
+        return False
+    worker.report_progress(percentage)
+    return True
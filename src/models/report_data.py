@@ -0,0 +1,337 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Report data computations.
+
+Each function reads the data shown by a single report and returns it as
+immutable named tuples, so the report can be rendered without touching the
+database again. Functions take an optional worker, so they can run on a
+worker thread, report their progress and stop early once cancelled.
+"""
+
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+
+from src.models.dashboard_data import add_months
+from src.models.progress import report_step
+
+# Number of slices of the category report, "Otros" included
+TOP_CATEGORIES = 8
+
+# Bucket collecting the categories beyond the top ones
+OTHERS_LABEL = "Otros"
+OTHERS_COLOR = "#888888"
+
+# Total of a single category, or of the "Otros" bucket when category_id is None
+CategoryTotal = namedtuple('CategoryTotal', ['category_id', 'name', 'color', 'total', 'percentage'])
+
+# Expenses by category over a period
+CategoryReport = namedtuple('CategoryReport', ['start_date', 'end_date', 'account_id', 'total', 'categories'])
+
+# Income and expenses of a single month
+MonthTotals = namedtuple('MonthTotals', ['month', 'label', 'income', 'expenses'])
+
+# Income and expenses per month over a period
+IncomeExpenseReport = namedtuple('IncomeExpenseReport', ['start_date', 'end_date', 'account_id', 'months',
+                                                         'total_income', 'total_expenses'])
+
+# Monthly averages and net worth growth over a period, for every account
+TrendReport = namedtuple('TrendReport', ['start_date', 'end_date', 'account_id', 'average_income',
+                                         'average_expenses', 'growth'])
+
+# Budgeted and actual expenses of a single category
+BudgetLine = namedtuple('BudgetLine', ['category_id', 'name', 'budgeted', 'actual'])
+
+# Budgets against actual expenses over a period
+BudgetReport = namedtuple('BudgetReport', ['start_date', 'end_date', 'account_id', 'lines',
+                                           'total_budgeted', 'total_actual'])
+
+# Average number of days per month
+DAYS_PER_MONTH = 30.4375
+
+# Number of computed reports kept by a ReportCache
+REPORT_CACHE_SIZE = 32
+
+
+def next_day(date):
+    """Return the day after a 'YYYY-MM-DD' date, as an exclusive end date."""
+    return (datetime.strptime(date[:10], '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+
+
+def month_keys(start_date, end_date):
+    """Return the 'YYYY-MM' keys of the months from start_date to end_date, both included."""
+    year, month = int(start_date[:4]), int(start_date[5:7])
+    end_key = end_date[:7]
+    keys = []
+    while f'{year:04d}-{month:02d}' <= end_key:
+        keys.append(f'{year:04d}-{month:02d}')
+        year, month = add_months(year, month, 1)
+    return keys
+
+
+def rank_categories(rows, top=TOP_CATEGORIES):
+    """Keep the largest categories and merge the rest into "Otros".
+
+    Args:
+        rows (list): get_category_totals() rows, largest first
+        top (int, optional): Maximum number of entries, "Otros" included
+
+    Returns:
+        tuple: CategoryTotal entries, largest first and "Otros" last
+    """
+    total = sum(row['total'] for row in rows)
+
+    def percentage(value):
+        return (value / total) * 100 if total > 0 else 0
+
+    shown = rows if len(rows) <= top else rows[:top - 1]
+    categories = [CategoryTotal(row['category_id'], row['category_name'], row['category_color'],
+                                row['total'], percentage(row['total']))
+                  for row in shown]
+
+    if len(shown) < len(rows):
+        others = sum(row['total'] for row in rows[len(shown):])
+        categories.append(CategoryTotal(None, OTHERS_LABEL, OTHERS_COLOR, others, percentage(others)))
+    return tuple(categories)
+
+
+def compute_income_expense_report(db_manager, start_date, end_date, account_id=None, worker=None):
+    """Compute the income vs expenses report.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        start_date (str): Start date in format 'yyyy-MM-dd'
+        end_date (str): End date in format 'yyyy-MM-dd', included in the report
+        account_id (int, optional): Account ID to filter by. Defaults to None.
+        worker (Worker, optional): Worker running the computation
+
+    Returns:
+        IncomeExpenseReport: Report data, or None if the worker was cancelled
+    """
+    rows = db_manager.get_monthly_totals(start_date, next_day(end_date), account_id)
+    if not report_step(worker, 80):
+        return None
+
+    totals = {}
+    for row in rows:
+        totals.setdefault(row['month'], {})[row['type']] = row['total'] or 0
+
+    # Every month of the period, with the year in the label when the period spans several
+    keys = month_keys(start_date, end_date)
+    label_format = '%b' if keys and keys[0][:4] == keys[-1][:4] else '%b %Y'
+    months = tuple(MonthTotals(key, datetime.strptime(key, '%Y-%m').strftime(label_format),
+                               totals.get(key, {}).get('income', 0), totals.get(key, {}).get('expense', 0))
+                   for key in keys)
+    return IncomeExpenseReport(start_date, end_date, account_id, months,
+                               sum(month.income for month in months), sum(month.expenses for month in months))
+
+
+def compute_category_report(db_manager, start_date, end_date, account_id=None, top=TOP_CATEGORIES, worker=None):
+    """Compute the expenses by category report.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        start_date (str): Start date in format 'yyyy-MM-dd'
+        end_date (str): End date in format 'yyyy-MM-dd', included in the report
+        account_id (int, optional): Account ID to filter by. Defaults to None.
+        top (int, optional): Maximum number of categories, "Otros" included
+        worker (Worker, optional): Worker running the computation
+
+    Returns:
+        CategoryReport: Report data, or None if the worker was cancelled
+    """
+    rows = db_manager.get_category_totals(start_date=start_date, end_date=next_day(end_date),
+                                          transaction_type='expense', account_id=account_id)
+    if not report_step(worker, 80):
+        return None
+    return CategoryReport(start_date, end_date, account_id, sum(row['total'] for row in rows),
+                          rank_categories(rows, top))
+
+
+def compute_trend_report(db_manager, start_date, end_date, account_id=None, worker=None):
+    """Compute the trend summary of every account, like the daily trend charts.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        start_date (str): Start date in format 'yyyy-MM-dd'
+        end_date (str): End date in format 'yyyy-MM-dd', included in the report
+        account_id (int, optional): Account selected in the report filters. The trends
+            include every account.
+        worker (Worker, optional): Worker running the computation
+
+    Returns:
+        TrendReport: Report data, or None if the worker was cancelled
+    """
+    period = db_manager.get_totals_by_type(start_date, next_day(end_date))
+    if not report_step(worker, 40):
+        return None
+
+    # Net worth before the period, from the initial balances and every earlier flow
+    earlier = db_manager.get_totals_by_type(end_date=start_date)
+    if not report_step(worker, 80):
+        return None
+    initial = db_manager.get_total_initial_balance()
+    opening = initial + earlier['income'] - earlier['expense']
+    closing = opening + period['income'] - period['expense']
+
+    days = (datetime.strptime(end_date, '%Y-%m-%d') - datetime.strptime(start_date, '%Y-%m-%d')).days + 1
+    months = max(days / DAYS_PER_MONTH, 1)
+    growth = ((closing - opening) / opening) * 100 if opening > 0 else 0
+    return TrendReport(start_date, end_date, account_id, period['income'] / months, period['expense'] / months,
+                       growth)
+
+
+def compute_budget_report(db_manager, start_date, end_date, account_id=None, worker=None):
+    """Compute the budgets vs actual expenses report.
+
+    Budgets overlapping the period are compared, per category, with the
+    category's expenses over the whole period.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        start_date (str): Start date in format 'yyyy-MM-dd'
+        end_date (str): End date in format 'yyyy-MM-dd', included in the report
+        account_id (int, optional): Account ID to filter expenses by. Defaults to None.
+        worker (Worker, optional): Worker running the computation
+
+    Returns:
+        BudgetReport: Report data, or None if the worker was cancelled
+    """
+    budgeted, names = {}, {}
+    for budget in db_manager.get_budgets(active_only=False):
+        if str(budget['start_date'])[:10] <= end_date and str(budget['end_date'])[:10] >= start_date:
+            budgeted[budget['category_id']] = budgeted.get(budget['category_id'], 0) + budget['amount']
+            names[budget['category_id']] = budget['category_name'] or OTHERS_LABEL
+    if not report_step(worker, 40):
+        return None
+
+    actual = {}
+    if budgeted:
+        rows = db_manager.get_category_totals(start_date=start_date, end_date=next_day(end_date),
+                                              transaction_type='expense', account_id=account_id)
+        actual = {row['category_id']: row['total'] for row in rows}
+    if not report_step(worker, 80):
+        return None
+
+    # Largest budgets first
+    lines = tuple(BudgetLine(category_id, names[category_id], amount, actual.get(category_id, 0))
+                  for category_id, amount in sorted(budgeted.items(), key=lambda item: -item[1]))
+    return BudgetReport(start_date, end_date, account_id, lines, sum(line.budgeted for line in lines),
+                        sum(line.actual for line in lines))
+
+
+# Function computing each type of report
+REPORT_FUNCTIONS = {
+    'income_expense': compute_income_expense_report,
+    'category': compute_category_report,
+    'trend': compute_trend_report,
+    'budget': compute_budget_report,
+}
+
+# Types of report that include every account, whatever account is selected
+ALL_ACCOUNT_REPORTS = {'trend'}
+
+
+def compute_report(db_manager, report_type, start_date, end_date, account_id=None, worker=None):
+    """Compute the data of any type of report.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+        report_type (str): Type of report ('income_expense', 'category', 'trend' or 'budget')
+        start_date (str): Start date in format 'yyyy-MM-dd'
+        end_date (str): End date in format 'yyyy-MM-dd', included in the report
+        account_id (int, optional): Account ID to filter by. Defaults to None.
+        worker (Worker, optional): Worker running the computation
+
+    Returns:
+        The report's data object, or None if the worker was cancelled
+
+    Raises:
+        ValueError: If the report type is unknown
+    """
+    if report_type not in REPORT_FUNCTIONS:
+        raise ValueError(f"Unknown report type: {report_type}")
+    if not report_step(worker, 0):
+        return None
+
+    report = REPORT_FUNCTIONS[report_type](db_manager, start_date, end_date, account_id, worker=worker)
+    if report is not None and not report_step(worker, 100):
+        return None
+    return report
+
+
+def report_rows(report):
+    """Return the data of a report as a table, e.g. to write it as CSV.
+
+    Args:
+        report: IncomeExpenseReport, CategoryReport, TrendReport or BudgetReport
+
+    Returns:
+        tuple: (column titles, list of row tuples)
+    """
+    if isinstance(report, IncomeExpenseReport):
+        return (["Mes", "Ingresos", "Gastos", "Neto"],
+                [(month.month, round(month.income, 2), round(month.expenses, 2),
+                  round(month.income - month.expenses, 2)) for month in report.months])
+    if isinstance(report, CategoryReport):
+        return (["Categoría", "Monto", "Porcentaje"],
+                [(entry.name, round(entry.total, 2), round(entry.percentage, 2)) for entry in report.categories])
+    if isinstance(report, TrendReport):
+        return (["Ingreso Mensual Promedio", "Gasto Mensual Promedio", "Crecimiento Patrimonial"],
+                [(round(report.average_income, 2), round(report.average_expenses, 2), round(report.growth, 2))])
+    if isinstance(report, BudgetReport):
+        return (["Categoría", "Presupuestado", "Real", "Diferencia"],
+                [(line.name, round(line.budgeted, 2), round(line.actual, 2), round(line.budgeted - line.actual, 2))
+                 for line in report.lines])
+    raise ValueError(f"Unknown report: {type(report).__name__}")
+
+
+def report_to_dict(report):
+    """Return the data of a report as nested dictionaries and lists, e.g. to write it as JSON."""
+    if hasattr(report, '_asdict'):
+        return {field: report_to_dict(value) for field, value in report._asdict().items()}
+    if isinstance(report, tuple):
+        return [report_to_dict(value) for value in report]
+    return report
+
+
+class ReportCache:
+    """Least recently used cache of computed reports.
+
+    Keys include the database's data version (ChangeBus.generation), so a
+    write makes every earlier result unreachable; those entries are evicted
+    as new reports are stored.
+    """
+
+    def __init__(self, max_size=REPORT_CACHE_SIZE):
+        """Initialize the cache.
+
+        Args:
+            max_size (int, optional): Maximum number of reports kept
+        """
+        self.max_size = max_size
+        self.reports = OrderedDict()
+
+    @staticmethod
+    def key(report_type, start_date, end_date, account_id, generation):
+        """Return the cache key of a report request."""
+        return (report_type, start_date, end_date, account_id, generation)
+
+    def get(self, key):
+        """Return a cached report and mark it as recently used, or None."""
+        report = self.reports.get(key)
+        if report is not None:
+            self.reports.move_to_end(key)
+        return report
+
+    def put(self, key, report):
+        """Store a computed report, evicting the least recently used ones."""
+        self.reports[key] = report
+        self.reports.move_to_end(key)
+        while len(self.reports) > self.max_size:
+            self.reports.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached report."""
+        self.reports.clear()
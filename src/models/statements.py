@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming parsers of bank statement files: OFX/QFX, QIF and CAMT.053.
+
+Each parser reads a binary file incrementally and yields one entry per
+transaction, discarding what it has read, so statements covering many
+years are parsed in bounded memory. Entries hold the texts found in the
+file; converting them into transactions is left to the importers.
+"""
+
+import codecs
+import html
+import re
+from collections import namedtuple
+from xml.etree import ElementTree
+
+# Bytes read from the file at a time
+BLOCK_SIZE = 64 * 1024
+
+# Transaction of a statement. The amount is signed (negative for debits),
+# and account is the statement's account number or name, if any.
+StatementEntry = namedtuple('StatementEntry', ['number', 'date', 'amount', 'description', 'account', 'category'])
+
+# Opening or closing tag of an OFX file and the text after it, up to the next tag
+OFX_TAG = re.compile(r'<(/?)([A-Za-z0-9.]+)[^>]*>([^<]*)')
+
+# QIF sections listing transactions; categories, memorized and investment sections are skipped
+QIF_TRANSACTION_SECTIONS = ('!type:bank', '!type:cash', '!type:ccard', '!type:oth a', '!type:oth l')
+
+
+def detect_format(path):
+    """Guess the format of a statement file from its first bytes.
+
+    Returns:
+        str: 'ofx', 'qif', 'camt053' or 'csv'
+    """
+    with open(path, 'rb') as statement_file:
+        head = statement_file.read(4096)
+    head = head.lstrip(codecs.BOM_UTF8).lstrip()
+    if head.startswith(b'OFXHEADER') or b'<OFX>' in head.upper():
+        return 'ofx'
+    if head.startswith(b'!'):
+        return 'qif'
+    if head.startswith(b'<') and b'camt.053' in head:
+        return 'camt053'
+    return 'csv'
+
+
+def ofx_encoding(head):
+    """Return the encoding declared by an OFX header, UTF-8 by default."""
+    header = head.upper()
+    if b'CHARSET:1252' in header or b'ISO-8859-1' in header or b'CHARSET:8859-1' in header:
+        return 'cp1252'
+    return 'utf-8'
+
+
+def ofx_entry(number, fields, account):
+    """Build the entry of an OFX <STMTTRN> aggregate."""
+    name, memo = fields.get('NAME', ''), fields.get('MEMO', '')
+    description = f"{name} - {memo}" if name and memo and memo != name else name or memo
+    return StatementEntry(number, fields.get('DTPOSTED', fields.get('DTUSER', ''))[:8], fields.get('TRNAMT', ''),
+                          description, account, '')
+
+
+def parse_ofx(statement_file):
+    """Yield the transactions of an OFX or QFX file, in SGML (1.x) or XML (2.x) form.
+
+    The file is read in blocks and scanned for tags, so no document tree is
+    built; SGML leaf elements without closing tags are read the same way.
+
+    Args:
+        statement_file (file): File opened in binary mode
+
+    Yields:
+        StatementEntry: One entry per <STMTTRN>; dates are 'YYYYMMDD'
+    """
+    head = statement_file.read(BLOCK_SIZE)
+    decoder = codecs.getincrementaldecoder(ofx_encoding(head[:1024]))(errors='replace')
+    text = decoder.decode(head)
+    account = ''
+    fields = None
+    number = 0
+
+    while True:
+        block = statement_file.read(BLOCK_SIZE)
+        # Scan up to the last tag start; its text may continue in the next block
+        end = len(text) if not block else text.rfind('<')
+        for match in OFX_TAG.finditer(text, 0, max(end, 0)):
+            closing, tag, value = match.group(1), match.group(2).upper(), html.unescape(match.group(3).strip())
+            if tag == 'STMTTRN':
+                if closing and fields is not None:
+                    number += 1
+                    yield ofx_entry(number, fields, account)
+                fields = None if closing else {}
+            elif closing or not value:
+                continue
+            elif tag == 'ACCTID' and fields is None:
+                # Accounts inside a transaction are transfer targets
+                account = value
+            elif fields is not None:
+                fields[tag] = value
+
+        if not block:
+            return
+        text = text[max(end, 0):] + decoder.decode(block)
+
+
+def qif_date(text):
+    """Expand the two-digit years of a QIF date, e.g. "1/ 5'24" becomes '1/5/2024'.
+
+    Quicken writes an apostrophe before the years after 1999.
+    """
+    text = text.replace(' ', '')
+    parts = re.split(r"[/'.-]", text)
+    if len(parts) == 3 and len(parts[2]) == 2:
+        parts[2] = ('20' if "'" in text else '19') + parts[2]
+        return '/'.join(parts)
+    return text
+
+
+def parse_qif(lines):
+    """Yield the transactions of a QIF file.
+
+    Args:
+        lines (iterable): Lines of the file, as text
+
+    Yields:
+        StatementEntry: One entry per record of the bank, cash and card
+            sections; dates keep the file's day and month order
+    """
+    account = ''
+    section = ''
+    fields = {}
+    number = 0
+
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if not line:
+            continue
+        if line.startswith('!'):
+            header = line.strip().lower()
+            # Options change how records are read, not the current section
+            if not header.startswith(('!option', '!clear')):
+                section = header
+            fields = {}
+            continue
+
+        code, value = line[0], line[1:].strip()
+        if code != '^':
+            # Split lines (S, E, $) repeat codes; the first value is kept
+            fields.setdefault(code, value)
+            continue
+
+        if section == '!account':
+            account = fields.get('N', account)
+        elif section in QIF_TRANSACTION_SECTIONS:
+            number += 1
+            payee, memo = fields.get('P', ''), fields.get('M', '')
+            description = f"{payee} - {memo}" if payee and memo and memo != payee else payee or memo
+            # '[Account]' categories are transfers; subcategories follow a ':'
+            category = fields.get('L', '')
+            category = '' if category.startswith('[') else category.split(':')[0]
+            yield StatementEntry(number, qif_date(fields.get('D', '')), fields.get('T', fields.get('U', '')),
+                                 description, account, category)
+        fields = {}
+
+
+def local_name(tag):
+    """Return a tag without its namespace."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def find_text(element, namespace, *paths):
+    """Return the text of the first of several child paths found, e.g. 'Id/IBAN'."""
+    for path in paths:
+        child = element.find('/'.join(namespace + step for step in path.split('/')))
+        if child is not None and child.text and child.text.strip():
+            return child.text.strip()
+    return ''
+
+
+def camt_entry(number, entry, namespace, account):
+    """Build the entry of a CAMT.053 <Ntry> element, or None for entries not booked yet."""
+    if find_text(entry, namespace, 'Sts', 'Sts/Cd') in ('PDNG', 'INFO'):
+        return None
+
+    amount = find_text(entry, namespace, 'Amt')
+    if find_text(entry, namespace, 'CdtDbtInd') == 'DBIT':
+        amount = '-' + amount
+    date = find_text(entry, namespace, 'BookgDt/Dt', 'BookgDt/DtTm', 'ValDt/Dt', 'ValDt/DtTm')[:10]
+
+    # The other party is the creditor of debits and the debtor of credits
+    party = 'Cdtr' if amount.startswith('-') else 'Dbtr'
+    details = 'NtryDtls/TxDtls/'
+    name = find_text(entry, namespace, f'{details}RltdPties/{party}/Nm', f'{details}RltdPties/{party}/Pty/Nm')
+    information = find_text(entry, namespace, f'{details}RmtInf/Ustrd', f'{details}AddtlTxInf', 'AddtlNtryInf')
+    description = f"{name} - {information}" if name and information else name or information
+    return StatementEntry(number, date, amount, description, account, '')
+
+
+def parse_camt053(statement_file):
+    """Yield the booked entries of an ISO 20022 CAMT.053 bank statement.
+
+    The XML is parsed with iterparse, and every entry is removed from the
+    tree once read, so the document is never held whole in memory.
+
+    Args:
+        statement_file (file): File opened in binary mode
+
+    Yields:
+        StatementEntry: One entry per <Ntry>; dates are 'YYYY-MM-DD'
+    """
+    account = ''
+    namespace = None
+    parents = []
+    number = 0
+
+    for event, element in ElementTree.iterparse(statement_file, events=('start', 'end')):
+        if event == 'start':
+            if namespace is None:
+                namespace = element.tag[:element.tag.index('}') + 1] if element.tag.startswith('{') else ''
+            parents.append(element)
+            continue
+
+        parents.pop()
+        tag = local_name(element.tag)
+        if tag == 'Acct' and parents and local_name(parents[-1].tag) == 'Stmt':
+            account = find_text(element, namespace, 'Id/IBAN', 'Id/Othr/Id')
+        elif tag == 'Ntry':
+            number += 1
+            entry = camt_entry(number, element, namespace, account)
+            if entry is not None:
+                yield entry
+            # Entries are children of the statement; drop them once read
+            if parents:
+                parents[-1].remove(element)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Level-of-detail pyramids of daily time series.
+
+A pyramid keeps the min, max and sum of a daily series at every power-of-two
+bin width, so a chart can draw any date range with at most one bin per
+pixel, whatever the length of the series. Pyramids are built once from the
+database and then updated in place as transactions are added.
+"""
+
+from collections import namedtuple
+from datetime import date, datetime
+
+import numpy as np
+
+# Ordinal of the day used as day number 0
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Bins of a pyramid level covering a range of days
+Window = namedtuple('Window', ['days', 'mins', 'maxs', 'sums', 'bin_days'])
+
+
+def day_number(value):
+    """Return the number of days since 1970-01-01 of a date.
+
+    Args:
+        value (date|datetime|str): Date, optionally a 'YYYY-MM-DD[ HH:MM:SS]' string
+
+    Returns:
+        int: Day number
+    """
+    if isinstance(value, str):
+        value = date(int(value[:4]), int(value[5:7]), int(value[8:10]))
+    elif isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def day_date(number):
+    """Return the date of a day number."""
+    return date.fromordinal(int(number) + EPOCH_ORDINAL)
+
+
+def densify(days, values):
+    """Turn sparse (day, value) pairs into one value per day.
+
+    Args:
+        days (iterable): Day numbers, in any order
+        values (iterable): Value of each day; repeated days are added up
+
+    Returns:
+        tuple: (first day number, numpy array with one value per day); an empty
+            series starts today
+    """
+    days = np.asarray(days, dtype=np.int64)
+    if not len(days):
+        return day_number(date.today()), np.empty(0)
+
+    first_day = int(days.min())
+    return first_day, np.bincount(days - first_day, weights=np.asarray(values, dtype=float))
+
+
+class LodPyramid:
+    """Min/max/sum pyramid of a daily series.
+
+    Level 0 holds one bin per day; each level above merges pairs of bins of
+    the level below. Bins past the last day are padding and do not affect
+    min and max.
+    """
+
+    def __init__(self, first_day, values):
+        """Initialize the pyramid.
+
+        Args:
+            first_day (int): Day number of the first value
+            values (iterable): One value per day, starting at first_day
+        """
+        self.first_day = int(first_day)
+        self._build(np.asarray(values, dtype=float))
+
+    @classmethod
+    def from_days(cls, days, values):
+        """Build a pyramid from sparse (day, value) pairs.
+
+        Args:
+            days (iterable): Day numbers, in any order
+            values (iterable): Value of each day; repeated days are added up
+
+        Returns:
+            LodPyramid: Pyramid covering the first to the last day
+        """
+        first_day, dense = densify(days, values)
+        return cls(first_day, dense)
+
+    def _build(self, values):
+        """Allocate every level and fill it from the level-0 values."""
+        self.length = len(values)
+        capacity = 1
+        while capacity < max(self.length, 1):
+            capacity *= 2
+
+        mins = np.full(capacity, np.inf)
+        maxs = np.full(capacity, -np.inf)
+        sums = np.zeros(capacity)
+        mins[:self.length] = values
+        maxs[:self.length] = values
+        sums[:self.length] = values
+        self.mins, self.maxs, self.sums = [mins], [maxs], [sums]
+
+        while len(self.sums[-1]) > 1:
+            self.mins.append(self.mins[-1].reshape(-1, 2).min(axis=1))
+            self.maxs.append(self.maxs[-1].reshape(-1, 2).max(axis=1))
+            self.sums.append(self.sums[-1].reshape(-1, 2).sum(axis=1))
+
+    def _refresh(self, first, last):
+        """Recompute the upper-level bins covering level-0 bins first to last."""
+        for level in range(1, len(self.sums)):
+            first, last = first // 2, last // 2
+            below = slice(2 * first, 2 * last + 2)
+            self.mins[level][first:last + 1] = self.mins[level - 1][below].reshape(-1, 2).min(axis=1)
+            self.maxs[level][first:last + 1] = self.maxs[level - 1][below].reshape(-1, 2).max(axis=1)
+            self.sums[level][first:last + 1] = self.sums[level - 1][below].reshape(-1, 2).sum(axis=1)
+
+    def leading_value(self):
+        """Return the value of the days added before the first one."""
+        return 0.0
+
+    def trailing_value(self):
+        """Return the value of the days added after the last one."""
+        return 0.0
+
+    def _cover(self, day):
+        """Extend the series so it includes a day.
+
+        Returns:
+            int: Level-0 index of the day
+        """
+        index = day - self.first_day
+        if not self.length:
+            # An empty series starts at its first day
+            self.first_day = day
+            self._build(np.full(1, self.trailing_value()))
+            return 0
+
+        if index < 0:
+            # Prepend days; the pyramid is rebuilt
+            values = np.concatenate([np.full(-index, self.leading_value()), self.values])
+            self.first_day = day
+            self._build(values)
+            return 0
+
+        if index >= len(self.sums[0]):
+            # Append days past the capacity; the pyramid is rebuilt
+            self._build(np.concatenate([self.values, np.full(index + 1 - self.length, self.trailing_value())]))
+            return index
+
+        if index >= self.length:
+            # Turn padding into days
+            first, fill = self.length, self.trailing_value()
+            self.mins[0][first:index + 1] = fill
+            self.maxs[0][first:index + 1] = fill
+            self.sums[0][first:index + 1] = fill
+            self.length = index + 1
+            self._refresh(first, index)
+        return index
+
+    @property
+    def values(self):
+        """Level-0 values, one per day from first_day."""
+        return self.sums[0][:self.length].copy()
+
+    @property
+    def last_day(self):
+        """Day number of the last value."""
+        return self.first_day + self.length - 1
+
+    @property
+    def levels(self):
+        """Number of levels, level 0 included."""
+        return len(self.sums)
+
+    def add(self, day, amount):
+        """Add an amount to the value of a day.
+
+        Args:
+            day (int): Day number
+            amount (float): Amount to add
+        """
+        index = self._cover(day)
+        self.sums[0][index] += amount
+        self.mins[0][index] = self.maxs[0][index] = self.sums[0][index]
+        self._refresh(index, index)
+
+    def add_from(self, day, amount):
+        """Add an amount to a day and every later day, as a flow does to a running total.
+
+        Args:
+            day (int): Day number
+            amount (float): Amount to add
+        """
+        index = self._cover(day)
+        self.sums[0][index:self.length] += amount
+        self.mins[0][index:self.length] = self.sums[0][index:self.length]
+        self.maxs[0][index:self.length] = self.sums[0][index:self.length]
+        self._refresh(index, self.length - 1)
+
+    def value_at(self, day):
+        """Return the value of a day, including days outside the series."""
+        index = int(day) - self.first_day
+        if index < 0:
+            return self.leading_value()
+        if index >= self.length:
+            return self.trailing_value()
+        return float(self.sums[0][index])
+
+    def total(self, first_day, last_day):
+        """Return the sum of the values from first_day to last_day, both included."""
+        first = max(int(first_day) - self.first_day, 0)
+        last = min(int(last_day) - self.first_day, self.length - 1)
+        return float(self.sums[0][first:last + 1].sum()) if last >= first else 0.0
+
+    def level_for(self, day_count, max_bins):
+        """Return the finest level showing a number of days in at most max_bins bins."""
+        level = 0
+        while level < self.levels - 1 and day_count > max_bins * (1 << level):
+            level += 1
+        return level
+
+    def window(self, first_day, last_day, max_bins, level=None):
+        """Return the bins covering a range of days.
+
+        Args:
+            first_day (int): Day number of the first day in range
+            last_day (int): Day number of the last day in range
+            max_bins (int): Maximum number of bins, e.g. the chart width in pixels
+            level (int, optional): Level to read. Defaults to the finest level
+                fitting max_bins.
+
+        Returns:
+            Window: Day number where each bin starts, its min, max and sum, and the
+                number of days per bin
+        """
+        first = max(int(first_day) - self.first_day, 0)
+        last = min(int(last_day) - self.first_day, self.length - 1)
+        if level is None:
+            level = self.level_for(last - first + 1, max(int(max_bins), 1))
+        if last < first:
+            empty = np.empty(0)
+            return Window(empty, empty, empty, empty, 1 << level)
+
+        bins = slice(first >> level, (last >> level) + 1)
+        days = self.first_day + (np.arange(bins.start, bins.stop) << level)
+        return Window(days, self.mins[level][bins], self.maxs[level][bins], self.sums[level][bins], 1 << level)
+
+
+class RunningTotalPyramid(LodPyramid):
+    """Pyramid of a running total, e.g. a balance.
+
+    Days added after the last one keep its value, and days added before the
+    first one hold the starting value.
+    """
+
+    def __init__(self, first_day, values, initial=0.0):
+        """Initialize the pyramid.
+
+        Args:
+            first_day (int): Day number of the first value
+            values (iterable): Running total at the end of each day, starting at first_day
+            initial (float, optional): Running total before the first day
+        """
+        self.initial = initial
+        super().__init__(first_day, values)
+
+    @classmethod
+    def from_flows(cls, days, flows, initial=0.0):
+        """Build the running total of sparse (day, flow) pairs.
+
+        Args:
+            days (iterable): Day numbers, in any order
+            flows (iterable): Net flow of each day; repeated days are added up
+            initial (float, optional): Running total before the first flow
+
+        Returns:
+            RunningTotalPyramid: Pyramid covering the first to the last day
+        """
+        first_day, dense = densify(days, flows)
+        return cls(first_day, np.cumsum(dense) + initial, initial)
+
+    def leading_value(self):
+        return self.initial
+
+    def trailing_value(self):
+        return self.sums[0][self.length - 1] if self.length else self.initial
+
+
+def build_daily_series(db_manager):
+    """Build the daily income, expense and balance pyramids of every account.
+
+    Args:
+        db_manager (DatabaseManager): Database manager
+
+    Returns:
+        dict: LodPyramid per series name ('income', 'expense', 'balance')
+    """
+    rows = db_manager.get_daily_totals()
+    days = [day_number(row['day']) for row in rows]
+    income = [row['income'] for row in rows]
+    expense = [row['expense'] for row in rows]
+    initial = db_manager.get_total_initial_balance()
+
+    return {
+        'income': LodPyramid.from_days(days, income),
+        'expense': LodPyramid.from_days(days, expense),
+        'balance': RunningTotalPyramid.from_flows(days, np.subtract(income, expense), initial)
+    }
+
+
+def apply_transaction(series, transaction):
+    """Update the daily pyramids with a new transaction.
+
+    Args:
+        series (dict): Pyramids returned by build_daily_series()
+        transaction (dict): Transaction with 'date', 'type' and 'amount' keys
+    """
+    day = day_number(transaction['date'])
+    amount = transaction['amount']
+    if transaction['type'] == 'income':
+        series['income'].add(day, amount)
+        series['balance'].add_from(day, amount)
+    elif transaction['type'] == 'expense':
+        series['expense'].add(day, amount)
+        series['balance'].add_from(day, -amount)
@@ -10,6 +10,9 @@ from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QIcon, QFont, QColor
 import os
 
+from src.views.delegates import RowActionsDelegate
+from src.views.record_index import RecordIndex
+
 class AccountsView(QWidget):
     """Accounts view showing all financial accounts and their details."""
     
@@ -24,6 +27,8 @@ class AccountsView(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Accounts shown in the table, indexed by ID
+        self.record_index = RecordIndex()
         self.init_ui()
     
     def init_ui(self):
@@ -62,6 +67,11 @@ class AccountsView(QWidget):
         self.accounts_table.setSelectionBehavior(QTableWidget.SelectRows)
         self.accounts_table.setSelectionMode(QTableWidget.SingleSelection)
         
+        # Edit and delete buttons are painted by a delegate, not created per row
+        self.actions_delegate = RowActionsDelegate(self.accounts_table)
+        self.actions_delegate.action_triggered.connect(self.on_row_action)
+        self.accounts_table.setItemDelegateForColumn(4, self.actions_delegate)
+        
         main_layout.addWidget(self.accounts_table)
     
     def load_accounts(self, accounts):
@@ -70,49 +80,82 @@ class AccountsView(QWidget):
         Args:
             accounts (list): List of account dictionaries
         """
-        self.accounts_table.setRowCount(0)  # Clear existing rows
+        self.record_index.reset(accounts)
+        self.accounts_table.setRowCount(len(self.record_index))
         
-        if not accounts:
-            return
+        for row, account in enumerate(self.record_index.records):
+            self.set_account_row(row, account)
+    
+    def set_account_row(self, row, account):
+        """Fill a table row with an account.
         
-        for row, account in enumerate(accounts):
-            self.accounts_table.insertRow(row)
-            
-            # Name
-            name_item = QTableWidgetItem(account['name'])
-            self.accounts_table.setItem(row, 0, name_item)
-            
-            # Type
-            type_item = QTableWidgetItem(self.get_account_type_display(account['type']))
-            self.accounts_table.setItem(row, 1, type_item)
-            
-            # Currency
-            currency_item = QTableWidgetItem(account['currency'])
-            self.accounts_table.setItem(row, 2, currency_item)
-            
-            # Balance
-            balance_item = QTableWidgetItem(f"{account['current_balance']:.2f}")
-            balance_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.accounts_table.setItem(row, 3, balance_item)
-            
-            # Actions
-            actions_layout = QHBoxLayout()
-            actions_layout.setContentsMargins(4, 4, 4, 4)
-            actions_layout.setSpacing(4)
-            
-            edit_btn = QPushButton("Editar")
-            edit_btn.setProperty("account_id", account['id'])
-            edit_btn.clicked.connect(lambda checked, aid=account['id']: self.edit_account(aid))
-            actions_layout.addWidget(edit_btn)
-            
-            delete_btn = QPushButton("Eliminar")
-            delete_btn.setProperty("account_id", account['id'])
-            delete_btn.clicked.connect(lambda checked, aid=account['id']: self.delete_account(aid))
-            actions_layout.addWidget(delete_btn)
-            
-            actions_widget = QWidget()
-            actions_widget.setLayout(actions_layout)
-            self.accounts_table.setCellWidget(row, 4, actions_widget)
+        Args:
+            row (int): Table row
+            account (dict): Account dictionary
+        """
+        # Name
+        name_item = QTableWidgetItem(account['name'])
+        self.accounts_table.setItem(row, 0, name_item)
+        
+        # Type
+        type_item = QTableWidgetItem(self.get_account_type_display(account['type']))
+        self.accounts_table.setItem(row, 1, type_item)
+        
+        # Currency
+        currency_item = QTableWidgetItem(account['currency'])
+        self.accounts_table.setItem(row, 2, currency_item)
+        
+        # Balance
+        balance_item = QTableWidgetItem(f"{account['current_balance']:.2f}")
+        balance_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.accounts_table.setItem(row, 3, balance_item)
+        
+        # Actions, painted by the actions delegate
+        actions_item = QTableWidgetItem()
+        actions_item.setData(Qt.UserRole, account['id'])
+        self.accounts_table.setItem(row, 4, actions_item)
+    
+    def update_account_row(self, account):
+        """Refresh the row of an account in place.
+        
+        Args:
+            account (dict): Updated account dictionary
+        
+        Returns:
+            bool: True if the account is shown in the table
+        """
+        row = self.record_index.update(account)
+        if row is None:
+            return False
+        self.set_account_row(row, account)
+        return True
+    
+    def remove_account_row(self, account_id):
+        """Remove the row of an account.
+        
+        Args:
+            account_id (int): ID of the account
+        
+        Returns:
+            bool: True if the account was shown in the table
+        """
+        row = self.record_index.remove(account_id)
+        if row is None:
+            return False
+        self.accounts_table.removeRow(row)
+        return True
+    
+    def on_row_action(self, action, account_id):
+        """Handle a click on the edit or delete button of a row.
+        
+        Args:
+            action (str): Clicked action ('edit' or 'delete')
+            account_id (int): ID of the row's account
+        """
+        if action == 'edit':
+            self.edit_account(account_id)
+        elif action == 'delete':
+            self.delete_account(account_id)
     
     def get_account_type_display(self, account_type):
         """Convert account type code to display name.
@@ -204,34 +247,20 @@ class AccountsView(QWidget):
         Args:
             account_id (int): ID of the account to edit
         """
-        # Find the account data in the table
-        for row in range(self.accounts_table.rowCount()):
-            for col in range(self.accounts_table.columnCount()):
-                cell_widget = self.accounts_table.cellWidget(row, 4)
-                if cell_widget:
-                    actions_layout = cell_widget.layout()
-                    for i in range(actions_layout.count()):
-                        button = actions_layout.itemAt(i).widget()
-                        if button and button.property("account_id") == account_id and button.text() == "Editar":
-                            # Found the account, get its data
-                            name = self.accounts_table.item(row, 0).text()
-                            account_type_display = self.accounts_table.item(row, 1).text()
-                            currency = self.accounts_table.item(row, 2).text()
-                            balance = self.accounts_table.item(row, 3).text()
-                            
-                            # Show edit dialog
-                            self.show_edit_account_dialog(account_id, name, account_type_display, currency, balance)
-                            return
+        # Find the account in the row index
+        account = self.record_index.get(account_id)
+        if account is None:
+            return
+        
+        # Show edit dialog
+        self.show_edit_account_dialog(account_id, account)
     
-    def show_edit_account_dialog(self, account_id, name, account_type_display, currency, balance):
+    def show_edit_account_dialog(self, account_id, account):
         """Show dialog to edit an existing account.
         
         Args:
             account_id (int): ID of the account to edit
-            name (str): Current name of the account
-            account_type_display (str): Current account type display name
-            currency (str): Current currency
-            balance (str): Current balance as string
+            account (dict): Current account data
         """
         dialog = QDialog(self)
         dialog.setWindowTitle("Editar Cuenta")
@@ -243,7 +272,7 @@ class AccountsView(QWidget):
         form_layout.setSpacing(10)
         
         # Name field
-        name_edit = QLineEdit(name)
+        name_edit = QLineEdit(account['name'])
         form_layout.addRow("Nombre:", name_edit)
         
         # Type field
@@ -255,10 +284,7 @@ class AccountsView(QWidget):
         type_combo.addItem("Efectivo", "cash")
         type_combo.addItem("Otro", "other")
         # Set current account type
-        for i in range(type_combo.count()):
-            if type_combo.itemText(i) == account_type_display:
-                type_combo.setCurrentIndex(i)
-                break
+        type_combo.setCurrentIndex(max(0, type_combo.findData(account['type'])))
         form_layout.addRow("Tipo:", type_combo)
         
         # Currency field
@@ -267,10 +293,7 @@ class AccountsView(QWidget):
         currency_combo.addItem("USD - Dólar Estadounidense", "USD")
         currency_combo.addItem("EUR - Euro", "EUR")
         # Set current currency
-        for i in range(currency_combo.count()):
-            if currency_combo.itemData(i) == currency:
-                currency_combo.setCurrentIndex(i)
-                break
+        currency_combo.setCurrentIndex(max(0, currency_combo.findData(account['currency'])))
         form_layout.addRow("Moneda:", currency_combo)
         
         # Current balance field
@@ -279,16 +302,13 @@ class AccountsView(QWidget):
         balance_spin.setDecimals(2)
         balance_spin.setSingleStep(100)
         # Set current balance
-        try:
-            balance_value = float(balance)
-            balance_spin.setValue(balance_value)
-        except ValueError:
-            balance_spin.setValue(0)
+        balance_spin.setValue(account['current_balance'] or 0)
         form_layout.addRow("Saldo Actual:", balance_spin)
         
         # Description field
         description_edit = QTextEdit()
         description_edit.setMaximumHeight(100)
+        description_edit.setText(account.get('description') or '')
         form_layout.addRow("Descripción:", description_edit)
         
         layout.addLayout(form_layout)
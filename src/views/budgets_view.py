@@ -5,12 +5,15 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QTableWidget, QTableWidgetItem,
                              QHeaderView, QFrame, QDialog, QFormLayout,
                              QLineEdit, QComboBox, QDoubleSpinBox, QTextEdit,
-                             QDialogButtonBox, QMessageBox, QDateEdit, QProgressBar)
+                             QDialogButtonBox, QMessageBox, QDateEdit)
 from PyQt5.QtCore import Qt, pyqtSignal, QDate
 from PyQt5.QtGui import QIcon, QFont, QColor
 import os
 from datetime import datetime
 
+from src.views.delegates import RowActionsDelegate, ProgressBarDelegate
+from src.views.record_index import RecordIndex
+
 class BudgetsView(QWidget):
     """Budgets view showing all financial budgets and their details."""
     
@@ -19,6 +22,8 @@ class BudgetsView(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Budgets shown in the table, indexed by ID
+        self.record_index = RecordIndex()
         self.init_ui()
     
     def init_ui(self):
@@ -57,6 +62,14 @@ class BudgetsView(QWidget):
         self.budgets_table.setSelectionBehavior(QTableWidget.SelectRows)
         self.budgets_table.setSelectionMode(QTableWidget.SingleSelection)
         
+        # Progress bars and row buttons are painted by delegates, not created per row
+        self.progress_delegate = ProgressBarDelegate(self.budgets_table, thresholds=((50, "#28A745"), (80, "#FFC107")), default_color="#DC3545")
+        self.budgets_table.setItemDelegateForColumn(4, self.progress_delegate)
+        
+        self.actions_delegate = RowActionsDelegate(self.budgets_table)
+        self.actions_delegate.action_triggered.connect(self.on_row_action)
+        self.budgets_table.setItemDelegateForColumn(5, self.actions_delegate)
+        
         main_layout.addWidget(self.budgets_table)
     
     def load_budgets(self, budgets):
@@ -65,80 +78,97 @@ class BudgetsView(QWidget):
         Args:
             budgets (list): List of budget dictionaries
         """
-        self.budgets_table.setRowCount(0)  # Clear existing rows
+        self.record_index.reset(budgets)
+        self.budgets_table.setRowCount(len(self.record_index))
         
-        if not budgets:
-            return
+        for row, budget in enumerate(self.record_index.records):
+            self.set_budget_row(row, budget)
+    
+    def set_budget_row(self, row, budget):
+        """Fill a table row with a budget.
         
-        for row, budget in enumerate(budgets):
-            self.budgets_table.insertRow(row)
-            
-            # Category
-            category_item = QTableWidgetItem(budget.get('category_name', 'Sin categoría'))
-            self.budgets_table.setItem(row, 0, category_item)
-            
-            # Amount
-            amount_item = QTableWidgetItem(f"{budget['amount']:.2f}")
-            amount_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.budgets_table.setItem(row, 1, amount_item)
-            
-            # Period
-            period_item = QTableWidgetItem(self.get_period_display(budget['period']))
-            self.budgets_table.setItem(row, 2, period_item)
-            
-            # Start date
-            start_date_str = budget['start_date']
-            if isinstance(start_date_str, str):
-                start_date_obj = datetime.strptime(start_date_str, '%Y-%m-%d')
-                start_date_display = start_date_obj.strftime('%d/%m/%Y')
-            else:
-                start_date_display = start_date_str.strftime('%d/%m/%Y')
-            start_date_item = QTableWidgetItem(start_date_display)
-            self.budgets_table.setItem(row, 3, start_date_item)
-            
-            # Progress
-            progress_widget = QWidget()
-            progress_layout = QVBoxLayout(progress_widget)
-            progress_layout.setContentsMargins(4, 4, 4, 4)
-            
-            # Placeholder progress - in a real app, this would be calculated
-            progress_value = budget.get('progress', 50)  # Default to 50% for demo
-            
-            progress_bar = QProgressBar()
-            progress_bar.setRange(0, 100)
-            progress_bar.setValue(progress_value)
-            progress_bar.setTextVisible(True)
-            progress_bar.setFormat("%p%")
-            
-            # Set color based on progress
-            if progress_value < 50:
-                progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #28A745; }")
-            elif progress_value < 80:
-                progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #FFC107; }")
-            else:
-                progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #DC3545; }")
-                
-            progress_layout.addWidget(progress_bar)
-            self.budgets_table.setCellWidget(row, 4, progress_widget)
-            
-            # Actions
-            actions_layout = QHBoxLayout()
-            actions_layout.setContentsMargins(4, 4, 4, 4)
-            actions_layout.setSpacing(4)
-            
-            edit_btn = QPushButton("Editar")
-            edit_btn.setProperty("budget_id", budget['id'])
-            edit_btn.clicked.connect(lambda checked, bid=budget['id']: self.edit_budget(bid))
-            actions_layout.addWidget(edit_btn)
-            
-            delete_btn = QPushButton("Eliminar")
-            delete_btn.setProperty("budget_id", budget['id'])
-            delete_btn.clicked.connect(lambda checked, bid=budget['id']: self.delete_budget(bid))
-            actions_layout.addWidget(delete_btn)
-            
-            actions_widget = QWidget()
-            actions_widget.setLayout(actions_layout)
-            self.budgets_table.setCellWidget(row, 5, actions_widget)
+        Args:
+            row (int): Table row
+            budget (dict): Budget dictionary
+        """
+        # Category
+        category_item = QTableWidgetItem(budget.get('category_name', 'Sin categoría'))
+        self.budgets_table.setItem(row, 0, category_item)
+        
+        # Amount
+        amount_item = QTableWidgetItem(f"{budget['amount']:.2f}")
+        amount_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.budgets_table.setItem(row, 1, amount_item)
+        
+        # Period
+        period_item = QTableWidgetItem(self.get_period_display(budget['period']))
+        self.budgets_table.setItem(row, 2, period_item)
+        
+        # Start date
+        start_date_str = budget['start_date']
+        if isinstance(start_date_str, str):
+            start_date_obj = datetime.strptime(start_date_str, '%Y-%m-%d')
+            start_date_display = start_date_obj.strftime('%d/%m/%Y')
+        else:
+            start_date_display = start_date_str.strftime('%d/%m/%Y')
+        start_date_item = QTableWidgetItem(start_date_display)
+        self.budgets_table.setItem(row, 3, start_date_item)
+        
+        # Progress
+        # Placeholder progress - in a real app, this would be calculated
+        progress_value = budget.get('progress', 50)  # Default to 50% for demo
+        
+        # Painted by the progress delegate
+        progress_item = QTableWidgetItem()
+        progress_item.setData(Qt.UserRole, progress_value)
+        self.budgets_table.setItem(row, 4, progress_item)
+        
+        # Actions, painted by the actions delegate
+        actions_item = QTableWidgetItem()
+        actions_item.setData(Qt.UserRole, budget['id'])
+        self.budgets_table.setItem(row, 5, actions_item)
+    
+    def update_budget_row(self, budget):
+        """Refresh the row of a budget in place.
+        
+        Args:
+            budget (dict): Updated budget dictionary
+        
+        Returns:
+            bool: True if the budget is shown in the table
+        """
+        row = self.record_index.update(budget)
+        if row is None:
+            return False
+        self.set_budget_row(row, budget)
+        return True
+    
+    def remove_budget_row(self, budget_id):
+        """Remove the row of a budget.
+        
+        Args:
+            budget_id (int): ID of the budget
+        
+        Returns:
+            bool: True if the budget was shown in the table
+        """
+        row = self.record_index.remove(budget_id)
+        if row is None:
+            return False
+        self.budgets_table.removeRow(row)
+        return True
+    
+    def on_row_action(self, action, budget_id):
+        """Handle a click on the edit or delete button of a row.
+        
+        Args:
+            action (str): Clicked action ('edit' or 'delete')
+            budget_id (int): ID of the row's budget
+        """
+        if action == 'edit':
+            self.edit_budget(budget_id)
+        elif action == 'delete':
+            self.delete_budget(budget_id)
     
     def get_period_display(self, period):
         """Convert period code to display name.
@@ -231,29 +261,13 @@ class BudgetsView(QWidget):
         Args:
             budget_id (int): ID of the budget to edit
         """
-        # Find the budget in the table
-        budget_row = None
-        for row in range(self.budgets_table.rowCount()):
-            for col in range(self.budgets_table.columnCount()):
-                cell_widget = self.budgets_table.cellWidget(row, 5)
-                if cell_widget:
-                    for child in cell_widget.findChildren(QPushButton):
-                        if child.property("budget_id") == budget_id:
-                            budget_row = row
-                            break
-            if budget_row is not None:
-                break
-        
-        if budget_row is None:
+        # Find the budget in the row index
+        budget = self.record_index.get(budget_id)
+        
+        if budget is None:
             QMessageBox.warning(self, "Error", "No se pudo encontrar el presupuesto seleccionado.")
             return
         
-        # Get budget data from the table
-        category_name = self.budgets_table.item(budget_row, 0).text()
-        amount = float(self.budgets_table.item(budget_row, 1).text())
-        period_display = self.budgets_table.item(budget_row, 2).text()
-        start_date_str = self.budgets_table.item(budget_row, 3).text()
-        
         # Create edit dialog
         dialog = QDialog(self)
         dialog.setWindowTitle("Editar Presupuesto")
@@ -273,10 +287,7 @@ class BudgetsView(QWidget):
         category_combo.addItem("Entretenimiento", 4)
         
         # Set current category
-        for i in range(category_combo.count()):
-            if category_combo.itemText(i) == category_name:
-                category_combo.setCurrentIndex(i)
-                break
+        category_combo.setCurrentIndex(max(0, category_combo.findData(budget['category_id'])))
         
         form_layout.addRow("Categoría:", category_combo)
         
@@ -285,7 +296,7 @@ class BudgetsView(QWidget):
         amount_spin.setRange(0, 1000000000)
         amount_spin.setDecimals(2)
         amount_spin.setSingleStep(100)
-        amount_spin.setValue(amount)
+        amount_spin.setValue(budget['amount'])
         form_layout.addRow("Monto:", amount_spin)
         
         # Period field
@@ -296,10 +307,7 @@ class BudgetsView(QWidget):
         period_combo.addItem("Personalizado", "custom")
         
         # Set current period
-        for i in range(period_combo.count()):
-            if period_combo.itemText(i) == period_display:
-                period_combo.setCurrentIndex(i)
-                break
+        period_combo.setCurrentIndex(max(0, period_combo.findData(budget['period'])))
         
         form_layout.addRow("Período:", period_combo)
         
@@ -307,19 +315,17 @@ class BudgetsView(QWidget):
         start_date_edit = QDateEdit()
         start_date_edit.setCalendarPopup(True)
         
-        # Parse and set the start date
-        try:
-            start_date = QDate.fromString(start_date_str, "dd/MM/yyyy")
-            start_date_edit.setDate(start_date)
-        except:
-            start_date_edit.setDate(QDate.currentDate())
+        # Set current start date, stored as 'YYYY-MM-DD'
+        start_date = QDate.fromString(str(budget['start_date'])[:10], "yyyy-MM-dd")
+        start_date_edit.setDate(start_date if start_date.isValid() else QDate.currentDate())
         
         form_layout.addRow("Fecha Inicio:", start_date_edit)
         
         # End date field
         end_date_edit = QDateEdit()
         end_date_edit.setCalendarPopup(True)
-        end_date_edit.setDate(start_date_edit.date().addMonths(1))
+        end_date = QDate.fromString(str(budget['end_date'])[:10], "yyyy-MM-dd")
+        end_date_edit.setDate(end_date if end_date.isValid() else start_date_edit.date().addMonths(1))
         form_layout.addRow("Fecha Fin:", end_date_edit)
         
         layout.addLayout(form_layout)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chart items shared by the dashboard and the reports.
+
+This module imports pyqtgraph and numpy, so it should only be imported
+when a chart is actually built.
+"""
+
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QColor, QPen, QBrush, QPicture, QPainter, QFont
+import pyqtgraph as pg
+import numpy as np
+from math import pi, atan2, hypot, cos, sin
+
+
+def create_pie_view_box():
+    """Create a ViewBox suited to show a PieChartItem.
+
+    The aspect ratio is locked so the pie stays round, and the y-axis points
+    down like the painter's, so the labels are drawn upright.
+    """
+    view_box = pg.ViewBox(enableMouse=False)
+    view_box.setAspectLocked(True)
+    view_box.invertY(True)
+    view_box.setMenuEnabled(False)
+    return view_box
+
+
+class PieChartItem(pg.GraphicsObject):
+    """Pie chart item for pyqtgraph.
+
+    Slices are rendered once into a QPicture, which is replayed on every paint
+    until the data changes. Categories beyond the largest ones are merged into
+    a single "Otros" slice, so painting cost does not grow with the data.
+    """
+
+    # Radius of the pie, in item coordinates
+    RADIUS = 100
+
+    # Maximum number of slices drawn, including "Otros"
+    MAX_SLICES = 8
+
+    # Slices smaller than this fraction of the total are merged into "Otros"
+    MIN_FRACTION = 0.02
+
+    # Slices smaller than this fraction of the total are drawn without a label
+    MIN_LABEL_FRACTION = 0.04
+
+    OTHERS_LABEL = "Otros"
+    OTHERS_COLOR = "#888888"
+
+    def __init__(self, values, colors, labels=None):
+        pg.GraphicsObject.__init__(self)
+        self.setAcceptHoverEvents(True)
+
+        self.picture = None
+        self.bounds = QRectF()
+        self.hovered = None
+
+        # Pens and brushes shared by every paint
+        self.outline_pen = QPen(Qt.black, 1)
+        self.outline_pen.setCosmetic(True)
+        self.highlight_pen = QPen(QColor("#FFFFFF"), 2)
+        self.highlight_pen.setCosmetic(True)
+        self.highlight_brush = QBrush(QColor(255, 255, 255, 60))
+        self.label_pen = QPen(QColor("#DDDDDD"))
+        self.label_font = QFont("Segoe UI", 8)
+
+        self.setData(values, colors, labels)
+
+    def setData(self, values, colors, labels=None):
+        """Replace the slices of the pie.
+
+        Args:
+            values (list): Slice values
+            colors (list): Slice colors
+            labels (list, optional): Slice labels
+        """
+        values = np.asarray(values, dtype=float)
+        labels = list(labels) if labels is not None else [''] * len(values)
+        colors = list(colors)
+
+        # Largest slices first, with the long tail merged into "Otros"
+        order = np.argsort(-values, kind='stable')
+        values = values[order]
+        total = values.sum()
+        keep = len(values)
+        if total > 0:
+            keep = min(keep, int(np.count_nonzero(values / total >= self.MIN_FRACTION)))
+        if keep < len(values) or len(values) > self.MAX_SLICES:
+            keep = min(keep, self.MAX_SLICES - 1)
+
+        self.values = values[:keep]
+        self.labels = [labels[i] for i in order[:keep]]
+        self.colors = [colors[i] for i in order[:keep]]
+        if keep < len(values):
+            self.values = np.append(self.values, values[keep:].sum())
+            self.labels.append(self.OTHERS_LABEL)
+            self.colors.append(self.OTHERS_COLOR)
+
+        self.total = total
+        self.brushes = [QBrush(QColor(color)) for color in self.colors]
+
+        # Slice angles in radians, counter-clockwise from 3 o'clock
+        if total > 0:
+            self.angles = 2 * pi * self.values / total
+        else:
+            self.angles = np.zeros(len(self.values))
+        self.end_angles = np.cumsum(self.angles)
+        self.startAngles = self.end_angles - self.angles
+
+        # Render once per data change; the bounds follow the rendered labels
+        self.hovered = None
+        self.setToolTip("")
+        self.prepareGeometryChange()
+        self.picture, self.bounds = self.render()
+        self.update()
+
+    def pie_rect(self):
+        """Return the rectangle enclosing the pie."""
+        return QRectF(-self.RADIUS, -self.RADIUS, 2 * self.RADIUS, 2 * self.RADIUS)
+
+    def render(self):
+        """Render the slices and labels into a QPicture.
+
+        Returns:
+            tuple: (QPicture, QRectF covering the pie and its labels)
+        """
+        picture = QPicture()
+        painter = QPainter(picture)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self.pie_rect()
+        bounds = QRectF(rect)
+
+        # Slices
+        painter.setPen(self.outline_pen)
+        for start, span, brush in zip(self.startAngles, self.angles, self.brushes):
+            painter.setBrush(brush)
+            painter.drawPie(rect, int(start * 180 / pi * 16), int(span * 180 / pi * 16))
+
+        # Labels outside the pie, at the middle angle of each slice
+        painter.setPen(self.label_pen)
+        painter.setFont(self.label_font)
+        metrics = painter.fontMetrics()
+        for start, span, label, value in zip(self.startAngles, self.angles, self.labels, self.values):
+            if not label or self.total <= 0 or value / self.total < self.MIN_LABEL_FRACTION:
+                continue
+            middle = start + span / 2
+            text = f"{label} {value / self.total * 100:.0f}%"
+            width, height = metrics.horizontalAdvance(text), metrics.height()
+            anchor = QPointF(cos(middle) * self.RADIUS * 1.08, -sin(middle) * self.RADIUS * 1.08)
+            # Right half labels start at the anchor, left half labels end at it
+            left = anchor.x() if cos(middle) >= 0 else anchor.x() - width
+            top = anchor.y() - height / 2 + (-sin(middle)) * height / 2
+            label_rect = QRectF(left, top, width, height)
+            painter.drawText(label_rect, Qt.AlignCenter, text)
+            bounds = bounds.united(label_rect)
+
+        painter.end()
+        return picture, bounds
+
+    def sliceAt(self, pos):
+        """Return the index of the slice under a point, or None.
+
+        Args:
+            pos (QPointF): Point in item coordinates
+        """
+        if self.total <= 0 or hypot(pos.x(), pos.y()) > self.RADIUS:
+            return None
+
+        # Same angle convention as QPainter.drawPie
+        angle = atan2(-pos.y(), pos.x()) % (2 * pi)
+        index = int(np.searchsorted(self.end_angles, angle, side='right'))
+        return index if index < len(self.values) else None
+
+    def hoverMoveEvent(self, event):
+        index = self.sliceAt(event.pos())
+        if index == self.hovered:
+            return
+
+        self.hovered = index
+        if index is None:
+            self.setToolTip("")
+        else:
+            value = self.values[index]
+            self.setToolTip(f"{self.labels[index]}: ${value:,.2f} ({value / self.total * 100:.1f}%)")
+        self.update()
+
+    def hoverLeaveEvent(self, event):
+        if self.hovered is not None:
+            self.hovered = None
+            self.setToolTip("")
+            self.update()
+
+    def paint(self, painter, option, widget):
+        self.picture.play(painter)
+
+        # Highlight the hovered slice on top of the cached picture
+        if self.hovered is not None:
+            painter.setPen(self.highlight_pen)
+            painter.setBrush(self.highlight_brush)
+            painter.drawPie(self.pie_rect(), int(self.startAngles[self.hovered] * 180 / pi * 16),
+                            int(self.angles[self.hovered] * 180 / pi * 16))
+
+    def boundingRect(self):
+        return self.bounds
+
+
+class LodSeries:
+    """Draws a LodPyramid in a plot at the level matching its visible x-range.
+
+    The plot's x-axis is in seconds since the epoch, as expected by
+    pg.DateAxisItem. Whenever the plot is zoomed, panned or resized, only the
+    bins of the visible range (plus one view width on each side) are drawn,
+    with at most one bin every pixels_per_bin pixels.
+    """
+
+    SECONDS_PER_DAY = 86400
+
+    def __init__(self, plot_item, style='envelope', pen=None, brush=None, pixels_per_bin=1,
+                 bar_offset=0.5, bar_width=0.8):
+        """Initialize the series.
+
+        Args:
+            plot_item (pg.PlotItem): Plot showing the series
+            style (str, optional): 'envelope' draws the min/max of each bin as a line,
+                'bars' draws the sum of each bin as a bar. Defaults to 'envelope'.
+            pen (optional): Line or bar outline pen
+            brush (optional): Bar brush
+            pixels_per_bin (int, optional): Minimum width of a bin, in pixels
+            bar_offset (float, optional): Bar center, as a fraction of the bin width
+            bar_width (float, optional): Bar width, as a fraction of the bin width
+        """
+        self.plot_item = plot_item
+        self.style = style
+        self.pixels_per_bin = pixels_per_bin
+        self.bar_offset = bar_offset
+        self.bar_width = bar_width
+        self.pyramid = None
+        # (level, first day, last day) of the bins currently drawn
+        self.drawn = None
+
+        if style == 'bars':
+            self.item = pg.BarGraphItem(x=[], height=[], width=1, pen=pen, brush=brush)
+        else:
+            self.item = pg.PlotDataItem(pen=pen)
+        plot_item.addItem(self.item)
+
+        view_box = plot_item.getViewBox()
+        view_box.sigXRangeChanged.connect(self.update_view)
+        view_box.sigResized.connect(self.update_view)
+
+    def set_pyramid(self, pyramid):
+        """Show another pyramid, or nothing if it is None."""
+        self.pyramid = pyramid
+        self.refresh()
+
+    def refresh(self):
+        """Draw the visible range again, e.g. after the pyramid was updated."""
+        self.drawn = None
+        self.update_view()
+
+    def update_view(self, *args):
+        if self.pyramid is None:
+            self.set_bins(np.empty(0), np.empty(0), np.empty(0), 1)
+            return
+
+        view_box = self.plot_item.getViewBox()
+        x_min, x_max = view_box.viewRange()[0]
+        first_day = int(np.floor(x_min / self.SECONDS_PER_DAY))
+        last_day = int(np.ceil(x_max / self.SECONDS_PER_DAY))
+        max_bins = max(int(view_box.width()) // self.pixels_per_bin, 1)
+        level = self.pyramid.level_for(last_day - first_day + 1, max_bins)
+
+        # Bins already drawn at this level are reused while they cover the view
+        if self.drawn is not None:
+            drawn_level, drawn_first, drawn_last = self.drawn
+            if drawn_level == level and drawn_first <= first_day and last_day <= drawn_last:
+                return
+
+        margin = last_day - first_day + 1
+        first_day, last_day = first_day - margin, last_day + margin
+        window = self.pyramid.window(first_day, last_day, max_bins, level=level)
+        self.drawn = (level, first_day, last_day)
+        self.set_bins(window.days, window.mins if self.style != 'bars' else window.sums,
+                      window.maxs, window.bin_days)
+
+    def set_bins(self, days, lows, highs, bin_days):
+        """Replace the drawn bins.
+
+        Args:
+            days (numpy.ndarray): Day number where each bin starts
+            lows (numpy.ndarray): Bin minimums, or bar heights
+            highs (numpy.ndarray): Bin maximums (envelope only)
+            bin_days (int): Days per bin
+        """
+        bin_seconds = bin_days * self.SECONDS_PER_DAY
+        if self.style == 'bars':
+            self.item.setOpts(x=days * self.SECONDS_PER_DAY + bin_seconds * self.bar_offset, height=lows,
+                              width=bin_seconds * self.bar_width)
+        elif bin_days == 1:
+            self.item.setData(days * self.SECONDS_PER_DAY + bin_seconds / 2, lows)
+        else:
+            # One vertical stroke from min to max per bin, joined bin to bin
+            x = np.repeat(days * self.SECONDS_PER_DAY + bin_seconds / 2, 2)
+            self.item.setData(x, np.column_stack([lows, highs]).ravel())
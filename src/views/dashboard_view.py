@@ -6,49 +6,16 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QScrollArea, QTableWidget, QTableWidgetItem, QHeaderView,
                              QDialog, QFormLayout, QLineEdit, QComboBox, QDoubleSpinBox, 
                              QTextEdit, QDialogButtonBox, QMessageBox, QDateEdit, QProgressBar)
-from PyQt5.QtCore import Qt, QSize, QRect, QRectF
+from PyQt5.QtCore import Qt, QSize, QRect, QRectF, QTimer
 from PyQt5.QtGui import QFont, QIcon, QColor, QPainter, QPen
-import pyqtgraph as pg
 import os
-import numpy as np
-from math import pi
-
-class PieChartItem(pg.GraphicsObject):
-    """Custom pie chart item for pyqtgraph."""
-    
-    def __init__(self, values, colors, labels=None):
-        pg.GraphicsObject.__init__(self)
-        self.values = np.array(values)
-        self.colors = colors
-        self.labels = labels
-        self.total = sum(values)
-        self.startAngles = np.zeros(len(values))
-        self.angles = 2 * pi * self.values / self.total
-        
-        # Calculate start angles
-        for i in range(1, len(values)):
-            self.startAngles[i] = self.startAngles[i-1] + self.angles[i-1]
-    
-    def paint(self, painter, option, widget):
-        painter.setPen(QPen(Qt.black, 1))
-        
-        # Draw pie segments
-        center = QSize(0, 0)
-        radius = 100
-        rect = QRect(center.width() - radius, center.height() - radius, 2 * radius, 2 * radius)
-        
-        for i in range(len(self.values)):
-            startAngle = int(self.startAngles[i] * 180 / pi * 16)
-            spanAngle = int(self.angles[i] * 180 / pi * 16)
-            painter.setBrush(QColor(self.colors[i]))
-            painter.drawPie(rect, startAngle, spanAngle)
-    
-    def boundingRect(self):
-        return QRectF(-120, -120, 240, 240)
 
 class DashboardView(QWidget):
     """Dashboard view showing financial overview and summaries."""
     
+    # Width of each bar in the income vs expenses chart
+    BAR_WIDTH = 0.35
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.init_ui()
@@ -265,24 +232,57 @@ class DashboardView(QWidget):
         layout.addWidget(title_label)
         
         # Charts layout
-        charts_layout = QHBoxLayout()
-        charts_layout.setContentsMargins(0, 10, 0, 0)
-        charts_layout.setSpacing(15)
+        self.charts_layout = QHBoxLayout()
+        self.charts_layout.setContentsMargins(0, 10, 0, 0)
+        self.charts_layout.setSpacing(15)
         
-        # Income vs Expenses chart
-        income_expenses_chart = self.create_income_expenses_chart()
-        charts_layout.addWidget(income_expenses_chart)
+        # Placeholders keep the layout stable until the charts are built,
+        # which happens after the first paint so pyqtgraph stays off the startup path
+        self.chart_placeholders = []
+        for _ in range(2):
+            placeholder = QWidget()
+            placeholder.setMinimumHeight(250)
+            self.charts_layout.addWidget(placeholder)
+            self.chart_placeholders.append(placeholder)
         
-        # Expense categories chart
-        categories_chart = self.create_expense_categories_chart()
-        charts_layout.addWidget(categories_chart)
+        self.income_expenses_plot = None
+        self.categories_plot = None
+        self.pending_chart_updates = {}
         
-        layout.addLayout(charts_layout)
+        layout.addLayout(self.charts_layout)
         
         return frame
     
+    def paintEvent(self, event):
+        """Schedule the chart construction right after the first paint."""
+        super().paintEvent(event)
+        if self.income_expenses_plot is None and not getattr(self, 'charts_scheduled', False):
+            self.charts_scheduled = True
+            QTimer.singleShot(0, self.build_charts)
+    
+    def build_charts(self):
+        """Build the chart widgets and apply any data received before they existed."""
+        if self.income_expenses_plot is not None:
+            return
+        
+        self.income_expenses_plot = self.create_income_expenses_chart()
+        self.categories_plot = self.create_expense_categories_chart()
+        
+        for placeholder, chart in zip(self.chart_placeholders, (self.income_expenses_plot, self.categories_plot)):
+            self.charts_layout.replaceWidget(placeholder, chart)
+            placeholder.deleteLater()
+        self.chart_placeholders = []
+        
+        # Apply the data received while the charts were not built yet
+        if 'income_expenses' in self.pending_chart_updates:
+            self.update_income_expenses_chart(*self.pending_chart_updates.pop('income_expenses'))
+        if 'expense_categories' in self.pending_chart_updates:
+            self.update_expense_categories_chart(*self.pending_chart_updates.pop('expense_categories'))
+    
     def create_income_expenses_chart(self):
         """Create income vs expenses bar chart."""
+        import pyqtgraph as pg
+        
         # Set background color for the chart
         pg.setConfigOption('background', '#252529')
         pg.setConfigOption('foreground', '#DDDDDD')
@@ -298,29 +298,31 @@ class DashboardView(QWidget):
         income = [3200, 3100, 3400, 3300, 3450, 3500]
         expenses = [2100, 2300, 2200, 2400, 2250, 2180]
         
-        # Set up x-axis
-        x_axis = plot_widget.getAxis('bottom')
-        x_axis.setTicks([[(i, month) for i, month in enumerate(months)]])
-        
-        # Create bar graph items
-        bar_width = 0.35
-        income_bars = pg.BarGraphItem(x=[i-bar_width/2 for i in range(len(months))], height=income, width=bar_width, brush='#28A745')
-        expense_bars = pg.BarGraphItem(x=[i+bar_width/2 for i in range(len(months))], height=expenses, width=bar_width, brush='#DC3545')
+        # Create bar graph items, kept and updated in place on every refresh
+        self.income_bars = pg.BarGraphItem(x=[0], height=[0], width=self.BAR_WIDTH, brush='#28A745')
+        self.expense_bars = pg.BarGraphItem(x=[0], height=[0], width=self.BAR_WIDTH, brush='#DC3545')
         
         # Add items to the plot
-        plot_widget.addItem(income_bars)
-        plot_widget.addItem(expense_bars)
+        plot_widget.addItem(self.income_bars)
+        plot_widget.addItem(self.expense_bars)
         
-        # Add legend
+        # Add legend, created once
         legend = pg.LegendItem((80, 60), offset=(70, 20))
         legend.setParentItem(plot_widget.graphicsItem())
-        legend.addItem(pg.BarGraphItem(x=[0], height=[1], width=bar_width, brush='#28A745'), 'Ingresos')
-        legend.addItem(pg.BarGraphItem(x=[0], height=[1], width=bar_width, brush='#DC3545'), 'Gastos')
+        legend.addItem(self.income_bars, 'Ingresos')
+        legend.addItem(self.expense_bars, 'Gastos')
+        
+        # Fill the bars with the sample data
+        self.chart_month_labels = None
+        self.set_income_expenses_bars(months, income, expenses, plot_widget)
         
         return plot_widget
     
     def create_expense_categories_chart(self):
         """Create expense categories pie chart."""
+        import pyqtgraph as pg
+        from src.views.charts import PieChartItem, create_pie_view_box
+        
         # Set background color for the chart
         pg.setConfigOption('background', '#252529')
         pg.setConfigOption('foreground', '#DDDDDD')
@@ -335,13 +337,13 @@ class DashboardView(QWidget):
         values = [650, 800, 250, 180, 220, 80]
         colors = ['#FF5733', '#33FF57', '#33A8FF', '#A833FF', '#FF33A8', '#FFFF33']
         
-        # Create a custom view box that will contain our pie chart
-        view_box = pg.ViewBox()
+        # Create a round, fixed view box that will contain our pie chart
+        view_box = create_pie_view_box()
         plot_widget.setCentralItem(view_box)
         
-        # Create a custom pie chart item
-        pie = PieChartItem(values, colors, categories)
-        view_box.addItem(pie)
+        # Create a custom pie chart item, kept and updated in place on every refresh
+        self.categories_pie = PieChartItem(values, colors, categories)
+        view_box.addItem(self.categories_pie)
         
         return plot_widget
     
@@ -517,72 +519,45 @@ class DashboardView(QWidget):
 
     def update_income_expenses_chart(self, months, income, expenses):
         """Update income vs expenses chart with new data."""
-        # Find the income vs expenses chart frame
-        charts_frame = None
-        for frame in self.findChildren(QFrame, "chartsFrame"):
-            charts_frame = frame
-            break
-            
-        if charts_frame:
-            # Find the plot widget (first one in the charts section)
-            plot_widgets = charts_frame.findChildren(pg.PlotWidget)
-            if plot_widgets and len(plot_widgets) > 0:
-                widget = plot_widgets[0]  # First plot widget is income vs expenses
-                
-                # Clear existing items
-                widget.clear()
-                
-                # Set title
-                widget.setTitle("Ingresos vs Gastos (últimos 6 meses)")
-
-                # Set up x-axis
-                x_axis = widget.getAxis('bottom')
-                x_axis.setTicks([[(i, month) for i, month in enumerate(months)]])
-
-                # Create bar graph items
-                bar_width = 0.35
-                income_bars = pg.BarGraphItem(x=[i-bar_width/2 for i in range(len(months))], height=income, width=bar_width, brush='#28A745')
-                expense_bars = pg.BarGraphItem(x=[i+bar_width/2 for i in range(len(months))], height=expenses, width=bar_width, brush='#DC3545')
-
-                # Add items to the plot
-                widget.addItem(income_bars)
-                widget.addItem(expense_bars)
-
-                # Add legend
-                legend = pg.LegendItem((80, 60), offset=(70, 20))
-                legend.setParentItem(widget.graphicsItem())
-                legend.addItem(pg.BarGraphItem(x=[0], height=[1], width=bar_width, brush='#28A745'), 'Ingresos')
-                legend.addItem(pg.BarGraphItem(x=[0], height=[1], width=bar_width, brush='#DC3545'), 'Gastos')
-
+        if self.income_expenses_plot is None:
+            # Charts are not built yet, keep the latest data for later
+            self.pending_chart_updates['income_expenses'] = (months, income, expenses)
+            return
+        
+        self.set_income_expenses_bars(months, income, expenses, self.income_expenses_plot)
+    
+    def set_income_expenses_bars(self, months, income, expenses, plot_widget):
+        """Move the persistent income and expense bars to new data.
+        
+        Args:
+            months (list): Month labels, one per pair of bars
+            income (list): Income per month
+            expenses (list): Expenses per month
+            plot_widget (PlotWidget): Chart holding the bars
+        """
+        positions = range(len(months))
+        self.income_bars.setOpts(x=[i - self.BAR_WIDTH / 2 for i in positions], height=income)
+        self.expense_bars.setOpts(x=[i + self.BAR_WIDTH / 2 for i in positions], height=expenses)
+        
+        # Only relabel the x-axis when the months change
+        labels = tuple(months)
+        if labels != self.chart_month_labels:
+            self.chart_month_labels = labels
+            plot_widget.getAxis('bottom').setTicks([[(i, month) for i, month in enumerate(labels)]])
+    
     def update_expense_categories_chart(self, categories, values, colors):
         """Update expense categories pie chart with new data."""
-        # Find the charts frame
-        charts_frame = None
-        for frame in self.findChildren(QFrame, "chartsFrame"):
-            charts_frame = frame
-            break
-            
-        if charts_frame:
-            # Find the plot widgets in the charts section
-            plot_widgets = charts_frame.findChildren(pg.PlotWidget)
-            if plot_widgets and len(plot_widgets) > 1:
-                widget = plot_widgets[1]  # Second plot widget is expense categories
-                
-                # Clear existing items
-                widget.clear()
-                
-                # Set title
-                widget.setTitle("Gastos por Categoría (este mes)")
-
-                # Create a custom view box
-                view_box = pg.ViewBox()
-                widget.setCentralItem(view_box)
-
-                # Create a custom pie chart item
-                if categories and values and len(categories) > 0 and len(values) > 0:
-                    pie = PieChartItem(values, colors, categories)
-                    view_box.addItem(pie)
-
+        if self.categories_plot is None:
+            # Charts are not built yet, keep the latest data for later
+            self.pending_chart_updates['expense_categories'] = (categories, values, colors)
+            return
+        
+        # Months without expenses show an empty pie
+        if categories and values:
+            self.categories_pie.setData(values, colors, categories)
+        else:
+            self.categories_pie.setData([], [], [])
+    
     def update_recent_transactions(self, transactions):
         """Update recent transactions table with new data."""
         # Find the transactions table
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Item delegates shared by the table views.
+
+Row action buttons and progress bars are painted by delegates instead of
+being placed as cell widgets, so tables keep a constant number of widgets
+no matter how many rows they show.
+"""
+
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle, QStyleOptionButton, QApplication
+from PyQt5.QtCore import Qt, QEvent, QRect, QRectF, QSize, pyqtSignal
+from PyQt5.QtGui import QColor, QPen
+
+
+class RowActionsDelegate(QStyledItemDelegate):
+    """Paints a row of push buttons in a cell and reports which one is clicked.
+
+    The ID of the row's record is read from the index's Qt.UserRole data.
+    """
+
+    # Signal emitted with the action name and the record ID when a button is clicked
+    action_triggered = pyqtSignal(str, object)
+
+    # Default (action, label) pairs
+    ACTIONS = (('edit', "Editar"), ('delete', "Eliminar"))
+
+    # Margin around the buttons and spacing between them, in pixels
+    MARGIN = 4
+    SPACING = 4
+
+    def __init__(self, parent=None, actions=ACTIONS):
+        """Initialize the delegate.
+
+        Args:
+            parent (QObject, optional): Parent object. Defaults to None.
+            actions (tuple, optional): (action, label) pairs of the painted buttons
+        """
+        super().__init__(parent)
+        self.actions = tuple(actions)
+        # (row, action) of the button being pressed, painted sunken
+        self.pressed = None
+
+    def button_rects(self, rect):
+        """Split a cell rectangle into one rectangle per button.
+
+        Args:
+            rect (QRect): Cell rectangle
+
+        Returns:
+            list: QRect of each button, in action order
+        """
+        inner = rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        count = len(self.actions)
+        width = (inner.width() - self.SPACING * (count - 1)) // count
+        return [QRect(inner.left() + i * (width + self.SPACING), inner.top(), width, inner.height())
+                for i in range(count)]
+
+    def action_at(self, rect, position):
+        """Return the action of the button under a position, or None."""
+        for (action, _), button_rect in zip(self.actions, self.button_rects(rect)):
+            if button_rect.contains(position):
+                return action
+        return None
+
+    def paint(self, painter, option, index):
+        # Cell background, selection and focus, without any text
+        self.initStyleOption(option, index)
+        option.text = ""
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, option, painter, widget)
+
+        for (action, label), button_rect in zip(self.actions, self.button_rects(option.rect)):
+            button = QStyleOptionButton()
+            button.rect = button_rect
+            button.text = label
+            button.state = QStyle.State_Enabled
+            if self.pressed == (index.row(), action):
+                button.state |= QStyle.State_Sunken
+            else:
+                button.state |= QStyle.State_Raised
+            style.drawControl(QStyle.CE_PushButton, button, painter, widget)
+
+    def sizeHint(self, option, index):
+        metrics = option.fontMetrics
+        width = sum(metrics.horizontalAdvance(label) + 24 for _, label in self.actions)
+        width += self.SPACING * (len(self.actions) - 1) + 2 * self.MARGIN
+        return QSize(width, metrics.height() + 12 + 2 * self.MARGIN)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return super().editorEvent(event, model, option, index)
+        if event.button() != Qt.LeftButton:
+            return False
+
+        action = self.action_at(option.rect, event.pos())
+
+        if event.type() == QEvent.MouseButtonPress:
+            self.pressed = (index.row(), action) if action else None
+            return action is not None
+
+        # Only a release over the pressed button triggers its action
+        pressed, self.pressed = self.pressed, None
+        if action is not None and pressed == (index.row(), action):
+            self.action_triggered.emit(action, index.data(Qt.UserRole))
+            return True
+        return False
+
+
+class ProgressBarDelegate(QStyledItemDelegate):
+    """Paints a progress bar from the percentage stored in the index's Qt.UserRole data."""
+
+    # Margin around the bar, in pixels
+    MARGIN = 4
+
+    def __init__(self, parent=None, thresholds=(), default_color="#28A745"):
+        """Initialize the delegate.
+
+        Args:
+            parent (QObject, optional): Parent object. Defaults to None.
+            thresholds (iterable, optional): (limit, color) pairs, in ascending order. The
+                bar takes the color of the first limit the percentage is below.
+            default_color (str, optional): Color used above every limit
+        """
+        super().__init__(parent)
+        self.thresholds = [(limit, QColor(color)) for limit, color in thresholds]
+        self.default_color = QColor(default_color)
+        self.track_color = QColor("#E9ECEF")
+        self.border_pen = QPen(QColor("#ADB5BD"))
+
+    def color_for(self, value):
+        """Return the bar color of a percentage."""
+        for limit, color in self.thresholds:
+            if value < limit:
+                return color
+        return self.default_color
+
+    def paint(self, painter, option, index):
+        # Cell background, selection and focus, without any text
+        self.initStyleOption(option, index)
+        option.text = ""
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, option, painter, widget)
+
+        value = index.data(Qt.UserRole) or 0
+        clamped = max(0, min(100, value))
+        bar = QRectF(option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN))
+
+        painter.save()
+        painter.setRenderHint(painter.Antialiasing)
+
+        # Track
+        painter.setPen(self.border_pen)
+        painter.setBrush(self.track_color)
+        painter.drawRoundedRect(bar, 3, 3)
+
+        # Chunk
+        if clamped > 0:
+            chunk = QRectF(bar)
+            chunk.setWidth(bar.width() * clamped / 100)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.color_for(value))
+            painter.drawRoundedRect(chunk, 3, 3)
+
+        # Percentage text
+        painter.setPen(QColor("#212529"))
+        painter.drawText(bar, Qt.AlignCenter, f"{int(value)}%")
+        painter.restore()
@@ -5,12 +5,15 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QTableWidget, QTableWidgetItem,
                              QHeaderView, QFrame, QDialog, QFormLayout,
                              QLineEdit, QComboBox, QDoubleSpinBox, QTextEdit,
-                             QDialogButtonBox, QMessageBox, QDateEdit, QProgressBar)
+                             QDialogButtonBox, QMessageBox, QDateEdit)
 from PyQt5.QtCore import Qt, pyqtSignal, QDate
 from PyQt5.QtGui import QIcon, QFont, QColor
 import os
 from datetime import datetime
 
+from src.views.delegates import RowActionsDelegate, ProgressBarDelegate
+from src.views.record_index import RecordIndex
+
 class GoalsView(QWidget):
     """Goals view showing all financial goals and their details."""
     
@@ -19,6 +22,8 @@ class GoalsView(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Goals shown in the table, indexed by ID
+        self.record_index = RecordIndex()
         self.init_ui()
     
     def init_ui(self):
@@ -57,6 +62,14 @@ class GoalsView(QWidget):
         self.goals_table.setSelectionBehavior(QTableWidget.SelectRows)
         self.goals_table.setSelectionMode(QTableWidget.SingleSelection)
         
+        # Progress bars and row buttons are painted by delegates, not created per row
+        self.progress_delegate = ProgressBarDelegate(self.goals_table, thresholds=((33, "#DC3545"), (66, "#FFC107")), default_color="#28A745")
+        self.goals_table.setItemDelegateForColumn(4, self.progress_delegate)
+        
+        self.actions_delegate = RowActionsDelegate(self.goals_table)
+        self.actions_delegate.action_triggered.connect(self.on_row_action)
+        self.goals_table.setItemDelegateForColumn(5, self.actions_delegate)
+        
         main_layout.addWidget(self.goals_table)
     
     def load_goals(self, goals):
@@ -65,87 +78,104 @@ class GoalsView(QWidget):
         Args:
             goals (list): List of goal dictionaries
         """
-        self.goals_table.setRowCount(0)  # Clear existing rows
+        self.record_index.reset(goals)
+        self.goals_table.setRowCount(len(self.record_index))
         
-        if not goals:
-            return
+        for row, goal in enumerate(self.record_index.records):
+            self.set_goal_row(row, goal)
+    
+    def set_goal_row(self, row, goal):
+        """Fill a table row with a goal.
         
-        for row, goal in enumerate(goals):
-            self.goals_table.insertRow(row)
-            
-            # Name
-            name_item = QTableWidgetItem(goal['name'])
-            self.goals_table.setItem(row, 0, name_item)
-            
-            # Target amount
-            target_item = QTableWidgetItem(f"{goal['target_amount']:.2f}")
-            target_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.goals_table.setItem(row, 1, target_item)
-            
-            # Current amount
-            current_item = QTableWidgetItem(f"{goal['current_amount']:.2f}")
-            current_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.goals_table.setItem(row, 2, current_item)
-            
-            # Deadline
-            deadline_str = goal.get('deadline', '')
-            if deadline_str:
-                if isinstance(deadline_str, str):
-                    deadline_obj = datetime.strptime(deadline_str, '%Y-%m-%d')
-                    deadline_display = deadline_obj.strftime('%d/%m/%Y')
-                else:
-                    deadline_display = deadline_str.strftime('%d/%m/%Y')
-                deadline_item = QTableWidgetItem(deadline_display)
-            else:
-                deadline_item = QTableWidgetItem("Sin fecha límite")
-            self.goals_table.setItem(row, 3, deadline_item)
-            
-            # Progress
-            progress_widget = QWidget()
-            progress_layout = QVBoxLayout(progress_widget)
-            progress_layout.setContentsMargins(4, 4, 4, 4)
-            
-            # Calculate progress percentage
-            if goal['target_amount'] > 0:
-                progress_value = min(100, int((goal['current_amount'] / goal['target_amount']) * 100))
-            else:
-                progress_value = 0
-            
-            progress_bar = QProgressBar()
-            progress_bar.setRange(0, 100)
-            progress_bar.setValue(progress_value)
-            progress_bar.setTextVisible(True)
-            progress_bar.setFormat("%p%")
-            
-            # Set color based on progress
-            if progress_value < 33:
-                progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #DC3545; }")
-            elif progress_value < 66:
-                progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #FFC107; }")
+        Args:
+            row (int): Table row
+            goal (dict): Goal dictionary
+        """
+        # Name
+        name_item = QTableWidgetItem(goal['name'])
+        self.goals_table.setItem(row, 0, name_item)
+        
+        # Target amount
+        target_item = QTableWidgetItem(f"{goal['target_amount']:.2f}")
+        target_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.goals_table.setItem(row, 1, target_item)
+        
+        # Current amount
+        current_item = QTableWidgetItem(f"{goal['current_amount']:.2f}")
+        current_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.goals_table.setItem(row, 2, current_item)
+        
+        # Deadline
+        deadline_str = goal.get('deadline', '')
+        if deadline_str:
+            if isinstance(deadline_str, str):
+                deadline_obj = datetime.strptime(deadline_str, '%Y-%m-%d')
+                deadline_display = deadline_obj.strftime('%d/%m/%Y')
             else:
-                progress_bar.setStyleSheet("QProgressBar::chunk { background-color: #28A745; }")
-                
-            progress_layout.addWidget(progress_bar)
-            self.goals_table.setCellWidget(row, 4, progress_widget)
-            
-            # Actions
-            actions_layout = QHBoxLayout()
-            actions_layout.setContentsMargins(4, 4, 4, 4)
-            actions_layout.setSpacing(4)
-            
-            edit_btn = QPushButton("Editar")
-            edit_btn.setProperty("goal_id", goal['id'])
-            edit_btn.clicked.connect(lambda checked, gid=goal['id']: self.edit_goal(gid))
-            actions_layout.addWidget(edit_btn)
-            
-            delete_btn = QPushButton("Eliminar")
-            delete_btn.setProperty("goal_id", goal['id'])
-            delete_btn.clicked.connect(lambda checked, gid=goal['id']: self.delete_goal(gid))
-            actions_layout.addWidget(delete_btn)
-            
-            actions_widget = QWidget()
-            actions_widget.setLayout(actions_layout)
-            self.goals_table.setCellWidget(row, 5, actions_widget)
+                deadline_display = deadline_str.strftime('%d/%m/%Y')
+            deadline_item = QTableWidgetItem(deadline_display)
+        else:
+            deadline_item = QTableWidgetItem("Sin fecha límite")
+        self.goals_table.setItem(row, 3, deadline_item)
+        
+        # Progress
+        # Calculate progress percentage
+        if goal['target_amount'] > 0:
+            progress_value = min(100, int((goal['current_amount'] / goal['target_amount']) * 100))
+        else:
+            progress_value = 0
+        
+        # Painted by the progress delegate
+        progress_item = QTableWidgetItem()
+        progress_item.setData(Qt.UserRole, progress_value)
+        self.goals_table.setItem(row, 4, progress_item)
+        
+        # Actions, painted by the actions delegate
+        actions_item = QTableWidgetItem()
+        actions_item.setData(Qt.UserRole, goal['id'])
+        self.goals_table.setItem(row, 5, actions_item)
+    
+    def update_goal_row(self, goal):
+        """Refresh the row of a goal in place.
+        
+        Args:
+            goal (dict): Updated goal dictionary
+        
+        Returns:
+            bool: True if the goal is shown in the table
+        """
+        row = self.record_index.update(goal)
+        if row is None:
+            return False
+        self.set_goal_row(row, goal)
+        return True
+    
+    def remove_goal_row(self, goal_id):
+        """Remove the row of a goal.
+        
+        Args:
+            goal_id (int): ID of the goal
+        
+        Returns:
+            bool: True if the goal was shown in the table
+        """
+        row = self.record_index.remove(goal_id)
+        if row is None:
+            return False
+        self.goals_table.removeRow(row)
+        return True
+    
+    def on_row_action(self, action, goal_id):
+        """Handle a click on the edit or delete button of a row.
+        
+        Args:
+            action (str): Clicked action ('edit' or 'delete')
+            goal_id (int): ID of the row's goal
+        """
+        if action == 'edit':
+            self.edit_goal(goal_id)
+        elif action == 'delete':
+            self.delete_goal(goal_id)
     
     def show_add_goal_dialog(self):
         """Show dialog to add a new goal."""
@@ -220,34 +250,20 @@ class GoalsView(QWidget):
         Args:
             goal_id (int): ID of the goal to edit
         """
-        # Find the goal data in the table
-        for row in range(self.goals_table.rowCount()):
-            for col in range(self.goals_table.columnCount()):
-                cell_widget = self.goals_table.cellWidget(row, 5)
-                if cell_widget:
-                    actions_layout = cell_widget.layout()
-                    for i in range(actions_layout.count()):
-                        button = actions_layout.itemAt(i).widget()
-                        if button and button.property("goal_id") == goal_id and button.text() == "Editar":
-                            # Found the goal, get its data
-                            name = self.goals_table.item(row, 0).text()
-                            target_amount = float(self.goals_table.item(row, 1).text())
-                            current_amount = float(self.goals_table.item(row, 2).text())
-                            deadline_text = self.goals_table.item(row, 3).text()
-                            
-                            # Show edit dialog
-                            self.show_edit_goal_dialog(goal_id, name, target_amount, current_amount, deadline_text)
-                            return
+        # Find the goal in the row index
+        goal = self.record_index.get(goal_id)
+        if goal is None:
+            return
+        
+        # Show edit dialog
+        self.show_edit_goal_dialog(goal_id, goal)
     
-    def show_edit_goal_dialog(self, goal_id, name, target_amount, current_amount, deadline_text):
+    def show_edit_goal_dialog(self, goal_id, goal):
         """Show dialog to edit an existing goal.
         
         Args:
             goal_id (int): ID of the goal to edit
-            name (str): Current name of the goal
-            target_amount (float): Current target amount
-            current_amount (float): Current saved amount
-            deadline_text (str): Current deadline text
+            goal (dict): Current goal data
         """
         dialog = QDialog(self)
         dialog.setWindowTitle("Editar Meta Financiera")
@@ -259,7 +275,7 @@ class GoalsView(QWidget):
         form_layout.setSpacing(10)
         
         # Name field
-        name_edit = QLineEdit(name)
+        name_edit = QLineEdit(goal['name'])
         form_layout.addRow("Nombre:", name_edit)
         
         # Target amount field
@@ -267,7 +283,7 @@ class GoalsView(QWidget):
         target_spin.setRange(0, 1000000000)
         target_spin.setDecimals(2)
         target_spin.setSingleStep(1000)
-        target_spin.setValue(target_amount)
+        target_spin.setValue(goal['target_amount'])
         form_layout.addRow("Monto Objetivo:", target_spin)
         
         # Current amount field
@@ -275,20 +291,17 @@ class GoalsView(QWidget):
         current_spin.setRange(0, 1000000000)
         current_spin.setDecimals(2)
         current_spin.setSingleStep(100)
-        current_spin.setValue(current_amount)
+        current_spin.setValue(goal['current_amount'])
         form_layout.addRow("Monto Actual:", current_spin)
         
         # Deadline field
         deadline_edit = QDateEdit()
         deadline_edit.setCalendarPopup(True)
         
-        # Parse deadline text
-        if deadline_text != "Sin fecha límite":
-            try:
-                deadline_date = QDate.fromString(deadline_text, "dd/MM/yyyy")
-                deadline_edit.setDate(deadline_date)
-            except:
-                deadline_edit.setDate(QDate.currentDate().addMonths(6))
+        # Set current deadline, stored as 'YYYY-MM-DD'
+        deadline_date = QDate.fromString(str(goal.get('deadline') or '')[:10], "yyyy-MM-dd")
+        if deadline_date.isValid():
+            deadline_edit.setDate(deadline_date)
         else:
             deadline_edit.setDate(QDate.currentDate().addMonths(6))
             
@@ -297,6 +310,7 @@ class GoalsView(QWidget):
         # Description field
         description_edit = QTextEdit()
         description_edit.setMaximumHeight(100)
+        description_edit.setText(goal.get('description') or '')
         form_layout.addRow("Descripción:", description_edit)
         
         layout.addLayout(form_layout)
@@ -3,19 +3,65 @@
 
 from PyQt5.QtWidgets import (QMainWindow, QTabWidget, QWidget, QVBoxLayout,
                              QHBoxLayout, QLabel, QPushButton, QAction, QToolBar,
-                             QStatusBar, QMessageBox, QSplitter, QFrame)
+                             QStatusBar, QMessageBox, QSplitter, QFrame, QDialog,
+                             QFormLayout, QComboBox, QDialogButtonBox, QProgressBar)
 from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QIcon, QFont, QPixmap
+import importlib
 import os
 import qdarkstyle
 
-from src.views.dashboard_view import DashboardView
-from src.views.accounts_view import AccountsView
-from src.views.transactions_view import TransactionsView
-from src.views.budgets_view import BudgetsView
-from src.views.reports_view import ReportsView
-from src.views.goals_view import GoalsView
-from src.views.settings_view import SettingsView
+
+def ask_export_path(parent, title, file_types):
+    """Ask where to save an export.
+    
+    Args:
+        parent (QWidget): Parent of the dialog
+        title (str): Dialog title
+        file_types (list): (description, extension) pairs offered, e.g. ("Archivos CSV", '.csv')
+    
+    Returns:
+        str: Chosen path, ending in the extension of the chosen type, or '' if cancelled
+    """
+    from PyQt5.QtWidgets import QFileDialog
+    
+    filters = [f"{description} (*{extension})" for description, extension in file_types]
+    path, selected = QFileDialog.getSaveFileName(parent, title, "", ";;".join(filters))
+    if path and selected in filters:
+        extension = file_types[filters.index(selected)][1]
+        if not path.lower().endswith(extension):
+            # Replace the extension of another type, e.g. 'datos.csv' saved as gzip
+            for _, other in sorted(file_types, key=lambda file_type: -len(file_type[1])):
+                if path.lower().endswith(other):
+                    path = path[:-len(other)]
+                    break
+            path += extension
+    return path
+
+
+def export_file_types(export_format):
+    """Return the title of the save dialog of an export format and the file types it offers.
+    
+    Args:
+        export_format (str): 'csv', 'excel', 'parquet' or 'arrow'
+    
+    Returns:
+        tuple: Title and (description, extension) pairs, as ask_export_path() takes them
+    """
+    from src.models.exporters import zstd_available
+    
+    if export_format == 'csv':
+        file_types = [("Archivos CSV", '.csv'), ("CSV comprimido con gzip", '.csv.gz')]
+        # zstd needs the optional zstandard package
+        if zstd_available():
+            file_types.append(("CSV comprimido con zstd", '.csv.zst'))
+        return "Exportar a CSV", file_types
+    if export_format == 'excel':
+        return "Exportar a Excel", [("Archivos Excel", '.xlsx')]
+    if export_format == 'parquet':
+        return "Exportar a Parquet", [("Archivos Parquet", '.parquet')]
+    return "Exportar a Arrow", [("Archivos Arrow IPC", '.arrow')]
+
 
 class MainWindow(QMainWindow):
     """Main window of the financial management application."""
@@ -24,9 +70,59 @@ class MainWindow(QMainWindow):
     from PyQt5.QtCore import pyqtSignal
     generate_report_signal = pyqtSignal(str)
     
-    def __init__(self):
+    # Signal emitted when the view of a tab is built
+    view_created = pyqtSignal(str, object)
+    
+    # Signal emitted when a tab becomes visible
+    view_activated = pyqtSignal(str)
+    
+    # Signal emitted to import a file (path, data type, date format, account ID or None)
+    import_requested = pyqtSignal(str, str, str, object)
+    
+    # Signal emitted to export data (path, datasets or None for every table, file format)
+    export_requested = pyqtSignal(str, object, str)
+    
+    # Signal emitted when the running import or export is cancelled
+    task_cancelled = pyqtSignal()
+    
+    # Signal emitted when the window is about to close
+    closing = pyqtSignal()
+    
+    # Tab names and titles, in display order
+    TABS = [
+        ('dashboard', "Panel Principal"),
+        ('accounts', "Cuentas"),
+        ('transactions', "Transacciones"),
+        ('budgets', "Presupuestos"),
+        ('reports', "Informes"),
+        ('goals', "Metas"),
+        ('settings', "Configuración")
+    ]
+    
+    # Module and class of the view shown in each tab
+    VIEW_CLASSES = {
+        'dashboard': ('src.views.dashboard_view', 'DashboardView'),
+        'accounts': ('src.views.accounts_view', 'AccountsView'),
+        'transactions': ('src.views.transactions_view', 'TransactionsView'),
+        'budgets': ('src.views.budgets_view', 'BudgetsView'),
+        'reports': ('src.views.reports_view', 'ReportsView'),
+        'goals': ('src.views.goals_view', 'GoalsView'),
+        'settings': ('src.views.settings_view', 'SettingsView')
+    }
+    
+    def __init__(self, lazy_tabs=True):
+        """Initialize the main window.
+        
+        Args:
+            lazy_tabs (bool, optional): Build tab views on first activation. Defaults to True.
+        """
         super().__init__()
         
+        self.lazy_tabs = lazy_tabs
+        
+        # Function returning the accounts offered as import destination
+        self.account_source = None
+        
         # Set window properties
         self.setWindowTitle("Finanzas - Gestión Financiera")
         self.setMinimumSize(1200, 800)
@@ -59,6 +155,7 @@ class MainWindow(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Listo")
+        self.create_task_progress()
         
         # Create toolbar
         self.create_toolbar()
@@ -110,42 +207,116 @@ class MainWindow(QMainWindow):
         self.main_layout.addWidget(separator)
     
     def create_tabs(self):
-        """Create the tab widget with different views."""
+        """Create the tab widget with lightweight placeholders for each view.
+        
+        Views are built the first time their tab is activated, except the
+        dashboard, which is visible at startup.
+        """
         self.tab_widget = QTabWidget()
         self.tab_widget.setTabPosition(QTabWidget.North)
         self.tab_widget.setDocumentMode(True)
         self.tab_widget.setMovable(True)
         
-        # Dashboard tab
-        self.dashboard_view = DashboardView()
-        self.tab_widget.addTab(self.dashboard_view, "Panel Principal")
+        # Built views by name, and the container page of every tab
+        self.views = {}
+        self.tab_pages = {}
         
-        # Accounts tab
-        self.accounts_view = AccountsView()
-        self.tab_widget.addTab(self.accounts_view, "Cuentas")
+        for name, title in self.TABS:
+            setattr(self, f'{name}_view', None)
+            
+            # Placeholder page that will host the view once it is built
+            page = QWidget()
+            page_layout = QVBoxLayout(page)
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            self.tab_pages[name] = page
+            self.tab_widget.addTab(page, title)
         
-        # Transactions tab
-        self.transactions_view = TransactionsView()
-        self.tab_widget.addTab(self.transactions_view, "Transacciones")
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         
-        # Budgets tab
-        self.budgets_view = BudgetsView()
-        self.tab_widget.addTab(self.budgets_view, "Presupuestos")
+        # Add tab widget to main layout
+        self.main_layout.addWidget(self.tab_widget)
         
-        # Reports tab
-        self.reports_view = ReportsView()
-        self.tab_widget.addTab(self.reports_view, "Informes")
+        # Build the visible tab right away, or every tab when lazy loading is disabled
+        for name, _ in self.TABS:
+            if not self.lazy_tabs or name == 'dashboard':
+                self.ensure_view(name)
+    
+    def create_view(self, name):
+        """Create the view shown in a tab.
         
-        # Goals tab
-        self.goals_view = GoalsView()
-        self.tab_widget.addTab(self.goals_view, "Metas")
+        Args:
+            name (str): Name of the tab
+            
+        Returns:
+            QWidget: The new view
+        """
+        # View modules are imported on first use to keep them off the startup path
+        module_name, class_name = self.VIEW_CLASSES[name]
+        view_class = getattr(importlib.import_module(module_name), class_name)
+        return view_class()
+    
+    def ensure_view(self, name):
+        """Return the view of a tab, building it on first use.
         
-        # Settings tab
-        self.settings_view = SettingsView()
-        self.tab_widget.addTab(self.settings_view, "Configuración")
+        Args:
+            name (str): Name of the tab
+            
+        Returns:
+            QWidget: The view of the tab
+        """
+        view = self.views.get(name)
+        if view is None:
+            view = self.create_view(name)
+            self.tab_pages[name].layout().addWidget(view)
+            self.views[name] = view
+            setattr(self, f'{name}_view', view)
+            self.view_created.emit(name, view)
+        return view
+    
+    def tab_name(self, index):
+        """Return the name of the tab at the given index."""
+        page = self.tab_widget.widget(index)
+        for name, tab_page in self.tab_pages.items():
+            if tab_page is page:
+                return name
+        return None
+    
+    def current_tab_name(self):
+        """Return the name of the currently visible tab."""
+        return self.tab_name(self.tab_widget.currentIndex())
+    
+    def show_tab(self, name):
+        """Switch to a tab, building its view if needed.
         
-        # Add tab widget to main layout
-        self.main_layout.addWidget(self.tab_widget)
+        Args:
+            name (str): Name of the tab
+            
+        Returns:
+            QWidget: The view of the tab
+        """
+        view = self.ensure_view(name)
+        self.tab_widget.setCurrentWidget(self.tab_pages[name])
+        return view
+    
+    def on_tab_changed(self, index):
+        """Build the view of the activated tab and notify listeners."""
+        name = self.tab_name(index)
+        if name is not None:
+            self.ensure_view(name)
+            self.view_activated.emit(name)
+    
+    def create_task_progress(self):
+        """Create the progress bar and cancel button shown in the status bar during imports and exports."""
+        self.task_progress = QProgressBar()
+        self.task_progress.setRange(0, 100)
+        self.task_progress.setMaximumWidth(200)
+        self.task_progress.hide()
+        self.status_bar.addPermanentWidget(self.task_progress)
+        
+        self.task_cancel_button = QPushButton("Cancelar")
+        self.task_cancel_button.clicked.connect(self.task_cancelled)
+        self.task_cancel_button.hide()
+        self.status_bar.addPermanentWidget(self.task_cancel_button)
     
     def create_toolbar(self):
         """Create the toolbar with quick actions."""
@@ -189,13 +360,13 @@ class MainWindow(QMainWindow):
         
         file_menu.addSeparator()
         
-        import_action = QAction("Importar Datos", self)
-        import_action.triggered.connect(self.import_data)
-        file_menu.addAction(import_action)
+        self.import_action = QAction("Importar Datos", self)
+        self.import_action.triggered.connect(self.import_data)
+        file_menu.addAction(self.import_action)
         
-        export_action = QAction("Exportar Datos", self)
-        export_action.triggered.connect(self.export_data)
-        file_menu.addAction(export_action)
+        self.export_action = QAction("Exportar Datos", self)
+        self.export_action.triggered.connect(self.export_data)
+        file_menu.addAction(self.export_action)
         
         file_menu.addSeparator()
         
@@ -381,106 +552,188 @@ class MainWindow(QMainWindow):
     # Action handlers
     def add_transaction(self):
         """Open dialog to add a new transaction."""
-        self.tab_widget.setCurrentIndex(2)  # Switch to transactions tab
-        self.transactions_view.show_add_transaction_dialog()
+        self.show_tab('transactions').show_add_transaction_dialog()
     
     def add_account(self):
         """Open dialog to add a new account."""
-        self.tab_widget.setCurrentIndex(1)  # Switch to accounts tab
-        self.accounts_view.show_add_account_dialog()
+        self.show_tab('accounts').show_add_account_dialog()
     
     def generate_report(self, report_type=None):
         """Generate a financial report."""
-        self.tab_widget.setCurrentIndex(4)  # Switch to reports tab
+        reports_view = self.show_tab('reports')
         if report_type:
-            self.reports_view.generate_report(report_type)
+            reports_view.generate_report(report_type)
+    
+    def set_account_source(self, account_source):
+        """Set the function returning the accounts offered as import destination.
+        
+        Args:
+            account_source (callable): Called without arguments, returns account dictionaries
+        """
+        self.account_source = account_source
     
     def import_data(self):
-        """Import data from external sources."""
+        """Ask for a CSV or bank statement file and its import options, and request the import."""
         from PyQt5.QtWidgets import QFileDialog
-        import csv
-        import sqlite3
-        import os
         
         # Ask user to select a file
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Importar Datos",
             "",
-            "Archivos CSV (*.csv);;Todos los archivos (*)"
+            "Archivos de datos (*.csv *.txt *.parquet *.arrow *.feather *.ofx *.qfx *.qif *.xml);;"
+            "Archivos CSV (*.csv *.txt);;Archivos Parquet y Arrow (*.parquet *.arrow *.feather);;"
+            "Extractos bancarios OFX, QIF y CAMT.053 (*.ofx *.qfx *.qif *.xml);;"
+            "Tasas de cambio del BCE (*.xml);;Todos los archivos (*)"
         )
         
         if not file_path:
             return  # User cancelled
         
-        try:
-            # Show import options dialog
-            import_dialog = QDialog(self)
-            import_dialog.setWindowTitle("Opciones de Importación")
-            import_dialog.setMinimumWidth(400)
-            
-            layout = QVBoxLayout(import_dialog)
-            
-            # Data type selection
-            form_layout = QFormLayout()
-            data_type_combo = QComboBox()
-            data_type_combo.addItem("Transacciones", "transactions")
-            data_type_combo.addItem("Cuentas", "accounts")
-            data_type_combo.addItem("Categorías", "categories")
-            form_layout.addRow("Tipo de datos:", data_type_combo)
-            
-            # Date format selection
-            date_format_combo = QComboBox()
-            date_format_combo.addItem("DD/MM/YYYY", "dd/MM/yyyy")
-            date_format_combo.addItem("MM/DD/YYYY", "MM/dd/yyyy")
-            date_format_combo.addItem("YYYY-MM-DD", "yyyy-MM-dd")
-            form_layout.addRow("Formato de fecha:", date_format_combo)
-            
-            layout.addLayout(form_layout)
-            
-            # Buttons
-            button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-            button_box.accepted.connect(import_dialog.accept)
-            button_box.rejected.connect(import_dialog.reject)
-            layout.addWidget(button_box)
-            
-            if import_dialog.exec_() != QDialog.Accepted:
-                return  # User cancelled
-            
-            # Get selected options
-            data_type = data_type_combo.currentData()
-            date_format = date_format_combo.currentData()
-            
-            # Read CSV file
-            with open(file_path, 'r', encoding='utf-8') as csv_file:
-                csv_reader = csv.DictReader(csv_file)
-                rows = list(csv_reader)
-            
-            if not rows:
-                QMessageBox.warning(self, "Importar Datos", "El archivo CSV está vacío o no tiene el formato correcto.")
-                return
-            
-            # Process data based on type
-            # In a real implementation, this would insert the data into the database
-            # For now, we'll just show a success message
-            
-            QMessageBox.information(
-                self,
-                "Importar Datos",
-                f"Se importaron {len(rows)} registros de {data_type} exitosamente."
-            )
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al importar datos: {str(e)}")
+        # Show import options dialog
+        import_dialog = QDialog(self)
+        import_dialog.setWindowTitle("Opciones de Importación")
+        import_dialog.setMinimumWidth(400)
+        
+        layout = QVBoxLayout(import_dialog)
+        
+        # Data type selection
+        form_layout = QFormLayout()
+        data_type_combo = QComboBox()
+        data_type_combo.addItem("Transacciones", "transactions")
+        data_type_combo.addItem("Cuentas", "accounts")
+        data_type_combo.addItem("Categorías", "categories")
+        data_type_combo.addItem("Tasas de cambio", "exchange_rates")
+        form_layout.addRow("Tipo de datos:", data_type_combo)
+        
+        # Date format selection
+        date_format_combo = QComboBox()
+        date_format_combo.addItem("DD/MM/YYYY", "dd/MM/yyyy")
+        date_format_combo.addItem("MM/DD/YYYY", "MM/dd/yyyy")
+        date_format_combo.addItem("YYYY-MM-DD", "yyyy-MM-dd")
+        form_layout.addRow("Formato de fecha:", date_format_combo)
+        
+        # Destination of the transactions of files that name no known account
+        account_combo = QComboBox()
+        account_combo.addItem("Según el archivo", None)
+        for account in (self.account_source() if self.account_source else []):
+            account_combo.addItem(account['name'], account['id'])
+        form_layout.addRow("Cuenta:", account_combo)
+        data_type_combo.currentIndexChanged.connect(
+            lambda: account_combo.setEnabled(data_type_combo.currentData() == 'transactions'))
+        
+        layout.addLayout(form_layout)
+        
+        # Buttons
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(import_dialog.accept)
+        button_box.rejected.connect(import_dialog.reject)
+        layout.addWidget(button_box)
+        
+        if import_dialog.exec_() != QDialog.Accepted:
+            return  # User cancelled
+        
+        # The file is read and written on a worker thread
+        self.import_requested.emit(file_path, data_type_combo.currentData(), date_format_combo.currentData(),
+                                   account_combo.currentData())
+    
+    def start_task(self, label):
+        """Show the progress of an import or export started on a worker thread.
+        
+        Args:
+            label (str): Text of the progress bar, e.g. "Importando"
+        """
+        self.import_action.setEnabled(False)
+        self.export_action.setEnabled(False)
+        self.task_progress.setFormat(f"{label} %p%")
+        self.show_task_progress(0)
+    
+    def show_task_progress(self, percentage, cancellable=True):
+        """Show the progress of the running import or export.
+        
+        Args:
+            percentage (int): Progress so far (0-100)
+            cancellable (bool, optional): Whether the task can still be cancelled
+        """
+        self.task_progress.setValue(percentage)
+        self.task_progress.show()
+        self.task_cancel_button.setEnabled(cancellable)
+        self.task_cancel_button.show()
+    
+    def show_task_cancelling(self):
+        """Show that the running task was asked to stop, until its worker ends."""
+        self.task_progress.setFormat("Cancelando %p%")
+        self.task_cancel_button.setEnabled(False)
+    
+    def end_task(self, message):
+        """Hide the task progress and show a message in the status bar."""
+        self.task_progress.hide()
+        self.task_cancel_button.hide()
+        self.import_action.setEnabled(True)
+        self.export_action.setEnabled(True)
+        self.status_bar.showMessage(message, 5000)
+    
+    def show_status_error(self, message):
+        """Show the error of a background task in the status bar.
+        
+        Args:
+            message (str): Error description
+        """
+        self.status_bar.showMessage(message, 10000)
+    
+    def show_task_busy(self):
+        """Tell that an import or export is already running."""
+        QMessageBox.information(self, "Finanzas", "Espere a que termine la importación o exportación en curso.")
+    
+    def show_import_result(self, result):
+        """Show the summary of a finished import, or of one stopped by an error after writing some rows.
+        
+        Args:
+            result (ImportResult): Summary of the import
+        """
+        names = {'transactions': "transacciones", 'accounts': "cuentas", 'categories': "categorías",
+                 'exchange_rates': "tasas de cambio"}
+        message = f"Se importaron {result.imported} registros de {names.get(result.data_type, result.data_type)}."
+        self.end_task(message)
+        if result.duplicates:
+            message += f" Se omitieron {result.duplicates} que ya existían."
+        if result.error:
+            message += f"\n\nLa importación se detuvo por un error: {result.error}"
+        
+        if result.rejected:
+            message += f"\n\nSe descartaron {result.rejected} filas:\n" + "\n".join(result.errors)
+            if result.rejected > len(result.errors):
+                message += "\n..."
+        
+        if result.rejected or result.error:
+            QMessageBox.warning(self, "Importar Datos", message)
+        else:
+            QMessageBox.information(self, "Importar Datos", message)
+    
+    def show_import_cancelled(self, imported=0):
+        """Hide the progress of a cancelled import.
+        
+        Args:
+            imported (int, optional): Rows written before the import was cancelled, which are kept
+        """
+        if imported:
+            self.end_task(f"Importación cancelada; se conservan {imported} registros ya importados")
+        else:
+            self.end_task("Importación cancelada")
+    
+    def show_import_error(self, message):
+        """Show why an import failed; nothing was imported.
+        
+        Args:
+            message (str): Error description
+        """
+        self.end_task("Error al importar datos")
+        QMessageBox.critical(self, "Error", f"Error al importar datos: {message}")
     
     def export_data(self):
-        """Export data to external formats."""
-        from PyQt5.QtWidgets import QFileDialog
-        import csv
-        import sqlite3
-        import os
+        """Ask for the data to export and the file to write, and request the export."""
+        from src.models.exporters import pyarrow_available
         
-        # Ask user to select export format and location
         export_dialog = QDialog(self)
         export_dialog.setWindowTitle("Exportar Datos")
         export_dialog.setMinimumWidth(400)
@@ -490,15 +743,21 @@ class MainWindow(QMainWindow):
         # Data type selection
         form_layout = QFormLayout()
         data_type_combo = QComboBox()
-        data_type_combo.addItem("Transacciones", "transactions")
-        data_type_combo.addItem("Cuentas", "accounts")
-        data_type_combo.addItem("Categorías", "categories")
+        data_type_combo.addItem("Transacciones", ['transactions'])
+        data_type_combo.addItem("Transacciones con cuenta y categoría", ['transactions_detail'])
+        data_type_combo.addItem("Cuentas", ['accounts'])
+        data_type_combo.addItem("Categorías", ['categories'])
+        data_type_combo.addItem("Todos los datos", None)
         form_layout.addRow("Tipo de datos:", data_type_combo)
         
         # Export format selection
         format_combo = QComboBox()
         format_combo.addItem("CSV", "csv")
         format_combo.addItem("Excel", "excel")
+        # Typed columnar formats need the optional pyarrow package
+        if pyarrow_available():
+            format_combo.addItem("Parquet", "parquet")
+            format_combo.addItem("Arrow IPC", "arrow")
         form_layout.addRow("Formato:", format_combo)
         
         layout.addLayout(form_layout)
@@ -512,74 +771,36 @@ class MainWindow(QMainWindow):
         if export_dialog.exec_() != QDialog.Accepted:
             return  # User cancelled
         
-        # Get selected options
-        data_type = data_type_combo.currentData()
         export_format = format_combo.currentData()
+        file_path = ask_export_path(self, *export_file_types(export_format))
+        if not file_path:
+            return  # User cancelled
         
-        try:
-            if export_format == "csv":
-                file_path, _ = QFileDialog.getSaveFileName(
-                    self,
-                    "Exportar a CSV",
-                    "",
-                    "Archivos CSV (*.csv)"
-                )
-                if not file_path:
-                    return  # User cancelled
-                
-                # Connect to database
-                db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'finanzas.db')
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-                
-                # Get table data
-                cursor.execute(f"SELECT * FROM {data_type}")
-                rows = cursor.fetchall()
-                
-                # Get column names
-                cursor.execute(f"PRAGMA table_info({data_type})")
-                headers = [column[1] for column in cursor.fetchall()]
-                
-                # Write to CSV
-                with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(headers)
-                    writer.writerows(rows)
-                
-                conn.close()
-                
-            elif export_format == "excel":
-                file_path, _ = QFileDialog.getSaveFileName(
-                    self,
-                    "Exportar a Excel",
-                    "",
-                    "Archivos Excel (*.xlsx)"
-                )
-                if not file_path:
-                    return  # User cancelled
-                
-                import pandas as pd
-                
-                # Connect to database
-                db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'finanzas.db')
-                conn = sqlite3.connect(db_path)
-                
-                # Read data into DataFrame
-                df = pd.read_sql_query(f"SELECT * FROM {data_type}", conn)
-                
-                # Export to Excel
-                df.to_excel(file_path, index=False)
-                
-                conn.close()
-            
-            QMessageBox.information(
-                self,
-                "Exportar Datos",
-                f"Los datos se han exportado exitosamente a {file_path}"
-            )
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al exportar datos: {str(e)}")
+        # The data is read and written on a worker thread
+        self.export_requested.emit(file_path, data_type_combo.currentData(), export_format)
+    
+    def show_export_result(self, result):
+        """Show the files written by a finished export.
+        
+        Args:
+            result (ExportResult): Written files and rows
+        """
+        self.end_task("Exportación completada")
+        QMessageBox.information(self, "Exportar Datos",
+                                f"Se exportaron {result.rows} registros a:\n" + "\n".join(result.paths))
+    
+    def show_export_cancelled(self):
+        """Hide the progress of a cancelled export."""
+        self.end_task("Exportación cancelada")
+    
+    def show_export_error(self, message):
+        """Show why an export failed; no file was left behind.
+        
+        Args:
+            message (str): Error description
+        """
+        self.end_task("Error al exportar datos")
+        QMessageBox.critical(self, "Error", f"Error al exportar datos: {message}")
     
     def show_about(self):
         """Show about dialog."""
@@ -591,4 +812,9 @@ class MainWindow(QMainWindow):
     
     def show_help(self):
         """Show help information."""
-        QMessageBox.information(self, "Ayuda", "Consulte la documentación para obtener ayuda sobre cómo usar el software.")
\ No newline at end of file
+        QMessageBox.information(self, "Ayuda", "Consulte la documentación para obtener ayuda sobre cómo usar el software.")
+    
+    def closeEvent(self, event):
+        """Let the controller save its state before the window closes."""
+        self.closing.emit()
+        super().closeEvent(event)
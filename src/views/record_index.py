@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Row index of the records shown in a table.
+
+Table views keep the records they display in a RecordIndex, so a row and
+its record can be found from an ID without scanning the table.
+"""
+
+
+class RecordIndex:
+    """Records in row order, indexed by their 'id' key."""
+
+    def __init__(self, records=()):
+        """Initialize the index.
+
+        Args:
+            records (iterable, optional): Initial records, in row order
+        """
+        self.records = []
+        self.rows = {}
+        self.reset(records)
+
+    def reset(self, records):
+        """Replace every record.
+
+        Args:
+            records (iterable): Record dictionaries, in row order
+        """
+        self.records = list(records or [])
+        self.rows = {record['id']: row for row, record in enumerate(self.records)}
+
+    def extend(self, records):
+        """Append records after the last row."""
+        for record in records:
+            self.rows[record['id']] = len(self.records)
+            self.records.append(record)
+
+    def row_of(self, record_id):
+        """Return the row of a record, or None if it is not shown."""
+        return self.rows.get(record_id)
+
+    def get(self, record_id):
+        """Return the record with an ID, or None if it is not shown."""
+        row = self.rows.get(record_id)
+        return self.records[row] if row is not None else None
+
+    def update(self, record):
+        """Replace a record in place.
+
+        Args:
+            record (dict): New version of the record
+
+        Returns:
+            int: Row of the record, or None if it is not shown
+        """
+        row = self.rows.get(record['id'])
+        if row is not None:
+            self.records[row] = record
+        return row
+
+    def remove(self, record_id):
+        """Remove a record, shifting the rows below it up.
+
+        Args:
+            record_id (int): ID of the record
+
+        Returns:
+            int: Row the record was in, or None if it was not shown
+        """
+        row = self.rows.pop(record_id, None)
+        if row is None:
+            return None
+
+        del self.records[row]
+        for below in self.records[row:]:
+            self.rows[below['id']] -= 1
+        return row
+
+    def __getitem__(self, row):
+        return self.records[row]
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, record_id):
+        return record_id in self.rows
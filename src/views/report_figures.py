@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Static report figures for images written outside the Qt interface.
+
+Figures are drawn with matplotlib's object-oriented API and its Agg and
+SVG canvases, so no QApplication or display is needed and several
+processes can render at once. The layout follows the report tabs.
+"""
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from src.models import report_data
+
+INCOME_COLOR = '#28A745'
+EXPENSE_COLOR = '#DC3545'
+BALANCE_COLOR = '#1565c0'
+BUDGET_COLOR = '#007BFF'
+ACTUAL_COLOR = '#FFC107'
+
+# Size of the figures, in inches at 100 dpi
+FIGURE_SIZE = (11, 6.5)
+
+# Maximum number of bins per trend chart
+TREND_BINS = 400
+
+
+def figure_title(title, report, account_name=None):
+    """Return the title of a report figure, with its period and account."""
+    text = f"{title}: {report.start_date} a {report.end_date}"
+    if report.account_id:
+        text += f"\nCuenta: {account_name or report.account_id}"
+    return text
+
+
+def draw_bar_pairs(axes, labels, first, second, first_label, second_label, first_color, second_color):
+    """Draw two bars per label, side by side."""
+    bar_width = 0.35
+    positions = range(len(labels))
+    axes.bar([i - bar_width / 2 for i in positions], first, bar_width, color=first_color, label=first_label)
+    axes.bar([i + bar_width / 2 for i in positions], second, bar_width, color=second_color, label=second_label)
+    axes.set_xticks(list(positions))
+    # Long periods get slanted labels so they do not overlap
+    if len(labels) > 12:
+        axes.set_xticklabels(labels, rotation=45, ha='right')
+    else:
+        axes.set_xticklabels(labels)
+    axes.grid(axis='y', alpha=0.3)
+    axes.legend()
+
+
+def draw_income_expense_report(figure, report):
+    """Draw the income and expenses per month."""
+    axes = figure.add_subplot()
+    draw_bar_pairs(axes, [month.label for month in report.months],
+                   [month.income for month in report.months], [month.expenses for month in report.months],
+                   'Ingresos', 'Gastos', INCOME_COLOR, EXPENSE_COLOR)
+    axes.set_xlabel(f"Ingresos: ${report.total_income:,.2f}    Gastos: ${report.total_expenses:,.2f}    "
+                    f"Neto: ${report.total_income - report.total_expenses:,.2f}", parse_math=False)
+
+
+def draw_category_report(figure, report):
+    """Draw the expenses by category as a pie and a bar chart."""
+    names = [entry.name for entry in report.categories]
+    totals = [entry.total for entry in report.categories]
+    colors = [entry.color for entry in report.categories]
+
+    pie_axes = figure.add_subplot(1, 2, 1)
+    if report.total > 0:
+        pie_axes.pie(totals, labels=[f"{entry.name} {entry.percentage:.0f}%" for entry in report.categories],
+                     colors=colors, startangle=90, counterclock=False, wedgeprops={'edgecolor': 'black'})
+    pie_axes.set_title("Distribución de Gastos por Categoría")
+    pie_axes.axis('equal')
+
+    bar_axes = figure.add_subplot(1, 2, 2)
+    bar_axes.bar(range(len(names)), totals, 0.6, color=colors)
+    bar_axes.set_xticks(list(range(len(names))))
+    bar_axes.set_xticklabels(names, rotation=45, ha='right')
+    bar_axes.set_title("Gastos por Categoría")
+    bar_axes.grid(axis='y', alpha=0.3)
+
+
+def draw_trend_report(figure, report, daily_series=None):
+    """Draw the daily balance and the income and expenses of the period."""
+    from src.models.timeseries import day_date, day_number
+
+    first_day, last_day = day_number(report.start_date), day_number(report.end_date)
+    balance_axes = figure.add_subplot(2, 1, 1)
+    balance_axes.set_title("Tendencia de Patrimonio Neto")
+    flow_axes = figure.add_subplot(2, 1, 2, sharex=balance_axes)
+    flow_axes.set_title("Tendencia de Ingresos y Gastos")
+
+    if daily_series is not None:
+        # Min/max band of the balance, one bin per pixel column at most
+        window = daily_series['balance'].window(first_day, last_day, TREND_BINS)
+        dates = [day_date(day) for day in window.days]
+        balance_axes.fill_between(dates, window.mins, window.maxs, color=BALANCE_COLOR, step='post')
+        balance_axes.plot(dates, window.maxs, color=BALANCE_COLOR, drawstyle='steps-post')
+
+        # Income and expenses summed per bin, wide enough to be seen
+        income = daily_series['income'].window(first_day, last_day, TREND_BINS // 4)
+        expense = daily_series['expense'].window(first_day, last_day, TREND_BINS // 4)
+        dates = [day_date(day) for day in income.days]
+        width = income.bin_days * 0.4
+        flow_axes.bar(dates, income.sums, width, align='edge', color=INCOME_COLOR, label='Ingresos')
+        flow_axes.bar([day_date(day + expense.bin_days * 0.5) for day in expense.days], expense.sums, width,
+                      align='edge', color=EXPENSE_COLOR, label='Gastos')
+        flow_axes.legend()
+
+    for axes in (balance_axes, flow_axes):
+        axes.grid(alpha=0.3)
+    flow_axes.set_xlabel(f"Ingreso mensual promedio: ${report.average_income:,.2f}    "
+                         f"Gasto mensual promedio: ${report.average_expenses:,.2f}    "
+                         f"Crecimiento patrimonial: {report.growth:.1f}%", parse_math=False)
+    figure.autofmt_xdate()
+
+
+def draw_budget_report(figure, report):
+    """Draw the budgeted and actual expenses per category."""
+    axes = figure.add_subplot()
+    draw_bar_pairs(axes, [line.name for line in report.lines],
+                   [line.budgeted for line in report.lines], [line.actual for line in report.lines],
+                   'Presupuestado', 'Real', BUDGET_COLOR, ACTUAL_COLOR)
+    axes.set_xlabel(f"Presupuestado: ${report.total_budgeted:,.2f}    Gastado: ${report.total_actual:,.2f}    "
+                    f"Diferencia: ${report.total_budgeted - report.total_actual:,.2f}", parse_math=False)
+
+
+def create_report_figure(report, account_name=None, daily_series=None):
+    """Draw a report.
+
+    Args:
+        report: IncomeExpenseReport, CategoryReport, TrendReport or BudgetReport
+        account_name (str, optional): Name of the account filtering the report
+        daily_series (dict, optional): build_daily_series() pyramids, drawn by trend reports
+
+    Returns:
+        Figure: Drawn figure, attached to an Agg canvas
+    """
+    figure = Figure(figsize=FIGURE_SIZE, dpi=100, layout='constrained')
+    FigureCanvasAgg(figure)
+
+    if isinstance(report, report_data.IncomeExpenseReport):
+        title = "Informe de Ingresos y Gastos"
+        draw_income_expense_report(figure, report)
+    elif isinstance(report, report_data.CategoryReport):
+        title = "Informe de Gastos por Categoría"
+        draw_category_report(figure, report)
+    elif isinstance(report, report_data.TrendReport):
+        title = "Informe de Tendencias Financieras"
+        draw_trend_report(figure, report, daily_series)
+        # The trends include every account
+        report = report._replace(account_id=None)
+    elif isinstance(report, report_data.BudgetReport):
+        title = "Informe de Presupuestos"
+        draw_budget_report(figure, report)
+    else:
+        raise ValueError(f"Unknown report: {type(report).__name__}")
+
+    figure.suptitle(figure_title(title, report, account_name), fontweight='bold', parse_math=False)
+    return figure
+
+
+def save_report_figure(report, path, file_format=None, account_name=None, daily_series=None):
+    """Draw a report and save it as an image.
+
+    Args:
+        report: Report data
+        path (str): Image path
+        file_format (str, optional): 'png' or 'svg'. Defaults to the path's extension.
+        account_name (str, optional): Name of the account filtering the report
+        daily_series (dict, optional): build_daily_series() pyramids, drawn by trend reports
+    """
+    figure = create_report_figure(report, account_name, daily_series)
+    figure.savefig(path, format=file_format)
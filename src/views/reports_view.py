@@ -3,9 +3,9 @@
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QComboBox, QFrame, QDateEdit,
-                             QFormLayout, QTabWidget, QMessageBox)
-from PyQt5.QtCore import Qt, QDate
-from PyQt5.QtGui import QFont
+                             QFormLayout, QTabWidget, QMessageBox, QProgressBar)
+from PyQt5.QtCore import Qt, QDate, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QColor
 import pyqtgraph as pg
 import os
 from datetime import datetime, timedelta
@@ -13,23 +13,50 @@ from datetime import datetime, timedelta
 class ReportsView(QWidget):
     """Reports view showing financial reports and analytics."""
     
+    # Signal emitted with (report_type, start_date, end_date, account_id) when a report is requested
+    report_requested = pyqtSignal(str, str, str, object)
+    
+    # Milliseconds the filters wait after the last edit before requesting the report again
+    REPORT_DELAY_MS = 300
+    
+    # Tab showing each type of report
+    REPORT_TABS = {'income_expense': 0, 'category': 1, 'trend': 2, 'budget': 3}
+    
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Daily series pyramids and the trend chart series drawing them
+        self.daily_series = None
+        self.trend_series = {}
+        self.trend_range = None
+        # Type of the last requested report, regenerated when the filters change
+        self.requested_type = None
+        # X-axis labels of each bar chart
+        self.axis_labels = {}
         self.init_ui()
-        self.load_accounts()
-
-    def load_accounts(self):
-        """Load accounts into the account filter combo box."""
+    
+    def load_accounts(self, accounts):
+        """Load accounts into the account filter combo box.
+        
+        Args:
+            accounts (list): List of account dictionaries
+        """
+        # Keep the current selection across reloads
+        selected_account = self.account_combo.currentData()
+        
+        self.account_combo.blockSignals(True)
         self.account_combo.clear()
         self.account_combo.addItem("Todas las Cuentas", None)
         
-        # Get accounts from database
-        from src.models.database_manager import DatabaseManager
-        db_manager = DatabaseManager()
-        accounts = db_manager.get_accounts()
-        
         for account in accounts:
             self.account_combo.addItem(account['name'], account['id'])
+        
+        index = self.account_combo.findData(selected_account)
+        self.account_combo.setCurrentIndex(max(index, 0))
+        self.account_combo.blockSignals(False)
+        
+        # The selected account no longer exists
+        if self.account_combo.currentData() != selected_account:
+            self.schedule_report()
     
     def init_ui(self):
         """Initialize the user interface."""
@@ -50,9 +77,17 @@ class ReportsView(QWidget):
         # Spacer
         header_layout.addStretch()
         
+        # Progress of the report being computed
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setFixedWidth(160)
+        self.progress_bar.hide()
+        header_layout.addWidget(self.progress_bar)
+        
         # Generate report button
         self.generate_btn = QPushButton("Generar Informe")
-        self.generate_btn.clicked.connect(self.generate_report)
+        self.generate_btn.clicked.connect(lambda: self.generate_report())
         header_layout.addWidget(self.generate_btn)
         
         main_layout.addLayout(header_layout)
@@ -107,6 +142,17 @@ class ReportsView(QWidget):
         
         main_layout.addWidget(filters_frame)
         
+        # Debounce timer, restarted on every filter edit
+        self.report_timer = QTimer(self)
+        self.report_timer.setSingleShot(True)
+        self.report_timer.setInterval(self.REPORT_DELAY_MS)
+        self.report_timer.timeout.connect(lambda: self.generate_report())
+        
+        self.report_type_combo.currentIndexChanged.connect(self.schedule_report)
+        self.start_date_edit.dateChanged.connect(self.schedule_report)
+        self.end_date_edit.dateChanged.connect(self.schedule_report)
+        self.account_combo.currentIndexChanged.connect(self.schedule_report)
+        
         # Reports tab widget
         self.reports_tabs = QTabWidget()
         self.reports_tabs.setTabPosition(QTabWidget.North)
@@ -130,20 +176,28 @@ class ReportsView(QWidget):
         
         main_layout.addWidget(self.reports_tabs)
     
+    def schedule_report(self, *args):
+        """Request the last report again once the user stops editing the filters."""
+        if self.requested_type is not None:
+            self.report_timer.start()
+    
     def generate_report(self, report_type=None):
-        """Generate a financial report.
+        """Request a financial report for the current filters.
+        
+        The report is computed by the controller, which calls show_report()
+        with its data. Only the latest request is shown.
         
         Args:
             report_type (str, optional): Type of report to generate. Defaults to None.
         """
+        self.report_timer.stop()
         if report_type is None:
             report_type = self.report_type_combo.currentData()
         else:
             # Set the combo box to the specified report type
-            for i in range(self.report_type_combo.count()):
-                if self.report_type_combo.itemData(i) == report_type:
-                    self.report_type_combo.setCurrentIndex(i)
-                    break
+            self.report_type_combo.blockSignals(True)
+            self.report_type_combo.setCurrentIndex(self.report_type_combo.findData(report_type))
+            self.report_type_combo.blockSignals(False)
         
         # Get date range
         start_date = self.start_date_edit.date().toString("yyyy-MM-dd")
@@ -153,495 +207,136 @@ class ReportsView(QWidget):
         account_id = self.account_combo.currentData()
         
         # Show appropriate tab based on report type
-        if report_type == "income_expense":
-            self.reports_tabs.setCurrentIndex(0)
-            self.generate_income_expense_report(start_date, end_date, account_id)
-        elif report_type == "category":
-            self.reports_tabs.setCurrentIndex(1)
-            self.generate_category_report(start_date, end_date, account_id)
-        elif report_type == "trend":
-            self.reports_tabs.setCurrentIndex(2)
-            self.generate_trend_report(start_date, end_date, account_id)
-        elif report_type == "budget":
-            self.reports_tabs.setCurrentIndex(3)
-            self.generate_budget_report(start_date, end_date, account_id)
+        self.reports_tabs.setCurrentIndex(self.REPORT_TABS[report_type])
+        self.requested_type = report_type
+        
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.report_requested.emit(report_type, start_date, end_date, account_id)
     
-    def generate_income_expense_report(self, start_date, end_date, account_id=None):
-        """Generate income vs expenses report.
+    def show_report_progress(self, percentage):
+        """Show the progress of the report being computed.
         
         Args:
-            start_date (str): Start date in format 'yyyy-MM-dd'
-            end_date (str): End date in format 'yyyy-MM-dd'
-            account_id (int, optional): Account ID to filter by. Defaults to None.
+            percentage (int): Progress so far (0-100)
         """
-        # Clear previous content
-        if self.income_expense_tab.layout():
-            # Clear previous layout
-            while self.income_expense_tab.layout().count():
-                item = self.income_expense_tab.layout().takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
-            # Remove the layout
-            QWidget().setLayout(self.income_expense_tab.layout())
-        
-        # Create new layout
-        layout = QVBoxLayout(self.income_expense_tab)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(20)
-        
-        # Add report header
-        header_label = QLabel(f"Informe de Ingresos y Gastos: {start_date} a {end_date}")
-        header_font = QFont("Segoe UI", 14, QFont.Bold)
-        header_label.setFont(header_font)
-        layout.addWidget(header_label)
-        
-        # Add account filter info if applicable
-        if account_id:
-            # Get account name from database
-            from src.models.database_manager import DatabaseManager
-            db_manager = DatabaseManager()
-            account = db_manager.get_account(account_id)
-            account_name = account['name'] if account else str(account_id)
-            account_label = QLabel(f"Cuenta: {account_name}")
-            account_label.setStyleSheet("color: #888;")
-            layout.addWidget(account_label)
-        
-        # Create chart frame
-        chart_frame = QFrame()
-        chart_frame.setObjectName("chartFrame")
-        chart_frame.setStyleSheet("""
-            #chartFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        chart_layout = QVBoxLayout(chart_frame)
-        
-        # Get real data from database
-        from src.models.database_manager import DatabaseManager
-        from datetime import datetime, timedelta
-        import calendar
-        
-        db_manager = DatabaseManager()
-        
-        # Parse start and end dates
-        start_date_obj = datetime.strptime(start_date, '%Y-%m-%d')
-        end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
-        
-        # Calculate months between start and end date
-        months_data = {}
-        current_date = start_date_obj
-        
-        while current_date <= end_date_obj:
-            month_name = current_date.strftime('%b')
-            first_day = datetime(current_date.year, current_date.month, 1)
-            last_day = datetime(current_date.year, current_date.month, 
-                               calendar.monthrange(current_date.year, current_date.month)[1])
-            
-            # Get transactions for this month
-            month_transactions = db_manager.get_transactions(
-                account_id=account_id,
-                start_date=first_day.strftime('%Y-%m-%d'),
-                end_date=last_day.strftime('%Y-%m-%d')
-            )
-            
-            # Calculate income and expenses
-            month_income = sum(t['amount'] for t in month_transactions if t['type'] == 'income')
-            month_expenses = sum(t['amount'] for t in month_transactions if t['type'] == 'expense')
-            
-            months_data[month_name] = {
-                'income': month_income,
-                'expenses': month_expenses
-            }
-            
-            # Move to next month
-            if current_date.month == 12:
-                current_date = datetime(current_date.year + 1, 1, 1)
-            else:
-                current_date = datetime(current_date.year, current_date.month + 1, 1)
-        
-        # Prepare data for chart
-        months = list(months_data.keys())
-        income = [months_data[month]['income'] for month in months]
-        expenses = [months_data[month]['expenses'] for month in months]
-        
-        # Create bar chart
-        pg.setConfigOption('background', '#252529')
-        pg.setConfigOption('foreground', '#DDDDDD')
-        
-        budget_widget = pg.PlotWidget()
-        budget_widget.setMinimumHeight(300)
-        budget_widget.setTitle("Rendimiento del Presupuesto por Categoría")
-        budget_widget.showGrid(y=True, alpha=0.3)
-        
-        # Set up x-axis
-        x_axis = budget_widget.getAxis('bottom')
-        x_axis.setTicks([[(i, cat) for i, cat in enumerate(categories)]])
-        
-        # Create bar graph items
-        bar_width = 0.35
-        budget_bars = pg.BarGraphItem(x=[i-bar_width/2 for i in range(len(categories))], height=budgeted, width=bar_width, brush='#007BFF')
-        actual_bars = pg.BarGraphItem(x=[i+bar_width/2 for i in range(len(categories))], height=actual, width=bar_width, brush='#FFC107')
-        
-        # Add items to the plot
-        budget_widget.addItem(budget_bars)
-        budget_widget.addItem(actual_bars)
-        
-        # Add legend
-        legend = pg.LegendItem((100, 60), offset=(70, 20))
-        legend.setParentItem(budget_widget.graphicsItem())
-        legend.addItem(pg.BarGraphItem(x=[0], height=[1], width=bar_width, brush='#007BFF'), 'Presupuestado')
-        legend.addItem(pg.BarGraphItem(x=[0], height=[1], width=bar_width, brush='#FFC107'), 'Real')
-        
-        budget_layout.addWidget(budget_widget)
-        layout.addWidget(budget_frame)
-        
-        # Create budget summary table
-        summary_frame = QFrame()
-        summary_frame.setObjectName("budgetSummaryFrame")
-        summary_frame.setStyleSheet("""
-            #budgetSummaryFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        summary_layout = QVBoxLayout(summary_frame)
-        
-        # Create a table for budget breakdown
-        from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
-        
-        budget_table = QTableWidget()
-        budget_table.setColumnCount(4)
-        budget_table.setHorizontalHeaderLabels(["Categoría", "Presupuestado", "Real", "Diferencia"])
-        budget_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        budget_table.setAlternatingRowColors(True)
-        budget_table.setStyleSheet("""
-            QTableWidget {
-                background-color: #1E1E1E;
-                border: none;
-                border-radius: 6px;
-                gridline-color: #333333;
-            }
-            QTableWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #333333;
-            }
-            QHeaderView::section {
-                background-color: #1E1E1E;
-                padding: 8px;
-                border: none;
-                font-weight: bold;
-            }
-            QTableWidget::item:selected {
-                background-color: #0d47a1;
-            }
-        """)
-        
-        # Populate table with data
-        budget_table.setRowCount(len(categories))
-        for row, (category, budget, act) in enumerate(zip(categories, budgeted, actual)):
-            # Category name
-            category_item = QTableWidgetItem(category)
-            budget_table.setItem(row, 0, category_item)
-            
-            # Budgeted amount
-            budget_item = QTableWidgetItem(f"${budget:,.2f}")
-            budget_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            budget_table.setItem(row, 1, budget_item)
-            
-            # Actual amount
-            actual_item = QTableWidgetItem(f"${act:,.2f}")
-            actual_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            budget_table.setItem(row, 2, actual_item)
-            
-            # Difference
-            diff = budget - act
-            diff_item = QTableWidgetItem(f"${diff:,.2f}")
-            diff_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            
-            # Color code the difference
-            if diff < 0:
-                diff_item.setForeground(QColor("#DC3545"))  # Red for over budget
-            else:
-                diff_item.setForeground(QColor("#28A745"))  # Green for under budget
-                
-            budget_table.setItem(row, 3, diff_item)
-        
-        summary_layout.addWidget(budget_table)
-        layout.addWidget(summary_frame)
-        
-        # Add overall summary section
-        overall_frame = QFrame()
-        overall_frame.setObjectName("overallFrame")
-        overall_frame.setStyleSheet("""
-            #overallFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        overall_layout = QHBoxLayout(overall_frame)
-        
-        # Total budgeted
-        total_budget = sum(budgeted)
-        budget_widget = QWidget()
-        budget_layout = QVBoxLayout(budget_widget)
-        budget_title = QLabel("Total Presupuestado")
-        budget_title.setStyleSheet("color: #888;")
-        budget_value = QLabel(f"${total_budget:,.2f}")
-        budget_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        budget_value.setStyleSheet("color: #007BFF;")
-        budget_layout.addWidget(budget_title)
-        budget_layout.addWidget(budget_value)
-        overall_layout.addWidget(budget_widget)
-        
-        # Total actual
-        total_actual = sum(actual)
-        actual_widget = QWidget()
-        actual_layout = QVBoxLayout(actual_widget)
-        actual_title = QLabel("Total Gastado")
-        actual_title.setStyleSheet("color: #888;")
-        actual_value = QLabel(f"${total_actual:,.2f}")
-        actual_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        actual_value.setStyleSheet("color: #FFC107;")
-        actual_layout.addWidget(actual_title)
-        actual_layout.addWidget(actual_value)
-        overall_layout.addWidget(actual_widget)
-        
-        # Total difference
-        total_diff = total_budget - total_actual
-        diff_widget = QWidget()
-        diff_layout = QVBoxLayout(diff_widget)
-        diff_title = QLabel("Diferencia Total")
-        diff_title.setStyleSheet("color: #888;")
-        diff_value = QLabel(f"${total_diff:,.2f}")
-        diff_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        
-        if total_diff < 0:
-            diff_value.setStyleSheet("color: #DC3545;")  # Red for over budget
-        else:
-            diff_value.setStyleSheet("color: #28A745;")  # Green for under budget
-            
-        diff_layout.addWidget(diff_title)
-        diff_layout.addWidget(diff_value)
-        overall_layout.addWidget(diff_widget)
-        
-        layout.addWidget(overall_frame)
-        
-        # Set chart configuration
-        pg.setConfigOption('background', '#252529')
-        pg.setConfigOption('foreground', '#DDDDDD')
-        
-        plot_widget = pg.PlotWidget()
-        plot_widget.setMinimumHeight(300)
-        plot_widget.showGrid(x=True, y=True, alpha=0.3)
-        
-        # Set up x-axis
-        x_axis = plot_widget.getAxis('bottom')
-        x_axis.setTicks([[(i, month) for i, month in enumerate(months)]])
-        
-        # Create bar graph items
-        bar_width = 0.35
-        income_bars = pg.BarGraphItem(x=[i-bar_width/2 for i in range(len(months))], height=income, width=bar_width, brush='#28A745')
-        expense_bars = pg.BarGraphItem(x=[i+bar_width/2 for i in range(len(months))], height=expenses, width=bar_width, brush='#DC3545')
-        
-        # Add items to the plot
-        plot_widget.addItem(income_bars)
-        plot_widget.addItem(expense_bars)
-        
-        # Add legend
-        legend = pg.LegendItem((80, 60), offset=(70, 20))
-        legend.setParentItem(plot_widget.graphicsItem())
-        legend.addItem(pg.BarGraphItem(x=[0], height=[1], width=bar_width, brush='#28A745'), 'Ingresos')
-        legend.addItem(pg.BarGraphItem(x=[0], height=[1], width=bar_width, brush='#DC3545'), 'Gastos')
-        
-        chart_layout.addWidget(plot_widget)
-        layout.addWidget(chart_frame)
+        self.progress_bar.setValue(percentage)
+    
+    def show_report(self, report):
+        """Show the data of a computed report in its tab.
         
-        # Add summary section
-        summary_frame = QFrame()
-        summary_frame.setObjectName("summaryFrame")
-        summary_frame.setStyleSheet("""
-            #summaryFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        summary_layout = QHBoxLayout(summary_frame)
-        
-        # Total income
-        total_income = sum(income)
-        income_widget = QWidget()
-        income_layout = QVBoxLayout(income_widget)
-        income_title = QLabel("Total de Ingresos")
-        income_title.setStyleSheet("color: #888;")
-        income_value = QLabel(f"${total_income:,.2f}")
-        income_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        income_value.setStyleSheet("color: #28A745;")
-        income_layout.addWidget(income_title)
-        income_layout.addWidget(income_value)
-        summary_layout.addWidget(income_widget)
-        
-        # Total expenses
-        total_expenses = sum(expenses)
-        expenses_widget = QWidget()
-        expenses_layout = QVBoxLayout(expenses_widget)
-        expenses_title = QLabel("Total de Gastos")
-        expenses_title.setStyleSheet("color: #888;")
-        expenses_value = QLabel(f"${total_expenses:,.2f}")
-        expenses_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        expenses_value.setStyleSheet("color: #DC3545;")
-        expenses_layout.addWidget(expenses_title)
-        expenses_layout.addWidget(expenses_value)
-        summary_layout.addWidget(expenses_widget)
-        
-        # Net income
-        net_income = total_income - total_expenses
-        net_widget = QWidget()
-        net_layout = QVBoxLayout(net_widget)
-        net_title = QLabel("Ingreso Neto")
-        net_title.setStyleSheet("color: #888;")
-        net_value = QLabel(f"${net_income:,.2f}")
-        net_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        net_value.setStyleSheet("color: #007BFF;")
-        net_layout.addWidget(net_title)
-        net_layout.addWidget(net_value)
-        summary_layout.addWidget(net_widget)
+        Args:
+            report: IncomeExpenseReport, CategoryReport, TrendReport or BudgetReport
+        """
+        from src.models import report_data
+        
+        self.progress_bar.hide()
+        updaters = {
+            report_data.IncomeExpenseReport: self.update_income_expense_report,
+            report_data.CategoryReport: self.update_category_report,
+            report_data.TrendReport: self.update_trend_report,
+            report_data.BudgetReport: self.update_budget_report,
+        }
+        updaters[type(report)](report)
+    
+    def show_report_error(self, message):
+        """End the progress indicator of a report that failed, and show why.
         
-        layout.addWidget(summary_frame)
+        Args:
+            message (str): Error description
+        """
+        self.progress_bar.hide()
+        QMessageBox.critical(self, "Error", f"Error al generar el informe: {message}")
     
-    def generate_category_report(self, start_date, end_date, account_id=None):
-        """Generate expenses by category report.
+    # Report tabs are built once, on their first report, and then updated in place
+    def create_tab_layout(self, tab):
+        """Create the layout of a report tab with its header and account labels.
         
         Args:
-            start_date (str): Start date in format 'yyyy-MM-dd'
-            end_date (str): End date in format 'yyyy-MM-dd'
-            account_id (int, optional): Account ID to filter by. Defaults to None.
+            tab (QWidget): Report tab
+        
+        Returns:
+            tuple: (QVBoxLayout, header QLabel, account QLabel)
         """
-        # Clear previous content
-        if self.categories_tab.layout():
-            # Clear previous layout
-            while self.categories_tab.layout().count():
-                item = self.categories_tab.layout().takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
-            # Remove the layout
-            QWidget().setLayout(self.categories_tab.layout())
-        
-        # Create new layout
-        layout = QVBoxLayout(self.categories_tab)
+        layout = QVBoxLayout(tab)
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(20)
         
         # Add report header
-        header_label = QLabel(f"Informe de Gastos por Categoría: {start_date} a {end_date}")
+        header_label = QLabel()
         header_font = QFont("Segoe UI", 14, QFont.Bold)
         header_label.setFont(header_font)
         layout.addWidget(header_label)
         
-        # Add account filter info if applicable
-        if account_id:
-            account_label = QLabel(f"Cuenta: {account_id}")
-            account_label.setStyleSheet("color: #888;")
-            layout.addWidget(account_label)
-        
-        # Create charts layout
-        charts_layout = QHBoxLayout()
-        
-        # Create pie chart frame
-        pie_frame = QFrame()
-        pie_frame.setObjectName("pieFrame")
-        pie_frame.setStyleSheet("""
-            #pieFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        pie_layout = QVBoxLayout(pie_frame)
-        
-        # Sample data - in a real app, this would come from the database
-        categories = ['Alimentación', 'Vivienda', 'Transporte', 'Entretenimiento', 'Servicios', 'Otros']
-        values = [650, 800, 250, 180, 220, 80]
-        colors = ['#FF5733', '#33FF57', '#33A8FF', '#A833FF', '#FF33A8', '#FFFF33']
+        # Add account filter info, shown when a report is filtered by account
+        account_label = QLabel()
+        account_label.setStyleSheet("color: #888;")
+        account_label.hide()
+        layout.addWidget(account_label)
         
-        # Create pie chart
-        pg.setConfigOption('background', '#252529')
-        pg.setConfigOption('foreground', '#DDDDDD')
-        
-        pie_widget = pg.PlotWidget()
-        pie_widget.setMinimumHeight(300)
-        pie_widget.setTitle("Distribución de Gastos por Categoría")
-        
-        # Create a custom view box that will contain our pie chart
-        view_box = pg.ViewBox()
-        pie_widget.setCentralItem(view_box)
-        
-        # Create a custom pie chart item
-        from src.views.dashboard_view import PieChartItem
-        pie = PieChartItem(values, colors, categories)
-        view_box.addItem(pie)
+        return layout, header_label, account_label
+    
+    def create_report_frame(self, name, layout_class=QVBoxLayout):
+        """Create a rounded frame holding a chart, table or summary.
         
-        pie_layout.addWidget(pie_widget)
-        charts_layout.addWidget(pie_frame, 1)
+        Args:
+            name (str): Object name of the frame, used by its stylesheet
+            layout_class (type, optional): Layout of the frame. Defaults to QVBoxLayout.
         
-        # Create bar chart frame
-        bar_frame = QFrame()
-        bar_frame.setObjectName("barFrame")
-        bar_frame.setStyleSheet("""
-            #barFrame {
+        Returns:
+            tuple: (QFrame, its layout)
+        """
+        frame = QFrame()
+        frame.setObjectName(name)
+        frame.setStyleSheet(f"""
+            #{name} {{
                 background-color: #252529;
                 border-radius: 8px;
                 border: 1px solid #333;
-            }
+            }}
         """)
-        bar_layout = QVBoxLayout(bar_frame)
-        
-        # Create bar chart
-        bar_widget = pg.PlotWidget()
-        bar_widget.setMinimumHeight(300)
-        bar_widget.setTitle("Gastos por Categoría")
-        bar_widget.showGrid(y=True, alpha=0.3)
-        
-        # Set up x-axis
-        x_axis = bar_widget.getAxis('bottom')
-        x_axis.setTicks([[(i, cat) for i, cat in enumerate(categories)]])
-        
-        # Create bar graph item
-        bars = pg.BarGraphItem(x=range(len(categories)), height=values, width=0.6, brush='#33A8FF')
-        bar_widget.addItem(bars)
-        
-        bar_layout.addWidget(bar_widget)
-        charts_layout.addWidget(bar_frame, 1)
+        return frame, layout_class(frame)
+    
+    def create_summary_value(self, layout, title, color):
+        """Add a titled amount to a summary section.
         
-        layout.addLayout(charts_layout)
+        Args:
+            layout (QHBoxLayout): Summary layout
+            title (str): Title shown above the amount
+            color (str): Amount color
         
-        # Add summary section
-        summary_frame = QFrame()
-        summary_frame.setObjectName("categorySummaryFrame")
-        summary_frame.setStyleSheet("""
-            #categorySummaryFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        summary_layout = QVBoxLayout(summary_frame)
+        Returns:
+            QLabel: Label showing the amount
+        """
+        widget = QWidget()
+        widget_layout = QVBoxLayout(widget)
+        title_label = QLabel(title)
+        title_label.setStyleSheet("color: #888;")
+        value_label = QLabel()
+        value_label.setFont(QFont("Segoe UI", 18, QFont.Bold))
+        value_label.setStyleSheet(f"color: {color};")
+        widget_layout.addWidget(title_label)
+        widget_layout.addWidget(value_label)
+        layout.addWidget(widget)
+        return value_label
+    
+    def create_report_table(self, headers):
+        """Create a breakdown table.
         
-        # Create a table for category breakdown
-        from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
+        Args:
+            headers (list): Column titles
         
-        category_table = QTableWidget()
-        category_table.setColumnCount(3)
-        category_table.setHorizontalHeaderLabels(["Categoría", "Monto", "Porcentaje"])
-        category_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        category_table.setAlternatingRowColors(True)
-        category_table.setStyleSheet("""
+        Returns:
+            QTableWidget: Created table
+        """
+        from PyQt5.QtWidgets import QTableWidget, QHeaderView
+        
+        table = QTableWidget()
+        table.setColumnCount(len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.setAlternatingRowColors(True)
+        table.setStyleSheet("""
             QTableWidget {
                 background-color: #1E1E1E;
                 border: none;
@@ -662,485 +357,132 @@ class ReportsView(QWidget):
                 background-color: #0d47a1;
             }
         """)
-        
-        # Calculate total
-        total = sum(values)
-        
-        # Populate table with data
-        category_table.setRowCount(len(categories))
-        for row, (category, value, color) in enumerate(zip(categories, values, colors)):
-            # Category name
-            category_item = QTableWidgetItem(category)
-            category_table.setItem(row, 0, category_item)
-            
-            # Amount
-            amount_item = QTableWidgetItem(f"${value:,.2f}")
-            amount_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            category_table.setItem(row, 1, amount_item)
-            
-            # Percentage
-            percentage = (value / total) * 100 if total > 0 else 0
-            percentage_item = QTableWidgetItem(f"{percentage:.1f}%")
-            percentage_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            category_table.setItem(row, 2, percentage_item)
-        
-        summary_layout.addWidget(category_table)
-        layout.addWidget(summary_frame)
+        return table
     
-    def generate_trend_report(self, start_date, end_date, account_id=None):
-        """Generate financial trends report.
+    def set_table_text(self, table, row, column, text, amount=False, color=None):
+        """Set the text of a table cell, reusing its item if it has one.
         
         Args:
-            start_date (str): Start date in format 'yyyy-MM-dd'
-            end_date (str): End date in format 'yyyy-MM-dd'
-            account_id (int, optional): Account ID to filter by. Defaults to None.
+            table (QTableWidget): Table
+            row (int): Row index
+            column (int): Column index
+            text (str): Cell text
+            amount (bool, optional): Align the text to the right. Defaults to False.
+            color (str, optional): Text color. Defaults to the table's.
         """
-        # Clear previous content
-        if self.trends_tab.layout():
-            # Clear previous layout
-            while self.trends_tab.layout().count():
-                item = self.trends_tab.layout().takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
-            # Remove the layout
-            QWidget().setLayout(self.trends_tab.layout())
-        
-        # Create new layout
-        layout = QVBoxLayout(self.trends_tab)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(20)
-        
-        # Add report header
-        header_label = QLabel(f"Informe de Tendencias Financieras: {start_date} a {end_date}")
-        header_font = QFont("Segoe UI", 14, QFont.Bold)
-        header_label.setFont(header_font)
-        layout.addWidget(header_label)
-        
-        # Add account filter info if applicable
-        if account_id:
-            account_label = QLabel(f"Cuenta: {account_id}")
-            account_label.setStyleSheet("color: #888;")
-            layout.addWidget(account_label)
-        
-        # Create line chart frame for net worth trend
-        net_worth_frame = QFrame()
-        net_worth_frame.setObjectName("netWorthFrame")
-        net_worth_frame.setStyleSheet("""
-            #netWorthFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        net_worth_layout = QVBoxLayout(net_worth_frame)
-        
-        # Sample data - in a real app, this would come from the database
-        months = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
-        net_worth = [8500, 8800, 9200, 9500, 9800, 10200, 10500, 10800, 11200, 11500, 11800, 12000]
-        
-        # Create line chart
-        pg.setConfigOption('background', '#252529')
-        pg.setConfigOption('foreground', '#DDDDDD')
-        
-        net_worth_widget = pg.PlotWidget()
-        net_worth_widget.setMinimumHeight(250)
-        net_worth_widget.setTitle("Tendencia de Patrimonio Neto")
-        net_worth_widget.showGrid(x=True, y=True, alpha=0.3)
-        
-        # Set up x-axis
-        x_axis = net_worth_widget.getAxis('bottom')
-        x_axis.setTicks([[(i, month) for i, month in enumerate(months)]])
-        
-        # Create line plot
-        pen = pg.mkPen(color='#1565c0', width=3)
-        line = net_worth_widget.plot(range(len(months)), net_worth, pen=pen, symbol='o', symbolSize=8, symbolBrush='#1565c0')
-        
-        net_worth_layout.addWidget(net_worth_widget)
-        layout.addWidget(net_worth_frame)
-        
-        # Create income/expense trend frame
-        income_expense_frame = QFrame()
-        income_expense_frame.setObjectName("incomeExpenseFrame")
-        income_expense_frame.setStyleSheet("""
-            #incomeExpenseFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        income_expense_layout = QVBoxLayout(income_expense_frame)
-        
-        # Sample data - in a real app, this would come from the database
-        income_trend = [3000, 3100, 3200, 3150, 3250, 3300, 3350, 3400, 3450, 3500, 3550, 3600]
-        expense_trend = [2200, 2300, 2100, 2000, 2200, 2300, 2250, 2300, 2350, 2400, 2450, 2500]
-        
-        # Create line chart
-        trend_widget = pg.PlotWidget()
-        trend_widget.setMinimumHeight(250)
-        trend_widget.setTitle("Tendencia de Ingresos y Gastos")
-        trend_widget.showGrid(x=True, y=True, alpha=0.3)
-        
-        # Set up x-axis
-        x_axis = trend_widget.getAxis('bottom')
-        x_axis.setTicks([[(i, month) for i, month in enumerate(months)]])
-        
-        # Create line plots
-        income_pen = pg.mkPen(color='#28A745', width=3)
-        expense_pen = pg.mkPen(color='#DC3545', width=3)
-        
-        income_line = trend_widget.plot(range(len(months)), income_trend, pen=income_pen, symbol='o', symbolSize=6, symbolBrush='#28A745', name='Ingresos')
-        expense_line = trend_widget.plot(range(len(months)), expense_trend, pen=expense_pen, symbol='o', symbolSize=6, symbolBrush='#DC3545', name='Gastos')
-        
-        # Add legend
-        legend = pg.LegendItem((100, 60), offset=(70, 20))
-        legend.setParentItem(trend_widget.graphicsItem())
-        legend.addItem(income_line, 'Ingresos')
-        legend.addItem(expense_line, 'Gastos')
-        
-        income_expense_layout.addWidget(trend_widget)
-        layout.addWidget(income_expense_frame)
-        
-        # Add summary section
-        summary_frame = QFrame()
-        summary_frame.setObjectName("trendSummaryFrame")
-        summary_frame.setStyleSheet("""
-            #trendSummaryFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        summary_layout = QHBoxLayout(summary_frame)
-        
-        # Average monthly income
-        avg_income = sum(income_trend) / len(income_trend)
-        income_widget = QWidget()
-        income_layout = QVBoxLayout(income_widget)
-        income_title = QLabel("Ingreso Mensual Promedio")
-        income_title.setStyleSheet("color: #888;")
-        income_value = QLabel(f"${avg_income:,.2f}")
-        income_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        income_value.setStyleSheet("color: #28A745;")
-        income_layout.addWidget(income_title)
-        income_layout.addWidget(income_value)
-        summary_layout.addWidget(income_widget)
-        
-        # Average monthly expenses
-        avg_expense = sum(expense_trend) / len(expense_trend)
-        expense_widget = QWidget()
-        expense_layout = QVBoxLayout(expense_widget)
-        expense_title = QLabel("Gasto Mensual Promedio")
-        expense_title.setStyleSheet("color: #888;")
-        expense_value = QLabel(f"${avg_expense:,.2f}")
-        expense_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        expense_value.setStyleSheet("color: #DC3545;")
-        expense_layout.addWidget(expense_title)
-        expense_layout.addWidget(expense_value)
-        summary_layout.addWidget(expense_widget)
-        
-        # Net worth growth
-        growth = ((net_worth[-1] - net_worth[0]) / net_worth[0]) * 100 if net_worth[0] > 0 else 0
-        growth_widget = QWidget()
-        growth_layout = QVBoxLayout(growth_widget)
-        growth_title = QLabel("Crecimiento Patrimonial")
-        growth_title.setStyleSheet("color: #888;")
-        growth_value = QLabel(f"{growth:.1f}%")
-        growth_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        growth_value.setStyleSheet("color: #007BFF;")
-        growth_layout.addWidget(growth_title)
-        growth_layout.addWidget(growth_value)
-        summary_layout.addWidget(growth_widget)
-        
-        layout.addWidget(summary_frame)
+        from PyQt5.QtWidgets import QTableWidgetItem
+        
+        item = table.item(row, column)
+        if item is None:
+            item = QTableWidgetItem()
+            if amount:
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            table.setItem(row, column, item)
+        if item.text() != text:
+            item.setText(text)
+        if color is not None:
+            item.setForeground(QColor(color))
     
-    def generate_budget_report(self, start_date, end_date, account_id=None):
-        """Generate budget performance report.
+    def set_axis_labels(self, plot_widget, labels):
+        """Label the x-axis of a bar chart, one label per bar position, if they changed."""
+        labels = tuple(labels)
+        if self.axis_labels.get(plot_widget) != labels:
+            self.axis_labels[plot_widget] = labels
+            plot_widget.getAxis('bottom').setTicks([[(i, label) for i, label in enumerate(labels)]])
+    
+    def update_header(self, header_label, account_label, title, report):
+        """Show the title, period and account of a report.
         
         Args:
-            start_date (str): Start date in format 'yyyy-MM-dd'
-            end_date (str): End date in format 'yyyy-MM-dd'
-            account_id (int, optional): Account ID to filter by. Defaults to None.
+            header_label (QLabel): Tab header
+            account_label (QLabel): Tab account label
+            title (str): Report title
+            report: Report data with start_date, end_date and account_id
         """
-        # Clear previous content
-        if self.budgets_tab.layout():
-            # Clear previous layout
-            while self.budgets_tab.layout().count():
-                item = self.budgets_tab.layout().takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
-            # Remove the layout
-            QWidget().setLayout(self.budgets_tab.layout())
-        
-        # Create new layout
-        layout = QVBoxLayout(self.budgets_tab)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(20)
-        
-        # Add report header
-        header_label = QLabel(f"Informe de Presupuestos: {start_date} a {end_date}")
-        header_font = QFont("Segoe UI", 14, QFont.Bold)
-        header_label.setFont(header_font)
-        layout.addWidget(header_label)
-        
-        # Add account filter info if applicable
-        if account_id:
-            account_label = QLabel(f"Cuenta: {account_id}")
-            account_label.setStyleSheet("color: #888;")
-            layout.addWidget(account_label)
+        header_label.setText(f"{title}: {report.start_date} a {report.end_date}")
         
-        # Create budget performance frame
-        budget_frame = QFrame()
-        budget_frame.setObjectName("budgetFrame")
-        budget_frame.setStyleSheet("""
-            #budgetFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        budget_layout = QVBoxLayout(budget_frame)
+        if report.account_id:
+            index = self.account_combo.findData(report.account_id)
+            account_name = self.account_combo.itemText(index) if index >= 0 else report.account_id
+            account_label.setText(f"Cuenta: {account_name}")
+        account_label.setVisible(bool(report.account_id))
+    
+    def build_income_expense_tab(self):
+        """Build the income vs expenses report tab."""
+        layout, self.income_expense_header, self.income_expense_account = self.create_tab_layout(self.income_expense_tab)
         
-        # Sample data - in a real app, this would come from the database
-        categories = ['Alimentación', 'Vivienda', 'Transporte', 'Entretenimiento', 'Servicios', 'Otros']
-        budgeted = [800, 1000, 300, 200, 250, 100]
-        actual = [650, 800, 250, 180, 220, 80]
+        # Create chart frame
+        chart_frame, chart_layout = self.create_report_frame("chartFrame")
         
-        # Create bar chart
+        # Set chart configuration
         pg.setConfigOption('background', '#252529')
         pg.setConfigOption('foreground', '#DDDDDD')
         
-        budget_widget = pg.PlotWidget()
-        budget_widget.setMinimumHeight(300)
-        budget_widget.setTitle("Rendimiento del Presupuesto por Categoría")
-        budget_widget.showGrid(y=True, alpha=0.3)
-        
-        # Set up x-axis
-        x_axis = budget_widget.getAxis('bottom')
-        x_axis.setTicks([[(i, cat) for i, cat in enumerate(categories)]])
+        self.income_expense_plot = pg.PlotWidget()
+        self.income_expense_plot.setMinimumHeight(300)
+        self.income_expense_plot.showGrid(x=True, y=True, alpha=0.3)
         
-        # Create bar graph items
+        # Create bar graph items, moved to the data of every report
         bar_width = 0.35
-        budget_bars = pg.BarGraphItem(x=[i-bar_width/2 for i in range(len(categories))], height=budgeted, width=bar_width, brush='#007BFF')
-        actual_bars = pg.BarGraphItem(x=[i+bar_width/2 for i in range(len(categories))], height=actual, width=bar_width, brush='#FFC107')
+        self.income_bars = pg.BarGraphItem(x=[], height=[], width=bar_width, brush='#28A745')
+        self.expense_bars = pg.BarGraphItem(x=[], height=[], width=bar_width, brush='#DC3545')
         
         # Add items to the plot
-        budget_widget.addItem(budget_bars)
-        budget_widget.addItem(actual_bars)
+        self.income_expense_plot.addItem(self.income_bars)
+        self.income_expense_plot.addItem(self.expense_bars)
         
         # Add legend
-        legend = pg.LegendItem((100, 60), offset=(70, 20))
-        legend.setParentItem(budget_widget.graphicsItem())
-        legend.addItem(pg.BarGraphItem(x=[0], height=[1], width=bar_width, brush='#007BFF'), 'Presupuestado')
-        legend.addItem(pg.BarGraphItem(x=[0], height=[1], width=bar_width, brush='#FFC107'), 'Real')
-        
-        budget_layout.addWidget(budget_widget)
-        layout.addWidget(budget_frame)
-        
-        # Create budget summary table
-        summary_frame = QFrame()
-        summary_frame.setObjectName("budgetSummaryFrame")
-        summary_frame.setStyleSheet("""
-            #budgetSummaryFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        summary_layout = QVBoxLayout(summary_frame)
-        
-        # Create a table for budget breakdown
-        from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
+        legend = pg.LegendItem((80, 60), offset=(70, 20))
+        legend.setParentItem(self.income_expense_plot.graphicsItem())
+        legend.addItem(self.income_bars, 'Ingresos')
+        legend.addItem(self.expense_bars, 'Gastos')
         
-        budget_table = QTableWidget()
-        budget_table.setColumnCount(4)
-        budget_table.setHorizontalHeaderLabels(["Categoría", "Presupuestado", "Real", "Diferencia"])
-        budget_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        budget_table.setAlternatingRowColors(True)
-        budget_table.setStyleSheet("""
-            QTableWidget {
-                background-color: #1E1E1E;
-                border: none;
-                border-radius: 6px;
-                gridline-color: #333333;
-            }
-            QTableWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #333333;
-            }
-            QHeaderView::section {
-                background-color: #1E1E1E;
-                padding: 8px;
-                border: none;
-                font-weight: bold;
-            }
-            QTableWidget::item:selected {
-                background-color: #0d47a1;
-            }
-        """)
+        chart_layout.addWidget(self.income_expense_plot)
+        layout.addWidget(chart_frame)
         
-        # Populate table with data
-        budget_table.setRowCount(len(categories))
-        for row, (category, budget, act) in enumerate(zip(categories, budgeted, actual)):
-            # Category name
-            category_item = QTableWidgetItem(category)
-            budget_table.setItem(row, 0, category_item)
-            
-            # Budgeted amount
-            budget_item = QTableWidgetItem(f"${budget:,.2f}")
-            budget_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            budget_table.setItem(row, 1, budget_item)
-            
-            # Actual amount
-            actual_item = QTableWidgetItem(f"${act:,.2f}")
-            actual_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            budget_table.setItem(row, 2, actual_item)
-            
-            # Difference
-            diff = budget - act
-            diff_item = QTableWidgetItem(f"${diff:,.2f}")
-            diff_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            
-            # Color code the difference
-            if diff < 0:
-                diff_item.setForeground(QColor("#DC3545"))  # Red for over budget
-            else:
-                diff_item.setForeground(QColor("#28A745"))  # Green for under budget
-                
-            budget_table.setItem(row, 3, diff_item)
-        
-        summary_layout.addWidget(budget_table)
+        # Add summary section
+        summary_frame, summary_layout = self.create_report_frame("summaryFrame", QHBoxLayout)
+        self.total_income_label = self.create_summary_value(summary_layout, "Total de Ingresos", "#28A745")
+        self.total_expenses_label = self.create_summary_value(summary_layout, "Total de Gastos", "#DC3545")
+        self.net_income_label = self.create_summary_value(summary_layout, "Ingreso Neto", "#007BFF")
         layout.addWidget(summary_frame)
-        
-        # Add overall summary section
-        overall_frame = QFrame()
-        overall_frame.setObjectName("overallFrame")
-        overall_frame.setStyleSheet("""
-            #overallFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        overall_layout = QHBoxLayout(overall_frame)
-        
-        # Total budgeted
-        total_budget = sum(budgeted)
-        budget_widget = QWidget()
-        budget_layout = QVBoxLayout(budget_widget)
-        budget_title = QLabel("Total Presupuestado")
-        budget_title.setStyleSheet("color: #888;")
-        budget_value = QLabel(f"${total_budget:,.2f}")
-        budget_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        budget_value.setStyleSheet("color: #007BFF;")
-        budget_layout.addWidget(budget_title)
-        budget_layout.addWidget(budget_value)
-        overall_layout.addWidget(budget_widget)
-        
-        # Total actual
-        total_actual = sum(actual)
-        actual_widget = QWidget()
-        actual_layout = QVBoxLayout(actual_widget)
-        actual_title = QLabel("Total Gastado")
-        actual_title.setStyleSheet("color: #888;")
-        actual_value = QLabel(f"${total_actual:,.2f}")
-        actual_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        actual_value.setStyleSheet("color: #FFC107;")
-        actual_layout.addWidget(actual_title)
-        actual_layout.addWidget(actual_value)
-        overall_layout.addWidget(actual_widget)
-        
-        # Total difference
-        total_diff = total_budget - total_actual
-        diff_widget = QWidget()
-        diff_layout = QVBoxLayout(diff_widget)
-        diff_title = QLabel("Diferencia Total")
-        diff_title.setStyleSheet("color: #888;")
-        diff_value = QLabel(f"${total_diff:,.2f}")
-        diff_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        
-        if total_diff < 0:
-            diff_value.setStyleSheet("color: #DC3545;")  # Red for over budget
-        else:
-            diff_value.setStyleSheet("color: #28A745;")  # Green for under budget
-            
-        diff_layout.addWidget(diff_title)
-        diff_layout.addWidget(diff_value)
-        overall_layout.addWidget(diff_widget)
-        
-        layout.addWidget(overall_frame)
     
-    def load_accounts(self):
-        """Load accounts into the account filter combo box."""
-        self.account_combo.clear()
-        self.account_combo.addItem("Todas las Cuentas", None)
-        
-        # Get accounts from database
-        from src.models.database_manager import DatabaseManager
-        db_manager = DatabaseManager()
-        accounts = db_manager.get_accounts()
-        
-        for account in accounts:
-            self.account_combo.addItem(account['name'], account['id'])
-    
-    def generate_category_report(self, start_date, end_date, account_id=None):
-        """Generate expenses by category report.
+    def update_income_expense_report(self, report):
+        """Show an income vs expenses report.
         
         Args:
-            start_date (str): Start date in format 'yyyy-MM-dd'
-            end_date (str): End date in format 'yyyy-MM-dd'
-            account_id (int, optional): Account ID to filter by. Defaults to None.
+            report (IncomeExpenseReport): Report data
         """
-        # Clear previous content
-        if self.categories_tab.layout():
-            # Clear previous layout
-            while self.categories_tab.layout().count():
-                item = self.categories_tab.layout().takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
-            # Remove the layout
-            QWidget().setLayout(self.categories_tab.layout())
-        
-        # Create new layout
-        layout = QVBoxLayout(self.categories_tab)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(20)
-        
-        # Add report header
-        header_label = QLabel(f"Informe de Gastos por Categoría: {start_date} a {end_date}")
-        header_font = QFont("Segoe UI", 14, QFont.Bold)
-        header_label.setFont(header_font)
-        layout.addWidget(header_label)
+        if self.income_expense_tab.layout() is None:
+            self.build_income_expense_tab()
+        
+        self.update_header(self.income_expense_header, self.income_expense_account,
+                           "Informe de Ingresos y Gastos", report)
+        
+        # Income and expenses of every month in the period
+        positions = range(len(report.months))
+        bar_width = self.income_bars.opts['width']
+        self.income_bars.setOpts(x=[i - bar_width / 2 for i in positions],
+                                 height=[month.income for month in report.months])
+        self.expense_bars.setOpts(x=[i + bar_width / 2 for i in positions],
+                                  height=[month.expenses for month in report.months])
+        self.set_axis_labels(self.income_expense_plot, [month.label for month in report.months])
+        
+        self.total_income_label.setText(f"${report.total_income:,.2f}")
+        self.total_expenses_label.setText(f"${report.total_expenses:,.2f}")
+        self.net_income_label.setText(f"${report.total_income - report.total_expenses:,.2f}")
+    
+    def build_category_tab(self):
+        """Build the expenses by category report tab."""
+        from src.views.charts import PieChartItem, create_pie_view_box
         
-        # Add account filter info if applicable
-        if account_id:
-            account_label = QLabel(f"Cuenta: {account_id}")
-            account_label.setStyleSheet("color: #888;")
-            layout.addWidget(account_label)
+        layout, self.category_header, self.category_account = self.create_tab_layout(self.categories_tab)
         
         # Create charts layout
         charts_layout = QHBoxLayout()
         
-        # Create pie chart frame
-        pie_frame = QFrame()
-        pie_frame.setObjectName("pieFrame")
-        pie_frame.setStyleSheet("""
-            #pieFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        pie_layout = QVBoxLayout(pie_frame)
-        
-        # Sample data - in a real app, this would come from the database
-        categories = ['Alimentación', 'Vivienda', 'Transporte', 'Entretenimiento', 'Servicios', 'Otros']
-        values = [650, 800, 250, 180, 220, 80]
-        colors = ['#FF5733', '#33FF57', '#33A8FF', '#A833FF', '#FF33A8', '#FFFF33']
-        
         # Create pie chart
+        pie_frame, pie_layout = self.create_report_frame("pieFrame")
         pg.setConfigOption('background', '#252529')
         pg.setConfigOption('foreground', '#DDDDDD')
         
@@ -1148,416 +490,265 @@ class ReportsView(QWidget):
         pie_widget.setMinimumHeight(300)
         pie_widget.setTitle("Distribución de Gastos por Categoría")
         
-        # Create a custom view box that will contain our pie chart
-        view_box = pg.ViewBox()
+        # Create a round, fixed view box that will contain our pie chart
+        view_box = create_pie_view_box()
         pie_widget.setCentralItem(view_box)
         
-        # Create a custom pie chart item
-        from src.views.dashboard_view import PieChartItem
-        pie = PieChartItem(values, colors, categories)
-        view_box.addItem(pie)
+        # Create a custom pie chart item, updated in place with every report
+        self.category_pie = PieChartItem([], [], [])
+        view_box.addItem(self.category_pie)
         
         pie_layout.addWidget(pie_widget)
         charts_layout.addWidget(pie_frame, 1)
         
-        # Create bar chart frame
-        bar_frame = QFrame()
-        bar_frame.setObjectName("barFrame")
-        bar_frame.setStyleSheet("""
-            #barFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        bar_layout = QVBoxLayout(bar_frame)
-        
         # Create bar chart
-        bar_widget = pg.PlotWidget()
-        bar_widget.setMinimumHeight(300)
-        bar_widget.setTitle("Gastos por Categoría")
-        bar_widget.showGrid(y=True, alpha=0.3)
+        bar_frame, bar_layout = self.create_report_frame("barFrame")
+        self.category_plot = pg.PlotWidget()
+        self.category_plot.setMinimumHeight(300)
+        self.category_plot.setTitle("Gastos por Categoría")
+        self.category_plot.showGrid(y=True, alpha=0.3)
         
-        # Set up x-axis
-        x_axis = bar_widget.getAxis('bottom')
-        x_axis.setTicks([[(i, cat) for i, cat in enumerate(categories)]])
+        # Create bar graph item, one bar per category in its color
+        self.category_bars = pg.BarGraphItem(x=[], height=[], width=0.6, brushes=[])
+        self.category_plot.addItem(self.category_bars)
         
-        # Create bar graph item
-        bars = pg.BarGraphItem(x=range(len(categories)), height=values, width=0.6, brush='#33A8FF')
-        bar_widget.addItem(bars)
-        
-        bar_layout.addWidget(bar_widget)
+        bar_layout.addWidget(self.category_plot)
         charts_layout.addWidget(bar_frame, 1)
         
         layout.addLayout(charts_layout)
         
-        # Add summary section
-        summary_frame = QFrame()
-        summary_frame.setObjectName("categorySummaryFrame")
-        summary_frame.setStyleSheet("""
-            #categorySummaryFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        summary_layout = QVBoxLayout(summary_frame)
+        # Add summary section with a table for category breakdown
+        summary_frame, summary_layout = self.create_report_frame("categorySummaryFrame")
+        self.category_table = self.create_report_table(["Categoría", "Monto", "Porcentaje"])
+        summary_layout.addWidget(self.category_table)
+        layout.addWidget(summary_frame)
+    
+    def update_category_report(self, report):
+        """Show an expenses by category report.
         
-        # Create a table for category breakdown
-        from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
+        Args:
+            report (CategoryReport): Report data
+        """
+        if self.categories_tab.layout() is None:
+            self.build_category_tab()
         
-        category_table = QTableWidget()
-        category_table.setColumnCount(3)
-        category_table.setHorizontalHeaderLabels(["Categoría", "Monto", "Porcentaje"])
-        category_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        category_table.setAlternatingRowColors(True)
-        category_table.setStyleSheet("""
-            QTableWidget {
-                background-color: #1E1E1E;
-                border: none;
-                border-radius: 6px;
-                gridline-color: #333333;
-            }
-            QTableWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #333333;
-            }
-            QHeaderView::section {
-                background-color: #1E1E1E;
-                padding: 8px;
-                border: none;
-                font-weight: bold;
-            }
-            QTableWidget::item:selected {
-                background-color: #0d47a1;
-            }
-        """)
+        self.update_header(self.category_header, self.category_account,
+                           "Informe de Gastos por Categoría", report)
+        
+        # Top categories, with the rest merged into "Otros"
+        categories = [entry.name for entry in report.categories]
+        values = [entry.total for entry in report.categories]
+        colors = [entry.color for entry in report.categories]
         
-        # Calculate total
-        total = sum(values)
+        self.category_pie.setData(values, colors, categories)
+        self.category_bars.setOpts(x=list(range(len(categories))), height=values, brushes=colors)
+        self.set_axis_labels(self.category_plot, categories)
         
         # Populate table with data
-        category_table.setRowCount(len(categories))
-        for row, (category, value, color) in enumerate(zip(categories, values, colors)):
-            # Category name
-            category_item = QTableWidgetItem(category)
-            category_table.setItem(row, 0, category_item)
-            
-            # Amount
-            amount_item = QTableWidgetItem(f"${value:,.2f}")
-            amount_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            category_table.setItem(row, 1, amount_item)
-            
-            # Percentage
-            percentage = (value / total) * 100 if total > 0 else 0
-            percentage_item = QTableWidgetItem(f"{percentage:.1f}%")
-            percentage_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            category_table.setItem(row, 2, percentage_item)
-        
-        summary_layout.addWidget(category_table)
-        layout.addWidget(summary_frame)
+        table = self.category_table
+        table.setRowCount(len(report.categories))
+        for row, entry in enumerate(report.categories):
+            self.set_table_text(table, row, 0, entry.name)
+            self.set_table_text(table, row, 1, f"${entry.total:,.2f}", amount=True)
+            self.set_table_text(table, row, 2, f"{entry.percentage:.1f}%", amount=True)
     
-    def generate_trend_report(self, start_date, end_date, account_id=None):
-        """Generate financial trends report.
+    def build_trend_tab(self):
+        """Build the financial trends report tab.
         
-        Args:
-            start_date (str): Start date in format 'yyyy-MM-dd'
-            end_date (str): End date in format 'yyyy-MM-dd'
-            account_id (int, optional): Account ID to filter by. Defaults to None.
+        The charts plot daily values at a level of detail matching the visible
+        range, so the whole history can be zoomed and panned.
         """
-        # Clear previous content
-        if self.trends_tab.layout():
-            # Clear previous layout
-            while self.trends_tab.layout().count():
-                item = self.trends_tab.layout().takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
-            # Remove the layout
-            QWidget().setLayout(self.trends_tab.layout())
-        
-        # Create new layout
-        layout = QVBoxLayout(self.trends_tab)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(20)
+        from src.views.charts import LodSeries
         
-        # Add report header
-        header_label = QLabel(f"Informe de Tendencias Financieras: {start_date} a {end_date}")
-        header_font = QFont("Segoe UI", 14, QFont.Bold)
-        header_label.setFont(header_font)
-        layout.addWidget(header_label)
+        layout, self.trend_header, self.trend_account = self.create_tab_layout(self.trends_tab)
         
-        # Add account filter info if applicable
-        if account_id:
-            account_label = QLabel(f"Cuenta: {account_id}")
-            account_label.setStyleSheet("color: #888;")
-            layout.addWidget(account_label)
+        # The daily series cover every account
+        self.trend_account.setText("Las tendencias incluyen todas las cuentas")
         
         # Create line chart frame for net worth trend
-        net_worth_frame = QFrame()
-        net_worth_frame.setObjectName("netWorthFrame")
-        net_worth_frame.setStyleSheet("""
-            #netWorthFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        net_worth_layout = QVBoxLayout(net_worth_frame)
-        
-        # Sample data - in a real app, this would come from the database
-        months = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
-        net_worth = [8500, 8800, 9200, 9500, 9800, 10200, 10500, 10800, 11200, 11500, 11800, 12000]
-        
-        # Create line chart
+        net_worth_frame, net_worth_layout = self.create_report_frame("netWorthFrame")
         pg.setConfigOption('background', '#252529')
         pg.setConfigOption('foreground', '#DDDDDD')
         
-        net_worth_widget = pg.PlotWidget()
-        net_worth_widget.setMinimumHeight(250)
-        net_worth_widget.setTitle("Tendencia de Patrimonio Neto")
-        net_worth_widget.showGrid(x=True, y=True, alpha=0.3)
-        
-        # Set up x-axis
-        x_axis = net_worth_widget.getAxis('bottom')
-        x_axis.setTicks([[(i, month) for i, month in enumerate(months)]])
+        self.net_worth_plot = self.create_daily_plot("Tendencia de Patrimonio Neto")
         
-        # Create line plot
-        pen = pg.mkPen(color='#1565c0', width=3)
-        line = net_worth_widget.plot(range(len(months)), net_worth, pen=pen, symbol='o', symbolSize=8, symbolBrush='#1565c0')
+        # Create line plot of the daily balance
+        pen = pg.mkPen(color='#1565c0', width=2)
+        self.trend_series['balance'] = LodSeries(self.net_worth_plot.getPlotItem(), pen=pen)
         
-        net_worth_layout.addWidget(net_worth_widget)
+        net_worth_layout.addWidget(self.net_worth_plot)
         layout.addWidget(net_worth_frame)
         
-        # Create income/expense trend frame
-        income_expense_frame = QFrame()
-        income_expense_frame.setObjectName("incomeExpenseFrame")
-        income_expense_frame.setStyleSheet("""
-            #incomeExpenseFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        income_expense_layout = QVBoxLayout(income_expense_frame)
-        
-        # Sample data - in a real app, this would come from the database
-        income_trend = [3000, 3100, 3200, 3150, 3250, 3300, 3350, 3400, 3450, 3500, 3550, 3600]
-        expense_trend = [2200, 2300, 2100, 2000, 2200, 2300, 2250, 2300, 2350, 2400, 2450, 2500]
-        
-        # Create line chart
-        trend_widget = pg.PlotWidget()
-        trend_widget.setMinimumHeight(250)
-        trend_widget.setTitle("Tendencia de Ingresos y Gastos")
-        trend_widget.showGrid(x=True, y=True, alpha=0.3)
+        # Create bar chart of the income and expenses per day, week, month...
+        income_expense_frame, income_expense_layout = self.create_report_frame("incomeExpenseFrame")
+        self.trend_plot = self.create_daily_plot("Tendencia de Ingresos y Gastos")
         
-        # Set up x-axis
-        x_axis = trend_widget.getAxis('bottom')
-        x_axis.setTicks([[(i, month) for i, month in enumerate(months)]])
-        
-        # Create line plots
-        income_pen = pg.mkPen(color='#28A745', width=3)
-        expense_pen = pg.mkPen(color='#DC3545', width=3)
-        
-        income_line = trend_widget.plot(range(len(months)), income_trend, pen=income_pen, symbol='o', symbolSize=6, symbolBrush='#28A745', name='Ingresos')
-        expense_line = trend_widget.plot(range(len(months)), expense_trend, pen=expense_pen, symbol='o', symbolSize=6, symbolBrush='#DC3545', name='Gastos')
+        income_series = LodSeries(self.trend_plot.getPlotItem(), style='bars', pen=pg.mkPen(None), brush='#28A745',
+                                  pixels_per_bin=6, bar_offset=0.3, bar_width=0.4)
+        expense_series = LodSeries(self.trend_plot.getPlotItem(), style='bars', pen=pg.mkPen(None), brush='#DC3545',
+                                   pixels_per_bin=6, bar_offset=0.7, bar_width=0.4)
+        self.trend_series['income'] = income_series
+        self.trend_series['expense'] = expense_series
         
         # Add legend
         legend = pg.LegendItem((100, 60), offset=(70, 20))
-        legend.setParentItem(trend_widget.graphicsItem())
-        legend.addItem(income_line, 'Ingresos')
-        legend.addItem(expense_line, 'Gastos')
+        legend.setParentItem(self.trend_plot.graphicsItem())
+        legend.addItem(income_series.item, 'Ingresos')
+        legend.addItem(expense_series.item, 'Gastos')
         
-        income_expense_layout.addWidget(trend_widget)
+        income_expense_layout.addWidget(self.trend_plot)
         layout.addWidget(income_expense_frame)
         
         # Add summary section
-        summary_frame = QFrame()
-        summary_frame.setObjectName("trendSummaryFrame")
-        summary_frame.setStyleSheet("""
-            #trendSummaryFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        summary_layout = QHBoxLayout(summary_frame)
-        
-        # Average monthly income
-        avg_income = sum(income_trend) / len(income_trend)
-        income_widget = QWidget()
-        income_layout = QVBoxLayout(income_widget)
-        income_title = QLabel("Ingreso Mensual Promedio")
-        income_title.setStyleSheet("color: #888;")
-        income_value = QLabel(f"${avg_income:,.2f}")
-        income_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        income_value.setStyleSheet("color: #28A745;")
-        income_layout.addWidget(income_title)
-        income_layout.addWidget(income_value)
-        summary_layout.addWidget(income_widget)
-        
-        # Average monthly expenses
-        avg_expense = sum(expense_trend) / len(expense_trend)
-        expense_widget = QWidget()
-        expense_layout = QVBoxLayout(expense_widget)
-        expense_title = QLabel("Gasto Mensual Promedio")
-        expense_title.setStyleSheet("color: #888;")
-        expense_value = QLabel(f"${avg_expense:,.2f}")
-        expense_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        expense_value.setStyleSheet("color: #DC3545;")
-        expense_layout.addWidget(expense_title)
-        expense_layout.addWidget(expense_value)
-        summary_layout.addWidget(expense_widget)
-        
-        # Net worth growth
-        growth = ((net_worth[-1] - net_worth[0]) / net_worth[0]) * 100 if net_worth[0] > 0 else 0
-        growth_widget = QWidget()
-        growth_layout = QVBoxLayout(growth_widget)
-        growth_title = QLabel("Crecimiento Patrimonial")
-        growth_title.setStyleSheet("color: #888;")
-        growth_value = QLabel(f"{growth:.1f}%")
-        growth_value.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        growth_value.setStyleSheet("color: #007BFF;")
-        growth_layout.addWidget(growth_title)
-        growth_layout.addWidget(growth_value)
-        summary_layout.addWidget(growth_widget)
-        
+        summary_frame, summary_layout = self.create_report_frame("trendSummaryFrame", QHBoxLayout)
+        self.avg_income_label = self.create_summary_value(summary_layout, "Ingreso Mensual Promedio", "#28A745")
+        self.avg_expense_label = self.create_summary_value(summary_layout, "Gasto Mensual Promedio", "#DC3545")
+        self.growth_label = self.create_summary_value(summary_layout, "Crecimiento Patrimonial", "#007BFF")
         layout.addWidget(summary_frame)
+        
+        # Fill the charts if the daily series are already loaded
+        self.set_daily_series(self.daily_series)
     
-    def generate_budget_report(self, start_date, end_date, account_id=None):
-        """Generate budget performance report.
+    def update_trend_report(self, report):
+        """Show a financial trends report.
         
         Args:
-            start_date (str): Start date in format 'yyyy-MM-dd'
-            end_date (str): End date in format 'yyyy-MM-dd'
-            account_id (int, optional): Account ID to filter by. Defaults to None.
+            report (TrendReport): Report data
         """
-        # Clear previous content
-        if self.budgets_tab.layout():
-            # Clear previous layout
-            while self.budgets_tab.layout().count():
-                item = self.budgets_tab.layout().takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
-            # Remove the layout
-            QWidget().setLayout(self.budgets_tab.layout())
-        
-        # Create new layout
-        layout = QVBoxLayout(self.budgets_tab)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(20)
+        from src.models.timeseries import day_number
+        from src.views.charts import LodSeries
         
-        # Add report header
-        header_label = QLabel(f"Informe de Presupuestos: {start_date} a {end_date}")
-        header_font = QFont("Segoe UI", 14, QFont.Bold)
-        header_label.setFont(header_font)
-        layout.addWidget(header_label)
+        if self.trends_tab.layout() is None:
+            self.build_trend_tab()
         
-        # Add account filter info if applicable
-        if account_id:
-            account_label = QLabel(f"Cuenta: {account_id}")
-            account_label.setStyleSheet("color: #888;")
-            layout.addWidget(account_label)
+        self.trend_header.setText(f"Informe de Tendencias Financieras: {report.start_date} a {report.end_date}")
+        self.trend_account.setVisible(bool(report.account_id))
         
-        # Create budget performance frame
-        budget_frame = QFrame()
-        budget_frame.setObjectName("budgetFrame")
-        budget_frame.setStyleSheet("""
-            #budgetFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        budget_layout = QVBoxLayout(budget_frame)
+        # Show the requested period; the rest of the history is reached by panning
+        self.trend_range = (day_number(report.start_date), day_number(report.end_date))
+        first_day, last_day = self.trend_range
+        for widget in (self.net_worth_plot, self.trend_plot):
+            widget.setXRange(first_day * LodSeries.SECONDS_PER_DAY, (last_day + 1) * LodSeries.SECONDS_PER_DAY,
+                             padding=0)
         
-        # Sample data - in a real app, this would come from the database
-        categories = ['Alimentación', 'Vivienda', 'Transporte', 'Entretenimiento', 'Servicios', 'Otros']
-        budgeted = [800, 1000, 300, 200, 250, 100]
-        actual = [650, 800, 250, 180, 220, 80]
+        self.avg_income_label.setText(f"${report.average_income:,.2f}")
+        self.avg_expense_label.setText(f"${report.average_expenses:,.2f}")
+        self.growth_label.setText(f"{report.growth:.1f}%")
+    
+    def create_daily_plot(self, title):
+        """Create a plot with a date x-axis that only zooms and pans horizontally.
         
-        # Create bar chart
+        Args:
+            title (str): Plot title
+        
+        Returns:
+            pg.PlotWidget: Created plot widget
+        """
+        plot_widget = pg.PlotWidget(axisItems={'bottom': pg.DateAxisItem(orientation='bottom')})
+        plot_widget.setMinimumHeight(250)
+        plot_widget.setTitle(title)
+        plot_widget.showGrid(x=True, y=True, alpha=0.3)
+        plot_widget.setMouseEnabled(x=True, y=False)
+        
+        # The y-axis follows the bins in view
+        plot_widget.enableAutoRange(axis='y')
+        plot_widget.setAutoVisible(y=True)
+        return plot_widget
+    
+    def set_daily_series(self, series):
+        """Show daily series in the trend charts.
+        
+        Args:
+            series (dict): LodPyramid per series name ('income', 'expense', 'balance'),
+                or None while they are loading
+        """
+        self.daily_series = series
+        for name, lod_series in self.trend_series.items():
+            lod_series.set_pyramid(series[name] if series else None)
+    
+    def refresh_daily_series(self):
+        """Redraw the trend charts after the daily series were updated in place."""
+        for lod_series in self.trend_series.values():
+            lod_series.refresh()
+    
+    def build_budget_tab(self):
+        """Build the budget performance report tab."""
+        layout, self.budget_header, self.budget_account = self.create_tab_layout(self.budgets_tab)
+        
+        # Create budget performance frame
+        budget_frame, budget_layout = self.create_report_frame("budgetFrame")
         pg.setConfigOption('background', '#252529')
         pg.setConfigOption('foreground', '#DDDDDD')
         
-        budget_widget = pg.PlotWidget()
-        budget_widget.setMinimumHeight(300)
-        budget_widget.setTitle("Rendimiento del Presupuesto por Categoría")
-        budget_widget.showGrid(y=True, alpha=0.3)
-        
-        # Set up x-axis
-        x_axis = budget_widget.getAxis('bottom')
-        x_axis.setTicks([[(i, cat) for i, cat in enumerate(categories)]])
+        self.budget_plot = pg.PlotWidget()
+        self.budget_plot.setMinimumHeight(300)
+        self.budget_plot.setTitle("Rendimiento del Presupuesto por Categoría")
+        self.budget_plot.showGrid(y=True, alpha=0.3)
         
-        # Create bar graph items
+        # Create bar graph items, moved to the data of every report
         bar_width = 0.35
-        budget_bars = pg.BarGraphItem(x=[i-bar_width/2 for i in range(len(categories))], height=budgeted, width=bar_width, brush='#007BFF')
-        actual_bars = pg.BarGraphItem(x=[i+bar_width/2 for i in range(len(categories))], height=actual, width=bar_width, brush='#FFC107')
+        self.budgeted_bars = pg.BarGraphItem(x=[], height=[], width=bar_width, brush='#007BFF')
+        self.actual_bars = pg.BarGraphItem(x=[], height=[], width=bar_width, brush='#FFC107')
         
         # Add items to the plot
-        budget_widget.addItem(budget_bars)
-        budget_widget.addItem(actual_bars)
+        self.budget_plot.addItem(self.budgeted_bars)
+        self.budget_plot.addItem(self.actual_bars)
         
         # Add legend
         legend = pg.LegendItem((100, 60), offset=(70, 20))
-        legend.setParentItem(budget_widget.graphicsItem())
-        legend.addItem(pg.BarGraphItem(x=[0], height=[1], width=bar_width, brush='#007BFF'), 'Presupuestado')
-        legend.addItem(pg.BarGraphItem(x=[0], height=[1], width=bar_width, brush='#FFC107'), 'Real')
+        legend.setParentItem(self.budget_plot.graphicsItem())
+        legend.addItem(self.budgeted_bars, 'Presupuestado')
+        legend.addItem(self.actual_bars, 'Real')
         
-        budget_layout.addWidget(budget_widget)
+        budget_layout.addWidget(self.budget_plot)
         layout.addWidget(budget_frame)
         
         # Create budget summary table
-        summary_frame = QFrame()
-        summary_frame.setObjectName("budgetSummaryFrame")
-        summary_frame.setStyleSheet("""
-            #budgetSummaryFrame {
-                background-color: #252529;
-                border-radius: 8px;
-                border: 1px solid #333;
-            }
-        """)
-        summary_layout = QVBoxLayout(summary_frame)
-        
-        # Create a table for budget breakdown
-        from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
+        summary_frame, summary_layout = self.create_report_frame("budgetSummaryFrame")
+        self.budget_table = self.create_report_table(["Categoría", "Presupuestado", "Real", "Diferencia"])
+        summary_layout.addWidget(self.budget_table)
+        layout.addWidget(summary_frame)
         
-        budget_table = QTableWidget()
-        budget_table.setColumnCount(4)
-        budget_table.setHorizontalHeaderLabels(["Categoría", "Presupuestado", "Real", "Diferencia"])
-        budget_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        budget_table.setAlternatingRowColors(True)
-        budget_table.setStyleSheet("""
-            QTableWidget {
-                background-color: #1E1E1E;
-                border: none;
-                border-radius: 6px;
-                gridline-color: #333333;
-            }
-            QTableWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #333333;
-            }
-            QHeaderView::section {
-                background-color: #1E1E1E;
-                padding: 8px;
-                border: none;
-                font-weight: bold;
-            }
-            QTableWidget::item:selected {
-                background-color: #0d47a1;
-            }
-        """)
+        # Add overall summary section
+        overall_frame, overall_layout = self.create_report_frame("overallFrame", QHBoxLayout)
+        self.total_budget_label = self.create_summary_value(overall_layout, "Total Presupuestado", "#007BFF")
+        self.total_actual_label = self.create_summary_value(overall_layout, "Total Gastado", "#FFC107")
+        self.total_diff_label = self.create_summary_value(overall_layout, "Diferencia Total", "#28A745")
+        layout.addWidget(overall_frame)
+    
+    def update_budget_report(self, report):
+        """Show a budget performance report.
         
-        # Populate table with data
-        budget_table.setRowCount(len(categories))
-        for row, (category, budget, act) in enumerate(zip(categories, budgeted, actual)):
-            # Category name
-            category_item = QTableWidgetItem(category)
-            budget_table.setItem(row, 0, category_item)
-            
-            # Budgeted amount
-            budget_item = QTableWidgetItem(f"${budget:,.2f}")
-            budget_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            budget_table.setItem(row, 1, budget_item)
\ No newline at end of file
+        Args:
+            report (BudgetReport): Report data
+        """
+        if self.budgets_tab.layout() is None:
+            self.build_budget_tab()
+        
+        self.update_header(self.budget_header, self.budget_account, "Informe de Presupuestos", report)
+        
+        # Budgeted and actual expenses per category
+        positions = range(len(report.lines))
+        bar_width = self.budgeted_bars.opts['width']
+        self.budgeted_bars.setOpts(x=[i - bar_width / 2 for i in positions],
+                                   height=[line.budgeted for line in report.lines])
+        self.actual_bars.setOpts(x=[i + bar_width / 2 for i in positions],
+                                 height=[line.actual for line in report.lines])
+        self.set_axis_labels(self.budget_plot, [line.name for line in report.lines])
+        
+        # Populate table with data, red for over budget and green for under budget
+        table = self.budget_table
+        table.setRowCount(len(report.lines))
+        for row, line in enumerate(report.lines):
+            diff = line.budgeted - line.actual
+            self.set_table_text(table, row, 0, line.name)
+            self.set_table_text(table, row, 1, f"${line.budgeted:,.2f}", amount=True)
+            self.set_table_text(table, row, 2, f"${line.actual:,.2f}", amount=True)
+            self.set_table_text(table, row, 3, f"${diff:,.2f}", amount=True,
+                                color="#DC3545" if diff < 0 else "#28A745")
+        
+        total_diff = report.total_budgeted - report.total_actual
+        self.total_budget_label.setText(f"${report.total_budgeted:,.2f}")
+        self.total_actual_label.setText(f"${report.total_actual:,.2f}")
+        self.total_diff_label.setText(f"${total_diff:,.2f}")
+        self.total_diff_label.setStyleSheet("color: #DC3545;" if total_diff < 0 else "color: #28A745;")
@@ -15,6 +15,12 @@ class SettingsView(QWidget):
     # Signal emitted when settings are saved
     settings_saved = pyqtSignal(dict)
     
+    # Signal emitted to export every table (path, datasets, file format)
+    export_requested = pyqtSignal(str, object, str)
+    
+    # Signal emitted to import an exchange rate file (path, data type, date format, account ID)
+    import_requested = pyqtSignal(str, str, str, object)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.init_ui()
@@ -164,6 +170,8 @@ class SettingsView(QWidget):
     
     def create_data_tab(self):
         """Create data settings tab."""
+        from src.models.exporters import pyarrow_available
+        
         tab = QWidget()
         layout = QVBoxLayout(tab)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -195,13 +203,19 @@ class SettingsView(QWidget):
         
         export_btn_layout = QHBoxLayout()
         self.export_csv_btn = QPushButton("Exportar a CSV")
-        self.export_csv_btn.clicked.connect(self.export_to_csv)
+        self.export_csv_btn.clicked.connect(lambda: self.export_data('csv'))
         export_btn_layout.addWidget(self.export_csv_btn)
         
         self.export_excel_btn = QPushButton("Exportar a Excel")
-        self.export_excel_btn.clicked.connect(self.export_to_excel)
+        self.export_excel_btn.clicked.connect(lambda: self.export_data('excel'))
         export_btn_layout.addWidget(self.export_excel_btn)
         
+        # Parquet needs the optional pyarrow package
+        if pyarrow_available():
+            self.export_parquet_btn = QPushButton("Exportar a Parquet")
+            self.export_parquet_btn.clicked.connect(lambda: self.export_data('parquet'))
+            export_btn_layout.addWidget(self.export_parquet_btn)
+        
         export_layout.addLayout(export_btn_layout)
         
         layout.addWidget(export_group)
@@ -241,19 +255,17 @@ class SettingsView(QWidget):
         
         layout.addWidget(currency_group)
         
-        # Exchange rates
+        # Exchange rates, stored per day; the totals convert each amount at the rate of its date
         exchange_group = QGroupBox("Tasas de cambio")
         exchange_layout = QFormLayout(exchange_group)
         
-        self.update_rates_btn = QPushButton("Actualizar tasas de cambio")
-        self.update_rates_btn.clicked.connect(self.update_exchange_rates)
-        exchange_layout.addRow("Actualizar:", self.update_rates_btn)
+        self.import_rates_btn = QPushButton("Importar tasas de cambio...")
+        self.import_rates_btn.clicked.connect(self.import_exchange_rates)
+        exchange_layout.addRow("Archivo CSV o del BCE:", self.import_rates_btn)
         
-        self.usd_rate = QLineEdit("20.50")
-        exchange_layout.addRow("USD a MXN:", self.usd_rate)
-        
-        self.eur_rate = QLineEdit("24.30")
-        exchange_layout.addRow("EUR a MXN:", self.eur_rate)
+        self.rates_label = QLabel("No hay tasas de cambio.")
+        self.rates_label.setWordWrap(True)
+        exchange_layout.addRow("Tasas actuales:", self.rates_label)
         
         layout.addWidget(exchange_group)
         
@@ -276,9 +288,7 @@ class SettingsView(QWidget):
             'font': self.font_combo.currentData(),
             'font_size': self.font_size_combo.currentData(),
             'auto_backup': self.auto_backup.isChecked(),
-            'default_currency': self.default_currency_combo.currentData(),
-            'usd_rate': float(self.usd_rate.text()),
-            'eur_rate': float(self.eur_rate.text())
+            'default_currency': self.default_currency_combo.currentData()
         }
         
         # Emit signal with settings data
@@ -332,79 +342,17 @@ class SettingsView(QWidget):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error al restaurar la copia de seguridad: {str(e)}")
     
-    def export_to_csv(self):
-        """Export data to CSV format."""
-        file_path, _ = QFileDialog.getSaveFileName(self, "Exportar a CSV", "", "Archivos CSV (*.csv)")
-        if file_path:
-            try:
-                import sqlite3
-                import csv
-                import os
-                
-                # Connect to the database
-                db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'finanzas.db')
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-                
-                # Get all tables
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-                tables = cursor.fetchall()
-                
-                # Export each table to a separate CSV file
-                base_name, ext = os.path.splitext(file_path)
-                for table in tables:
-                    table_name = table[0]
-                    table_file = f"{base_name}_{table_name}{ext}"
-                    
-                    # Get table data
-                    cursor.execute(f"SELECT * FROM {table_name}")
-                    rows = cursor.fetchall()
-                    
-                    # Get column names
-                    cursor.execute(f"PRAGMA table_info({table_name})")
-                    headers = [column[1] for column in cursor.fetchall()]
-                    
-                    # Write to CSV
-                    with open(table_file, 'w', newline='', encoding='utf-8') as f:
-                        writer = csv.writer(f)
-                        writer.writerow(headers)
-                        writer.writerows(rows)
-                
-                conn.close()
-                QMessageBox.information(self, "Exportar a CSV", "Datos exportados exitosamente a CSV.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al exportar a CSV: {str(e)}")
-    
-    def export_to_excel(self):
-        """Export data to Excel format."""
-        file_path, _ = QFileDialog.getSaveFileName(self, "Exportar a Excel", "", "Archivos Excel (*.xlsx)")
+    def export_data(self, export_format):
+        """Export every table, to one file per table or, in Excel, one sheet per table.
+        
+        Args:
+            export_format (str): 'csv', 'excel' or 'parquet'
+        """
+        from src.views.main_window import ask_export_path, export_file_types
+        
+        file_path = ask_export_path(self, *export_file_types(export_format))
         if file_path:
-            try:
-                import sqlite3
-                import pandas as pd
-                import os
-                
-                # Connect to the database
-                db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'finanzas.db')
-                conn = sqlite3.connect(db_path)
-                
-                # Get all tables
-                tables = pd.read_sql_query("SELECT name FROM sqlite_master WHERE type='table';", conn)
-                
-                # Create Excel writer object
-                with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                    # Export each table to a separate sheet
-                    for table_name in tables['name']:
-                        # Read table data
-                        df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
-                        
-                        # Write to Excel sheet
-                        df.to_excel(writer, sheet_name=table_name, index=False)
-                
-                conn.close()
-                QMessageBox.information(self, "Exportar a Excel", "Datos exportados exitosamente a Excel.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al exportar a Excel: {str(e)}")
+            self.export_requested.emit(file_path, None, export_format)
     
     def clear_all_data(self):
         """Clear all data from the database."""
@@ -443,28 +391,42 @@ class SettingsView(QWidget):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error al limpiar los datos: {str(e)}")
     
-    def update_exchange_rates(self):
-        """Update currency exchange rates using an external API."""
-        try:
-            import requests
-            import json
-            
-            # Use the ExchangeRate-API (you would need to sign up for an API key)
-            API_KEY = "YOUR_API_KEY"  # Replace with your actual API key
-            base_currency = "MXN"
-            
-            # Make API request
-            response = requests.get(f"https://v6.exchangerate-api.com/v6/{API_KEY}/latest/{base_currency}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Update exchange rate fields
-                self.usd_rate.setText(str(round(1 / data['conversion_rates']['USD'], 2)))
-                self.eur_rate.setText(str(round(1 / data['conversion_rates']['EUR'], 2)))
-                
-                QMessageBox.information(self, "Actualizar tasas", "Tasas de cambio actualizadas exitosamente.")
-            else:
-                raise Exception("Error en la respuesta de la API")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al actualizar las tasas de cambio: {str(e)}\n\nPor favor, verifique su conexión a internet y la configuración de la API.")
\ No newline at end of file
+    def set_base_currency(self, currency):
+        """Select the currency the totals are converted to.
+        
+        Args:
+            currency (str): Currency code, e.g. 'MXN'
+        """
+        index = self.default_currency_combo.findData(currency)
+        if index < 0:
+            self.default_currency_combo.addItem(currency, currency)
+            index = self.default_currency_combo.count() - 1
+        self.default_currency_combo.setCurrentIndex(index)
+    
+    def show_exchange_rates(self, rates):
+        """Show the current rate of each currency.
+        
+        Args:
+            rates (list): get_latest_rates() rows, in the base currency
+        """
+        base = self.default_currency_combo.currentData()
+        lines = [f"1 {rate['currency']} = {rate['rate']:,.4f} {base} (última tasa: {rate['day']})"
+                 if rate['rate'] is not None else f"{rate['currency']}: sin tasa para {base}"
+                 for rate in rates]
+        self.rates_label.setText("\n".join(lines) or "No hay tasas de cambio.")
+    
+    def import_exchange_rates(self):
+        """Ask for an exchange rate file and request its import."""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Importar tasas de cambio",
+            "",
+            "Tasas de cambio (*.csv *.txt *.xml);;Todos los archivos (*)"
+        )
+        
+        if not file_path:
+            return  # User cancelled
+        
+        # CSV rates list a date, a currency and its rate in the default currency, dates written as YYYY-MM-DD
+        self.import_requested.emit(file_path, 'exchange_rates', 'yyyy-MM-dd', None)
+
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Table model of the transactions view.
+
+Rows are read from the database in pages as the table is scrolled, so only
+the transactions the user actually reaches are kept in memory. Pages may be
+delivered later, e.g. by a background worker; pages requested before the
+last reload are discarded.
+"""
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant, pyqtSignal
+from PyQt5.QtGui import QColor
+
+from src.views.record_index import RecordIndex
+
+# Number of transactions read from the database per page
+PAGE_SIZE = 200
+
+# Amount colors per transaction type
+AMOUNT_COLORS = {
+    'expense': QColor("#DC3545"),  # Red for expenses
+    'income': QColor("#28A745"),  # Green for income
+    'transfer': QColor("#6C757D")  # Gray for transfers
+}
+
+
+def format_date(date):
+    """Format a stored date as 'dd/mm/YYYY'.
+
+    Args:
+        date (str|datetime): Stored date, optionally including a time portion
+
+    Returns:
+        str: Formatted date
+    """
+    if isinstance(date, str):
+        # Stored as 'YYYY-MM-DD[ HH:MM:SS]'
+        return f"{date[8:10]}/{date[5:7]}/{date[0:4]}"
+    return date.strftime('%d/%m/%Y')
+
+
+def format_amount(amount, transaction_type):
+    """Format an amount with the sign of its transaction type."""
+    if transaction_type == 'expense':
+        return f"-{amount:.2f}"
+    elif transaction_type == 'income':
+        return f"+{amount:.2f}"
+    return f"{amount:.2f}"
+
+
+class TransactionsTableModel(QAbstractTableModel):
+    """Transactions model fetching its rows page by page on demand."""
+
+    # Signal emitted when a page request starts (True) or its page arrives (False)
+    loading_changed = pyqtSignal(bool)
+
+    COLUMNS = ["Fecha", "Cuenta", "Categoría", "Descripción", "Monto", "Acciones"]
+
+    # Column indexes
+    DATE_COLUMN = 0
+    ACCOUNT_COLUMN = 1
+    CATEGORY_COLUMN = 2
+    DESCRIPTION_COLUMN = 3
+    AMOUNT_COLUMN = 4
+    ACTIONS_COLUMN = 5
+
+    def __init__(self, parent=None, page_size=PAGE_SIZE):
+        """Initialize the model.
+
+        Args:
+            parent (QObject, optional): Parent object. Defaults to None.
+            page_size (int, optional): Rows read per page. Defaults to PAGE_SIZE.
+        """
+        super().__init__(parent)
+        self.page_size = page_size
+        self.page_source = None
+        # Loaded transactions in row order, indexed by ID
+        self.rows = RecordIndex()
+        self.has_more = False
+        # Whether a page has been requested and not delivered yet
+        self.fetching = False
+        # Incremented on every reload, so late pages of older requests are dropped
+        self.generation = 0
+
+    def set_page_source(self, page_source):
+        """Set the function reading pages of transactions and reload the model.
+
+        Args:
+            page_source (callable): Called as page_source(after, limit, deliver), where after
+                is the (date, id) key of the last loaded row or None for the first page.
+                It must call deliver(page) with a list of transaction dictionaries,
+                newest first, either right away or later on the GUI thread.
+        """
+        self.page_source = page_source
+        self.reload()
+
+    def set_rows(self, transactions):
+        """Show a fixed list of transactions, without paging.
+
+        Args:
+            transactions (list): List of transaction dictionaries
+        """
+        self.beginResetModel()
+        self.generation += 1
+        self.page_source = None
+        self.rows.reset(transactions)
+        self.has_more = False
+        self.set_fetching(False)
+        self.endResetModel()
+
+    def reload(self):
+        """Drop the loaded rows and read the first page again."""
+        self.beginResetModel()
+        self.generation += 1
+        self.rows.reset([])
+        self.has_more = self.page_source is not None
+        self.set_fetching(False)
+        self.endResetModel()
+
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def record(self, row):
+        """Return the transaction dictionary shown in a row."""
+        return self.rows[row]
+
+    def find_record(self, transaction_id):
+        """Return a loaded transaction by ID, or None if it is not loaded."""
+        return self.rows.get(transaction_id)
+
+    def update_record(self, transaction):
+        """Replace a loaded transaction in place.
+
+        Args:
+            transaction (dict): Updated transaction dictionary
+
+        Returns:
+            bool: True if the transaction is loaded
+        """
+        row = self.rows.update(transaction)
+        if row is None:
+            return False
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+        return True
+
+    def remove_record(self, transaction_id):
+        """Remove a loaded transaction.
+
+        Args:
+            transaction_id (int): ID of the transaction
+
+        Returns:
+            bool: True if the transaction was loaded
+        """
+        row = self.rows.row_of(transaction_id)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.rows.remove(transaction_id)
+        self.endRemoveRows()
+        return True
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.COLUMNS)
+
+    def canFetchMore(self, parent):
+        if parent.isValid():
+            return False
+        return self.has_more and not self.fetching
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+
+        # Continue after the last loaded row
+        after = None
+        if self.rows:
+            last = self.rows[-1]
+            after = (last['date'], last['id'])
+
+        self.set_fetching(True)
+        generation = self.generation
+        self.page_source(after, self.page_size, lambda page: self.add_page(page, generation))
+
+    def set_fetching(self, fetching):
+        """Track whether a page request is pending."""
+        if fetching != self.fetching:
+            self.fetching = fetching
+            self.loading_changed.emit(fetching)
+
+    def add_page(self, page, generation):
+        """Append a page delivered by the page source.
+
+        Args:
+            page (list): Transaction dictionaries, newest first
+            generation (int): Model generation the page was requested in
+        """
+        if generation != self.generation:
+            # Requested before the last reload
+            return
+
+        self.has_more = len(page) == self.page_size
+        self.set_fetching(False)
+
+        if not page:
+            return
+
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self.rows.extend(page)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+
+        transaction = self.rows[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == self.DATE_COLUMN:
+                return format_date(transaction['date'])
+            elif column == self.ACCOUNT_COLUMN:
+                return transaction.get('account_name') or 'Unknown'
+            elif column == self.CATEGORY_COLUMN:
+                return transaction.get('category_name') or 'Sin categoría'
+            elif column == self.DESCRIPTION_COLUMN:
+                return transaction.get('description') or ''
+            elif column == self.AMOUNT_COLUMN:
+                return format_amount(transaction['amount'], transaction['type'])
+
+        elif role == Qt.ForegroundRole and column == self.AMOUNT_COLUMN:
+            return AMOUNT_COLORS.get(transaction['type'], AMOUNT_COLORS['transfer'])
+
+        elif role == Qt.TextAlignmentRole:
+            if column == self.AMOUNT_COLUMN:
+                return Qt.AlignRight | Qt.AlignVCenter
+
+        elif role == Qt.UserRole:
+            return transaction['id']
+
+        return QVariant()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return QVariant()
@@ -2,15 +2,18 @@
 # -*- coding: utf-8 -*-
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QTableWidget, QTableWidgetItem,
+                             QPushButton, QTableView, QAbstractItemView,
                              QHeaderView, QFrame, QDialog, QFormLayout,
                              QLineEdit, QComboBox, QDoubleSpinBox, QTextEdit,
                              QDialogButtonBox, QMessageBox, QDateEdit)
-from PyQt5.QtCore import Qt, pyqtSignal, QDate
+from PyQt5.QtCore import Qt, pyqtSignal, QDate, QTimer
 from PyQt5.QtGui import QIcon, QFont, QColor
 import os
 from datetime import datetime
 
+from src.views.delegates import RowActionsDelegate
+from src.views.transactions_model import TransactionsTableModel
+
 class TransactionsView(QWidget):
     """Transactions view showing all financial transactions and their details."""
     
@@ -23,6 +26,15 @@ class TransactionsView(QWidget):
     # Signal emitted when user requests to delete a transaction
     delete_transaction_requested = pyqtSignal(int)
     
+    # Signal emitted with the get_transactions filters after the filter bar settles
+    filters_changed = pyqtSignal(dict)
+    
+    # Milliseconds the filter bar waits after the last edit before applying it
+    FILTER_DELAY_MS = 300
+    
+    # Earliest selectable date, shown as "no limit" in the date filters
+    NO_DATE_LIMIT = QDate(2000, 1, 1)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.init_ui()
@@ -53,93 +65,214 @@ class TransactionsView(QWidget):
         
         main_layout.addLayout(header_layout)
         
-        # Transactions table
-        self.transactions_table = QTableWidget()
-        self.transactions_table.setColumnCount(6)
-        self.transactions_table.setHorizontalHeaderLabels(["Fecha", "Cuenta", "Categoría", "Descripción", "Monto", "Acciones"])
+        # Filter bar
+        main_layout.addLayout(self.create_filter_bar())
+        
+        # Transactions table, backed by a model that reads rows page by page
+        self.transactions_model = TransactionsTableModel(self)
+        self.transactions_table = QTableView()
+        self.transactions_table.setModel(self.transactions_model)
         self.transactions_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.transactions_table.verticalHeader().setVisible(False)
         self.transactions_table.setAlternatingRowColors(True)
-        self.transactions_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.transactions_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.transactions_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.transactions_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.transactions_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.transactions_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        
+        # Edit and delete buttons are painted by a delegate, not created per row
+        self.actions_delegate = RowActionsDelegate(self.transactions_table)
+        self.actions_delegate.action_triggered.connect(self.on_row_action)
+        self.transactions_table.setItemDelegateForColumn(TransactionsTableModel.ACTIONS_COLUMN, self.actions_delegate)
         
         main_layout.addWidget(self.transactions_table)
+        
+        # Loading and row count status
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #6C757D;")
+        main_layout.addWidget(self.status_label)
+        self.transactions_model.loading_changed.connect(self.update_status)
+        self.transactions_model.rowsInserted.connect(self.update_status)
+        self.transactions_model.rowsRemoved.connect(self.update_status)
+        self.transactions_model.modelReset.connect(self.update_status)
+    
+    def create_filter_bar(self):
+        """Create the filter bar above the transactions table.
+        
+        Returns:
+            QHBoxLayout: Layout with the filter widgets
+        """
+        filter_layout = QHBoxLayout()
+        filter_layout.setSpacing(8)
+        
+        # Date range, the earliest date meaning no limit
+        self.start_date_filter = QDateEdit()
+        self.end_date_filter = QDateEdit()
+        for date_edit, placeholder in ((self.start_date_filter, "Desde"), (self.end_date_filter, "Hasta")):
+            date_edit.setCalendarPopup(True)
+            date_edit.setMinimumDate(self.NO_DATE_LIMIT)
+            date_edit.setSpecialValueText(placeholder)
+            date_edit.setDate(self.NO_DATE_LIMIT)
+            date_edit.dateChanged.connect(self.schedule_filter)
+            filter_layout.addWidget(date_edit)
+        
+        # Account
+        self.account_filter = QComboBox()
+        self.account_filter.addItem("Todas las cuentas", None)
+        self.account_filter.currentIndexChanged.connect(self.schedule_filter)
+        filter_layout.addWidget(self.account_filter)
+        
+        # Category
+        self.category_filter = QComboBox()
+        self.category_filter.addItem("Todas las categorías", None)
+        self.category_filter.currentIndexChanged.connect(self.schedule_filter)
+        filter_layout.addWidget(self.category_filter)
+        
+        # Type
+        self.type_filter = QComboBox()
+        self.type_filter.addItem("Todos los tipos", None)
+        self.type_filter.addItem("Gasto", "expense")
+        self.type_filter.addItem("Ingreso", "income")
+        self.type_filter.addItem("Transferencia", "transfer")
+        self.type_filter.currentIndexChanged.connect(self.schedule_filter)
+        filter_layout.addWidget(self.type_filter)
+        
+        # Amount range, zero meaning no limit
+        self.min_amount_filter = QDoubleSpinBox()
+        self.max_amount_filter = QDoubleSpinBox()
+        for spin, placeholder in ((self.min_amount_filter, "Monto mín."), (self.max_amount_filter, "Monto máx.")):
+            spin.setRange(0, 1000000000)
+            spin.setDecimals(2)
+            spin.setSpecialValueText(placeholder)
+            spin.valueChanged.connect(self.schedule_filter)
+            filter_layout.addWidget(spin)
+        
+        # Description text
+        self.search_filter = QLineEdit()
+        self.search_filter.setPlaceholderText("Buscar descripción...")
+        self.search_filter.setClearButtonEnabled(True)
+        self.search_filter.textChanged.connect(self.schedule_filter)
+        filter_layout.addWidget(self.search_filter, 1)
+        
+        # Clear button
+        clear_btn = QPushButton("Limpiar")
+        clear_btn.clicked.connect(self.clear_filters)
+        filter_layout.addWidget(clear_btn)
+        
+        # Debounce timer, restarted on every edit
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(self.apply_filters)
+        
+        return filter_layout
+    
+    def load_filter_options(self, accounts, categories):
+        """Fill the account and category filters, keeping the current selection.
+        
+        Args:
+            accounts (list): List of account dictionaries
+            categories (list): List of category dictionaries
+        """
+        for combo, records, all_label in ((self.account_filter, accounts, "Todas las cuentas"),
+                                          (self.category_filter, categories, "Todas las categorías")):
+            selected = combo.currentData()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem(all_label, None)
+            for record in records:
+                combo.addItem(record['name'], record['id'])
+            combo.setCurrentIndex(max(0, combo.findData(selected)))
+            combo.blockSignals(False)
+            
+            # The selected record no longer exists
+            if combo.currentData() != selected:
+                self.schedule_filter()
+    
+    def schedule_filter(self, *args):
+        """Apply the filters once the user stops editing them."""
+        self.filter_timer.start()
+    
+    def clear_filters(self):
+        """Reset every filter to its default value."""
+        self.start_date_filter.setDate(self.NO_DATE_LIMIT)
+        self.end_date_filter.setDate(self.NO_DATE_LIMIT)
+        self.account_filter.setCurrentIndex(0)
+        self.category_filter.setCurrentIndex(0)
+        self.type_filter.setCurrentIndex(0)
+        self.min_amount_filter.setValue(0)
+        self.max_amount_filter.setValue(0)
+        self.search_filter.clear()
+    
+    def get_filters(self):
+        """Return the current filters as get_transactions keyword arguments.
+        
+        Returns:
+            dict: Filters with a value, unset filters are omitted
+        """
+        filters = {
+            'account_id': self.account_filter.currentData(),
+            'category_id': self.category_filter.currentData(),
+            'transaction_type': self.type_filter.currentData(),
+            'min_amount': self.min_amount_filter.value() or None,
+            'max_amount': self.max_amount_filter.value() or None,
+            'search': self.search_filter.text().strip() or None
+        }
+        
+        # Stored dates include a time portion, so the end date covers the whole day
+        if self.start_date_filter.date() != self.NO_DATE_LIMIT:
+            filters['start_date'] = self.start_date_filter.date().toString("yyyy-MM-dd")
+        if self.end_date_filter.date() != self.NO_DATE_LIMIT:
+            filters['end_date'] = self.end_date_filter.date().toString("yyyy-MM-dd") + " 23:59:59"
+        
+        return {key: value for key, value in filters.items() if value is not None}
+    
+    def apply_filters(self):
+        """Emit the current filters."""
+        self.filter_timer.stop()
+        self.filters_changed.emit(self.get_filters())
+    
+    def update_status(self, *args):
+        """Show the number of loaded rows and whether more are being read."""
+        count = self.transactions_model.rowCount()
+        if self.transactions_model.fetching:
+            self.status_label.setText(f"{count} transacciones cargadas, cargando más...")
+        elif self.transactions_model.has_more:
+            self.status_label.setText(f"{count} transacciones cargadas, desplácese para ver más")
+        else:
+            self.status_label.setText(f"{count} transacciones")
+    
+    def set_page_source(self, page_source):
+        """Read the transactions shown in the table page by page.
+        
+        Args:
+            page_source (callable): Called as page_source(after, limit, deliver), it passes
+                the next transactions, newest first, to deliver
+        """
+        self.transactions_model.set_page_source(page_source)
+    
+    def reload_transactions(self):
+        """Reload the table from its first page."""
+        self.transactions_model.reload()
     
     def load_transactions(self, transactions):
-        """Load transactions data into the table.
+        """Load a fixed list of transactions into the table.
         
         Args:
             transactions (list): List of transaction dictionaries
         """
-        self.transactions_table.setRowCount(0)  # Clear existing rows
-        
-        if not transactions:
-            return
+        self.transactions_model.set_rows(transactions)
+    
+    def on_row_action(self, action, transaction_id):
+        """Handle a click on the edit or delete button of a row.
         
-        for row, transaction in enumerate(transactions):
-            self.transactions_table.insertRow(row)
-            
-            # Date
-            date_str = transaction['date']
-            if isinstance(date_str, str):
-                # Handle date strings that might include time information
-                if ' ' in date_str:  # Check if there's a space indicating time portion
-                    date_obj = datetime.strptime(date_str.split(' ')[0], '%Y-%m-%d')  # Extract just the date part
-                else:
-                    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                date_display = date_obj.strftime('%d/%m/%Y')
-            else:
-                date_display = date_str.strftime('%d/%m/%Y')
-            date_item = QTableWidgetItem(date_display)
-            self.transactions_table.setItem(row, 0, date_item)
-            
-            # Account
-            account_item = QTableWidgetItem(transaction.get('account_name', 'Unknown'))
-            self.transactions_table.setItem(row, 1, account_item)
-            
-            # Category
-            category_item = QTableWidgetItem(transaction.get('category_name', 'Sin categoría'))
-            self.transactions_table.setItem(row, 2, category_item)
-            
-            # Description
-            description_item = QTableWidgetItem(transaction.get('description', ''))
-            self.transactions_table.setItem(row, 3, description_item)
-            
-            # Amount
-            amount = transaction['amount']
-            if transaction['type'] == 'expense':
-                amount_str = f"-{amount:.2f}"
-                amount_color = QColor("#DC3545")  # Red for expenses
-            elif transaction['type'] == 'income':
-                amount_str = f"+{amount:.2f}"
-                amount_color = QColor("#28A745")  # Green for income
-            else:
-                amount_str = f"{amount:.2f}"
-                amount_color = QColor("#6C757D")  # Gray for transfers
-                
-            amount_item = QTableWidgetItem(amount_str)
-            amount_item.setForeground(amount_color)
-            amount_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.transactions_table.setItem(row, 4, amount_item)
-            
-            # Actions
-            actions_layout = QHBoxLayout()
-            actions_layout.setContentsMargins(4, 4, 4, 4)
-            actions_layout.setSpacing(4)
-            
-            edit_btn = QPushButton("Editar")
-            edit_btn.setProperty("transaction_id", transaction['id'])
-            edit_btn.clicked.connect(lambda checked, tid=transaction['id']: self.edit_transaction(tid))
-            actions_layout.addWidget(edit_btn)
-            
-            delete_btn = QPushButton("Eliminar")
-            delete_btn.setProperty("transaction_id", transaction['id'])
-            delete_btn.clicked.connect(lambda checked, tid=transaction['id']: self.delete_transaction(tid))
-            actions_layout.addWidget(delete_btn)
-            
-            actions_widget = QWidget()
-            actions_widget.setLayout(actions_layout)
-            self.transactions_table.setCellWidget(row, 5, actions_widget)
+        Args:
+            action (str): Clicked action ('edit' or 'delete')
+            transaction_id (int): ID of the row's transaction
+        """
+        if action == 'edit':
+            self.edit_transaction(transaction_id)
+        elif action == 'delete':
+            self.delete_transaction(transaction_id)
     
     def show_add_transaction_dialog(self):
         """Show dialog to add a new transaction."""
@@ -222,36 +355,42 @@ class TransactionsView(QWidget):
         Args:
             transaction_id (int): ID of the transaction to edit
         """
-        # Find the transaction data in the table
-        for row in range(self.transactions_table.rowCount()):
-            for col in range(self.transactions_table.columnCount()):
-                cell_widget = self.transactions_table.cellWidget(row, 5)
-                if cell_widget:
-                    actions_layout = cell_widget.layout()
-                    for i in range(actions_layout.count()):
-                        button = actions_layout.itemAt(i).widget()
-                        if button and button.property("transaction_id") == transaction_id and button.text() == "Editar":
-                            # Found the transaction, get its data
-                            date_text = self.transactions_table.item(row, 0).text()
-                            account_name = self.transactions_table.item(row, 1).text()
-                            category_name = self.transactions_table.item(row, 2).text()
-                            description = self.transactions_table.item(row, 3).text()
-                            amount_text = self.transactions_table.item(row, 4).text()
-                            
-                            # Show edit dialog
-                            self.show_edit_transaction_dialog(transaction_id, date_text, account_name, category_name, description, amount_text)
-                            return
+        # Find the transaction in the model's row index
+        transaction = self.transactions_model.find_record(transaction_id)
+        if transaction is None:
+            return
+        
+        # Show edit dialog
+        self.show_edit_transaction_dialog(transaction_id, transaction)
+    
+    def update_transaction_row(self, transaction):
+        """Refresh the row of a loaded transaction in place.
+        
+        Args:
+            transaction (dict): Updated transaction dictionary
+        
+        Returns:
+            bool: True if the transaction is loaded in the table
+        """
+        return self.transactions_model.update_record(transaction)
     
-    def show_edit_transaction_dialog(self, transaction_id, date_text, account_name, category_name, description, amount_text):
+    def remove_transaction_row(self, transaction_id):
+        """Remove the row of a loaded transaction.
+        
+        Args:
+            transaction_id (int): ID of the transaction
+        
+        Returns:
+            bool: True if the transaction was loaded in the table
+        """
+        return self.transactions_model.remove_record(transaction_id)
+    
+    def show_edit_transaction_dialog(self, transaction_id, transaction):
         """Show dialog to edit an existing transaction.
         
         Args:
             transaction_id (int): ID of the transaction to edit
-            date_text (str): Current date of the transaction
-            account_name (str): Current account name
-            category_name (str): Current category name
-            description (str): Current description
-            amount_text (str): Current amount text
+            transaction (dict): Current transaction data
         """
         dialog = QDialog(self)
         dialog.setWindowTitle("Editar Transacción")
@@ -269,10 +408,7 @@ class TransactionsView(QWidget):
         account_combo.addItem("Tarjeta de Crédito", 2)
         account_combo.addItem("Ahorros", 3)
         # Set current account
-        for i in range(account_combo.count()):
-            if account_combo.itemText(i) == account_name:
-                account_combo.setCurrentIndex(i)
-                break
+        account_combo.setCurrentIndex(max(0, account_combo.findData(transaction['account_id'])))
         form_layout.addRow("Cuenta:", account_combo)
         
         # Type field
@@ -280,13 +416,8 @@ class TransactionsView(QWidget):
         type_combo.addItem("Gasto", "expense")
         type_combo.addItem("Ingreso", "income")
         type_combo.addItem("Transferencia", "transfer")
-        # Set current type based on amount prefix
-        if amount_text.startswith("+"):
-            type_combo.setCurrentIndex(1)  # Income
-        elif amount_text.startswith("-"):
-            type_combo.setCurrentIndex(0)  # Expense
-        else:
-            type_combo.setCurrentIndex(2)  # Transfer
+        # Set current type
+        type_combo.setCurrentIndex(max(0, type_combo.findData(transaction['type'])))
         form_layout.addRow("Tipo:", type_combo)
         
         # Category field
@@ -297,10 +428,7 @@ class TransactionsView(QWidget):
         category_combo.addItem("Vivienda", 3)
         category_combo.addItem("Entretenimiento", 4)
         # Set current category
-        for i in range(category_combo.count()):
-            if category_combo.itemText(i) == category_name:
-                category_combo.setCurrentIndex(i)
-                break
+        category_combo.setCurrentIndex(max(0, category_combo.findData(transaction['category_id'])))
         form_layout.addRow("Categoría:", category_combo)
         
         # Amount field
@@ -308,26 +436,22 @@ class TransactionsView(QWidget):
         amount_spin.setRange(0, 1000000000)
         amount_spin.setDecimals(2)
         amount_spin.setSingleStep(100)
-        # Set current amount (remove prefix and convert to float)
-        amount_value = float(amount_text.replace("+", "").replace("-", ""))
-        amount_spin.setValue(amount_value)
+        # Set current amount
+        amount_spin.setValue(transaction['amount'])
         form_layout.addRow("Monto:", amount_spin)
         
         # Date field
         date_edit = QDateEdit()
         date_edit.setCalendarPopup(True)
-        # Parse date text
-        try:
-            date = QDate.fromString(date_text, "dd/MM/yyyy")
-            date_edit.setDate(date)
-        except:
-            date_edit.setDate(QDate.currentDate())
+        # Set current date, stored as 'YYYY-MM-DD HH:MM:SS'
+        date = QDate.fromString(str(transaction['date'])[:10], "yyyy-MM-dd")
+        date_edit.setDate(date if date.isValid() else QDate.currentDate())
         form_layout.addRow("Fecha:", date_edit)
         
         # Description field
         description_edit = QTextEdit()
         description_edit.setMaximumHeight(100)
-        description_edit.setText(description)
+        description_edit.setText(transaction.get('description') or '')
         form_layout.addRow("Descripción:", description_edit)
         
         layout.addLayout(form_layout)
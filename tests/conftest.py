@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+import pytest
+
+# Make the application sources importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.database_manager import DatabaseManager
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Manager of a new database with the default categories."""
+    db_manager = DatabaseManager(str(tmp_path / 'finanzas.db'))
+    db_manager.setup_database()
+    return db_manager
+
+
+@pytest.fixture
+def account_id(db_manager):
+    """Checking account in MXN, starting at 1000."""
+    return db_manager.add_account('Cuenta de Nómina', 'checking', 'MXN', 1000.0)
+
+
+@pytest.fixture(scope='session')
+def qt_app():
+    """Application needed by the Qt models and widgets, on the offscreen platform."""
+    pytest.importorskip('PyQt5.QtWidgets')
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def write_file(tmp_path):
+    """Write a text file to the temporary directory and return its path."""
+    def write(name, content, encoding='utf-8'):
+        path = tmp_path / name
+        path.write_text(content, encoding=encoding)
+        return str(path)
+    return write
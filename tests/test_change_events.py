@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Change events published by the DatabaseManager writes, and their delivery
+by the ChangeBus.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.models.change_events import (ChangeBus, ChangeEvent, month_key, ACCOUNT, TRANSACTION, CATEGORY, BUDGET,
+                                      GOAL, INSERT, UPDATE, DELETE)
+
+
+@pytest.fixture
+def events(db_manager):
+    """Events published by the database manager, in order."""
+    published = []
+    db_manager.subscribe(published.append)
+    return published
+
+
+def test_month_key():
+    assert month_key('2024-03-15 10:00:00') == '2024-03'
+    assert month_key(datetime(2024, 11, 2)) == '2024-11'
+
+
+def test_bus_filters_by_entity_and_counts_generations():
+    bus = ChangeBus()
+    every, accounts = [], []
+    bus.subscribe(every.append)
+    bus.subscribe(accounts.append, entities=[ACCOUNT])
+
+    bus.publish(ChangeEvent(ACCOUNT, INSERT, ids=[1]))
+    bus.publish(ChangeEvent(GOAL, DELETE, ids=[2]))
+    assert [event.entity for event in every] == [ACCOUNT, GOAL]
+    assert [event.entity for event in accounts] == [ACCOUNT]
+    assert bus.generation == 2
+
+    bus.unsubscribe(every.append)
+    bus.publish(ChangeEvent(ACCOUNT, UPDATE, ids=[1]))
+    assert len(every) == 2 and len(accounts) == 2
+
+
+def test_event_drops_missing_ids_and_matches_months():
+    event = ChangeEvent(TRANSACTION, INSERT, ids=[5], accounts=[1, None], categories=[None],
+                        months=['2024-01'])
+    assert event.accounts == {1} and event.categories == frozenset()
+    assert event.affects_months(['2023-12', '2024-01'])
+    assert not event.affects_months(['2024-02'])
+
+
+def test_account_writes(db_manager, events):
+    account_id = db_manager.add_account('Ahorros', 'savings', 'MXN', 0.0)
+    db_manager.update_account(account_id, name='Ahorros 2024')
+
+    assert [(event.entity, event.operation) for event in events] == [(ACCOUNT, INSERT), (ACCOUNT, UPDATE)]
+    assert all(event.ids == {account_id} and event.accounts == {account_id} for event in events)
+
+
+def test_transaction_insert_lists_the_affected_data(db_manager, account_id, events):
+    category_id = db_manager.get_categories('expense')[0]['id']
+    transaction_id = db_manager.add_transaction(account_id, 250.0, 'expense', '2024-05-20', category_id=category_id)
+
+    event, = events
+    assert (event.entity, event.operation) == (TRANSACTION, INSERT)
+    assert event.ids == {transaction_id}
+    assert event.accounts == {account_id}
+    assert event.categories == {category_id}
+    assert event.months == {'2024-05'}
+    assert event.records[0]['amount'] == 250.0
+
+
+def test_transfer_affects_both_accounts(db_manager, account_id, events):
+    savings_id = db_manager.add_account('Ahorros', 'savings', 'MXN', 0.0)
+    events.clear()
+    db_manager.add_transaction(account_id, 300.0, 'transfer', '2024-05-21', description=f'Transferencia:{savings_id}')
+
+    assert events[0].accounts == {account_id, savings_id}
+    assert db_manager.get_account(account_id)['current_balance'] == 700
+    assert db_manager.get_account(savings_id)['current_balance'] == 300
+
+
+def test_category_budget_and_goal_writes(db_manager, events):
+    category_id = db_manager.add_category('Mascotas', 'expense', '#8E44AD')
+    db_manager.add_budget(category_id, 500.0, 'monthly', '2024-11-01', '2025-02-28')
+    goal_id = db_manager.add_goal('Vacaciones', 45000.0)
+    db_manager.update_goal(goal_id, current_amount=1000.0)
+    db_manager.delete_goal(goal_id)
+
+    assert [(event.entity, event.operation) for event in events] == [
+        (CATEGORY, INSERT), (BUDGET, INSERT), (GOAL, INSERT), (GOAL, UPDATE), (GOAL, DELETE)]
+    assert events[1].categories == {category_id}
+    assert events[1].months == {'2024-11', '2024-12', '2025-01', '2025-02'}
+
+
+def test_writes_that_change_nothing_publish_nothing(db_manager, events):
+    assert not db_manager.update_goal(999, current_amount=1.0)
+    assert not db_manager.delete_goal(999)
+    assert events == []
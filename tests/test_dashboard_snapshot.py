@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The dashboard snapshot shown at startup, before the current dashboard is
+computed on a worker thread.
+"""
+
+import json
+
+import pytest
+
+from src.models import dashboard_data
+
+
+@pytest.fixture
+def snapshot_path(db_manager):
+    return dashboard_data.snapshot_path(db_manager.db_path)
+
+
+def wait_for_workers(qt_app):
+    """Let the running workers finish and deliver their results to the GUI thread."""
+    from PyQt5.QtCore import QThreadPool
+
+    QThreadPool.globalInstance().waitForDone()
+    qt_app.processEvents()
+
+
+def start_controller(db_manager):
+    from src.controllers.main_controller import MainController
+    from src.views.main_window import MainWindow
+
+    return MainController(MainWindow(), db_manager)
+
+
+def test_snapshot_path(tmp_path):
+    assert dashboard_data.snapshot_path(str(tmp_path / 'finanzas.db')) == str(tmp_path / 'finanzas.dashboard.json')
+
+
+def test_saved_and_loaded(db_manager, account_id, snapshot_path):
+    db_manager.add_transaction(account_id, 120.0, 'expense', '2024-01-10')
+    dashboard = dashboard_data.compute_dashboard(db_manager)
+
+    dashboard_data.save_snapshot(snapshot_path, dashboard)
+
+    assert dashboard_data.load_snapshot(snapshot_path) == json.loads(json.dumps(dashboard))
+
+
+@pytest.mark.parametrize('content', ['', '{"state": ', '[]', '{"version": 0, "state": {}, "chart_months": {}}'])
+def test_unreadable_snapshots_are_ignored(snapshot_path, content):
+    with open(snapshot_path, 'w', encoding='utf-8') as snapshot_file:
+        snapshot_file.write(content)
+
+    assert dashboard_data.load_snapshot(snapshot_path) is None
+
+
+def test_missing_snapshot(snapshot_path):
+    assert dashboard_data.load_snapshot(snapshot_path) is None
+
+
+def test_stale_snapshot_is_shown_until_the_dashboard_is_computed(qt_app, db_manager, account_id, snapshot_path):
+    dashboard_data.save_snapshot(snapshot_path, dashboard_data.compute_dashboard(db_manager))
+    # Written after the snapshot was saved
+    db_manager.add_transaction(account_id, 250.0, 'income', '2024-01-01')
+
+    controller = start_controller(db_manager)
+    assert controller.dashboard_state['total_balance'] == 1000
+    assert controller.dashboard_worker is not None
+
+    wait_for_workers(qt_app)
+    assert controller.dashboard_state['total_balance'] == 1250
+    assert controller.dashboard_worker is None
+    assert dashboard_data.load_snapshot(snapshot_path)['state']['total_balance'] == 1250
+
+
+def test_dashboard_changed_while_computed_is_computed_again(qt_app, db_manager, account_id, snapshot_path):
+    controller = start_controller(db_manager)
+    db_manager.add_transaction(account_id, 100.0, 'expense', '2024-01-01')
+
+    wait_for_workers(qt_app)
+    # The first result was older than the write and another worker replaced it
+    wait_for_workers(qt_app)
+    assert controller.dashboard_worker is None
+    assert controller.dashboard_state['total_balance'] == 900
+    assert dashboard_data.load_snapshot(snapshot_path)['state']['total_balance'] == 900
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Conversion of the totals of accounts in other currencies at the exchange
+rate of each transaction's date.
+"""
+
+import pytest
+
+from src.models import importers
+
+
+@pytest.fixture
+def usd_account_id(db_manager):
+    """Account in USD, with rates of 17 MXN from January 1st and 18 MXN from January 10th."""
+    db_manager.add_exchange_rates([[('USD', '2024-01-01', 17.0, 'MXN'), ('USD', '2024-01-10', 18.0, 'MXN')]])
+    return db_manager.add_account('Cuenta en dólares', 'checking', 'USD', 0.0)
+
+
+def expenses(db_manager, start_date, end_date):
+    return db_manager.get_totals_by_type(start_date, end_date)['expense']
+
+
+@pytest.mark.parametrize('day, rate', [
+    ('2023-12-20', 17.0),  # Before the first rate: the first one after the day
+    ('2024-01-01', 17.0),
+    ('2024-01-09', 17.0),  # The latest rate up to the day
+    ('2024-01-10', 18.0),
+    ('2024-03-15', 18.0),
+])
+def test_converted_at_the_rate_of_the_day(db_manager, usd_account_id, day, rate):
+    db_manager.add_transaction(usd_account_id, 100.0, 'expense', day)
+
+    assert expenses(db_manager, None, None) == pytest.approx(100 * rate)
+
+
+def test_accounts_in_the_base_currency_are_not_converted(db_manager, account_id, usd_account_id):
+    db_manager.add_transaction(account_id, 500.0, 'expense', '2024-01-05')
+    db_manager.add_transaction(usd_account_id, 10.0, 'expense', '2024-01-05')
+    db_manager.add_transaction(usd_account_id, 10.0, 'expense', '2024-01-12')
+
+    assert expenses(db_manager, '2024-01-01', '2024-02-01') == pytest.approx(500 + 170 + 180)
+    # Periods starting mid-month read the days before from the transactions
+    assert expenses(db_manager, '2024-01-06', '2024-02-01') == pytest.approx(180)
+
+    monthly = {(row['month'], row['type']): row['total'] for row in db_manager.get_monthly_totals()}
+    assert monthly == {('2024-01', 'expense'): pytest.approx(850)}
+
+
+def test_rates_quoted_in_another_currency(db_manager, usd_account_id, write_file):
+    eur_account_id = db_manager.add_account('Cuenta en euros', 'savings', 'EUR', 0.0)
+    path = write_file('tasas.csv', "fecha,moneda,tasa,moneda base\n"
+                                   "2024-01-05,EUR,1.10,USD\n")
+
+    result = importers.import_file(db_manager, 'exchange_rates', path, 'yyyy-MM-dd')
+    assert result.imported == 1
+
+    # 1.10 USD at the 17 MXN of January 5th
+    db_manager.add_transaction(eur_account_id, 100.0, 'expense', '2024-01-20')
+    assert expenses(db_manager, None, None) == pytest.approx(100 * 1.10 * 17)
+
+
+def test_without_rates_of_the_base_currency_nothing_is_converted(db_manager):
+    db_manager.add_exchange_rates([[('USD', '2024-01-01', 1.0, 'EUR'), ('GBP', '2024-01-01', 1.2, 'EUR')]])
+    usd_account_id = db_manager.add_account('Cuenta en dólares', 'checking', 'USD', 0.0)
+    db_manager.add_transaction(usd_account_id, 100.0, 'expense', '2024-01-05')
+
+    assert db_manager.get_converted_accounts() == set()
+    assert expenses(db_manager, None, None) == 100
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming exports of the database to CSV files, plain and compressed, and
+to Excel workbooks.
+"""
+
+import csv
+import gzip
+import os
+from datetime import datetime
+
+import pytest
+
+from src.models import exporters
+
+
+class CancelledWorker:
+    """Worker cancelled before the export starts, or after reporting progress a number of times."""
+
+    def __init__(self, reports=0):
+        self.reports = reports
+
+    def is_cancelled(self):
+        return self.reports <= 0
+
+    def report_progress(self, percentage):
+        self.reports -= 1
+
+
+@pytest.fixture
+def transactions(db_manager, account_id):
+    """Three transactions, added out of date order."""
+    category_id = db_manager.get_categories('expense')[0]['id']
+    db_manager.add_transaction(account_id, 20.0, 'expense', '2024-01-10', category_id, 'Café')
+    db_manager.add_transaction(account_id, 1500.0, 'income', '2024-01-01', description='Nómina')
+    db_manager.add_transaction(account_id, 35.5, 'expense', '2024-01-05')
+
+
+def read_csv(path, opener=open):
+    with opener(path, 'rt', encoding='utf-8', newline='') as csv_file:
+        return list(csv.reader(csv_file))
+
+
+def test_gzip_csv(db_manager, transactions, tmp_path):
+    path = str(tmp_path / 'movimientos.csv.gz')
+
+    result = exporters.export_csv(db_manager, ['transactions_detail'], path, batch_size=2)
+
+    assert result == exporters.ExportResult([path], 3)
+    rows = read_csv(path, gzip.open)
+    assert rows[0] == ['id', 'date', 'type', 'amount', 'account', 'currency', 'category', 'description']
+    # Oldest first, with the names of the account and category
+    assert [(row[1], row[2], row[3], row[4], row[7]) for row in rows[1:]] == [
+        ('2024-01-01', 'income', '1500.0', 'Cuenta de Nómina', 'Nómina'),
+        ('2024-01-05', 'expense', '35.5', 'Cuenta de Nómina', ''),
+        ('2024-01-10', 'expense', '20.0', 'Cuenta de Nómina', 'Café'),
+    ]
+    assert rows[3][6] == db_manager.get_categories('expense')[0]['name']
+
+
+def test_one_file_per_dataset(db_manager, transactions, tmp_path):
+    path = str(tmp_path / 'datos.csv')
+
+    result = exporters.export_csv(db_manager, ['accounts', 'transactions'], path)
+
+    assert result.paths == [str(tmp_path / 'datos_accounts.csv'), str(tmp_path / 'datos_transactions.csv')]
+    assert result.rows == 1 + 3
+    assert [row[1] for row in read_csv(result.paths[0])] == ['name', 'Cuenta de Nómina']
+    assert len(read_csv(result.paths[1])) == 1 + 3
+
+
+def test_dataset_path():
+    assert exporters.dataset_path('/tmp/datos.csv.gz', 'goals') == '/tmp/datos_goals.csv.gz'
+    assert exporters.dataset_path('/tmp/datos.csv', 'goals') == '/tmp/datos_goals.csv'
+
+
+def test_cancelled_export_leaves_no_file(db_manager, transactions, tmp_path):
+    path = str(tmp_path / 'datos.csv.gz')
+
+    result = exporters.export_csv(db_manager, ['accounts', 'transactions'], path, worker=CancelledWorker())
+
+    assert result is None
+    assert sorted(os.listdir(tmp_path)) == ['finanzas.db']
+
+
+def test_unknown_dataset(db_manager, tmp_path):
+    with pytest.raises(ValueError):
+        exporters.export_csv(db_manager, ['sqlite_master'], str(tmp_path / 'tablas.csv'))
+
+
+def test_zstd_without_zstandard(db_manager, tmp_path):
+    if exporters.zstd_available():
+        pytest.skip("zstandard is installed")
+
+    with pytest.raises(exporters.ExportFormatError):
+        exporters.export_csv(db_manager, ['accounts'], str(tmp_path / 'cuentas.csv.zst'))
+    assert sorted(os.listdir(tmp_path)) == ['finanzas.db']
+
+
+def test_excel(db_manager, transactions, tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+    path = str(tmp_path / 'datos.xlsx')
+
+    result = exporters.export_excel(db_manager, ['accounts', 'transactions'], path, batch_size=2)
+
+    assert result == exporters.ExportResult([path], 1 + 3)
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    assert workbook.sheetnames == ['accounts', 'transactions']
+    rows = list(workbook['transactions'].values)
+    assert rows[0][:4] == ('id', 'account_id', 'category_id', 'amount')
+    # Dates are written as Excel dates, not text
+    date_column = rows[0].index('date')
+    assert sorted(row[date_column] for row in rows[1:]) == [
+        datetime(2024, 1, 1), datetime(2024, 1, 5), datetime(2024, 1, 10)]
+    workbook.close()
+
+
+def test_excel_sheets_continue_past_the_row_limit(db_manager, transactions, tmp_path, monkeypatch):
+    openpyxl = pytest.importorskip('openpyxl')
+    monkeypatch.setattr(exporters, 'EXCEL_MAX_ROWS', 3)
+    path = str(tmp_path / 'movimientos.xlsx')
+
+    exporters.export_excel(db_manager, ['transactions_detail', 'goals'], path)
+
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    assert workbook.sheetnames == ['transactions_detail', 'transactions_detail (2)', 'goals']
+    assert [len(list(workbook[name].values)) for name in workbook.sheetnames] == [3, 2, 1]
+    workbook.close()
+
+
+def test_cancelled_excel_export_leaves_no_file(db_manager, transactions, tmp_path):
+    pytest.importorskip('openpyxl')
+
+    result = exporters.export_excel(db_manager, ['transactions'], str(tmp_path / 'datos.xlsx'),
+                                    worker=CancelledWorker())
+
+    assert result is None
+    assert sorted(os.listdir(tmp_path)) == ['finanzas.db']
+
+
+@pytest.mark.parametrize('name', ['datos.csv.gz', 'datos.xlsx'])
+def test_cancelled_export_keeps_the_replaced_file(db_manager, transactions, tmp_path, name):
+    if name.endswith('.xlsx'):
+        pytest.importorskip('openpyxl')
+    path = tmp_path / name
+    path.write_bytes(b'exportado antes')
+    export = exporters.export_excel if name.endswith('.xlsx') else exporters.export_csv
+
+    # Cancelled once the first rows are written
+    result = export(db_manager, ['transactions'], str(path), worker=CancelledWorker(reports=1), batch_size=1)
+
+    assert result is None
+    assert path.read_bytes() == b'exportado antes'
+    assert sorted(os.listdir(tmp_path)) == sorted(['finanzas.db', name])
+
+
+def test_export_replaces_the_file(db_manager, transactions, tmp_path):
+    path = tmp_path / 'datos.csv'
+    path.write_text('exportado antes', encoding='utf-8')
+
+    exporters.export_csv(db_manager, ['transactions'], str(path))
+
+    assert len(read_csv(str(path))) == 1 + 3
+    assert sorted(os.listdir(tmp_path)) == ['datos.csv', 'finanzas.db']
+
+
+def test_date_cache_is_bounded():
+    convert = exporters.date_converter(datetime.fromisoformat)
+
+    for day in range(1, 29):
+        assert convert(f'2024-02-{day:02d}') == datetime(2024, 2, day)
+    assert convert(None) is None
+    assert convert('sin fecha') == 'sin fecha'
+    assert convert.cache_info().maxsize == exporters.DATE_CACHE_SIZE
@@ -0,0 +1,421 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Imports of CSV and Parquet files and OFX, QIF and CAMT.053 bank statements,
+and the deduplication of transactions imported again.
+"""
+
+import sqlite3
+
+import pytest
+
+from src.models import exporters, importers
+from src.models.change_events import TRANSACTION
+from src.models.database_manager import DatabaseManager
+
+OFX_STATEMENT = """OFXHEADER:100
+DATA:OFXSGML
+VERSION:102
+ENCODING:USASCII
+CHARSET:1252
+
+<OFX>
+<BANKMSGSRSV1><STMTTRNRS><STMTRS>
+<CURDEF>MXN
+<BANKACCTFROM><BANKID>002<ACCTID>99887766<ACCTTYPE>CHECKING</BANKACCTFROM>
+<BANKTRANLIST>
+<DTSTART>20240101<DTEND>20240131
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240105120000[-6:CST]<TRNAMT>-50.25<FITID>1<NAME>Farmacia<MEMO>Receta</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240110<TRNAMT>1000.00<FITID>2<NAME>Dep&oacute;sito</STMTTRN>
+</BANKTRANLIST>
+</STMTRS></STMTTRNRS></BANKMSGSRSV1>
+</OFX>
+"""
+
+QIF_STATEMENT = """!Type:Bank
+D01/15/2024
+T-75.50
+PGasolinera
+MTanque lleno
+LTransporte:Gasolina
+^
+D1/20'24
+T300.00
+PReembolso
+^
+"""
+
+CAMT_STATEMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02">
+<BkToCstmrStmt><Stmt>
+<Acct><Id><IBAN>ES9121000418450200051332</IBAN></Id></Acct>
+<Ntry>
+  <Amt Ccy="MXN">20.00</Amt><CdtDbtInd>DBIT</CdtDbtInd><Sts>BOOK</Sts>
+  <BookgDt><Dt>2024-03-01</Dt></BookgDt>
+  <NtryDtls><TxDtls>
+    <RltdPties><Cdtr><Nm>Cafetería</Nm></Cdtr></RltdPties>
+    <RmtInf><Ustrd>Desayuno</Ustrd></RmtInf>
+  </TxDtls></NtryDtls>
+</Ntry>
+<Ntry>
+  <Amt Ccy="MXN">999.00</Amt><CdtDbtInd>DBIT</CdtDbtInd><Sts>PDNG</Sts>
+  <BookgDt><Dt>2024-03-02</Dt></BookgDt>
+</Ntry>
+<Ntry>
+  <Amt Ccy="MXN">150.00</Amt><CdtDbtInd>CRDT</CdtDbtInd><Sts>BOOK</Sts>
+  <BookgDt><Dt>2024-03-03</Dt></BookgDt>
+  <NtryDtls><TxDtls><RltdPties><Dbtr><Nm>Cliente</Nm></Dbtr></RltdPties></TxDtls></NtryDtls>
+</Ntry>
+</Stmt></BkToCstmrStmt>
+</Document>
+"""
+
+
+class CancelledWorker:
+    """Worker cancelled before the import starts, or once a condition holds."""
+
+    def __init__(self, condition=lambda: True):
+        self.condition = condition
+
+    def is_cancelled(self):
+        return self.condition()
+
+    def report_progress(self, percentage):
+        pass
+
+
+def imported_rows(db_manager):
+    """Return the (date, type, amount, description, category) of every transaction, oldest first."""
+    rows = sorted(db_manager.get_transactions(), key=lambda row: (row['date'], row['id']))
+    return [(row['date'][:10], row['type'], row['amount'], row['description'], row['category_name'])
+            for row in rows]
+
+
+def balance(db_manager, account_id):
+    return db_manager.get_account(account_id)['current_balance']
+
+
+@pytest.mark.parametrize('text, amount', [
+    ('1,000,000', 1000000),
+    ('1.000.000', 1000000),
+    ('1.000.000,50', 1000000.5),
+    ('1,000,000.50', 1000000.5),
+    ('-1.234,56 €', -1234.56),
+    ('$1,234.56', 1234.56),
+    ('1,234', 1234),
+    ('1.234', 1234),
+    ('0.125', 0.125),
+    ('-0,125', -0.125),
+    ('.125', 0.125),
+    ('12,5', 12.5),
+    ('2500', 2500),
+])
+def test_parse_amount(text, amount):
+    assert importers.parse_amount(text) == pytest.approx(amount)
+
+
+def test_import_csv(db_manager, account_id, write_file):
+    path = write_file('movimientos.csv', "fecha;importe;concepto;categoría\n"
+                                         "05/01/2024;-1.234,56;Supermercado;Alimentación\n"
+                                         "06/01/2024;2500;Nómina;\n"
+                                         "07/01/2024;no es importe;Error;\n")
+
+    result = importers.import_file(db_manager, 'transactions', path, 'dd/MM/yyyy', account_id)
+
+    assert (result.imported, result.duplicates, result.rejected) == (2, 0, 1)
+    assert not result.cancelled and result.error is None
+    assert result.errors == ("Línea 4: importe no válido",)
+    assert imported_rows(db_manager) == [
+        ('2024-01-05', 'expense', 1234.56, 'Supermercado', 'Alimentación'),
+        ('2024-01-06', 'income', 2500.0, 'Nómina', None),
+    ]
+    assert balance(db_manager, account_id) == pytest.approx(1000 + 2500 - 1234.56)
+    assert [event.entity for event in result.events] == [TRANSACTION]
+    assert result.events[0].months == {'2024-01'}
+
+
+def test_windows_encoding_type_and_account_columns(db_manager, account_id, write_file):
+    savings_id = db_manager.add_account('Ahorros', 'savings', 'MXN', 0.0)
+    path = write_file('movimientos.csv', "Fecha\tCantidad\tTipo\tCuenta\tDescripción\n"
+                                         "2024-02-01\t150\tgasto\tAhorros\tFerretería\n"
+                                         "2024-02-02\t80\tabono\tCuenta de Nómina\tDevolución\n"
+                                         "2024-02-03\t10\tpréstamo\tAhorros\t\n"
+                                         "2024-02-04\t10\tgasto\tInversiones\t\n", encoding='cp1252')
+
+    result = importers.import_file(db_manager, 'transactions', path, 'yyyy-MM-dd')
+
+    assert (result.imported, result.rejected) == (2, 2)
+    assert result.errors == ("Línea 4: tipo desconocido: préstamo", "Línea 5: cuenta desconocida: Inversiones")
+    assert imported_rows(db_manager) == [
+        ('2024-02-01', 'expense', 150.0, 'Ferretería', None),
+        ('2024-02-02', 'income', 80.0, 'Devolución', None),
+    ]
+    assert balance(db_manager, savings_id) == -150
+    assert balance(db_manager, account_id) == 1080
+
+
+def test_missing_columns(db_manager, account_id, write_file):
+    path = write_file('movimientos.csv', "fecha,concepto\n05/01/2024,Renta\n")
+
+    with pytest.raises(importers.ImportFormatError, match="importe"):
+        importers.import_file(db_manager, 'transactions', path, account_id=account_id)
+
+
+def test_transactions_without_an_account(db_manager, write_file):
+    path = write_file('movimientos.csv', "fecha,importe\n05/01/2024,-10\n")
+
+    with pytest.raises(importers.ImportFormatError):
+        importers.import_file(db_manager, 'transactions', path)
+
+
+def test_cancelled_import(db_manager, account_id, write_file):
+    path = write_file('movimientos.csv', "fecha,importe\n05/01/2024,-10\n")
+
+    assert importers.import_file(db_manager, 'transactions', path, account_id=account_id,
+                                worker=CancelledWorker()) is None
+    assert db_manager.get_transactions() == []
+
+
+def long_statement(write_file, rows):
+    """Write a CSV file of rows distinct expenses and return its path."""
+    lines = ''.join(f"2024-03-{number % 28 + 1:02d},-{number + 1},Compra {number}\n" for number in range(rows))
+    return write_file('largo.csv', "fecha,importe,concepto\n" + lines)
+
+
+def test_cancelled_import_keeps_committed_chunks(db_manager, account_id, write_file):
+    path = long_statement(write_file, importers.IMPORT_CHUNK_SIZE * 2)
+
+    def written():
+        with sqlite3.connect(db_manager.db_path) as conn:
+            return conn.execute('SELECT COUNT(*) FROM transactions').fetchone()[0] > 0
+
+    result = importers.import_file(db_manager, 'transactions', path, 'yyyy-MM-dd', account_id,
+                                   worker=CancelledWorker(written))
+
+    assert result.cancelled and result.error is None
+    assert result.imported == importers.IMPORT_CHUNK_SIZE
+    assert len(db_manager.get_transactions()) == importers.IMPORT_CHUNK_SIZE
+    assert [event.entity for event in result.events] == [TRANSACTION]
+
+
+def test_failed_import_keeps_committed_chunks(db_manager, account_id, write_file, monkeypatch):
+    path = long_statement(write_file, importers.IMPORT_CHUNK_SIZE * 2)
+    parse_dates = importers.parse_dates
+    calls = []
+
+    def fail_on_the_second_chunk(*args):
+        calls.append(args)
+        if len(calls) > 1:
+            raise OSError("disco lleno")
+        return parse_dates(*args)
+
+    monkeypatch.setattr(importers, 'parse_dates', fail_on_the_second_chunk)
+    result = importers.import_file(db_manager, 'transactions', path, 'yyyy-MM-dd', account_id)
+
+    assert not result.cancelled and result.error == "disco lleno"
+    assert result.imported == importers.IMPORT_CHUNK_SIZE
+    assert len(db_manager.get_transactions()) == importers.IMPORT_CHUNK_SIZE
+
+
+def test_failure_before_any_chunk_is_raised(db_manager, account_id, write_file, monkeypatch):
+    path = long_statement(write_file, 10)
+
+    def fail(*args):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(importers, 'parse_dates', fail)
+    with pytest.raises(OSError):
+        importers.import_file(db_manager, 'transactions', path, 'yyyy-MM-dd', account_id)
+
+
+def test_import_ofx(db_manager, account_id, write_file):
+    path = write_file('extracto.ofx', OFX_STATEMENT, encoding='cp1252')
+
+    result = importers.import_file(db_manager, 'transactions', path, account_id=account_id)
+
+    assert result.imported == 2
+    assert imported_rows(db_manager) == [
+        ('2024-01-05', 'expense', 50.25, 'Farmacia - Receta', None),
+        ('2024-01-10', 'income', 1000.0, 'Depósito', None),
+    ]
+    assert balance(db_manager, account_id) == pytest.approx(1000 - 50.25 + 1000)
+
+
+def test_import_qif(db_manager, account_id, write_file):
+    path = write_file('extracto.qif', QIF_STATEMENT)
+
+    result = importers.import_file(db_manager, 'transactions', path, 'MM/dd/yyyy', account_id)
+
+    assert result.imported == 2
+    assert imported_rows(db_manager) == [
+        ('2024-01-15', 'expense', 75.5, 'Gasolinera - Tanque lleno', 'Transporte'),
+        ('2024-01-20', 'income', 300.0, 'Reembolso', None),
+    ]
+    assert balance(db_manager, account_id) == pytest.approx(1000 - 75.5 + 300)
+
+
+def test_import_camt053(db_manager, account_id, write_file):
+    path = write_file('extracto.xml', CAMT_STATEMENT)
+
+    result = importers.import_file(db_manager, 'transactions', path, account_id=account_id)
+
+    # The pending entry is not booked yet
+    assert result.imported == 2
+    assert imported_rows(db_manager) == [
+        ('2024-03-01', 'expense', 20.0, 'Cafetería - Desayuno', None),
+        ('2024-03-03', 'income', 150.0, 'Cliente', None),
+    ]
+    assert balance(db_manager, account_id) == pytest.approx(1000 - 20 + 150)
+
+
+def test_statement_account_matching_an_account_name(db_manager, account_id, write_file):
+    savings_id = db_manager.add_account('99887766', 'savings', 'MXN', 0.0)
+    path = write_file('extracto.ofx', OFX_STATEMENT, encoding='cp1252')
+
+    importers.import_file(db_manager, 'transactions', path, account_id=account_id)
+
+    assert {row['account_id'] for row in db_manager.get_transactions()} == {savings_id}
+    assert balance(db_manager, account_id) == 1000
+    assert balance(db_manager, savings_id) == pytest.approx(-50.25 + 1000)
+
+
+def test_reimport_is_deduplicated(db_manager, account_id, write_file):
+    first = write_file('enero.csv', "fecha,importe,concepto\n"
+                                    "2024-01-05,-100,Renta\n"
+                                    "2024-01-06,-20.5,Café\n")
+    importers.import_file(db_manager, 'transactions', first, 'yyyy-MM-dd', account_id)
+
+    again = importers.import_file(db_manager, 'transactions', first, 'yyyy-MM-dd', account_id)
+    assert (again.imported, again.duplicates) == (0, 2)
+    assert again.events == ()
+
+    # Overlapping statement: only the new row is added, whatever the spacing and case of the description
+    overlapping = write_file('enero_2.csv', "fecha,importe,concepto\n"
+                                            "2024-01-06,-20.50,  CAFÉ \n"
+                                            "2024-01-07,-35,Taxi\n")
+    result = importers.import_file(db_manager, 'transactions', overlapping, 'yyyy-MM-dd', account_id)
+
+    assert (result.imported, result.duplicates) == (1, 1)
+    assert len(db_manager.get_transactions()) == 3
+    assert balance(db_manager, account_id) == pytest.approx(1000 - 100 - 20.5 - 35)
+
+
+def test_identical_rows_of_a_file_are_kept(db_manager, account_id, write_file):
+    path = write_file('cafes.csv', "fecha,importe,concepto\n"
+                                   "2024-02-01,-45,Café\n"
+                                   "2024-02-01,-45,Café\n")
+
+    result = importers.import_file(db_manager, 'transactions', path, 'yyyy-MM-dd', account_id)
+    assert result.imported == 2
+
+    # A later statement with a third identical row adds only that one
+    longer = write_file('cafes_2.csv', "fecha,importe,concepto\n"
+                                       "2024-02-01,-45,Café\n"
+                                       "2024-02-01,-45,Café\n"
+                                       "2024-02-01,-45,Café\n")
+    result = importers.import_file(db_manager, 'transactions', longer, 'yyyy-MM-dd', account_id)
+
+    assert (result.imported, result.duplicates) == (1, 2)
+    assert len(db_manager.get_transactions()) == 3
+    assert balance(db_manager, account_id) == pytest.approx(1000 - 3 * 45)
+
+
+def test_interrupted_import_keeps_committed_chunks(db_manager, account_id):
+    def chunks():
+        yield [(account_id, None, 10.0, 'expense', 'Primero', '2024-04-01',
+                importers.fingerprint(account_id, '2024-04-01', 10.0, 'expense', 'Primero'))]
+        raise OSError("disco lleno")
+
+    events = []
+    db_manager.subscribe(events.append)
+    committed = []
+    with pytest.raises(OSError):
+        db_manager.add_transactions(chunks(), on_commit=committed.append)
+
+    assert committed == [1]
+    assert imported_rows(db_manager) == [('2024-04-01', 'expense', 10.0, 'Primero', None)]
+    assert balance(db_manager, account_id) == 990
+    assert len(events) == 1 and events[0].months == {'2024-04'}
+
+
+def test_subscribers_do_not_hide_the_import_error(db_manager, account_id):
+    def chunks():
+        yield [(account_id, None, 10.0, 'expense', 'Primero', '2024-04-01', None)]
+        raise OSError("disco lleno")
+
+    connections = []
+
+    def failing_subscriber(event):
+        # Subscribers may query the manager, so its connection is closed by now
+        connections.append(db_manager.conn)
+        raise RuntimeError("suscriptor roto")
+
+    db_manager.subscribe(failing_subscriber)
+    with pytest.raises(OSError):
+        db_manager.add_transactions(chunks())
+    assert connections == [None]
+
+    # Without an import error, the subscriber's own error is raised
+    with pytest.raises(RuntimeError):
+        db_manager.add_transactions([[(account_id, None, 5.0, 'expense', 'Segundo', '2024-04-02', None)]])
+    assert connections == [None, None]
+
+
+def test_import_transfers(db_manager, account_id, write_file):
+    savings_id = db_manager.add_account('Ahorros', 'savings', 'MXN', 0.0)
+    path = write_file('traspasos.csv', "fecha,importe,tipo,concepto\n"
+                                       f"2024-05-01,300,transferencia,Ahorro mensual:{savings_id}\n"
+                                       "2024-05-02,50,transfer,Sin destino\n"
+                                       "2024-05-03,50,transfer,Cuenta borrada:999\n")
+
+    result = importers.import_file(db_manager, 'transactions', path, 'yyyy-MM-dd', account_id)
+
+    assert (result.imported, result.rejected) == (1, 2)
+    assert balance(db_manager, account_id) == 700
+    assert balance(db_manager, savings_id) == 300
+    assert result.events[0].accounts == {account_id, savings_id}
+
+
+def test_columnar_round_trip(db_manager, account_id, tmp_path):
+    pytest.importorskip('pyarrow')
+    savings_id = db_manager.add_account('Ahorros', 'savings', 'MXN', 0.0)
+    category_id = db_manager.get_categories('expense')[0]['id']
+    db_manager.add_transaction(account_id, 2000.0, 'income', '2024-06-01', description='Nómina')
+    db_manager.add_transaction(account_id, 120.5, 'expense', '2024-06-02', category_id, 'Cena')
+    db_manager.add_transaction(account_id, 500.0, 'transfer', '2024-06-03', description=f'Ahorro:{savings_id}')
+    path = str(tmp_path / 't.parquet')
+    exporters.export_columnar(db_manager, ['transactions_detail'], path)
+
+    # A new database with the same accounts
+    copy = DatabaseManager(str(tmp_path / 'copia.db'))
+    copy.setup_database()
+    copy.add_account('Cuenta de Nómina', 'checking', 'MXN', 1000.0)
+    copy.add_account('Ahorros', 'savings', 'MXN', 0.0)
+    result = importers.import_file(copy, 'transactions', path)
+
+    assert (result.imported, result.rejected) == (3, 0)
+    assert imported_rows(copy) == imported_rows(db_manager)
+    for account in db_manager.get_accounts():
+        assert balance(copy, account['id']) == pytest.approx(account['current_balance'])
+
+
+def test_import_accounts_and_categories(db_manager, account_id, write_file):
+    accounts = write_file('cuentas.csv', "nombre,moneda,saldo inicial\n"
+                                         "Cuenta de Nómina,MXN,5\n"
+                                         "Tarjeta,MXN,\"-1,500.00\"\n"
+                                         ",MXN,0\n")
+    result = importers.import_file(db_manager, 'accounts', accounts)
+
+    assert (result.imported, result.rejected) == (1, 1)
+    card = [account for account in db_manager.get_accounts() if account['name'] == 'Tarjeta'][0]
+    assert (card['type'], card['initial_balance']) == (importers.DEFAULT_ACCOUNT_TYPE, -1500)
+
+    categories = write_file('categorias.csv', "nombre,tipo\n"
+                                              "Mascotas,gasto\n"
+                                              "Alimentación,expense\n"
+                                              "Otros,préstamo\n")
+    result = importers.import_file(db_manager, 'categories', categories)
+
+    assert (result.imported, result.rejected) == (1, 1)
+    assert 'Mascotas' in {category['name'] for category in db_manager.get_categories('expense')}
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Synthetic ledgers generated for load testing.
+"""
+
+import sqlite3
+from datetime import date
+
+import pytest
+
+from src.models.database_manager import DatabaseManager
+from src.models.ledger_generator import generate_ledger
+
+# Small ledger ending on a fixed day
+OPTIONS = dict(accounts=3, categories=16, transactions=3000, years=2, currencies=['MXN', 'USD'], goals=2,
+               today=date(2024, 6, 30))
+
+TABLES = ('accounts', 'categories', 'transactions', 'budgets', 'goals', 'exchange_rates')
+
+
+def generate(tmp_path, name, **options):
+    """Generate a ledger in a new database and return the manager and the counts per table."""
+    db_manager = DatabaseManager(str(tmp_path / name))
+    db_manager.setup_database()
+    return db_manager, generate_ledger(db_manager, **{**OPTIONS, **options})
+
+
+def table_rows(db_manager, table):
+    """Return the rows of a table without the columns stamped with the current time."""
+    with sqlite3.connect(db_manager.db_path) as conn:
+        cursor = conn.execute(f'SELECT * FROM {table} ORDER BY 1')
+        columns = [column[0] for column in cursor.description]
+        kept = [index for index, column in enumerate(columns) if column not in ('created_at', 'updated_at')]
+        return [tuple(row[index] for index in kept) for row in cursor.fetchall()]
+
+
+def test_same_seed_same_ledger(tmp_path):
+    first, first_counts = generate(tmp_path, 'primero.db', seed=7)
+    second, second_counts = generate(tmp_path, 'segundo.db', seed=7)
+
+    assert first_counts == second_counts
+    for table in TABLES:
+        assert table_rows(first, table) == table_rows(second, table), table
+
+
+def test_another_seed_another_ledger(tmp_path):
+    first, _ = generate(tmp_path, 'primero.db', seed=7)
+    second, _ = generate(tmp_path, 'segundo.db', seed=8)
+
+    assert table_rows(first, 'transactions') != table_rows(second, 'transactions')
+
+
+def test_requested_size(tmp_path):
+    db_manager, counts = generate(tmp_path, 'libro.db')
+
+    assert counts['accounts'] == 3
+    assert counts['categories'] == 16
+    assert counts['goals'] == 2
+    assert counts['transactions'] == len(table_rows(db_manager, 'transactions'))
+    assert counts['transactions'] == pytest.approx(3000, rel=0.05)
+
+    dates = [row['date'][:10] for row in db_manager.get_transactions()]
+    assert '2022-06-01' <= min(dates) and max(dates) <= '2024-06-30'
+    assert {account['currency'] for account in db_manager.get_accounts()} == {'MXN', 'USD'}
+
+
+def test_balances_match_the_transactions(tmp_path):
+    db_manager, _ = generate(tmp_path, 'libro.db')
+
+    with sqlite3.connect(db_manager.db_path) as conn:
+        flows = dict(conn.execute('''
+            SELECT account_id, SUM(CASE type WHEN 'income' THEN amount WHEN 'expense' THEN -amount ELSE 0 END)
+            FROM transactions GROUP BY account_id
+        ''').fetchall())
+        transfers = conn.execute("SELECT account_id, description, amount FROM transactions WHERE type = 'transfer'")
+        # Transfers name their destination account after the last ':' of the description
+        for source_id, description, amount in transfers.fetchall():
+            destination_id = int(description.rsplit(':', 1)[1])
+            flows[source_id] = flows.get(source_id, 0) - amount
+            flows[destination_id] = flows.get(destination_id, 0) + amount
+
+    for account in db_manager.get_accounts(active_only=False):
+        assert account['current_balance'] == pytest.approx(account['initial_balance'] + flows.get(account['id'], 0))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Row index of table records, and its use by the transactions model.
+"""
+
+import pytest
+
+from src.views.record_index import RecordIndex
+
+
+def records(*ids):
+    return [{'id': record_id, 'name': f'Registro {record_id}'} for record_id in ids]
+
+
+def test_lookups():
+    index = RecordIndex(records(7, 3, 9))
+
+    assert len(index) == 3
+    assert index.row_of(3) == 1
+    assert index.get(9)['name'] == 'Registro 9'
+    assert index[0]['id'] == 7
+    assert 7 in index and 4 not in index
+    assert index.row_of(4) is None and index.get(4) is None
+
+
+def test_extend_and_reset():
+    index = RecordIndex(records(1, 2))
+    index.extend(records(5, 6))
+    assert index.row_of(6) == 3
+
+    index.reset(records(6))
+    assert index.row_of(6) == 0
+    assert index.row_of(1) is None
+    assert len(index) == 1
+
+
+def test_update_in_place():
+    index = RecordIndex(records(1, 2, 3))
+
+    assert index.update({'id': 2, 'name': 'Renombrado'}) == 1
+    assert index.get(2)['name'] == 'Renombrado'
+    assert index.update({'id': 8, 'name': 'Ausente'}) is None
+    assert 8 not in index
+
+
+def test_remove_shifts_the_rows_below():
+    index = RecordIndex(records(1, 2, 3, 4))
+
+    assert index.remove(2) == 1
+    assert [index.row_of(record_id) for record_id in (1, 3, 4)] == [0, 1, 2]
+    assert [record['id'] for record in index.records] == [1, 3, 4]
+    assert index.remove(2) is None
+
+
+def test_transactions_model_finds_updates_and_removes_rows(qt_app):
+    pytest.importorskip('PyQt5.QtCore')
+    from src.views.transactions_model import TransactionsTableModel
+
+    model = TransactionsTableModel()
+    model.set_rows([{'id': 1, 'date': '2024-01-03', 'amount': 5.0, 'type': 'expense'},
+                    {'id': 2, 'date': '2024-01-02', 'amount': 7.0, 'type': 'income'},
+                    {'id': 3, 'date': '2024-01-01', 'amount': 9.0, 'type': 'expense'}])
+    changed = []
+    model.dataChanged.connect(lambda first, last: changed.append((first.row(), last.row())))
+
+    assert model.find_record(2)['amount'] == 7.0
+    assert model.update_record({'id': 2, 'date': '2024-01-02', 'amount': 70.0, 'type': 'income'})
+    assert changed == [(1, 1)]
+    assert model.data(model.index(1, model.AMOUNT_COLUMN)) == '+70.00'
+
+    assert model.remove_record(1)
+    assert model.rowCount() == 2
+    assert model.find_record(3) == model.record(1)
+    assert not model.remove_record(1)
+    assert not model.update_record({'id': 1, 'date': '2024-01-03', 'amount': 1.0, 'type': 'expense'})
+
+
+def test_get_goal(db_manager):
+    goal_id = db_manager.add_goal('Vacaciones', 45000.0)
+
+    assert db_manager.get_goal(goal_id)['name'] == 'Vacaciones'
+    assert db_manager.get_goal(goal_id + 1) is None
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache of computed reports, keyed by the database's data version.
+"""
+
+from src.models import report_data
+from src.models.report_data import ReportCache
+
+
+def cached_report(cache, db_manager, report_type, start_date, end_date):
+    """Return a report from the cache, computing and storing it on a miss, as the controller does."""
+    key = ReportCache.key(report_type, start_date, end_date, None, db_manager.change_bus.generation)
+    report = cache.get(key)
+    if report is None:
+        report = report_data.compute_report(db_manager, report_type, start_date, end_date)
+        cache.put(key, report)
+    return report
+
+
+def test_hits_until_the_data_changes(db_manager, account_id):
+    cache = ReportCache()
+    db_manager.add_transaction(account_id, 100.0, 'expense', '2024-01-10')
+
+    first = cached_report(cache, db_manager, 'income_expense', '2024-01-01', '2024-01-31')
+    assert cached_report(cache, db_manager, 'income_expense', '2024-01-01', '2024-01-31') is first
+    assert first.total_expenses == 100
+
+    # A write bumps the data version and the report is computed again
+    db_manager.add_transaction(account_id, 50.0, 'expense', '2024-01-11')
+    second = cached_report(cache, db_manager, 'income_expense', '2024-01-01', '2024-01-31')
+    assert second is not first
+    assert second.total_expenses == 150
+
+
+def test_key_includes_the_request():
+    keys = {
+        ReportCache.key('category', '2024-01-01', '2024-01-31', None, 1),
+        ReportCache.key('trend', '2024-01-01', '2024-01-31', None, 1),
+        ReportCache.key('category', '2024-01-02', '2024-01-31', None, 1),
+        ReportCache.key('category', '2024-01-01', '2024-01-30', None, 1),
+        ReportCache.key('category', '2024-01-01', '2024-01-31', 7, 1),
+        ReportCache.key('category', '2024-01-01', '2024-01-31', None, 2),
+    }
+    assert len(keys) == 6
+
+
+def test_least_recently_used_are_evicted():
+    cache = ReportCache(max_size=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+
+    cache.clear()
+    assert cache.get('a') is None
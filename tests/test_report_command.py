@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Reports written by the `finanzas.py report` command line.
+"""
+
+import csv
+import json
+import os
+from datetime import date
+
+import pytest
+
+import finanzas
+
+
+@pytest.fixture
+def ledger(db_manager, account_id):
+    """January incomes and expenses in two accounts."""
+    savings_id = db_manager.add_account('Ahorros', 'savings', 'MXN', 0.0)
+    db_manager.add_transaction(account_id, 3000.0, 'income', '2024-01-01')
+    db_manager.add_transaction(account_id, 400.0, 'expense', '2024-01-10')
+    category_id = db_manager.get_categories('expense')[0]['id']
+    db_manager.add_transaction(savings_id, 100.0, 'expense', '2024-01-31', category_id)
+    return account_id, savings_id
+
+
+def run_report(db_manager, output_dir, *arguments):
+    return finanzas.main(['--db', db_manager.db_path, 'report', '--from', '2024-01-01', '--to', '2024-01-31',
+                          '--output', str(output_dir), '--jobs', '1', *arguments])
+
+
+def printed_files(capsys):
+    return sorted(os.path.basename(line) for line in capsys.readouterr().out.splitlines())
+
+
+def test_json_and_csv(db_manager, ledger, tmp_path, capsys):
+    status = run_report(db_manager, tmp_path, '--type', 'income_expense', '--format', 'json', '--format', 'csv')
+
+    assert status == 0
+    assert printed_files(capsys) == ['income_expense_2024-01-01_2024-01-31_todas.csv',
+                                     'income_expense_2024-01-01_2024-01-31_todas.json']
+
+    with open(tmp_path / 'income_expense_2024-01-01_2024-01-31_todas.json', encoding='utf-8') as input_file:
+        report = json.load(input_file)
+    assert (report['total_income'], report['total_expenses']) == (3000, 500)
+    assert report['months'][0]['month'] == '2024-01'
+
+    with open(tmp_path / 'income_expense_2024-01-01_2024-01-31_todas.csv', encoding='utf-8') as input_file:
+        rows = list(csv.reader(input_file))
+    assert rows == [["Mes", "Ingresos", "Gastos", "Neto"], ['2024-01', '3000.0', '500.0', '2500.0']]
+
+
+def test_one_report_per_account(db_manager, ledger, tmp_path, capsys):
+    account_id, savings_id = ledger
+
+    status = run_report(db_manager, tmp_path, '--type', 'category', '--type', 'category', '--all-accounts')
+
+    assert status == 0
+    assert printed_files(capsys) == [f'category_2024-01-01_2024-01-31_cuenta{account_id}.json',
+                                     f'category_2024-01-01_2024-01-31_cuenta{savings_id}.json']
+    with open(tmp_path / f'category_2024-01-01_2024-01-31_cuenta{savings_id}.json', encoding='utf-8') as input_file:
+        assert json.load(input_file)['total'] == 100
+
+
+def test_images(db_manager, ledger, tmp_path, capsys):
+    pytest.importorskip('matplotlib')
+    account_id, _ = ledger
+
+    status = run_report(db_manager, tmp_path, '--type', 'category', '--account', str(account_id),
+                        '--format', 'png', '--format', 'svg')
+
+    assert status == 0
+    png, svg = printed_files(capsys)
+    assert (tmp_path / png).read_bytes().startswith(b'\x89PNG')
+    assert b'<svg' in (tmp_path / svg).read_bytes()
+
+
+def test_period_ending_before_it_starts(db_manager, tmp_path, capsys):
+    status = finanzas.main(['--db', db_manager.db_path, 'report', '--type', 'trend',
+                            '--from', '2024-02-01', '--to', '2024-01-31', '--output', str(tmp_path)])
+
+    assert status == 2
+    assert 'Error' in capsys.readouterr().err
+    assert os.listdir(tmp_path) == ['finanzas.db']
+
+
+def test_invalid_date(db_manager):
+    with pytest.raises(SystemExit):
+        finanzas.main(['--db', db_manager.db_path, 'report', '--type', 'trend', '--from', '31/01/2024'])
+
+
+@pytest.mark.parametrize('today, period', [
+    (date(2024, 3, 15), ('2024-02-01', '2024-02-29')),
+    (date(2024, 1, 1), ('2023-12-01', '2023-12-31')),
+])
+def test_last_month(today, period):
+    assert finanzas.last_month(today) == period
+
+
+def test_trend_is_written_once(db_manager, ledger, tmp_path, capsys):
+    status = run_report(db_manager, tmp_path, '--type', 'trend', '--type', 'category', '--all-accounts')
+
+    assert status == 0
+    # The trend covers every account, whatever account is selected
+    assert [name for name in printed_files(capsys) if name.startswith('trend')] == [
+        'trend_2024-01-01_2024-01-31_todas.json']
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Data of each report, computed without the report widgets.
+"""
+
+import pytest
+
+from src.models import report_data
+
+
+class FakeWorker:
+    """Worker recording the progress reported, cancelled once it reaches a percentage."""
+
+    def __init__(self, cancel_at=None):
+        self.cancel_at = cancel_at
+        self.progress = []
+
+    def is_cancelled(self):
+        return self.cancel_at is not None and bool(self.progress) and self.progress[-1] >= self.cancel_at
+
+    def report_progress(self, percentage):
+        self.progress.append(percentage)
+
+
+@pytest.fixture
+def categories(db_manager):
+    """IDs of the expense categories, by name."""
+    return {category['name']: category['id'] for category in db_manager.get_categories('expense')}
+
+
+@pytest.fixture
+def savings_id(db_manager):
+    return db_manager.add_account('Ahorros', 'savings', 'MXN', 500.0)
+
+
+@pytest.fixture
+def transactions(db_manager, account_id, savings_id, categories):
+    """Two months of incomes and expenses, across two accounts."""
+    food, transport = categories['Alimentación'], categories['Transporte']
+    db_manager.add_transaction(account_id, 3000.0, 'income', '2024-01-01')
+    db_manager.add_transaction(account_id, 400.0, 'expense', '2024-01-10', food)
+    db_manager.add_transaction(account_id, 100.0, 'expense', '2024-01-31', transport)
+    db_manager.add_transaction(savings_id, 200.0, 'expense', '2024-02-15', food)
+    db_manager.add_transaction(account_id, 1000.0, 'income', '2024-02-29')
+    # Outside every period below
+    db_manager.add_transaction(account_id, 50.0, 'expense', '2024-04-01', food)
+
+
+def test_income_expense_report(db_manager, transactions):
+    report = report_data.compute_income_expense_report(db_manager, '2024-01-01', '2024-03-31')
+
+    assert [(month.month, month.income, month.expenses) for month in report.months] == [
+        ('2024-01', 3000, 500), ('2024-02', 1000, 200), ('2024-03', 0, 0)]
+    assert (report.total_income, report.total_expenses) == (4000, 700)
+
+
+def test_income_expense_report_of_an_account(db_manager, transactions, savings_id):
+    report = report_data.compute_income_expense_report(db_manager, '2024-01-01', '2024-02-29', savings_id)
+
+    assert [(month.month, month.income, month.expenses) for month in report.months] == [
+        ('2024-01', 0, 0), ('2024-02', 0, 200)]
+
+
+def test_category_report(db_manager, transactions, categories):
+    report = report_data.compute_category_report(db_manager, '2024-01-01', '2024-02-29')
+
+    assert report.total == 700
+    assert [(category.category_id, category.total) for category in report.categories] == [
+        (categories['Alimentación'], 600), (categories['Transporte'], 100)]
+    assert sum(category.percentage for category in report.categories) == pytest.approx(100)
+
+
+def test_category_report_merges_the_smallest_into_others(db_manager, account_id, categories):
+    for amount, category_id in enumerate(categories.values(), start=1):
+        db_manager.add_transaction(account_id, float(amount), 'expense', '2024-05-10', category_id)
+
+    report = report_data.compute_category_report(db_manager, '2024-05-01', '2024-05-31', top=3)
+
+    assert len(report.categories) == 3
+    assert report.categories[-1].category_id is None
+    assert report.categories[-1].name == report_data.OTHERS_LABEL
+    assert sum(category.total for category in report.categories) == report.total
+
+
+def test_trend_report(db_manager, transactions, savings_id):
+    report = report_data.compute_trend_report(db_manager, '2024-02-01', '2024-02-29', savings_id)
+
+    # Every account counts: 1500 of initial balances and the January flows before the period
+    opening = 1000 + 500 + 3000 - 500
+    assert report.average_income == pytest.approx(1000)
+    assert report.average_expenses == pytest.approx(200)
+    assert report.growth == pytest.approx((1000 - 200) / opening * 100)
+
+
+def test_budget_report(db_manager, transactions, categories):
+    food, transport = categories['Alimentación'], categories['Transporte']
+    db_manager.add_budget(food, 300.0, 'monthly', '2024-01-01', '2024-01-31')
+    db_manager.add_budget(food, 300.0, 'monthly', '2024-02-01', '2024-02-29')
+    db_manager.add_budget(transport, 150.0, 'monthly', '2024-01-01', '2024-01-31')
+    # Not overlapping the period
+    db_manager.add_budget(transport, 999.0, 'monthly', '2024-06-01', '2024-06-30')
+
+    report = report_data.compute_budget_report(db_manager, '2024-01-01', '2024-02-29')
+
+    assert [(line.category_id, line.budgeted, line.actual) for line in report.lines] == [
+        (food, 600, 600), (transport, 150, 100)]
+    assert (report.total_budgeted, report.total_actual) == (750, 700)
+
+
+def test_compute_report_reports_progress(db_manager, transactions):
+    worker = FakeWorker()
+
+    report = report_data.compute_report(db_manager, 'category', '2024-01-01', '2024-02-29', worker=worker)
+
+    assert isinstance(report, report_data.CategoryReport)
+    assert worker.progress == [0, 80, 100]
+
+
+@pytest.mark.parametrize('report_type', sorted(report_data.REPORT_FUNCTIONS))
+def test_cancelled_report_returns_none(db_manager, transactions, report_type):
+    worker = FakeWorker(cancel_at=0)
+
+    assert report_data.compute_report(db_manager, report_type, '2024-01-01', '2024-02-29', worker=worker) is None
+
+
+def test_unknown_report_type(db_manager):
+    with pytest.raises(ValueError):
+        report_data.compute_report(db_manager, 'forecast', '2024-01-01', '2024-01-31')
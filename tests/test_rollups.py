@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The monthly_category_totals rollup kept by triggers, compared with a full
+recompute over the transactions table.
+"""
+
+import sqlite3
+
+import pytest
+
+RECOMPUTE = '''
+SELECT substr(date, 1, 7), account_id, COALESCE(category_id, 0), type, ROUND(SUM(amount), 2), COUNT(*)
+FROM transactions
+GROUP BY 1, 2, 3, 4
+'''
+
+ROLLUP = '''
+SELECT month, account_id, category_id, type, ROUND(total, 2), count
+FROM monthly_category_totals
+'''
+
+
+def execute(db_manager, query, params=()):
+    """Run a statement on its own connection, as a write outside the manager would."""
+    with sqlite3.connect(db_manager.db_path) as conn:
+        return conn.execute(query, params).fetchall()
+
+
+def assert_rollup_matches(db_manager):
+    assert sorted(execute(db_manager, ROLLUP)) == sorted(execute(db_manager, RECOMPUTE))
+
+
+@pytest.fixture
+def category_ids(db_manager):
+    """IDs of two expense categories."""
+    return [category['id'] for category in db_manager.get_categories('expense')[:2]]
+
+
+@pytest.fixture
+def transactions(db_manager, account_id, category_ids):
+    """Expenses and incomes over three months, some of them uncategorized."""
+    food, transport = category_ids
+    db_manager.add_transaction(account_id, 100.0, 'expense', '2024-01-05', food)
+    db_manager.add_transaction(account_id, 40.0, 'expense', '2024-01-20', transport)
+    db_manager.add_transaction(account_id, 15.5, 'expense', '2024-01-31')
+    db_manager.add_transaction(account_id, 2000.0, 'income', '2024-02-01')
+    db_manager.add_transaction(account_id, 60.0, 'expense', '2024-02-14', food)
+    db_manager.add_transaction(account_id, 25.0, 'expense', '2024-03-02', transport)
+
+
+def test_inserts_are_rolled_up(db_manager, transactions):
+    assert_rollup_matches(db_manager)
+    assert execute(db_manager, "SELECT total, count FROM monthly_category_totals "
+                               "WHERE month = '2024-01' AND category_id = 0") == [(15.5, 1)]
+
+
+def test_updates_move_the_totals(db_manager, transactions, category_ids):
+    execute(db_manager, "UPDATE transactions SET amount = amount * 2 WHERE date LIKE '2024-01-05%'")
+    execute(db_manager, "UPDATE transactions SET date = '2024-03-10' WHERE date LIKE '2024-02-14%'")
+    execute(db_manager, "UPDATE transactions SET category_id = ? WHERE category_id IS NULL", (category_ids[1],))
+    execute(db_manager, "UPDATE transactions SET type = 'income' WHERE date LIKE '2024-03-02%'")
+
+    assert_rollup_matches(db_manager)
+
+
+def test_deletes_drop_empty_groups(db_manager, transactions):
+    execute(db_manager, "DELETE FROM transactions WHERE date LIKE '2024-03%'")
+    execute(db_manager, "DELETE FROM transactions WHERE date LIKE '2024-01-05%'")
+
+    assert_rollup_matches(db_manager)
+    assert execute(db_manager, "SELECT COUNT(*) FROM monthly_category_totals WHERE month = '2024-03'") == [(0,)]
+
+
+def test_existing_transactions_are_summed_up_once(db_manager, transactions):
+    execute(db_manager, "DROP TABLE monthly_category_totals")
+    db_manager.setup_database()
+    assert_rollup_matches(db_manager)
+
+    # Setting up an existing rollup again keeps it as it is
+    db_manager.setup_database()
+    assert_rollup_matches(db_manager)
+
+
+@pytest.mark.parametrize('start_date, end_date', [
+    (None, None),
+    ('2024-01-01', '2024-03-01'),
+    ('2024-01-06', '2024-02-15'),
+    ('2024-01-10', '2024-01-25'),
+    ('2024-02-01', None),
+    (None, '2024-01-21'),
+])
+def test_totals_match_the_transactions(db_manager, account_id, transactions, start_date, end_date):
+    query = 'SELECT type, SUM(amount) FROM transactions WHERE date >= ? AND date < ? GROUP BY type'
+    expected = dict(execute(db_manager, query, (start_date or '0001-01-01', end_date or '9999-12-31')))
+
+    totals = db_manager.get_totals_by_type(start_date, end_date, account_id)
+
+    assert totals['income'] == pytest.approx(expected.get('income', 0))
+    assert totals['expense'] == pytest.approx(expected.get('expense', 0))
+
+    categories = db_manager.get_category_totals(start_date, end_date)
+    expected_categories = execute(db_manager, '''
+        SELECT category_id, SUM(amount) FROM transactions
+        WHERE type = 'expense' AND category_id IS NOT NULL AND date >= ? AND date < ?
+        GROUP BY category_id
+    ''', (start_date or '0001-01-01', end_date or '9999-12-31'))
+    assert {row['category_id']: pytest.approx(row['total']) for row in categories} == dict(expected_categories)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Paged table model of the transactions view, over keyset pages of the database.
+"""
+
+import pytest
+
+pytest.importorskip('PyQt5.QtCore')
+
+from PyQt5.QtCore import QModelIndex, Qt
+
+from src.views.transactions_model import TransactionsTableModel, format_amount, format_date
+
+# Transactions of the ledger, as (date, type, amount); several share a day
+TRANSACTIONS = [
+    ('2024-01-10', 'income', 5000.0),
+    ('2024-01-12', 'expense', 120.5),
+    ('2024-01-12', 'expense', 80.0),
+    ('2024-01-12', 'expense', 35.0),
+    ('2024-01-15', 'expense', 900.0),
+]
+
+
+@pytest.fixture
+def ledger(db_manager, account_id):
+    """IDs of the TRANSACTIONS, in insertion order."""
+    return [db_manager.add_transaction(account_id, amount, transaction_type, date, description=f'Movimiento {number}')
+            for number, (date, transaction_type, amount) in enumerate(TRANSACTIONS)]
+
+
+def page_source(db_manager, reads):
+    """Page source reading from the database right away, recording the (after, limit) of every read."""
+    def read(after, limit, deliver):
+        reads.append((after, limit))
+        deliver(db_manager.get_transactions(after=after, limit=limit))
+    return read
+
+
+def test_formatting():
+    assert format_date('2024-01-12 00:00:00') == '12/01/2024'
+    assert format_amount(120.5, 'expense') == '-120.50'
+    assert format_amount(5000, 'income') == '+5000.00'
+    assert format_amount(10, 'transfer') == '10.00'
+
+
+def test_pages_are_read_on_demand(qt_app, db_manager, ledger):
+    reads = []
+    model = TransactionsTableModel(page_size=2)
+    model.set_page_source(page_source(db_manager, reads))
+
+    # Only the first page is read until the view scrolls
+    assert model.rowCount() == 2
+    assert reads == [(None, 2)]
+    assert model.canFetchMore(QModelIndex())
+
+    while model.canFetchMore(QModelIndex()):
+        model.fetchMore(QModelIndex())
+
+    # Newest first, transactions of the same day by descending ID, each row once
+    assert [model.record(row)['id'] for row in range(model.rowCount())] == [
+        ledger[4], ledger[3], ledger[2], ledger[1], ledger[0]]
+    assert len(reads) == 3
+    assert reads[1][0] == (model.record(1)['date'], model.record(1)['id'])
+
+
+def test_data_roles(qt_app, db_manager, ledger):
+    model = TransactionsTableModel()
+    model.set_page_source(page_source(db_manager, []))
+
+    assert model.rowCount() == len(TRANSACTIONS)
+    assert not model.canFetchMore(QModelIndex())
+
+    newest = model.index(0, model.AMOUNT_COLUMN)
+    assert model.data(newest) == '-900.00'
+    assert model.data(newest, Qt.UserRole) == ledger[4]
+    assert model.data(model.index(0, model.DATE_COLUMN)) == '15/01/2024'
+    assert model.data(model.index(0, model.ACCOUNT_COLUMN)) == 'Cuenta de Nómina'
+    assert model.data(model.index(0, model.CATEGORY_COLUMN)) == 'Sin categoría'
+    assert model.data(model.index(4, model.AMOUNT_COLUMN), Qt.ForegroundRole).name() == '#28a745'
+    assert model.headerData(model.DESCRIPTION_COLUMN, Qt.Horizontal) == 'Descripción'
+
+
+def test_reload_reads_the_first_page_again(qt_app, db_manager, account_id, ledger):
+    reads = []
+    model = TransactionsTableModel(page_size=2)
+    model.set_page_source(page_source(db_manager, reads))
+    model.fetchMore(QModelIndex())
+
+    newest_id = db_manager.add_transaction(account_id, 10.0, 'expense', '2024-02-01')
+    model.reload()
+
+    assert model.rowCount() == 2
+    assert model.record(0)['id'] == newest_id
+    assert reads[-1] == (None, 2)
+
+
+def test_pages_delivered_later(qt_app, db_manager, ledger):
+    pending = []
+    loading = []
+    model = TransactionsTableModel(page_size=2)
+    model.loading_changed.connect(loading.append)
+    model.set_page_source(lambda after, limit, deliver: pending.append((after, limit, deliver)))
+
+    # A single request at a time
+    assert model.rowCount() == 0 and len(pending) == 1
+    assert not model.canFetchMore(QModelIndex())
+    assert loading == [True]
+
+    pending.pop()[2](db_manager.get_transactions(limit=2))
+    assert model.rowCount() == 2 and loading == [True, False]
+    assert model.canFetchMore(QModelIndex())
+
+
+def test_pages_requested_before_a_reload_are_dropped(qt_app, db_manager, ledger):
+    pending = []
+    model = TransactionsTableModel(page_size=2)
+    model.set_page_source(lambda after, limit, deliver: pending.append(deliver))
+    model.reload()
+
+    stale, current = pending
+    current(db_manager.get_transactions(limit=2))
+    stale(db_manager.get_transactions(limit=2))
+
+    assert model.rowCount() == 2
+
+
+def test_fixed_rows_are_not_paged(qt_app):
+    model = TransactionsTableModel(page_size=1)
+    model.set_rows([{'id': 1, 'date': '2024-01-01', 'amount': 5.0, 'type': 'expense'},
+                    {'id': 2, 'date': '2024-01-02', 'amount': 7.0, 'type': 'income'}])
+
+    assert model.rowCount() == 2
+    assert not model.canFetchMore(QModelIndex())